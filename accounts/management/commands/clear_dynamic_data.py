@@ -2,6 +2,7 @@ from django.core.management.base import BaseCommand
 from django.contrib.auth import get_user_model
 from leaves.models import LeaveRequest
 from notifications.models import Notification
+from notifications.unread import clear_unread_counts
 from django.db import transaction
 
 
@@ -73,7 +74,11 @@ class Command(BaseCommand):
         
         count = Notification.objects.count()
         if count > 0:
+            unread_user_ids = list(
+                Notification.objects.filter(is_read=False).values_list('user_id', flat=True).distinct()
+            )
             Notification.objects.all().delete()
+            clear_unread_counts(unread_user_ids)
             self.stdout.write(f'  Διαγράφηκαν {count} ειδοποιήσεις')
         else:
             self.stdout.write('  Δεν βρέθηκαν ειδοποιήσεις για διαγραφή')
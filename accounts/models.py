@@ -185,17 +185,12 @@ class Department(models.Model):
         return self.name
     
     def get_all_sub_departments(self):
-        """Επιστρέφει όλα τα υποτμήματα (άμεσα και έμμεσα)"""
-        sub_departments = [self]  # Συμπεριλαμβάνω και το ίδιο το τμήμα
-        
-        # Βρίσκω τα άμεσα παιδιά
-        direct_children = Department.objects.filter(parent_department=self)
-        
-        # Για κάθε άμεσο παιδί, βρίσκω και τα δικά του παιδιά (αναδρομικά)
-        for child in direct_children:
-            sub_departments.extend(child.get_all_sub_departments())
-        
-        return sub_departments
+        """Επιστρέφει όλα τα υποτμήματα (άμεσα και έμμεσα), μαζί με το ίδιο το τμήμα"""
+        from accounts.utils.department_hierarchy import get_department_hierarchy
+
+        ids = get_department_hierarchy(self.pk).descendant_ids(self.pk)
+        departments = Department.objects.in_bulk(ids)
+        return [departments[pk] for pk in ids if pk in departments]
 
     def get_department_manager(self):
         """
@@ -476,7 +471,9 @@ class User(AbstractUser):
         """
         if not self.department_id:
             return False
-        return self.department.get_department_manager() == self
+        from accounts.utils.department_hierarchy import get_department_hierarchy
+        hierarchy = get_department_hierarchy(self.department_id)
+        return hierarchy.department_manager_id(self.department_id) == self.id
     
     @property
     def is_leave_handler(self):
@@ -524,58 +521,21 @@ class User(AbstractUser):
         1. Αν ο χρήστης είναι manager του τμήματός του → εγκρίνει ο γονικού τμήματος ή PDEDE
         2. Αν ο χρήστης ΔΕΝ είναι manager → εγκρίνει ο manager του τμήματός του
         3. Αν δεν υπάρχει manager → ανεβαίνουμε στο γονικό τμήμα ή PDEDE
+
+        Η αναζήτηση γίνεται στο στιγμιότυπο ιεραρχίας (accounts.utils.department_hierarchy)·
+        μόνο ο προϊστάμενος που βρέθηκε φορτώνεται από τη βάση.
         """
-        if not self.department:
+        manager_id = self.get_approving_manager_id()
+        if manager_id is None:
             return None
-        
-        # Αν είναι manager του τμήματός του, ψάχνουμε τον γονικού ή PDEDE
-        if self.is_manager_of_department(self.department):
-            if self.department.parent_department:
-                # Αναδρομικά βρίσκουμε τον πρώτο manager πάνω στην ιεραρχία
-                return self._find_manager_in_hierarchy(self.department.parent_department)
-            else:
-                # Είναι root τμήμα, ψάχνουμε για PDEDE
-                return self._find_pdede_manager()
-        
-        # Δεν είναι manager, βρίσκουμε τον manager του τμήματός του
-        return self._find_manager_in_hierarchy(self.department)
-    
-    def _find_pdede_manager(self):
-        """
-        Βρίσκει τον manager του ΠΔΕΔΕ όταν δεν υπάρχει parent.
-        Υποστηρίζει και PDEDE_MAIN (tests) και PDEDE (production).
-        """
-        pdede = (
-            Department.objects.filter(department_type__code='PDEDE_MAIN').first()
-            or Department.objects.filter(department_type__code='PDEDE').first()
-            or Department.objects.filter(code='PDEDE').first()
-        )
-        if pdede:
-            if pdede.manager and pdede.manager != self:
-                return pdede.manager
-            manager = pdede.users.filter(roles__code=ROLE_MANAGER).exclude(pk=self.pk).first()
-            if manager:
-                return manager
-        return None
-    
-    def _find_manager_in_hierarchy(self, department):
-        """
-        Αναζητά τον πρώτο manager ξεκινώντας από το τμήμα και ανεβαίνοντας στην ιεραρχία.
-        Αν δεν βρει parent, ψάχνει για PDEDE department.
-        """
-        while department:
-            # Πρώτα ελέγχουμε αν υπάρχει ρητά ορισμένος manager
-            if department.manager and department.manager != self:
-                return department.manager
-            # Διαφορετικά ψάχνουμε για χρήστη με ρόλο MANAGER
-            manager = department.users.filter(roles__code=ROLE_MANAGER).exclude(pk=self.pk).first()
-            if manager:
-                return manager
-            # Αν δεν βρούμε, πάμε στο γονικό
-            department = department.parent_department
-        
-        # Αν φτάσαμε εδώ χωρίς parent, ψάχνουμε για PDEDE department
-        return self._find_pdede_manager()
+        return User.objects.filter(pk=manager_id).first()
+
+    def get_approving_manager_id(self):
+        """Όπως το get_approving_manager(), χωρίς φόρτωση του προϊσταμένου."""
+        if not self.department_id:
+            return None
+        from accounts.utils.department_hierarchy import get_department_hierarchy
+        return get_department_hierarchy(self.department_id).approver_id(self.pk, self.department_id)
     
     def is_substitute_contract_blocked(self):
         """Αναπληρωτής σε αναμονή/λήξη σύμβασης — χωρίς νέες αιτήσεις."""
@@ -620,34 +580,24 @@ class User(AbstractUser):
     
     def get_subordinates(self):
         """Επιστρέφει τους υφισταμένους — μόνο αν είναι ενεργός προϊστάμενος του τμήματος."""
-        if not self.department or not self.is_effective_department_manager:
+        if not self.department_id or not self.is_effective_department_manager:
             return User.objects.none()
 
         from django.db.models import Q
+        from accounts.utils.department_hierarchy import get_department_hierarchy
+
+        # Τμήματα από το στιγμιότυπο ιεραρχίας: ίδιο τμήμα + ΣΔΕΥ (για ΚΕΔΑΣΥ) χωρίς
+        # προϊσταμένους, όλοι οι χρήστες των υποτμημάτων για AUTOTELOUS_DN
+        hierarchy = get_department_hierarchy(self.department_id)
+        without_managers, everyone = hierarchy.subordinate_scope(self.department_id)
+        conditions = (
+            Q(department_id__in=without_managers)
+            & ~Q(pk__in=hierarchy.manager_ids_in(without_managers))
+        )
+        if everyone:
+            conditions = conditions | Q(department_id__in=everyone)
 
-        conditions = Q(
-            department=self.department,
-            is_active=True,
-        ) & ~Q(roles__code=ROLE_MANAGER)
-
-        if (self.department.department_type and
-                self.department.department_type.code == 'KEDASY'):
-            from accounts.department_utils import SDEY_DEPARTMENT_TYPE_CODES
-            sdei_condition = Q(
-                department__parent_department=self.department,
-                department__department_type__code__in=SDEY_DEPARTMENT_TYPE_CODES,
-                is_active=True,
-            ) & ~Q(roles__code=ROLE_MANAGER)
-            conditions = conditions | sdei_condition
-
-        if self.department.code == 'AUTOTELOUS_DN':
-            child_dept_condition = Q(
-                department__parent_department=self.department,
-                is_active=True,
-            )
-            conditions = conditions | child_dept_condition
-
-        return User.objects.filter(conditions).distinct()
+        return User.objects.filter(conditions, is_active=True)
 
     def get_role_names(self):
         """Επιστρέφει τα ονόματα των ρόλων του χρήστη"""
@@ -1,6 +1,10 @@
 from django.contrib.auth.signals import user_logged_in
+from django.db.models.signals import m2m_changed, post_delete, post_save
 from django.dispatch import receiver
 
+from accounts.models import Department, User
+from accounts.utils.department_hierarchy import department_hierarchy, invalidate_department_hierarchy
+
 
 @receiver(user_logged_in)
 def notify_substitute_reappearance(sender, request, user, **kwargs):
@@ -11,3 +15,44 @@ def notify_substitute_reappearance(sender, request, user, **kwargs):
     except Exception:
         # Μην μπλοκάρουμε το login για αποτυχία ειδοποίησης
         pass
+
+
+@receiver(post_save, sender=Department)
+@receiver(post_delete, sender=Department)
+def invalidate_hierarchy_on_department_change(sender, instance, **kwargs):
+    """Αλλαγή τμήματος (γονικό, τύπος, προϊστάμενος) → νέο στιγμιότυπο ιεραρχίας."""
+    invalidate_department_hierarchy()
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_hierarchy_on_user_change(sender, instance, signal, **kwargs):
+    """
+    Το στιγμιότυπο κρατά τους χρήστες με ρόλο MANAGER ανά τμήμα· ακυρώνεται όταν
+    αλλάζει τμήμα τέτοιος χρήστης και σε κάθε διαγραφή χρήστη — το SET_NULL του
+    Department.manager γίνεται με UPDATE χωρίς signals του Department.
+    """
+    if signal is post_delete:
+        invalidate_department_hierarchy()
+        return
+    update_fields = kwargs.get('update_fields')
+    if update_fields is not None and 'department' not in update_fields:
+        return
+    snapshot = department_hierarchy.peek()
+    if snapshot is not None:
+        known_department_id = next(
+            (dept_id for dept_id, user_ids in snapshot.role_managers.items() if instance.pk in user_ids),
+            None,
+        )
+        if known_department_id is None:
+            return
+        if known_department_id == instance.department_id:
+            return
+    invalidate_department_hierarchy()
+
+
+@receiver(m2m_changed, sender=User.roles.through)
+def invalidate_hierarchy_on_role_change(sender, action, **kwargs):
+    """Προσθήκη/αφαίρεση ρόλου (MANAGER) αλλάζει τους προϊσταμένους ανά τμήμα."""
+    if action in ('post_add', 'post_remove', 'post_clear'):
+        invalidate_department_hierarchy()
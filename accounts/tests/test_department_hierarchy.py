@@ -0,0 +1,76 @@
+"""Tests για το στιγμιότυπο ιεραρχίας τμημάτων."""
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from accounts.models import Department
+from accounts.tests.test_data import TestDataMixin
+from accounts.utils.department_hierarchy import department_hierarchy, get_department_hierarchy
+
+User = get_user_model()
+
+
+class DepartmentHierarchyTests(TestDataMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        department_hierarchy.invalidate()
+        self.addCleanup(department_hierarchy.invalidate)
+
+    def test_ancestors_and_descendants(self):
+        hierarchy = get_department_hierarchy()
+        self.assertEqual(
+            hierarchy.ancestor_ids(self.child_department.pk),
+            [self.child_department.pk, self.autotelous_dn.pk],
+        )
+        self.assertEqual(
+            [d.pk for d in self.autotelous_dn.get_all_sub_departments()],
+            [self.autotelous_dn.pk, self.child_department.pk],
+        )
+
+    def test_approvers_follow_hierarchy_without_queries(self):
+        get_department_hierarchy()
+        with self.assertNumQueries(0):
+            self.assertEqual(self.employee.get_approving_manager_id(), self.dept_manager.pk)
+            self.assertEqual(self.dept_manager.get_approving_manager_id(), self.kizilou.pk)
+            self.assertEqual(self.kizilou.get_approving_manager_id(), self.delegkos.pk)
+            self.assertTrue(self.dept_manager.is_effective_department_manager)
+
+    def test_manager_change_rebuilds_snapshot(self):
+        self.assertEqual(self.employee.get_approving_manager(), self.dept_manager)
+        self.child_department.manager = None
+        self.child_department.save()
+        self.dept_manager.roles.remove(self.manager_role)
+        self.assertEqual(self.employee.get_approving_manager(), self.kizilou)
+
+    def test_deleting_fk_only_manager_rebuilds_snapshot(self):
+        fk_manager = User.objects.create_user(
+            email='fk_manager@test.com', password='testpass123', first_name='Μόνο', last_name='Προϊστάμενος',
+        )
+        self.child_department.manager = fk_manager
+        self.child_department.save()
+        self.dept_manager.roles.remove(self.manager_role)
+        self.assertEqual(self.employee.get_approving_manager_id(), fk_manager.pk)
+
+        # Το SET_NULL του Department.manager δεν στέλνει signal του Department
+        fk_manager.delete()
+        self.assertEqual(self.employee.get_approving_manager(), self.kizilou)
+
+    def test_subordinates_of_autotelous_include_child_department(self):
+        subordinates = set(self.kizilou.get_subordinates().values_list('pk', flat=True))
+        self.assertEqual(subordinates, {self.employee.pk, self.dept_manager.pk})
+        self.assertEqual(
+            set(self.dept_manager.get_subordinates().values_list('pk', flat=True)),
+            {self.employee.pk},
+        )
+
+    def test_new_department_from_other_worker_is_loaded_on_demand(self):
+        get_department_hierarchy()
+        # Δημιουργία χωρίς signals, όπως σε άλλον worker πριν ενημερωθεί το στιγμιότυπο
+        Department.objects.bulk_create([Department(
+            name='Νέο Τμήμα', code='NEW_DEPT', department_type=self.child_dept_type,
+            parent_department=self.child_department,
+        )])
+        new_department = Department.objects.get(code='NEW_DEPT')
+        self.assertEqual(
+            get_department_hierarchy(new_department.pk).ancestor_ids(new_department.pk)[-1],
+            self.autotelous_dn.pk,
+        )
@@ -0,0 +1,248 @@
+"""
+Στιγμιότυπο της ιεραρχίας τμημάτων στη μνήμη.
+
+Όλα τα τμήματα (γονικό, τύπος, προϊστάμενος FK) και οι χρήστες με ρόλο MANAGER ανά
+τμήμα φορτώνονται με δύο queries και κρατιούνται ανά διεργασία. Έτσι οι ερωτήσεις
+ιεραρχίας (υποτμήματα, πρόγονοι, ποιος εγκρίνει, εύρος υφισταμένων) γίνονται με
+lookups σε dict αντί για ένα query ανά κόμβο.
+
+Το στιγμιότυπο ακυρώνεται από τα signals του accounts (αλλαγές τμήματος, τμήματος
+προϊσταμένου, ρόλων). Οι υπόλοιποι workers μαθαίνουν την αλλαγή μέσω μετρητή
+έκδοσης στο cache, όπως το ευρετήριο εργάσιμων ημερών.
+"""
+import threading
+import time
+from collections import defaultdict, namedtuple
+
+from accounts.department_utils import SDEY_DEPARTMENT_TYPE_CODES
+from accounts.role_constants import ROLE_MANAGER
+
+CACHE_VERSION_NAME = 'department_hierarchy'
+
+# Κάθε πόσα δευτερόλεπτα ελέγχεται ο μετρητής έκδοσης στο cache
+GENERATION_CHECK_INTERVAL = 5
+
+# Σειρά αναζήτησης τμήματος ΠΔΕΔΕ (PDEDE_MAIN στα tests, PDEDE στην παραγωγή)
+PDEDE_TYPE_CODES = ('PDEDE_MAIN', 'PDEDE')
+
+DepartmentNode = namedtuple('DepartmentNode', 'id parent_id code name type_code manager_id')
+
+
+class DepartmentHierarchy:
+    """Αμετάβλητο στιγμιότυπο της ιεραρχίας τμημάτων."""
+
+    def __init__(self, nodes, role_managers):
+        self.nodes = {node.id: node for node in nodes}
+        self.children = defaultdict(list)
+        for node in nodes:
+            if node.parent_id is not None:
+                self.children[node.parent_id].append(node.id)
+        # department_id -> [user_id, ...] με ρόλο MANAGER (σειρά επωνύμου/ονόματος)
+        self.role_managers = role_managers
+        self.pdede_id = self._find_pdede_id(nodes)
+
+    @staticmethod
+    def _find_pdede_id(nodes):
+        for type_code in PDEDE_TYPE_CODES:
+            for node in nodes:
+                if node.type_code == type_code:
+                    return node.id
+        for node in nodes:
+            if node.code == 'PDEDE':
+                return node.id
+        return None
+
+    def __contains__(self, department_id):
+        return department_id in self.nodes
+
+    def type_code(self, department_id):
+        node = self.nodes.get(department_id)
+        return node.type_code if node else None
+
+    def parent_id(self, department_id):
+        node = self.nodes.get(department_id)
+        return node.parent_id if node else None
+
+    def descendant_ids(self, department_id):
+        """Το τμήμα και όλα τα υποτμήματά του (preorder, παιδιά κατά όνομα)."""
+        if department_id not in self.nodes:
+            return []
+        result = []
+        stack = [department_id]
+        while stack:
+            current = stack.pop()
+            result.append(current)
+            stack.extend(reversed(self.children.get(current, ())))
+        return result
+
+    def ancestor_ids(self, department_id):
+        """Το τμήμα και οι πρόγονοί του, από κάτω προς τα πάνω."""
+        result = []
+        seen = set()
+        while department_id is not None and department_id in self.nodes and department_id not in seen:
+            seen.add(department_id)
+            result.append(department_id)
+            department_id = self.nodes[department_id].parent_id
+        return result
+
+    def department_manager_id(self, department_id):
+        """Όπως το Department.get_department_manager(): FK, αλλιώς πρώτος με ρόλο MANAGER."""
+        node = self.nodes.get(department_id)
+        if node is None:
+            return None
+        if node.manager_id:
+            return node.manager_id
+        managers = self.role_managers.get(department_id)
+        return managers[0] if managers else None
+
+    def _manager_of(self, department_id, exclude_user_id):
+        node = self.nodes[department_id]
+        if node.manager_id and node.manager_id != exclude_user_id:
+            return node.manager_id
+        for user_id in self.role_managers.get(department_id, ()):
+            if user_id != exclude_user_id:
+                return user_id
+        return None
+
+    def _pdede_manager_id(self, exclude_user_id):
+        if self.pdede_id is None:
+            return None
+        return self._manager_of(self.pdede_id, exclude_user_id)
+
+    def approver_id(self, user_id, department_id):
+        """
+        Προϊστάμενος που εγκρίνει τις αιτήσεις του χρήστη (βλ. User.get_approving_manager).
+
+        Ο προϊστάμενος (FK) ενός τμήματος εγκρίνεται από το γονικό τμήμα ή το ΠΔΕΔΕ·
+        οι υπόλοιποι από τον πρώτο προϊστάμενο που βρίσκεται ανεβαίνοντας την ιεραρχία.
+        """
+        node = self.nodes.get(department_id)
+        if node is None:
+            return None
+        start = node.parent_id if node.manager_id == user_id else department_id
+        for ancestor_id in self.ancestor_ids(start):
+            manager_id = self._manager_of(ancestor_id, user_id)
+            if manager_id:
+                return manager_id
+        return self._pdede_manager_id(user_id)
+
+    def subordinate_scope(self, department_id):
+        """
+        Τμήματα υφισταμένων ενός προϊσταμένου (βλ. User.get_subordinates).
+
+        Returns:
+            tuple: (τμήματα όπου εξαιρούνται οι χρήστες με ρόλο MANAGER,
+                    τμήματα όπου μετρούν όλοι οι ενεργοί χρήστες)
+        """
+        node = self.nodes.get(department_id)
+        if node is None:
+            return [], []
+        without_managers = [department_id]
+        everyone = []
+        children = self.children.get(department_id, ())
+        if node.type_code == 'KEDASY':
+            without_managers.extend(
+                child for child in children if self.nodes[child].type_code in SDEY_DEPARTMENT_TYPE_CODES
+            )
+        if node.code == 'AUTOTELOUS_DN':
+            everyone.extend(children)
+        return without_managers, everyone
+
+    def is_kedasy_sdey_child(self, department_id, kedasy_id):
+        """True αν το department_id είναι ΣΔΕΥ με γονικό το ΚΕΔΑΣΥ kedasy_id."""
+        return (
+            kedasy_id is not None
+            and self.type_code(kedasy_id) == 'KEDASY'
+            and self.type_code(department_id) in SDEY_DEPARTMENT_TYPE_CODES
+            and self.parent_id(department_id) == kedasy_id
+        )
+
+    def kedasy_sdey_child_ids(self, kedasy_id):
+        """ΣΔΕΥ με γονικό το ΚΕΔΑΣΥ kedasy_id (κενό αν το τμήμα δεν είναι ΚΕΔΑΣΥ)."""
+        if kedasy_id is None or self.type_code(kedasy_id) != 'KEDASY':
+            return []
+        return [
+            child for child in self.children.get(kedasy_id, ())
+            if self.nodes[child].type_code in SDEY_DEPARTMENT_TYPE_CODES
+        ]
+
+    def manager_ids_in(self, department_ids):
+        """Χρήστες με ρόλο MANAGER στα δοσμένα τμήματα."""
+        return [user_id for dept_id in department_ids for user_id in self.role_managers.get(dept_id, ())]
+
+
+def build_department_hierarchy():
+    """Φόρτωση του στιγμιότυπου με δύο queries."""
+    from accounts.models import Department, User
+
+    nodes = [
+        DepartmentNode(*row)
+        for row in Department.objects.order_by('name', 'pk').values_list(
+            'pk', 'parent_department_id', 'code', 'name', 'department_type__code', 'manager_id',
+        )
+    ]
+    role_managers = defaultdict(list)
+    for department_id, user_id in User.objects.filter(
+        roles__code=ROLE_MANAGER, department__isnull=False,
+    ).order_by('last_name', 'first_name', 'pk').values_list('department_id', 'pk'):
+        role_managers[department_id].append(user_id)
+    return DepartmentHierarchy(nodes, dict(role_managers))
+
+
+class _HierarchyHolder:
+    """Το στιγμιότυπο της διεργασίας, με έλεγχο έκδοσης ανά GENERATION_CHECK_INTERVAL."""
+
+    def __init__(self):
+        self._snapshot = None
+        self._lock = threading.Lock()
+        self._generation = None
+        self._checked_at = 0.0
+
+    def invalidate(self):
+        self._snapshot = None
+
+    def peek(self):
+        """Το τρέχον στιγμιότυπο χωρίς φόρτωση (None αν δεν υπάρχει)."""
+        return self._snapshot
+
+    def _sync_generation(self):
+        from leaves.utils.cache_versions import get_cache_version
+
+        now = time.monotonic()
+        if now - self._checked_at < GENERATION_CHECK_INTERVAL:
+            return
+        self._checked_at = now
+        generation = get_cache_version(CACHE_VERSION_NAME)
+        if generation is None or generation != self._generation:
+            self.invalidate()
+            self._generation = generation
+
+    def get(self, department_id=None):
+        """
+        Το στιγμιότυπο· ξαναφορτώνεται αν λείπει το department_id
+        (π.χ. τμήμα που δημιουργήθηκε σε άλλον worker).
+        """
+        self._sync_generation()
+        snapshot = self._snapshot
+        if snapshot is None or (department_id is not None and department_id not in snapshot):
+            with self._lock:
+                snapshot = build_department_hierarchy()
+                self._snapshot = snapshot
+        return snapshot
+
+
+department_hierarchy = _HierarchyHolder()
+
+
+def get_department_hierarchy(department_id=None):
+    return department_hierarchy.get(department_id)
+
+
+def invalidate_department_hierarchy():
+    """Ακύρωση τοπικά και σε όλους τους workers (ξανά και μετά το commit)."""
+    from django.db import transaction
+    from leaves.utils.cache_versions import bump_cache_version
+
+    department_hierarchy.invalidate()
+    bump_cache_version(CACHE_VERSION_NAME)
+    transaction.on_commit(department_hierarchy.invalidate)
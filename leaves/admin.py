@@ -9,7 +9,7 @@ from .models import (
     DocumentUploadAcknowledgment,
     ApplicantDocumentsSubmissionAcknowledgment,
     ProtocolEmailFailureAcknowledgment,
-    YearlySickLeaveTotal
+    YearlySickLeaveTotal, SickLeaveAlertTotal
 )
 
 
@@ -45,7 +45,7 @@ class LeaveTypeAdmin(admin.ModelAdmin):
 @admin.register(LeaveRequest)
 class LeaveRequestAdmin(admin.ModelAdmin):
     list_display = ('user', 'leave_type', 'days', 'status', 'submitted_at', 'kedasy_kepea_protocol_number', 'pdede_protocol_number', 'protocol_number')
-    list_filter = ('status', 'leave_type', 'created_at', 'locking_user')
+    list_filter = ('status', 'leave_type', 'created_at')
     search_fields = ('user__first_name', 'user__last_name', 'user__email', 'protocol_number', 'kedasy_kepea_protocol_number', 'pdede_protocol_number')
     fieldsets = (
         ('Βασικά Στοιχεία', {
@@ -90,14 +90,11 @@ class LeaveRequestAdmin(admin.ModelAdmin):
         ('Ανάκληση / Διαγραφή', {
             'fields': ('parent_leave', 'revoked_days')
         }),
-        ('Κλείδωμα', {
-            'fields': ('locking_user', 'locked_at')
-        }),
         ('Ολοκλήρωση', {
             'fields': ('completed_at',)
         }),
     )
-    readonly_fields = ('created_at', 'updated_at', 'submitted_at', 'manager_approved_at', 'manager_approved_by', 'processed_at', 'rejected_at', 'completed_at', 'protocol_created_at', 'decision_created_at', 'merged_pdf_created_at', 'merged_pdf_sent_at', 'exact_copy_uploaded_at', 'documents_requested_at', 'documents_provided_at', 'locked_at', 'returned_at')
+    readonly_fields = ('created_at', 'updated_at', 'submitted_at', 'manager_approved_at', 'manager_approved_by', 'processed_at', 'rejected_at', 'completed_at', 'protocol_created_at', 'decision_created_at', 'merged_pdf_created_at', 'merged_pdf_sent_at', 'exact_copy_uploaded_at', 'documents_requested_at', 'documents_provided_at', 'returned_at')
     # Remove flawed 'periods' field display since it's not a direct FK field
 
     def get_queryset(self, request):
@@ -118,7 +115,7 @@ class SecureFileAdmin(admin.ModelAdmin):
     list_display = ('original_filename', 'leave_request', 'uploaded_by', 'uploaded_at', 'file_size')
     list_filter = ('uploaded_at', 'content_type')
     search_fields = ('original_filename', 'leave_request__user__first_name', 'leave_request__user__last_name')
-    readonly_fields = ('uploaded_at', 'file_size', 'content_type', 'encryption_key', 'file_path')
+    readonly_fields = ('uploaded_at', 'file_size', 'content_type', 'encryption_key', 'file_path', 'content_sha256')
 
 
 @admin.register(Logo)
@@ -279,6 +276,15 @@ class YearlySickLeaveTotalAdmin(admin.ModelAdmin):
     ordering = ('-year', 'employee__last_name', 'employee__first_name')
 
 
+@admin.register(SickLeaveAlertTotal)
+class SickLeaveAlertTotalAdmin(admin.ModelAdmin):
+    list_display = ('employee', 'year', 'total_days', 'updated_at')
+    list_filter = ('year',)
+    search_fields = ('employee__email', 'employee__last_name', 'employee__first_name')
+    readonly_fields = ('employee', 'year', 'total_days', 'updated_at')
+    ordering = ('-year', '-total_days')
+
+
 @admin.register(YCCommitteeAcknowledgment)
 class YCCommitteeAcknowledgmentAdmin(admin.ModelAdmin):
     list_display = ('handler', 'employee', 'acknowledged_at')
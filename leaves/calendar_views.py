@@ -1,15 +1,16 @@
 from django.shortcuts import render
 from django.contrib.auth.decorators import login_required
 from django.core.exceptions import PermissionDenied
+from django.http import JsonResponse
 from django.utils import timezone
-from django.db.models import Q
-from datetime import datetime, timedelta, date
+from datetime import timedelta, date
 import calendar
-from .models import LeaveRequest, LeavePeriod
-from accounts.department_utils import SDEY_DEPARTMENT_TYPE_CODES
-from django.contrib.auth import get_user_model
-
-User = get_user_model()
+from leaves.utils.leave_calendar import (
+    bucket_events_by_day,
+    calendar_scope_user_ids,
+    get_calendar_events,
+)
+from leaves.utils.reference_data import get_leave_type_colors
 
 
 @login_required
@@ -41,52 +42,10 @@ def leave_calendar_view(request, year=None, month=None):
     next_month = month + 1 if month < 12 else 1
     next_year = year if month < 12 else year + 1
     
-    # Βρίσκω όλους τους υφισταμένους του προϊσταμένου
-    subordinates = request.user.get_subordinates()
-    employees_to_include = list(subordinates)
-    
-    # Αν ο χρήστης είναι προϊστάμενος ΚΕΔΑΣΥ, προσθέτω και χρήστες από ΣΔΕΥ
-    if (request.user.department and
-        request.user.department.department_type and
-        request.user.department.department_type.code == 'KEDASY'):
-        
-        sdeu_users = User.objects.filter(
-            department__department_type__code__in=SDEY_DEPARTMENT_TYPE_CODES,
-            department__parent_department=request.user.department,
-            is_active=True
-        )
-        employees_to_include.extend(list(sdeu_users))
-    
-    # Βρίσκω όλες τις αιτήσεις αδειών που επηρεάζουν αυτόν τον μήνα
-    # Συμπεριλαμβάνω αιτήσεις που είναι εγκεκριμένες ή ολοκληρωμένες
-    approved_statuses = ['PENDING_PROTOCOL', 'PENDING_PROTOCOL', 'PENDING_PROTOCOL', 
-                        'WAITING_FOR_DOCUMENTS', 'IN_REVIEW', 'COMPLETED']
-    
-    leave_requests = LeaveRequest.objects.filter(
-        user__in=employees_to_include,
-        status__in=approved_statuses,
-        leave_type__is_revocation=False,
-    ).exclude(status='REVOKED_BY_REQUEST').select_related('user', 'leave_type').prefetch_related('periods')
-    
-    # Φιλτράρω τις περιόδους που τέμνουν με τον τρέχοντα μήνα
-    month_periods = []
-    for leave_request in leave_requests:
-        for period in leave_request.periods.all():
-            # Έλεγχος αν η περίοδος τέμνει με τον μήνα
-            if (period.start_date <= last_day and period.end_date >= first_day):
-                # Κλιπάρω τις ημερομηνίες στον μήνα
-                period_start = max(period.start_date, first_day)
-                period_end = min(period.end_date, last_day)
-                
-                month_periods.append({
-                    'request': leave_request,
-                    'period': period,
-                    'period_start': period_start,
-                    'period_end': period_end,
-                    'user': leave_request.user,
-                    'leave_type': leave_request.leave_type,
-                    'status': leave_request.status
-                })
+    # Υπάλληλοι του προϊσταμένου (και ΣΔΕΥ για ΚΕΔΑΣΥ) και διαστήματα του μήνα
+    employee_ids = calendar_scope_user_ids(request.user)
+    month_events = get_calendar_events(request.user, first_day, last_day, user_ids=employee_ids)
+    events_by_day = bucket_events_by_day(month_events, first_day, last_day)
     
     # Δημιουργία του ημερολογίου
     cal = calendar.Calendar(firstweekday=0)  # Δευτέρα = 0
@@ -118,17 +77,7 @@ def leave_calendar_view(request, year=None, month=None):
                 day_date = date(year, month, day)
                 weekday = day_date.weekday()  # 0 = Δευτέρα, 6 = Κυριακή
                 
-                # Βρίσκω τα events για αυτή την ημέρα
-                day_events = []
-                for period in month_periods:
-                    if period['period_start'] <= day_date <= period['period_end']:
-                        day_events.append({
-                            'user_name': period['user'].full_name,
-                            'leave_type': period['leave_type'].name,
-                            'leave_type_id': period['leave_type'].id,
-                            'status': period['status'],
-                            'request_id': period['request'].id
-                        })
+                day_events = [dict(event) for event in events_by_day[day_date]]
                 
                 calendar_days.append({
                     'day': day,
@@ -178,46 +127,55 @@ def leave_calendar_view(request, year=None, month=None):
         'next_year': next_year,
         'today': today,
         'leave_type_colors': leave_type_colors,
-        'total_employees': len(employees_to_include),
-        'total_requests': len(month_periods),
+        'total_employees': len(employee_ids),
+        'total_requests': len(month_events),
     }
     
     return render(request, 'leaves/calendar.html', context)
 
 
-def get_leave_type_colors():
-    """Επιστρέφει χρώματα για κάθε τύπο άδειας"""
-    from .models import LeaveType
-    
-    # Προκαθορισμένα χρώματα Bootstrap και επιπλέον
-    colors = [
-        '#007bff',  # Primary blue
-        '#28a745',  # Success green
-        '#dc3545',  # Danger red
-        '#ffc107',  # Warning yellow
-        '#17a2b8',  # Info cyan
-        '#6f42c1',  # Purple
-        '#e83e8c',  # Pink
-        '#fd7e14',  # Orange
-        '#20c997',  # Teal
-        '#6c757d',  # Secondary gray
-        '#795548',  # Brown
-        '#607d8b',  # Blue gray
-        '#f44336',  # Red
-        '#e91e63',  # Pink
-        '#9c27b0',  # Purple
-        '#673ab7',  # Deep purple
-        '#3f51b5',  # Indigo
-        '#2196f3',  # Blue
-        '#03a9f4',  # Light blue
-        '#00bcd4',  # Cyan
+# Μέγιστο εύρος που επιστρέφει το JSON feed
+CALENDAR_FEED_MAX_DAYS = 366
+
+
+@login_required
+def leave_calendar_feed(request):
+    """JSON feed ημερολογίου για αυθαίρετο διάστημα (?start=YYYY-MM-DD&end=YYYY-MM-DD)"""
+    if not request.user.is_department_manager:
+        raise PermissionDenied("Δεν έχετε δικαίωμα πρόσβασης σε αυτή τη σελίδα.")
+
+    try:
+        start_date = date.fromisoformat(request.GET.get('start', ''))
+        end_date = date.fromisoformat(request.GET.get('end', ''))
+    except ValueError:
+        return JsonResponse({'error': 'Μη έγκυρη μορφή ημερομηνίας.'}, status=400)
+    if start_date > end_date or (end_date - start_date).days >= CALENDAR_FEED_MAX_DAYS:
+        return JsonResponse({'error': 'Μη έγκυρο διάστημα ημερομηνιών.'}, status=400)
+
+    leave_type_colors = get_leave_type_colors()
+    events = [
+        {
+            **event,
+            'start': event['start'].isoformat(),
+            'end': event['end'].isoformat(),
+            'color': leave_type_colors.get(event['leave_type_id'], '#007bff'),
+        }
+        for event in get_calendar_events(request.user, start_date, end_date)
     ]
-    
-    leave_types = LeaveType.objects.filter(is_active=True).order_by('id')
-    type_colors = {}
-    
-    for i, leave_type in enumerate(leave_types):
-        color_index = i % len(colors)
-        type_colors[leave_type.id] = colors[color_index]
-    
-    return type_colors
\ No newline at end of file
+
+    from .models import PublicHoliday
+    holidays = [
+        {'date': holiday_date.isoformat(), 'name': name}
+        for holiday_date, name in PublicHoliday.objects.filter(
+            date__gte=start_date,
+            date__lte=end_date,
+            is_active=True,
+        ).order_by('date').values_list('date', 'name')
+    ]
+
+    return JsonResponse({
+        'start': start_date.isoformat(),
+        'end': end_date.isoformat(),
+        'events': events,
+        'holidays': holidays,
+    })
@@ -2,28 +2,259 @@
 Κρυπτογραφικές λειτουργίες για ασφαλή διαχείριση αρχείων
 Security by Design - AES-256 encryption
 """
+import io
 import os
 import hashlib
+import struct
 from Crypto.Cipher import AES
 from Crypto.Random import get_random_bytes
-from Crypto.Util.Padding import pad, unpad
+from Crypto.Util.Padding import unpad
 from django.conf import settings
 
 
 class SecureFileHandler:
-    """Χειρισμός κρυπτογραφημένων αρχείων"""
+    """Χειρισμός κρυπτογραφημένων αρχείων
+
+    Μορφή αρχείων (έκδοση 2, streaming AES-256-GCM):
+
+        header  = MAGIC(4) | VERSION(1) | CHUNK_SIZE(4, big-endian) | NONCE_PREFIX(7)
+        record  = ciphertext(<= CHUNK_SIZE) | GCM tag(16)
+
+    Κάθε record κρυπτογραφείται ανεξάρτητα με nonce
+    NONCE_PREFIX | αύξων αριθμός(4) | σημαία τελευταίου(1) και AAD το header,
+    οπότε αναδιάταξη, αποκοπή ή αλλοίωση records απορρίπτονται. Τα παλαιά
+    αρχεία AES-256-CBC (IV + ciphertext) αναγνωρίζονται από την απουσία header
+    και αποκρυπτογραφούνται επίσης σταδιακά.
+    """
     
     CHUNK_SIZE = 64 * 1024  # 64KB chunks για μεγάλα αρχεία
+    # Όριο για το CHUNK_SIZE που διαβάζεται από το header (κάθε record φορτώνεται στη μνήμη)
+    MAX_CHUNK_SIZE = 4 * CHUNK_SIZE
+
+    STREAM_MAGIC = b'PDSF'
+    STREAM_VERSION = 2
+    NONCE_PREFIX_SIZE = 7
+    HEADER_SIZE = 16
+    TAG_SIZE = 16
     
     @staticmethod
     def generate_key():
         """Δημιουργία τυχαίου AES-256 κλειδιού"""
         return get_random_bytes(32)  # 256 bits = 32 bytes
+
+    @classmethod
+    def _build_header(cls, chunk_size, nonce_prefix):
+        return (
+            cls.STREAM_MAGIC
+            + bytes([cls.STREAM_VERSION])
+            + struct.pack('>I', chunk_size)
+            + nonce_prefix
+        )
+
+    @classmethod
+    def _parse_header(cls, header):
+        """
+        Επιστρέφει (chunk_size, nonce_prefix) για header έκδοσης 2,
+        ή None αν τα bytes ανήκουν σε παλαιό αρχείο CBC.
+
+        Raises:
+            ValueError: Αν το CHUNK_SIZE του header είναι 0 ή πάνω από MAX_CHUNK_SIZE
+        """
+        if (len(header) != cls.HEADER_SIZE
+                or header[:4] != cls.STREAM_MAGIC
+                or header[4] != cls.STREAM_VERSION):
+            return None
+        chunk_size = struct.unpack('>I', header[5:9])[0]
+        if not 0 < chunk_size <= cls.MAX_CHUNK_SIZE:
+            raise ValueError('Invalid encrypted file header')
+        return chunk_size, header[9:]
+
+    @classmethod
+    def _record_cipher(cls, key, header, nonce_prefix, index, is_last):
+        nonce = nonce_prefix + struct.pack('>I', index) + (b'\x01' if is_last else b'\x00')
+        cipher = AES.new(key, AES.MODE_GCM, nonce=nonce, mac_len=cls.TAG_SIZE)
+        cipher.update(header)
+        return cipher
+
+    @staticmethod
+    def _rechunk(chunks, size):
+        """Ομαδοποιεί αυθαίρετα κομμάτια bytes σε blocks ακριβώς `size` bytes."""
+        buffer = bytearray()
+        for piece in chunks:
+            if not piece:
+                continue
+            buffer += piece
+            while len(buffer) >= size:
+                yield bytes(buffer[:size])
+                del buffer[:size]
+        yield bytes(buffer)
+
+    @classmethod
+    def encrypt_chunks(cls, chunks, key):
+        """
+        Σταδιακή κρυπτογράφηση ροής bytes στη μορφή έκδοσης 2.
+
+        Args:
+            chunks (iterable): Κομμάτια bytes (π.χ. UploadedFile.chunks())
+            key (bytes): Κλειδί AES-256
+
+        Yields:
+            bytes: Πρώτα το header και μετά ένα record ανά chunk
+        """
+        nonce_prefix = get_random_bytes(cls.NONCE_PREFIX_SIZE)
+        header = cls._build_header(cls.CHUNK_SIZE, nonce_prefix)
+        yield header
+
+        # Κρατάμε ένα block πίσω ώστε να γνωρίζουμε ποιο είναι το τελευταίο
+        index = 0
+        pending = None
+        for block in cls._rechunk(chunks, cls.CHUNK_SIZE):
+            if pending is not None:
+                cipher = cls._record_cipher(key, header, nonce_prefix, index, False)
+                ciphertext, tag = cipher.encrypt_and_digest(pending)
+                yield ciphertext + tag
+                index += 1
+            pending = block
+
+        # Το _rechunk επιστρέφει πάντα τουλάχιστον ένα (ίσως κενό) block
+        cipher = cls._record_cipher(key, header, nonce_prefix, index, True)
+        ciphertext, tag = cipher.encrypt_and_digest(pending)
+        yield ciphertext + tag
+
+    @classmethod
+    def iter_decrypted_stream(cls, fh, key_hex, offset=0, length=None):
+        """
+        Σταδιακή αποκρυπτογράφηση από ανοιχτό binary αρχείο (ή BytesIO).
+
+        Υποστηρίζει τόσο τη μορφή έκδοσης 2 όσο και τα παλαιά αρχεία CBC.
+        Με `offset`/`length` αποκρυπτογραφείται μόνο το ζητούμενο τμήμα:
+        γίνεται seek στο record (ή CBC block) που το περιέχει.
+
+        Args:
+            fh: Binary αρχείο με δυνατότητα seek
+            key_hex (str): Κλειδί σε hex format
+            offset (int): Αρχή τμήματος στο αποκρυπτογραφημένο περιεχόμενο
+            length (int, optional): Πλήθος bytes· None = μέχρι το τέλος
+
+        Yields:
+            bytes: Αποκρυπτογραφημένα κομμάτια έως CHUNK_SIZE
+
+        Raises:
+            ValueError: Αν το αρχείο είναι αλλοιωμένο ή το κλειδί λάθος
+        """
+        key = bytes.fromhex(key_hex)
+        header = fh.read(cls.HEADER_SIZE)
+        parsed = cls._parse_header(header)
+        if parsed is None:
+            block_index = offset // AES.block_size
+            iv = header
+            if block_index:
+                # Στο CBC το IV κάθε block είναι το προηγούμενο ciphertext block
+                fh.seek(block_index * AES.block_size)
+                iv = fh.read(AES.block_size)
+            chunks = cls._iter_legacy_cbc(fh, key, iv=iv)
+            skip = offset - block_index * AES.block_size
+        else:
+            chunk_size, nonce_prefix = parsed
+            chunk_index = offset // chunk_size
+            if chunk_index:
+                fh.seek(cls.HEADER_SIZE + chunk_index * (chunk_size + cls.TAG_SIZE))
+            chunks = cls._iter_stream_records(
+                fh, key, header, chunk_size, nonce_prefix, chunk_index
+            )
+            skip = offset - chunk_index * chunk_size
+
+        if not skip and length is None:
+            yield from chunks
+            return
+
+        remaining = length
+        for chunk in chunks:
+            if skip:
+                if skip >= len(chunk):
+                    skip -= len(chunk)
+                    continue
+                chunk = chunk[skip:]
+                skip = 0
+            if remaining is not None:
+                chunk = chunk[:remaining]
+                remaining -= len(chunk)
+            if chunk:
+                yield chunk
+            if remaining == 0:
+                return
+
+    @classmethod
+    def _iter_stream_records(cls, fh, key, header, chunk_size, nonce_prefix, index):
+        """Αποκρυπτογράφηση records έκδοσης 2 ξεκινώντας από το record `index`."""
+        record_size = chunk_size + cls.TAG_SIZE
+        record = fh.read(record_size)
+        while True:
+            if len(record) < cls.TAG_SIZE:
+                raise ValueError('Truncated encrypted file')
+            next_record = fh.read(record_size) if len(record) == record_size else b''
+            is_last = not next_record
+            cipher = cls._record_cipher(key, header, nonce_prefix, index, is_last)
+            yield cipher.decrypt_and_verify(record[:-cls.TAG_SIZE], record[-cls.TAG_SIZE:])
+            if is_last:
+                return
+            record = next_record
+            index += 1
+
+    @classmethod
+    def _iter_legacy_cbc(cls, fh, key, iv):
+        """Σταδιακή αποκρυπτογράφηση παλαιού αρχείου AES-256-CBC."""
+        if len(iv) != AES.block_size:
+            raise ValueError('Truncated encrypted file')
+        cipher = AES.new(key, AES.MODE_CBC, iv)
+        # Κρατάμε πίσω το τελευταίο block για την αφαίρεση του padding
+        held = b''
+        while True:
+            block = fh.read(cls.CHUNK_SIZE)
+            if not block:
+                break
+            plain = held + cipher.decrypt(block)
+            held = plain[-AES.block_size:]
+            if len(plain) > AES.block_size:
+                yield plain[:-AES.block_size]
+        yield unpad(held, AES.block_size)
+
+    @classmethod
+    def get_plaintext_size(cls, file_path, key_hex):
+        """
+        Μέγεθος αποκρυπτογραφημένου περιεχομένου χωρίς πλήρη αποκρυπτογράφηση.
+
+        Στη μορφή έκδοσης 2 υπολογίζεται από το μέγεθος του αρχείου· στα
+        παλαιά αρχεία CBC αποκρυπτογραφείται μόνο το τελευταίο block για το
+        padding (που επαληθεύει ταυτόχρονα και το κλειδί).
+
+        Raises:
+            OSError, ValueError: Αν το αρχείο λείπει ή είναι αλλοιωμένο
+        """
+        file_size = os.path.getsize(file_path)
+        with open(file_path, 'rb') as f:
+            header = f.read(cls.HEADER_SIZE)
+            parsed = cls._parse_header(header)
+            if parsed is not None:
+                record_size = parsed[0] + cls.TAG_SIZE
+                body = file_size - cls.HEADER_SIZE
+                if body < cls.TAG_SIZE:
+                    raise ValueError('Truncated encrypted file')
+                records = -(-body // record_size)
+                return body - records * cls.TAG_SIZE
+
+            if file_size < 2 * AES.block_size or file_size % AES.block_size:
+                raise ValueError('Invalid legacy encrypted file')
+            f.seek(file_size - 2 * AES.block_size)
+            tail = f.read(2 * AES.block_size)
+        cipher = AES.new(bytes.fromhex(key_hex), AES.MODE_CBC, tail[:AES.block_size])
+        last_block = unpad(cipher.decrypt(tail[AES.block_size:]), AES.block_size)
+        return file_size - 2 * AES.block_size + len(last_block)
     
     @staticmethod
     def encrypt_file(file_content, key=None):
         """
-        Κρυπτογράφηση περιεχομένου αρχείου με AES-256-CBC
+        Κρυπτογράφηση περιεχομένου αρχείου με AES-256-GCM (μορφή έκδοσης 2)
         
         Args:
             file_content (bytes): Το περιεχόμενο του αρχείου
@@ -34,23 +265,13 @@ class SecureFileHandler:
         """
         if key is None:
             key = SecureFileHandler.generate_key()
+
+        view = memoryview(file_content)
+        size = SecureFileHandler.CHUNK_SIZE
+        pieces = (view[i:i + size] for i in range(0, len(view), size))
+        encrypted_content = b''.join(SecureFileHandler.encrypt_chunks(pieces, key))
         
-        # Δημιουργία τυχαίου IV
-        iv = get_random_bytes(AES.block_size)
-        
-        # Δημιουργία cipher object
-        cipher = AES.new(key, AES.MODE_CBC, iv)
-        
-        # Padding του περιεχομένου σε μπλοκ των 16 bytes
-        padded_content = pad(file_content, AES.block_size)
-        
-        # Κρυπτογράφηση
-        encrypted_content = cipher.encrypt(padded_content)
-        
-        # Συνδυασμός IV + encrypted_content
-        final_content = iv + encrypted_content
-        
-        return final_content, key.hex()
+        return encrypted_content, key.hex()
     
     @staticmethod
     def decrypt_file(encrypted_content, key_hex):
@@ -58,37 +279,52 @@ class SecureFileHandler:
         Αποκρυπτογράφηση περιεχομένου αρχείου
         
         Args:
-            encrypted_content (bytes): Κρυπτογραφημένο περιεχόμενο (IV + data)
+            encrypted_content (bytes): Κρυπτογραφημένο περιεχόμενο (έκδοση 2 ή IV + data)
             key_hex (str): Κλειδί σε hex format
         
         Returns:
             bytes: Αποκρυπτογραφημένο περιεχόμενο
         """
-        # Μετατροπή κλειδιού από hex
-        key = bytes.fromhex(key_hex)
-        
-        # Εξαγωγή IV (πρώτα 16 bytes)
-        iv = encrypted_content[:AES.block_size]
-        
-        # Εξαγωγή κρυπτογραφημένων δεδομένων
-        ciphertext = encrypted_content[AES.block_size:]
-        
-        # Δημιουργία cipher object
-        cipher = AES.new(key, AES.MODE_CBC, iv)
-        
-        # Αποκρυπτογράφηση
-        padded_content = cipher.decrypt(ciphertext)
-        
-        # Αφαίρεση padding
-        original_content = unpad(padded_content, AES.block_size)
-        
-        return original_content
+        return b''.join(
+            SecureFileHandler.iter_decrypted_stream(io.BytesIO(encrypted_content), key_hex)
+        )
+
+    @staticmethod
+    def _write_encrypted_chunks(chunks, file_path):
+        """
+        Κρυπτογραφεί και γράφει σταδιακά στον δίσκο.
+
+        Returns:
+            tuple: (key_hex, plaintext_size)
+        """
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        key = SecureFileHandler.generate_key()
+        counted = {'size': 0}
+
+        def counting(source):
+            for piece in source:
+                counted['size'] += len(piece)
+                yield piece
+
+        try:
+            with open(file_path, 'wb') as f:
+                for part in SecureFileHandler.encrypt_chunks(counting(chunks), key):
+                    f.write(part)
+        except Exception:
+            # Δεν αφήνουμε μισογραμμένο αρχείο στον δίσκο
+            if os.path.exists(file_path):
+                os.remove(file_path)
+            raise
+        return key.hex(), counted['size']
     
     @staticmethod
     def save_encrypted_file(file_obj, file_path):
         """
         Αποθήκευση κρυπτογραφημένου αρχείου στον δίσκο
         
+        Το αρχείο διαβάζεται με UploadedFile.chunks() και κρυπτογραφείται
+        σταδιακά, χωρίς να φορτωθεί ολόκληρο στη μνήμη.
+        
         Args:
             file_obj: Django UploadedFile object
             file_path (str): Πλήρη διαδρομή αποθήκευσης
@@ -97,19 +333,12 @@ class SecureFileHandler:
             tuple: (success, key_hex, file_size)
         """
         try:
-            # Δημιουργία καταλόγου αν δεν υπάρχει
-            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            if hasattr(file_obj, 'chunks'):
+                chunks = file_obj.chunks(SecureFileHandler.CHUNK_SIZE)
+            else:
+                chunks = iter(lambda: file_obj.read(SecureFileHandler.CHUNK_SIZE), b'')
             
-            # Διάβασμα περιεχομένου αρχείου
-            file_content = file_obj.read()
-            file_size = len(file_content)
-            
-            # Κρυπτογράφηση
-            encrypted_content, key_hex = SecureFileHandler.encrypt_file(file_content)
-            
-            # Αποθήκευση κρυπτογραφημένου αρχείου
-            with open(file_path, 'wb') as f:
-                f.write(encrypted_content)
+            key_hex, file_size = SecureFileHandler._write_encrypted_chunks(chunks, file_path)
             
             return True, key_hex, file_size
             
@@ -132,15 +361,11 @@ class SecureFileHandler:
             tuple: (file_path, key_hex)
         """
         try:
-            # Δημιουργία καταλόγου αν δεν υπάρχει
-            os.makedirs(os.path.dirname(file_path), exist_ok=True)
+            view = memoryview(file_content)
+            size = SecureFileHandler.CHUNK_SIZE
+            chunks = (view[i:i + size] for i in range(0, len(view), size))
             
-            # Κρυπτογράφηση
-            encrypted_content, key_hex = SecureFileHandler.encrypt_file(file_content)
-            
-            # Αποθήκευση κρυπτογραφημένου αρχείου
-            with open(file_path, 'wb') as f:
-                f.write(encrypted_content)
+            key_hex, _ = SecureFileHandler._write_encrypted_chunks(chunks, file_path)
             
             return file_path, key_hex
             
@@ -152,6 +377,26 @@ class SecureFileHandler:
             
             raise e
 
+    @staticmethod
+    def iter_encrypted_file(file_path, key_hex, offset=0, length=None):
+        """
+        Σταδιακή φόρτωση και αποκρυπτογράφηση αρχείου από τον δίσκο
+        
+        Args:
+            file_path (str): Διαδρομή κρυπτογραφημένου αρχείου
+            key_hex (str): Κλειδί κρυπτογράφησης σε hex format
+            offset (int): Αρχή τμήματος (για HTTP Range)
+            length (int, optional): Πλήθος bytes· None = μέχρι το τέλος
+        
+        Yields:
+            bytes: Αποκρυπτογραφημένα κομμάτια έως CHUNK_SIZE
+        
+        Raises:
+            OSError, ValueError: Αν το αρχείο λείπει ή δεν αποκρυπτογραφείται
+        """
+        with open(file_path, 'rb') as f:
+            yield from SecureFileHandler.iter_decrypted_stream(f, key_hex, offset, length)
+
     @staticmethod
     def load_encrypted_file(file_path, key_hex):
         """
@@ -169,12 +414,10 @@ class SecureFileHandler:
             if not os.path.exists(file_path):
                 return None
             
-            # Ανάγνωση κρυπτογραφημένου αρχείου
-            with open(file_path, 'rb') as f:
-                encrypted_content = f.read()
-            
-            # Αποκρυπτογράφηση
-            decrypted_content = SecureFileHandler.decrypt_file(encrypted_content, key_hex)
+            # Σταδιακή αποκρυπτογράφηση χωρίς ενδιάμεσο αντίγραφο του ciphertext
+            decrypted_content = b''.join(
+                SecureFileHandler.iter_encrypted_file(file_path, key_hex)
+            )
             
             return decrypted_content
             
@@ -345,6 +588,28 @@ class FileAccessController:
         
         return False
     
+    @staticmethod
+    def accessible_file_ids(user, file_ids):
+        """
+        Ποια από τα αρχεία μπορεί να ανοίξει ο χρήστης, με ένα query
+        (ίδιοι κανόνες με το can_user_access_file).
+
+        Args:
+            user: User object
+            file_ids: ids των SecureFile προς έλεγχο
+
+        Returns:
+            set: ids με δικαίωμα πρόσβασης
+        """
+        from leaves.models import SecureFile
+        from leaves.utils.visibility import secure_file_access_q
+
+        files = SecureFile.objects.filter(pk__in=list(file_ids))
+        condition = secure_file_access_q(user)
+        if condition is not None:
+            files = files.filter(condition)
+        return set(files.values_list('pk', flat=True))
+    
     @staticmethod
     def log_file_access(user, secure_file, access_type='VIEW', ip_address=None):
         """
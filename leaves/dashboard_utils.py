@@ -1,11 +1,11 @@
 """
 Dashboard utilities - sorting, filtering, action resolver
 """
-from django.db.models import DateTimeField, Q
+from django.db.models import DateTimeField, F, Q, prefetch_related_objects
 from django.db.models.functions import Coalesce
 from django.utils import timezone
 
-from leaves.models import LeaveRequest
+from leaves.models import LeaveActionLog, LeaveRequest, SecureFile
 
 
 def apply_sort(queryset, sort_param):
@@ -77,11 +77,11 @@ class DashboardFilterMixin:
 
         date_from = self.request.GET.get('date_from')
         if date_from:
-            queryset = queryset.filter(periods__start_date__gte=date_from)
+            queryset = queryset.filter(first_start_date__gte=date_from)
 
         date_to = self.request.GET.get('date_to')
         if date_to:
-            queryset = queryset.filter(periods__end_date__lte=date_to)
+            queryset = queryset.filter(last_end_date__lte=date_to)
 
         return queryset
 
@@ -130,8 +130,44 @@ def _append_view(actions):
     actions.append(('view', 'ΠΡΟΒΟΛΗ', 'leaves:leave_request_detail'))
 
 
-def _owner_actions(leave_request, user, actions):
-    if leave_request.user != user:
+class _PageFacts:
+    """
+    Στοιχεία ενεργειών μιας σελίδας αιτήσεων, υπολογισμένα με ένα query ανά είδος.
+
+    None σε κάποιο πεδίο σημαίνει «δεν υπολογίστηκε» — η αίτηση το ρωτά μόνη της.
+    """
+
+    def __init__(self, open_revocation_ids=None, uploaded_document_ids=None,
+                 returned_from_yc_ids=None, sick_totals=None):
+        self.open_revocation_ids = open_revocation_ids
+        self.uploaded_document_ids = uploaded_document_ids
+        self.returned_from_yc_ids = returned_from_yc_ids
+        self.sick_totals = sick_totals
+
+    @staticmethod
+    def _member(ids, leave_request):
+        return None if ids is None else leave_request.pk in ids
+
+    def has_open_revocation(self, leave_request):
+        return self._member(self.open_revocation_ids, leave_request)
+
+    def has_uploaded_documents(self, leave_request):
+        return self._member(self.uploaded_document_ids, leave_request)
+
+    def returned_from_yc(self, leave_request):
+        return self._member(self.returned_from_yc_ids, leave_request)
+
+    def sick_total(self, leave_request):
+        if self.sick_totals is None:
+            return None
+        return self.sick_totals.get(leave_request.user_id, 0)
+
+
+_NO_FACTS = _PageFacts()
+
+
+def _owner_actions(leave_request, user, actions, facts=_NO_FACTS):
+    if leave_request.user_id != user.pk:
         return
 
     status = leave_request.status
@@ -144,7 +180,9 @@ def _owner_actions(leave_request, user, actions):
         ])
     elif status == 'COMPLETED':
         _append_view(actions)
-        if leave_request.can_request_leave_revocation(user):
+        if leave_request.can_request_leave_revocation(
+            user, has_open_revocation=facts.has_open_revocation(leave_request),
+        ):
             actions.append(
                 ('revoke_leave', 'ΑΝΑΚΛΗΣΗ ΑΔΕΙΑΣ', 'leaves:create_leave_revocation'),
             )
@@ -156,7 +194,9 @@ def _owner_actions(leave_request, user, actions):
             actions.append(
                 ('upload_attachment', 'ΕΠΙΣΥΝΑΨΗ ΑΡΧΕΙΟΥ', 'leaves:leave_request_detail'),
             )
-        if status == 'WAITING_FOR_DOCUMENTS' and leave_request.can_submit_applicant_documents(user):
+        if status == 'WAITING_FOR_DOCUMENTS' and leave_request.can_submit_applicant_documents(
+            user, has_uploaded_documents=facts.has_uploaded_documents(leave_request),
+        ):
             actions.append(
                 ('submit_documents', 'ΟΛΟΚΛΗΡΩΣΗ ΑΠΟΣΤΟΛΗΣ', 'leaves:submit_applicant_documents'),
             )
@@ -164,7 +204,7 @@ def _owner_actions(leave_request, user, actions):
             actions.append(('cancel', 'ΑΝΑΚΛΗΣΗ ΑΙΤΗΣΗΣ', 'leaves:withdraw_leave_request'))
 
 
-def _handler_actions(leave_request, actions):
+def _handler_actions(leave_request, actions, facts=_NO_FACTS):
     status = leave_request.status
 
     if status == 'PENDING_PROTOCOL':
@@ -181,7 +221,10 @@ def _handler_actions(leave_request, actions):
             ('return', 'ΕΠΙΣΤΡΟΦΗ', None),
             ('reject', 'ΑΠΟΡΡΙΨΗ', None),
         ])
-        if leave_request.can_send_to_yc:
+        if leave_request.check_can_send_to_yc(
+            returned_from_yc=facts.returned_from_yc(leave_request),
+            sick_total=facts.sick_total(leave_request),
+        ):
             actions.append(('yc_referral', 'ΔΙΑΒΙΒΑΣΤΙΚΟ ΥΕ', 'leaves:send_to_yc_committee'))
         if leave_request.can_create_decision():
             actions.append(('decision', 'ΕΤΟΙΜΑΣΙΑ ΑΠΟΦΑΣΗΣ', 'leaves:prepare_decision_preview'))
@@ -240,22 +283,121 @@ def _manager_actions(leave_request, user, actions):
         actions.append(('kedasy_protocol', 'ΚΑΤΑΧΩΡΗΣΗ ΠΡΩΤ.', None))
 
 
+def _resolve_actions(leave_request, user, facts=_NO_FACTS):
+    actions = []
+
+    _owner_actions(leave_request, user, actions, facts)
+
+    if user.is_leave_handler:
+        _handler_actions(leave_request, actions, facts)
+
+    if user.is_department_manager or user.is_secretary:
+        _manager_actions(leave_request, user, actions)
+
+    return _dedupe_actions(actions)
+
+
 def get_available_actions(leave_request, user):
     """
     Ενιαία λίστα ενεργειών ανά κατάσταση αίτησης και ρόλο χρήστη.
     Returns: [(action_code, label, url_name_or_None), ...]
+
+    Για λίστες αιτήσεων (dashboards) βλ. resolve_available_actions.
     """
     if not leave_request or not user or not user.is_authenticated:
         return []
+    return _resolve_actions(leave_request, user)
+
+
+def _collect_page_facts(leave_requests, user):
+    """Ένα query ανά είδος στοιχείου, μόνο για τις αιτήσεις που το χρειάζονται."""
+    is_handler = user.is_leave_handler
+
+    revocable_ids = [
+        lr.pk for lr in leave_requests
+        if lr.status == 'COMPLETED' and lr.remaining_revocable_days > 0 and lr.user_id == user.pk
+    ]
+    open_revocation_ids = set()
+    if revocable_ids:
+        open_revocation_ids = set(
+            LeaveRequest.objects.filter(
+                parent_leave_id__in=revocable_ids,
+                leave_type__is_revocation=True,
+            ).exclude(
+                status__in=LeaveRequest.REVOCATION_TERMINAL_STATUSES,
+            ).values_list('parent_leave_id', flat=True)
+        )
 
-    actions = []
+    waiting_ids = [
+        lr.pk for lr in leave_requests
+        if lr.status == 'WAITING_FOR_DOCUMENTS' and lr.user_id == user.pk
+    ]
+    uploaded_document_ids = set()
+    if waiting_ids:
+        uploaded_document_ids = set(
+            SecureFile.objects.filter(
+                leave_request_id__in=waiting_ids,
+                uploaded_by_id=F('leave_request__user_id'),
+            ).values_list('leave_request_id', flat=True)
+        )
+
+    yc_candidates = []
+    if is_handler:
+        yc_candidates = [
+            lr for lr in leave_requests
+            if lr.status == 'IN_REVIEW' and lr.leave_type.is_sick_leave_total
+            and not lr.documents_provided_at
+        ]
+    returned_from_yc_ids = set()
+    sick_totals = {}
+    if yc_candidates:
+        from leaves.utils.sick_leave_alerts import get_yearly_sick_totals_by_user
+
+        returned_from_yc_ids = set(
+            LeaveActionLog.objects.filter(
+                leave_request_id__in=[lr.pk for lr in yc_candidates],
+                previous_status='PENDING_YC_COMMITTEE',
+                new_status='DECISION_PREPARATION',
+            ).values_list('leave_request_id', flat=True)
+        )
+        sick_totals = get_yearly_sick_totals_by_user(
+            user_ids={lr.user_id for lr in yc_candidates},
+        )
 
-    _owner_actions(leave_request, user, actions)
+    return _PageFacts(
+        open_revocation_ids=open_revocation_ids,
+        uploaded_document_ids=uploaded_document_ids,
+        returned_from_yc_ids=returned_from_yc_ids,
+        sick_totals=sick_totals,
+    )
 
-    if user.is_leave_handler:
-        _handler_actions(leave_request, actions)
 
-    if user.is_department_manager or user.is_secretary:
-        _manager_actions(leave_request, user, actions)
+def resolve_available_actions(leave_requests, user):
+    """
+    Ενέργειες για μια ολόκληρη σελίδα αιτήσεων.
 
-    return _dedupe_actions(actions)
+    Οι ρόλοι του χρήστη, οι σχέσεις που χρειάζονται οι έλεγχοι (τύπος άδειας,
+    τμήμα αιτούντα και γονικό τμήμα) και τα στοιχεία ανά αίτηση (ανοιχτές
+    ανακλήσεις, δικαιολογητικά αιτούντα, επιστροφή από ΥΕ, σύνολο αναρρωτικών)
+    φορτώνονται μία φορά, οπότε το πλήθος queries δεν εξαρτάται από το μέγεθος
+    της σελίδας. Οι ρόλοι γίνονται prefetch πάνω στο αντικείμενο user
+    (συνήθως request.user).
+
+    Returns:
+        dict: pk αίτησης -> [(action_code, label, url_name_or_None), ...]
+    """
+    leave_requests = [lr for lr in leave_requests if lr is not None]
+    if not leave_requests or not user or not user.is_authenticated:
+        return {lr.pk: [] for lr in leave_requests}
+
+    prefetch_related_objects([user], 'roles')
+    lookups = ['leave_type']
+    if user.is_department_manager or user.is_secretary:
+        lookups += [
+            'user__department__department_type',
+            'user__department__parent_department__department_type',
+        ]
+    prefetch_related_objects(leave_requests, *lookups)
+
+    facts = _collect_page_facts(leave_requests, user)
+    return {lr.pk: _resolve_actions(lr, user, facts) for lr in leave_requests}
@@ -121,24 +121,39 @@ def get_gender_dative_article(gender):
     return 'στο(ν)/στη(ν)'
 
 
+# Διαδρομή εθνόσημου -> (mtime_ns, markup): το αρχείο διαβάζεται/κωδικοποιείται
+# μία φορά ανά διεργασία και ξανά μόνο όταν αλλάξει
+_ethnosimo_markup_cache = {}
+
+
+def _render_ethnosimo_markup(path):
+    if path.suffix == '.png':
+        encoded = base64.b64encode(path.read_bytes()).decode('ascii')
+        return (
+            f'<div class="ethnosimo-wrap">'
+            f'<img src="data:image/png;base64,{encoded}" class="ethnosimo" alt="Εθνόσημο">'
+            f'</div>'
+        )
+    svg_content = path.read_text(encoding='utf-8')
+    svg_content = svg_content.replace('<svg', '<svg class="ethnosimo" width="60"')
+    return f'<div class="ethnosimo-wrap">{svg_content}</div>'
+
+
 def get_ethnosimo_markup(base_dir=None):
     """Επιστρέφει HTML εθνόσημου (PNG base64 ή inline SVG) για PDF/preview."""
     base = Path(base_dir or settings.BASE_DIR)
     static_dir = base / 'static'
     for filename in ('ethnosimo.png', 'ethnosimo.svg'):
         path = static_dir / filename
-        if not path.exists():
+        try:
+            mtime_ns = path.stat().st_mtime_ns
+        except OSError:
             continue
-        if filename.endswith('.png'):
-            encoded = base64.b64encode(path.read_bytes()).decode('ascii')
-            return (
-                f'<div class="ethnosimo-wrap">'
-                f'<img src="data:image/png;base64,{encoded}" class="ethnosimo" alt="Εθνόσημο">'
-                f'</div>'
-            )
-        svg_content = path.read_text(encoding='utf-8')
-        svg_content = svg_content.replace('<svg', '<svg class="ethnosimo" width="60"')
-        return f'<div class="ethnosimo-wrap">{svg_content}</div>'
+        cached = _ethnosimo_markup_cache.get(path)
+        if cached is None or cached[0] != mtime_ns:
+            cached = (mtime_ns, _render_ethnosimo_markup(path))
+            _ethnosimo_markup_cache[path] = cached
+        return cached[1]
     return ''
 
 
@@ -254,7 +269,6 @@ def build_decision_pdf_context(
         'notification_recipients': notification_recipients,
         'ethnosimo_markup': get_ethnosimo_markup(),
         'decision_body': edited_decision_body or build_decision_body_html(leave_request),
-        'decision_pdf_css': DECISION_PDF_CSS,
     }
 
 
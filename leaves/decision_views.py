@@ -1,8 +1,7 @@
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required
 from django.contrib.admin.views.decorators import staff_member_required
-from django.http import HttpResponse
-from django.template.loader import render_to_string
+from django.http import Http404, HttpResponse
 from django.utils import timezone
 from django.utils.http import content_disposition_header
 from django.contrib import messages
@@ -12,6 +11,7 @@ from datetime import datetime
 
 from leaves.models import LeaveRequest, Logo, Info, Ypopsin, Signee
 from leaves.crypto_utils import SecureFileHandler
+from leaves.file_streaming import encrypted_file_response
 from leaves.decision_helpers import (
     build_decision_body_html,
     build_decision_pdf_context,
@@ -21,6 +21,18 @@ from leaves.decision_helpers import (
     format_decision_days_phrase,
     get_ethnosimo_markup,
 )
+from leaves.utils.pdf_renderer import render_pdf
+from leaves.utils.reference_data import get_active_reference_data, get_reference_by_id
+
+
+def _get_reference_or_404(model, pk):
+    """Εγγραφή αναφοράς από τη φόρμα (None αν δεν επιλέχθηκε)."""
+    if not pk:
+        return None
+    item = get_reference_by_id(model, pk)
+    if item is None:
+        raise Http404(f'{model._meta.verbose_name}: δεν βρέθηκε')
+    return item
 
 
 @login_required
@@ -49,51 +61,51 @@ def prepare_decision_preview(request, leave_request_id):
     if leave_request.status == 'IN_REVIEW':
         leave_request.start_decision_preparation(request.user)
     
-    # Φόρτωση δεδομένων από βάση
-    logos = Logo.objects.filter(is_active=True)
-    infos = Info.objects.filter(is_active=True)
-    ypopsins = Ypopsin.objects.filter(is_active=True)
-    signees = Signee.objects.filter(is_active=True)
+    # Ενεργά στοιχεία αποφάσεων (cache δεδομένων αναφοράς)
+    reference = get_active_reference_data()
     
-    # Δημιουργία default δεδομένων αν δεν υπάρχουν
-    if not logos.exists():
-        default_logo = Logo.objects.create(
+    # Δημιουργία default δεδομένων αν δεν υπάρχουν (τα signals ακυρώνουν το cache)
+    if not reference['logos']:
+        Logo.objects.create(
             logo_short="ΕΛΛΗΝΙΚΗ ΔΗΜΟΚΡΑΤΙΑ",
             logo="ΕΛΛΗΝΙΚΗ ΔΗΜΟΚΡΑΤΙΑ\nΠΕΡΙΦΕΡΕΙΑΚΗ ΔΙΕΥΘΥΝΣΗ ΕΚΠΑΙΔΕΥΣΗΣ\nΔΥΤΙΚΗΣ ΕΛΛΑΔΑΣ",
             is_active=True
         )
-        logos = Logo.objects.filter(is_active=True)
     
-    if not infos.exists():
-        default_info = Info.objects.create(
+    if not reference['infos']:
+        Info.objects.create(
             info_short="Πληροφορίες ΠΔΕΔΕ",
             info="Στοιχεία Χειριστή Αδειών:\nΠεριφερειακή Διεύθυνση Εκπαίδευσης Δυτικής Ελλάδας\nΤμήμα Διοικητικού",
             is_active=True
         )
-        infos = Info.objects.filter(is_active=True)
     
-    if not ypopsins.exists():
-        default_ypopsin = Ypopsin.objects.create(
+    if not reference['ypopsins']:
+        Ypopsin.objects.create(
             ypopsin_short="Νομοθεσία Αδειών",
             ypopsin="1. Τις διατάξεις του Ν. 3528/2007\n2. Τις σχετικές εγκυκλίους\n3. Την αίτηση του/της ενδιαφερομένου/ης",
             is_active=True
         )
-        ypopsins = Ypopsin.objects.filter(is_active=True)
     
-    if not signees.exists():
-        default_signee = Signee.objects.create(
+    if not reference['signees']:
+        Signee.objects.create(
             signee_short="Διευθυντής ΠΔΕΔΕ",
             signee_name="Ο/Η Περιφερειακός/ή Διευθυντής/ντρια",
             signee="Ο/Η Περιφερειακός/ή Διευθυντής/ντρια\nΕκπαίδευσης Δυτικής Ελλάδας\n\n\n(Υπογραφή)",
             is_active=True
         )
-        signees = Signee.objects.filter(is_active=True)
+    
+    if not all(reference.values()):
+        reference = get_active_reference_data()
+    logos = reference['logos']
+    infos = reference['infos']
+    ypopsins = reference['ypopsins']
+    signees = reference['signees']
     
     # Προεπιλεγμένα δεδομένα
-    default_logo = leave_request.decision_logo or logos.first()
-    default_info = leave_request.decision_info or infos.first()
-    default_ypopsin = leave_request.decision_ypopsin or ypopsins.first()
-    default_signee = leave_request.decision_signee or signees.first()
+    default_logo = get_reference_by_id(Logo, leave_request.decision_logo_id) or logos[0]
+    default_info = get_reference_by_id(Info, leave_request.decision_info_id) or infos[0]
+    default_ypopsin = get_reference_by_id(Ypopsin, leave_request.decision_ypopsin_id) or ypopsins[0]
+    default_signee = get_reference_by_id(Signee, leave_request.decision_signee_id) or signees[0]
 
     user = leave_request.user
     ethnosimo_markup = get_ethnosimo_markup()
@@ -158,7 +170,7 @@ def generate_final_decision_pdf(request):
     try:
         # Έλεγχος διαθεσιμότητας WeasyPrint
         try:
-            from weasyprint import HTML
+            import weasyprint  # noqa: F401
         except ImportError:
             messages.error(request, 'Η δημιουργία PDF δεν είναι διαθέσιμη. Παρακαλώ επικοινωνήστε με τον διαχειριστή.')
             return redirect('leaves:detail', pk=leave_request.id)
@@ -176,11 +188,11 @@ def generate_final_decision_pdf(request):
         edited_decision_body = request.POST.get('decision_body', '')
         edited_notification_recipients = request.POST.get('notification_recipients', '')
         
-        # Λήψη αντικειμένων
-        logo = get_object_or_404(Logo, id=logo_id) if logo_id else None
-        info = get_object_or_404(Info, id=info_id) if info_id else None
-        ypopsin = get_object_or_404(Ypopsin, id=ypopsin_id) if ypopsin_id else None
-        signee = get_object_or_404(Signee, id=signee_id) if signee_id else None
+        # Λήψη αντικειμένων (ενεργά από το cache δεδομένων αναφοράς)
+        logo = _get_reference_or_404(Logo, logo_id)
+        info = _get_reference_or_404(Info, info_id)
+        ypopsin = _get_reference_or_404(Ypopsin, ypopsin_id)
+        signee = _get_reference_or_404(Signee, signee_id)
         
         # Ενημέρωση LeaveRequest
         leave_request.decision_logo = logo
@@ -207,11 +219,8 @@ def generate_final_decision_pdf(request):
             edited_decision_body=edited_decision_body,
             edited_notification_recipients=edited_notification_recipients,
         )
-        html_string = render_to_string('leaves/decision_pdf_template.html', context)
-        
-        # Δημιουργία PDF
-        html = HTML(string=html_string)
-        pdf_content = html.write_pdf()
+        # Δημιουργία PDF (κοινός renderer με προμεταγλωττισμένο CSS απόφασης)
+        pdf_content = render_pdf('leaves/decision_pdf_template.html', context)
         
         filename = build_decision_pdf_filename(leave_request)
 
@@ -278,25 +287,23 @@ def serve_decision_pdf(request, pk):
         return redirect('leaves:detail', pk=leave_request.id)
     
     try:
-        # Αποκρυπτογράφηση PDF
-        handler = SecureFileHandler()
-        pdf_content = handler.load_encrypted_file(leave_request.decision_pdf_path, leave_request.decision_pdf_encryption_key)
-        
-        if pdf_content is None:
-            messages.error(request, 'Δεν ήταν δυνατή η φόρτωση του PDF της απόφασης.')
-            return redirect('leaves:detail', pk=leave_request.id)
-        
         # Έλεγχος αν είναι για download ή preview
         is_download = request.GET.get('download') == '1'
         
-        filename = build_decision_pdf_filename(leave_request)
-
-        # Δημιουργία response
-        response = HttpResponse(pdf_content, content_type='application/pdf')
-        response['Content-Disposition'] = content_disposition_header(
-            as_attachment=is_download, filename=filename
+        # Σταδιακή αποκρυπτογράφηση PDF
+        response = encrypted_file_response(
+            request,
+            leave_request.decision_pdf_path,
+            leave_request.decision_pdf_encryption_key,
+            content_type='application/pdf',
+            filename=build_decision_pdf_filename(leave_request),
+            as_attachment=is_download,
         )
         
+        if response is None:
+            messages.error(request, 'Δεν ήταν δυνατή η φόρτωση του PDF της απόφασης.')
+            return redirect('leaves:detail', pk=leave_request.id)
+        
         return response
         
     except Exception as e:
@@ -387,24 +394,22 @@ def serve_exact_copy_pdf(request, pk):
         return redirect('leaves:detail', pk=leave_request.id)
     
     try:
-        # Φόρτωση και αποκρυπτογράφηση PDF
-        handler = SecureFileHandler()
-        pdf_content = handler.load_encrypted_file(leave_request.exact_copy_pdf_path, leave_request.exact_copy_pdf_encryption_key)
-        
-        if pdf_content is None:
-            messages.error(request, 'Δεν ήταν δυνατή η φόρτωση του ακριβούς αντιγράφου.')
-            return redirect('leaves:detail', pk=leave_request.id)
-        
         # Έλεγχος αν είναι για download ή preview
         is_download = request.GET.get('download') == '1'
         
-        # Δημιουργία response
-        response = HttpResponse(pdf_content, content_type='application/pdf')
+        # Σταδιακή αποκρυπτογράφηση PDF
+        response = encrypted_file_response(
+            request,
+            leave_request.exact_copy_pdf_path,
+            leave_request.exact_copy_pdf_encryption_key,
+            content_type='application/pdf',
+            filename=f'exact_copy_{leave_request.id}.pdf',
+            as_attachment=is_download,
+        )
         
-        if is_download:
-            response['Content-Disposition'] = f'attachment; filename="exact_copy_{leave_request.id}.pdf"'
-        else:
-            response['Content-Disposition'] = f'inline; filename="exact_copy_{leave_request.id}.pdf"'
+        if response is None:
+            messages.error(request, 'Δεν ήταν δυνατή η φόρτωση του ακριβούς αντιγράφου.')
+            return redirect('leaves:detail', pk=leave_request.id)
         
         return response
         
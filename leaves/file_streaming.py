@@ -0,0 +1,134 @@
+"""
+Σερβίρισμα κρυπτογραφημένων αρχείων με σταδιακή αποκρυπτογράφηση.
+
+Αντί να αποκρυπτογραφείται ολόκληρο το αρχείο σε bytes, το response
+παράγει αποκρυπτογραφημένα chunks καθώς τα καταναλώνει ο client.
+Υποστηρίζονται HTTP Range requests (ένα εύρος) ώστε οι PDF viewers των
+browsers να μπορούν να κάνουν seek.
+"""
+import logging
+import re
+
+from django.http import HttpResponse, StreamingHttpResponse
+from django.utils.http import content_disposition_header
+
+from .crypto_utils import SecureFileHandler
+
+logger = logging.getLogger(__name__)
+
+_RANGE_RE = re.compile(r'^bytes=(\d*)-(\d*)$')
+
+
+def parse_range_header(header, size):
+    """
+    Ανάλυση header `Range` για ένα εύρος bytes.
+
+    Returns:
+        tuple | None | False: (start, end) inclusive για έγκυρο εύρος,
+        None αν το header λείπει ή δεν υποστηρίζεται (σερβίρεται όλο το αρχείο),
+        False αν το εύρος δεν ικανοποιείται (416).
+    """
+    if not header:
+        return None
+    match = _RANGE_RE.match(header.strip())
+    if not match:
+        # Πολλαπλά εύρη ή άγνωστη μονάδα: αγνοούνται σύμφωνα με το RFC 9110
+        return None
+    first, last = match.groups()
+    if not first and not last:
+        return None
+    if not first:
+        suffix = int(last)
+        if suffix == 0 or size == 0:
+            return False
+        return max(size - suffix, 0), size - 1
+    start = int(first)
+    end = int(last) if last else size - 1
+    if start >= size or end < start:
+        return False
+    return start, min(end, size - 1)
+
+
+def is_initial_response(response):
+    """
+    True για πλήρη απάντηση (200) ή για εύρος που ξεκινά από την αρχή του αρχείου.
+
+    Οι PDF viewers ζητούν ένα αρχείο με πολλά διαδοχικά Range requests· η καταγραφή
+    πρόσβασης γίνεται μόνο για το πρώτο, όχι για κάθε 206.
+    """
+    if response.status_code == 200:
+        return True
+    return response.status_code == 206 and response.get('Content-Range', '').startswith('bytes 0-')
+
+
+def _primed(iterator):
+    """Αποκρυπτογραφεί το πρώτο chunk πριν σταλούν headers, ώστε λάθος κλειδί ή
+    αλλοιωμένο αρχείο να εντοπίζεται όσο μπορούμε ακόμη να απαντήσουμε με σφάλμα."""
+    first = next(iterator, b'')
+
+    def generate():
+        try:
+            if first:
+                yield first
+            yield from iterator
+        finally:
+            iterator.close()
+
+    return generate()
+
+
+def encrypted_file_response(request, file_path, key_hex, content_type,
+                            filename, as_attachment=False, extra_headers=None):
+    """
+    Δημιουργεί StreamingHttpResponse που αποκρυπτογραφεί σταδιακά το αρχείο.
+
+    Args:
+        request: HttpRequest (για το header Range)
+        file_path (str): Διαδρομή κρυπτογραφημένου αρχείου
+        key_hex (str): Κλειδί κρυπτογράφησης σε hex format
+        content_type (str): Content-Type του περιεχομένου
+        filename (str): Όνομα αρχείου για το Content-Disposition
+        as_attachment (bool): attachment αντί για inline
+        extra_headers (dict, optional): Επιπλέον headers (π.χ. Cache-Control)
+
+    Returns:
+        HttpResponse | None: None αν το αρχείο λείπει ή δεν αποκρυπτογραφείται,
+        ώστε η κάθε view να διατηρεί τη δική της διαχείριση σφάλματος.
+    """
+    try:
+        size = SecureFileHandler.get_plaintext_size(file_path, key_hex)
+    except (OSError, ValueError, TypeError) as exc:
+        logger.error('Error opening encrypted file %s: %s', file_path, exc)
+        return None
+
+    byte_range = parse_range_header(request.META.get('HTTP_RANGE'), size)
+    if byte_range is False:
+        response = HttpResponse(status=416)
+        response['Content-Range'] = f'bytes */{size}'
+        return response
+
+    if byte_range is None:
+        start, end, status = 0, size - 1, 200
+    else:
+        (start, end), status = byte_range, 206
+    length = end - start + 1 if size else 0
+
+    try:
+        chunks = _primed(SecureFileHandler.iter_encrypted_file(
+            file_path, key_hex, start, length if status == 206 else None
+        ))
+    except (OSError, ValueError, TypeError) as exc:
+        logger.error('Error decrypting file %s: %s', file_path, exc)
+        return None
+
+    response = StreamingHttpResponse(chunks, content_type=content_type, status=status)
+    response['Content-Length'] = str(length)
+    response['Accept-Ranges'] = 'bytes'
+    if status == 206:
+        response['Content-Range'] = f'bytes {start}-{end}/{size}'
+    response['Content-Disposition'] = content_disposition_header(
+        as_attachment=as_attachment, filename=filename
+    )
+    for header, value in (extra_headers or {}).items():
+        response[header] = value
+    return response
@@ -0,0 +1,75 @@
+"""
+Εφαρμογή (ή προεπισκόπηση) της ετήσιας ανανέωσης κανονικών αδειών από τη γραμμή εντολών.
+
+Χρήση: docker compose exec web python manage.py apply_balance_renewal --year 2025 [--dry-run]
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.models import User
+from leaves.models import BalanceRenewalSeason
+from leaves.utils.balance_renewal import (
+    RENEWAL_CHUNK_SIZE,
+    apply_renewal_season,
+    refresh_season_statuses,
+    run_renewal,
+)
+
+
+class Command(BaseCommand):
+    help = 'Ετήσια ανανέωση κανονικών αδειών ανά ομάδες χρηστών (με dry-run diff)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--year', type=int, required=True, help='Έτος που κλείνει')
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Εμφάνιση υπολοίπων πριν/μετά χωρίς αποθήκευση',
+        )
+        parser.add_argument(
+            '--user-id',
+            type=int,
+            action='append',
+            dest='user_ids',
+            help='Συγκεκριμένος χρήστης (επαναλαμβανόμενο)',
+        )
+        parser.add_argument('--chunk-size', type=int, default=RENEWAL_CHUNK_SIZE)
+        parser.add_argument('--applied-by', help='Email χρήστη που καταγράφεται ως εκτελών')
+
+    def handle(self, *args, **options):
+        try:
+            season = BalanceRenewalSeason.objects.get(closing_year=options['year'])
+        except BalanceRenewalSeason.DoesNotExist:
+            raise CommandError(f"Δεν υπάρχει σεζόν ανανέωσης για το {options['year']}.")
+
+        applied_by = None
+        if options['applied_by']:
+            applied_by = User.objects.filter(email=options['applied_by']).first()
+            if applied_by is None:
+                raise CommandError(f"Δεν βρέθηκε χρήστης {options['applied_by']}.")
+
+        refresh_season_statuses(season)
+
+        def progress(done, total):
+            self.stdout.write(f'  {done}/{total}')
+
+        if options['dry_run']:
+            result = run_renewal(
+                season, applied_by, user_ids=options['user_ids'], dry_run=True,
+                chunk_size=options['chunk_size'], progress=progress,
+            )
+            for row in result['diff']:
+                self.stdout.write(
+                    f"{row['user']}: {row['balance_before']} → {row['balance_after']} "
+                    f"(λήγουν {row['expired_days']}, μεταφέρονται {row['carryover_days']}, "
+                    f"δικαίωμα {row['entitlement_days']}) [{', '.join(row['entry_types'])}]"
+                )
+            self.stdout.write(self.style.SUCCESS(f"Χρήστες προς ανανέωση: {len(result['diff'])} (DRY RUN)"))
+            return
+
+        ok, errors = apply_renewal_season(
+            season, applied_by, user_ids=options['user_ids'],
+            chunk_size=options['chunk_size'], progress=progress,
+        )
+        for error in errors:
+            self.stdout.write(self.style.ERROR(error))
+        self.stdout.write(self.style.SUCCESS(f'Εφαρμόστηκε ανανέωση σε {ok} χρήστες.'))
@@ -0,0 +1,36 @@
+"""
+Συμπλήρωση των first_start_date / last_end_date / total_days των αιτήσεων από τα διαστήματα.
+
+Χρήση: docker compose exec web python manage.py backfill_period_summary [--dry-run]
+"""
+from django.core.management.base import BaseCommand
+
+from leaves.utils.period_summary import backfill_period_summaries
+
+
+class Command(BaseCommand):
+    help = 'Επαναϋπολογισμός σύνοψης διαστημάτων (έναρξη, λήξη, ημέρες) για όλες τις αιτήσεις'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Εμφάνιση πλήθους αλλαγών χωρίς αποθήκευση',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500,
+            help='Αιτήσεις ανά παρτίδα (default 500)',
+        )
+
+    def handle(self, *args, **options):
+        dry_run = options['dry_run']
+        changed = backfill_period_summaries(
+            batch_size=options['batch_size'],
+            dry_run=dry_run,
+        )
+        suffix = ' (DRY RUN)' if dry_run else ''
+        self.stdout.write(self.style.SUCCESS(
+            f'Αιτήσεις με διορθωμένη σύνοψη διαστημάτων: {changed}{suffix}'
+        ))
@@ -0,0 +1,61 @@
+"""
+Μέτρηση p50/p95 latency και SQL queries των dashboards, ημερολογίου, παρουσιολογίου και εξαγωγής SCH.
+
+Χρήση: docker compose exec web python manage.py benchmark_views --output before.json
+       docker compose exec web python manage.py benchmark_views --baseline before.json --output after.json
+"""
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.models import User
+from leaves.utils.benchmark import compare_results, run_benchmarks
+
+
+class Command(BaseCommand):
+    help = 'Benchmark σελίδων/utilities (αποτελέσματα σε JSON)'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--iterations', type=int, default=10)
+        parser.add_argument('--warmup', type=int, default=2)
+        parser.add_argument('--cold', action='store_true', help='Ακύρωση caches πριν από κάθε εκτέλεση')
+        parser.add_argument('--only', action='append', help='Μόνο περιπτώσεις με αυτό το πρόθεμα (επαναλαμβανόμενο)')
+        parser.add_argument('--handler', help='Email χειριστή αδειών')
+        parser.add_argument('--manager', help='Email προϊσταμένου')
+        parser.add_argument('--baseline', help='Προηγούμενο JSON για σύγκριση')
+        parser.add_argument('--output', help='Αρχείο JSON (προεπιλογή: stdout)')
+
+    def _user(self, email):
+        if not email:
+            return None
+        user = User.objects.filter(email=email).first()
+        if user is None:
+            raise CommandError(f'Δεν βρέθηκε χρήστης {email}.')
+        return user
+
+    def handle(self, *args, **options):
+        log = self.stderr.write if not options['output'] else self.stdout.write
+        try:
+            report = run_benchmarks(
+                handler=self._user(options['handler']),
+                manager=self._user(options['manager']),
+                iterations=options['iterations'],
+                warmup=options['warmup'],
+                cold=options['cold'],
+                only=options['only'],
+                log=log,
+            )
+        except (ValueError, RuntimeError) as exc:
+            raise CommandError(str(exc))
+
+        if options['baseline']:
+            with open(options['baseline'], encoding='utf-8') as baseline_file:
+                compare_results(report, json.load(baseline_file))
+
+        payload = json.dumps(report, ensure_ascii=False, indent=2)
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as output_file:
+                output_file.write(payload)
+            self.stdout.write(self.style.SUCCESS(f"Αποτελέσματα: {options['output']}"))
+        else:
+            self.stdout.write(payload)
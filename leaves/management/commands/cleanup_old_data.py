@@ -5,6 +5,8 @@ from django.core.management.base import BaseCommand
 from django.utils import timezone
 from datetime import timedelta
 from leaves.models import LeaveRequest, LeaveAccessLog, LeaveActionLog
+from notifications.utils import delete_old_notifications
+from pdede_leaves.retention import RETENTION_BATCH_SIZE, delete_in_batches
 
 
 class Command(BaseCommand):
@@ -28,8 +30,27 @@ class Command(BaseCommand):
             default=5,
             help='Έτη διατήρησης αιτήσεων (default: 5)',
         )
+        parser.add_argument(
+            '--notifications-days',
+            type=int,
+            default=None,
+            help='Ημέρες διατήρησης ειδοποιήσεων (default: δεν διαγράφονται)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=RETENTION_BATCH_SIZE,
+            help=f'Εγγραφές ανά παρτίδα διαγραφής (default: {RETENTION_BATCH_SIZE})',
+        )
+        parser.add_argument(
+            '--sleep',
+            type=float,
+            default=0.1,
+            help='Δευτερόλεπτα παύσης ανάμεσα στις παρτίδες (default: 0.1)',
+        )
 
     def handle(self, *args, **options):
+        self.verbosity = options['verbosity']
         dry_run = options['dry_run']
         logs_years = options['logs_years']
         requests_years = options['requests_years']
@@ -41,20 +62,31 @@ class Command(BaseCommand):
             f'=== Data Retention Cleanup {"(DRY RUN)" if dry_run else ""} ==='
         ))
 
-        # Καθαρισμός παλαιών access logs
-        old_access_logs = LeaveAccessLog.objects.filter(timestamp__lt=logs_cutoff)
-        access_count = old_access_logs.count()
-        if not dry_run:
-            old_access_logs.delete()
+        batch_options = {
+            'batch_size': options['batch_size'],
+            'sleep': options['sleep'],
+            'dry_run': dry_run,
+        }
+
+        # Καθαρισμός παλαιών logs σε παρτίδες (index στο timestamp)
+        access_count = delete_in_batches(
+            LeaveAccessLog.objects.filter(timestamp__lt=logs_cutoff),
+            progress=self._progress('Access Logs'), **batch_options,
+        )
         self.stdout.write(f'Access Logs: {access_count} διαγραφές')
 
-        # Καθαρισμός παλαιών action logs
-        old_action_logs = LeaveActionLog.objects.filter(timestamp__lt=logs_cutoff)
-        action_count = old_action_logs.count()
-        if not dry_run:
-            old_action_logs.delete()
+        action_count = delete_in_batches(
+            LeaveActionLog.objects.filter(timestamp__lt=logs_cutoff),
+            progress=self._progress('Action Logs'), **batch_options,
+        )
         self.stdout.write(f'Action Logs: {action_count} διαγραφές')
 
+        if options['notifications_days'] is not None:
+            notifications_count = delete_old_notifications(
+                options['notifications_days'], progress=self._progress('Notifications'), **batch_options,
+            )
+            self.stdout.write(f'Notifications: {notifications_count} διαγραφές')
+
         # Σημείωση: Οι αιτήσεις ΔΕΝ διαγράφονται αυτόματα,
         # μόνο αν είναι σε terminal state (COMPLETED, REJECTED, WITHDRAWN)
         # και έχουν περάσει τα requests_years
@@ -78,3 +110,9 @@ class Command(BaseCommand):
         self.stdout.write(self.style.SUCCESS('\nΟλοκληρώθηκε!'))
         if dry_run:
             self.stdout.write(self.style.WARNING('Αυτό ήταν DRY RUN - δεν έγιναν αλλαγές.'))
+
+    def _progress(self, label):
+        def report(total):
+            if self.verbosity > 1:
+                self.stdout.write(f'  {label}: {total}...')
+        return report
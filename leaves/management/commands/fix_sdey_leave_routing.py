@@ -5,6 +5,7 @@ from django.db.models import Q
 
 from accounts.department_utils import is_sdey_under_kedasy
 from leaves.models import LeaveRequest
+from leaves.utils.action_log import buffered_action_logs
 
 
 class Command(BaseCommand):
@@ -40,20 +41,22 @@ class Command(BaseCommand):
             qs = qs.filter(pk=request_id)
 
         fixed = 0
-        for leave_request in qs:
-            department = leave_request.user.department
-            if not is_sdey_under_kedasy(department):
-                continue
-
-            dept_code = department.department_type.code if department and department.department_type else '?'
-            self.stdout.write(
-                f"#{leave_request.pk}: {leave_request.user.email} "
-                f"({dept_code}) SUBMITTED → PENDING_KEDASY_PROTOCOL"
-            )
-            if not dry_run:
-                leave_request.status = 'PENDING_KEDASY_PROTOCOL'
-                leave_request.save(update_fields=['status'])
-            fixed += 1
+        # Μία transaction· τα LeaveActionLog των αλλαγών γράφονται με ένα bulk_create στο τέλος
+        with buffered_action_logs():
+            for leave_request in qs:
+                department = leave_request.user.department
+                if not is_sdey_under_kedasy(department):
+                    continue
+
+                dept_code = department.department_type.code if department and department.department_type else '?'
+                self.stdout.write(
+                    f"#{leave_request.pk}: {leave_request.user.email} "
+                    f"({dept_code}) SUBMITTED → PENDING_KEDASY_PROTOCOL"
+                )
+                if not dry_run:
+                    leave_request.status = 'PENDING_KEDASY_PROTOCOL'
+                    leave_request.save(update_fields=['status'])
+                fixed += 1
 
         suffix = ' (dry-run)' if dry_run else ''
         self.stdout.write(self.style.SUCCESS(f'Ολοκληρώθηκε: {fixed} αίτηση/εις{suffix}'))
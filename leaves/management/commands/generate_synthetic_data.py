@@ -0,0 +1,61 @@
+"""
+Δημιουργία συνθετικού οργανισμού μεγάλης κλίμακας για μετρήσεις απόδοσης.
+
+Χρήση: docker compose exec web python manage.py generate_synthetic_data --users 5000 --leave-requests 100000
+       docker compose exec web python manage.py generate_synthetic_data --clear
+Μόνο σε βάση δοκιμών — ποτέ σε παραγωγή. Σε βάση με πραγματικά τμήματα απαιτείται --force.
+"""
+from django.core.management.base import BaseCommand, CommandError
+
+from accounts.models import User
+from leaves.utils.synthetic_data import SYNTHETIC_EMAIL_DOMAIN, SyntheticDataGenerator, clear_synthetic_data
+
+
+class Command(BaseCommand):
+    help = 'Συνθετικά δεδομένα (τμήματα, χρήστες, αιτήσεις, ledger, ειδοποιήσεις) για benchmarks'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--users', type=int, default=5000)
+        parser.add_argument('--leave-requests', type=int, default=100000)
+        parser.add_argument('--departments', type=int, default=40, help='Τμήματα Αυτοτελούς Διεύθυνσης')
+        parser.add_argument('--kedasy', type=int, default=8)
+        parser.add_argument('--sdey-per-kedasy', type=int, default=12)
+        parser.add_argument('--handlers', type=int, default=5)
+        parser.add_argument('--notifications-per-user', type=int, default=20)
+        parser.add_argument('--years', type=int, default=3, help='Έτη ιστορικού αιτήσεων')
+        parser.add_argument('--seed', type=int, default=1)
+        parser.add_argument('--clear', action='store_true', help='Διαγραφή υπαρχόντων συνθετικών δεδομένων')
+        parser.add_argument(
+            '--force', action='store_true',
+            help='Εκτέλεση και σε βάση με πραγματικά τμήματα (δημιουργείται ξεχωριστό δέντρο SYN_)',
+        )
+
+    def handle(self, *args, **options):
+        existing = User.objects.filter(email__endswith=f'@{SYNTHETIC_EMAIL_DOMAIN}').exists()
+        if options['clear']:
+            deleted = clear_synthetic_data()
+            self.stdout.write(self.style.SUCCESS(f'Διαγράφηκαν {deleted} συνθετικοί χρήστες και τα δεδομένα τους.'))
+            return
+        if existing:
+            raise CommandError('Υπάρχουν ήδη συνθετικά δεδομένα — εκτελέστε πρώτα με --clear.')
+
+        generator = SyntheticDataGenerator(
+            users=options['users'],
+            leave_requests=options['leave_requests'],
+            departments=options['departments'],
+            kedasy=options['kedasy'],
+            sdey_per_kedasy=options['sdey_per_kedasy'],
+            handlers=options['handlers'],
+            notifications_per_user=options['notifications_per_user'],
+            years=options['years'],
+            seed=options['seed'],
+            log=self.stdout.write,
+            force=options['force'],
+        )
+        try:
+            stats = generator.generate()
+        except ValueError as exc:
+            raise CommandError(f'{exc} Χρησιμοποιήστε --force.') from exc
+        for key, value in stats.items():
+            self.stdout.write(f'  {key}: {value}')
+        self.stdout.write(self.style.SUCCESS('Τα συνθετικά δεδομένα δημιουργήθηκαν.'))
@@ -6,6 +6,7 @@ from django.core.management.base import BaseCommand, CommandError
 from django.db import transaction
 
 from leaves.models import LeaveType
+from leaves.utils.reference_data import invalidate_leave_type_colors
 
 
 class Command(BaseCommand):
@@ -107,6 +108,10 @@ class Command(BaseCommand):
                     created += 1
                     self.stdout.write(f'Δημιουργήθηκε: {operation["code"]} - {operation["data"]["name"]}')
 
+        if updated:
+            # Το update() δεν στέλνει post_save — ακύρωση των χρωμάτων ημερολογίου εδώ
+            invalidate_leave_type_colors()
+
         if options['dry_run']:
             self.stdout.write(self.style.WARNING('Dry run: δεν έγιναν αλλαγές στη βάση.'))
         else:
@@ -0,0 +1,35 @@
+"""
+Έλεγχος και διόρθωση του πίνακα SickLeaveAlertTotal έναντι των αιτήσεων αναρρωτικής.
+
+Χρήση: docker compose exec web python manage.py reconcile_sick_leave_alert_totals [--year 2026] [--dry-run]
+"""
+from django.core.management.base import BaseCommand
+
+from leaves.utils.sick_leave_alerts import reconcile_sick_alert_totals
+
+
+class Command(BaseCommand):
+    help = 'Επαλήθευση και διόρθωση των τρεχόντων συνόλων αναρρωτικών (alert Υγειονομικής Επιτροπής)'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--year',
+            type=int,
+            help='Περιορισμός σε συγκεκριμένο έτος (default όλα)',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Εμφάνιση αποκλίσεων χωρίς αποθήκευση',
+        )
+
+    def handle(self, *args, **options):
+        dry_run = options['dry_run']
+        result = reconcile_sick_alert_totals(year=options['year'], dry_run=dry_run)
+        suffix = ' (DRY RUN)' if dry_run else ''
+        drift = result['created'] + result['updated'] + result['deleted']
+        style = self.style.WARNING if drift else self.style.SUCCESS
+        self.stdout.write(style(
+            f"Αποκλίσεις: {drift} (νέες {result['created']}, διορθωμένες {result['updated']}, "
+            f"διαγραμμένες {result['deleted']}){suffix}"
+        ))
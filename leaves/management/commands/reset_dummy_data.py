@@ -3,6 +3,7 @@ from django.contrib.auth import get_user_model
 from accounts.models import Department
 from leaves.models import LeaveType, LeaveRequest
 from notifications.models import Notification
+from notifications.unread import clear_unread_counts
 
 User = get_user_model()
 
@@ -24,7 +25,9 @@ class Command(BaseCommand):
     def clean_all_data(self):
         """Καθαρισμός όλων των δεδομένων"""
         self.stdout.write('Διαγραφή ειδοποιήσεων...')
+        unread_user_ids = list(Notification.objects.filter(is_read=False).values_list('user_id', flat=True).distinct())
         Notification.objects.all().delete()
+        clear_unread_counts(unread_user_ids)
         
         self.stdout.write('Διαγραφή αιτήσεων αδειών...')
         LeaveRequest.objects.all().delete()
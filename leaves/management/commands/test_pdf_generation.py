@@ -2,8 +2,8 @@ from django.core.management.base import BaseCommand
 from django.template.loader import render_to_string
 from leaves.models import LeaveRequest, Logo, Info, Ypopsin, Signee
 from leaves.crypto_utils import SecureFileHandler
+from leaves.utils.pdf_renderer import render_html_to_pdf
 from datetime import datetime
-import weasyprint
 import os
 
 
@@ -41,7 +41,7 @@ class Command(BaseCommand):
             self.stdout.write(self.style.SUCCESS(f'✓ HTML generated: {len(html_string)} characters'))
             
             # Step 4: Generate PDF
-            pdf = weasyprint.HTML(string=html_string).write_pdf()
+            pdf = render_html_to_pdf(html_string, family='decision')
             self.stdout.write(self.style.SUCCESS(f'✓ PDF generated: {len(pdf)} bytes'))
             
             # Step 5: Save and encrypt
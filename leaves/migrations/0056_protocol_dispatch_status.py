@@ -0,0 +1,33 @@
+# Generated by Django 5.2.3 on 2026-10-18 12:46
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leaves', '0055_leave_revocation_workflow'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='leaverequest',
+            name='protocol_dispatch_error',
+            field=models.TextField(blank=True, verbose_name='Σφάλμα Αποστολής στο Πρωτόκολλο'),
+        ),
+        migrations.AddField(
+            model_name='leaverequest',
+            name='protocol_dispatch_key',
+            field=models.CharField(blank=True, help_text='Idempotency key της τελευταίας αποστολής — αποτρέπει διπλές αποστολές', max_length=64, verbose_name='Κλειδί Αποστολής στο Πρωτόκολλο'),
+        ),
+        migrations.AddField(
+            model_name='leaverequest',
+            name='protocol_dispatch_status',
+            field=models.CharField(blank=True, choices=[('QUEUED', 'Σε αναμονή'), ('BUILDING', 'Δημιουργία PDF'), ('SENDING', 'Αποστολή email'), ('SENT', 'Στάλθηκε'), ('FAILED', 'Απέτυχε')], help_text='Κατάσταση της ασύγχρονης δημιουργίας και αποστολής του ενοποιημένου PDF', max_length=10, verbose_name='Κατάσταση Αποστολής στο Πρωτόκολλο'),
+        ),
+        migrations.AddField(
+            model_name='leaverequest',
+            name='protocol_dispatch_updated_at',
+            field=models.DateTimeField(blank=True, null=True, verbose_name='Τελευταία Ενημέρωση Αποστολής στο Πρωτόκολλο'),
+        ),
+    ]
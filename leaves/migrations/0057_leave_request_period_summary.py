@@ -0,0 +1,65 @@
+# Generated by Django 5.2.3 on 2026-10-18 12:56
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+def backfill_period_summary(apps, schema_editor):
+    """
+    Συμπλήρωση σύνοψης διαστημάτων για τις υπάρχουσες αιτήσεις, σε παρτίδες.
+
+    Αυτόνομη (μόνο ιστορικά μοντέλα) — η ίδια λογική με το leaves.models.period_summary.
+    """
+    LeaveRequest = apps.get_model('leaves', 'LeaveRequest')
+    LeavePeriod = apps.get_model('leaves', 'LeavePeriod')
+
+    last_pk = 0
+    while True:
+        batch = list(LeaveRequest.objects.filter(pk__gt=last_pk).order_by('pk').only('pk')[:500])
+        if not batch:
+            return
+        last_pk = batch[-1].pk
+
+        periods_by_request = {}
+        for leave_request_id, start_date, end_date in LeavePeriod.objects.filter(
+            leave_request_id__in=[lr.pk for lr in batch],
+        ).values_list('leave_request_id', 'start_date', 'end_date'):
+            periods_by_request.setdefault(leave_request_id, []).append((start_date, end_date))
+
+        for lr in batch:
+            periods = periods_by_request.get(lr.pk, ())
+            lr.first_start_date = min((start for start, _end in periods), default=None)
+            lr.last_end_date = max((end for _start, end in periods), default=None)
+            lr.total_days = sum((end - start).days + 1 for start, end in periods)
+        LeaveRequest.objects.bulk_update(batch, ['first_start_date', 'last_end_date', 'total_days'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leaves', '0056_protocol_dispatch_status'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='leaverequest',
+            name='first_start_date',
+            field=models.DateField(blank=True, editable=False, null=True, verbose_name='Πρώτη Ημερομηνία Έναρξης'),
+        ),
+        migrations.AddField(
+            model_name='leaverequest',
+            name='last_end_date',
+            field=models.DateField(blank=True, db_index=True, editable=False, null=True, verbose_name='Τελευταία Ημερομηνία Λήξης'),
+        ),
+        migrations.AddField(
+            model_name='leaverequest',
+            name='total_days',
+            field=models.PositiveIntegerField(default=0, editable=False, verbose_name='Συνολικές Ημέρες'),
+        ),
+        migrations.AddIndex(
+            model_name='leaverequest',
+            index=models.Index(fields=['first_start_date', 'last_end_date'], name='leaves_lr_period_range_idx'),
+        ),
+        migrations.RunPython(backfill_period_summary, migrations.RunPython.noop),
+    ]
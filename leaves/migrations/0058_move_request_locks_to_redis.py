@@ -0,0 +1,21 @@
+# Generated by Django 5.2.3 on 2026-10-18 13:00
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leaves', '0057_leave_request_period_summary'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='leaverequest',
+            name='locked_at',
+        ),
+        migrations.RemoveField(
+            model_name='leaverequest',
+            name='locking_user',
+        ),
+    ]
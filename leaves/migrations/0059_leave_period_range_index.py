@@ -0,0 +1,17 @@
+# Generated by Django 5.2.3 on 2026-10-18 13:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leaves', '0058_move_request_locks_to_redis'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='leaveperiod',
+            index=models.Index(fields=['start_date', 'end_date'], name='leaves_period_range_idx'),
+        ),
+    ]
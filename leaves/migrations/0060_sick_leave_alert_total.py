@@ -0,0 +1,63 @@
+# Generated by Django 5.2.3 on 2026-10-18 13:10
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Sum
+from django.db.models.functions import ExtractYear
+
+
+def backfill_sick_leave_alert_totals(apps, schema_editor):
+    """
+    Αρχικός υπολογισμός των συνόλων αναρρωτικών από τις υπάρχουσες αιτήσεις.
+
+    Αυτόνομη (μόνο ιστορικά μοντέλα) — τα ίδια κριτήρια με το
+    leaves.utils.sick_leave_alerts.compute_sick_totals κατά τη δημιουργία του πίνακα.
+    """
+    LeaveRequest = apps.get_model('leaves', 'LeaveRequest')
+    SickLeaveAlertTotal = apps.get_model('leaves', 'SickLeaveAlertTotal')
+
+    rows = LeaveRequest.objects.filter(
+        leave_type__is_sick_leave_total=True,
+        submitted_at__isnull=False,
+    ).exclude(
+        status__in=['DRAFT', 'SUPERVISOR_REJECTED', 'REJECTED_BY_LEAVES_DEPT', 'CANCELLED_BY_APPLICANT'],
+    ).order_by().annotate(
+        submitted_year=ExtractYear('submitted_at'),
+    ).values('user_id', 'submitted_year').annotate(
+        total=Sum('total_days'),
+    ).values_list('user_id', 'submitted_year', 'total')
+
+    SickLeaveAlertTotal.objects.bulk_create([
+        SickLeaveAlertTotal(employee_id=user_id, year=year, total_days=total)
+        for user_id, year, total in rows
+        if total
+    ], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leaves', '0059_leave_period_range_index'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SickLeaveAlertTotal',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.PositiveIntegerField(verbose_name='Έτος')),
+                ('total_days', models.PositiveIntegerField(default=0, verbose_name='Σύνολο Ημερών')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Τελευταία Ενημέρωση')),
+                ('employee', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='sick_leave_alert_totals', to=settings.AUTH_USER_MODEL, verbose_name='Υπάλληλος')),
+            ],
+            options={
+                'verbose_name': 'Τρέχον Σύνολο Αναρρωτικών (alert ΥΕ)',
+                'verbose_name_plural': 'Τρέχοντα Σύνολα Αναρρωτικών (alert ΥΕ)',
+                'indexes': [models.Index(fields=['year', 'total_days'], name='leaves_sick_alert_total_idx')],
+                'unique_together': {('employee', 'year')},
+            },
+        ),
+        migrations.RunPython(backfill_sick_leave_alert_totals, migrations.RunPython.noop),
+    ]
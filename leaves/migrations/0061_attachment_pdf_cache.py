@@ -0,0 +1,34 @@
+# Generated by Django 5.2.3 on 2026-10-18 13:41
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('leaves', '0060_sick_leave_alert_total'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AttachmentPdfCache',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('content_sha256', models.CharField(max_length=64, unique=True, verbose_name='SHA-256 Περιεχομένου')),
+                ('pdf_path', models.CharField(blank=True, max_length=500, verbose_name='Διαδρομή PDF')),
+                ('encryption_key', models.CharField(blank=True, max_length=64, verbose_name='Κλειδί Κρυπτογράφησης')),
+                ('page_count', models.PositiveIntegerField(default=0, verbose_name='Σελίδες')),
+                ('pdf_size', models.PositiveIntegerField(default=0, verbose_name='Μέγεθος PDF (bytes)')),
+                ('created_at', models.DateTimeField(auto_now_add=True, verbose_name='Ημερομηνία Δημιουργίας')),
+            ],
+            options={
+                'verbose_name': 'Μετατροπή Συνημμένου σε PDF',
+                'verbose_name_plural': 'Μετατροπές Συνημμένων σε PDF',
+            },
+        ),
+        migrations.AddField(
+            model_name='securefile',
+            name='content_sha256',
+            field=models.CharField(blank=True, db_index=True, help_text='Συμπληρώνεται στην πρώτη μετατροπή σε PDF (cache μετατροπών)', max_length=64, verbose_name='SHA-256 Περιεχομένου'),
+        ),
+    ]
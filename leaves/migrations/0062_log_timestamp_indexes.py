@@ -0,0 +1,26 @@
+# Generated by Django 5.2.3 on 2026-10-18 14:20
+
+from django.conf import settings
+from django.contrib.postgres.operations import AddIndexConcurrently
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # Τα logs είναι μεγάλοι πίνακες — CREATE INDEX CONCURRENTLY χωρίς κλείδωμα εγγραφών
+    atomic = False
+
+    dependencies = [
+        ('leaves', '0061_attachment_pdf_cache'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrently(
+            model_name='leaveaccesslog',
+            index=models.Index(fields=['timestamp'], name='leaves_accesslog_ts_idx'),
+        ),
+        AddIndexConcurrently(
+            model_name='leaveactionlog',
+            index=models.Index(fields=['timestamp'], name='leaves_actionlog_ts_idx'),
+        ),
+    ]
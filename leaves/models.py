@@ -6,7 +6,7 @@ from django.core.validators import FileExtensionValidator
 from django.utils import timezone
 from django.contrib.contenttypes.fields import GenericRelation
 from notifications.models import Notification
-from accounts.department_utils import is_sdey_department, is_sdey_under_kedasy
+from accounts.department_utils import is_sdey_under_kedasy
 
 User = get_user_model()
 
@@ -64,6 +64,9 @@ class LeavePeriod(models.Model):
         verbose_name = 'Διάστημα Άδειας'
         verbose_name_plural = 'Διαστήματα Αδειών'
         ordering = ['start_date']
+        indexes = [
+            models.Index(fields=['start_date', 'end_date'], name='leaves_period_range_idx'),
+        ]
     
     def __str__(self):
         return f"{self.start_date} - {self.end_date} ({self.days} ημέρες)"
@@ -95,6 +98,27 @@ class LeavePeriod(models.Model):
                     raise ValidationError('Το διάστημα επικαλύπτεται με άλλο διάστημα της ίδιας αίτησης.')
 
 
+def period_summary(periods):
+    """
+    Σύνοψη διαστημάτων μιας αίτησης.
+
+    Args:
+        periods: iterable από (start_date, end_date)
+
+    Returns:
+        dict: first_start_date, last_end_date, total_days
+    """
+    first_start = last_end = None
+    total = 0
+    for start_date, end_date in periods:
+        total += (end_date - start_date).days + 1
+        if first_start is None or start_date < first_start:
+            first_start = start_date
+        if last_end is None or end_date > last_end:
+            last_end = end_date
+    return {'first_start_date': first_start, 'last_end_date': last_end, 'total_days': total}
+
+
 def secure_file_path(instance, filename):
     """Δημιουργία ασφαλούς path για αρχείο"""
     # Δημιουργία UUID για το αρχείο
@@ -120,6 +144,10 @@ class SecureFile(models.Model):
     uploaded_by = models.ForeignKey(User, on_delete=models.CASCADE, related_name='uploaded_files')
     uploaded_at = models.DateTimeField('Ημερομηνία Αποστολής', auto_now_add=True)
     description = models.TextField('Περιγραφή Αρχείου', blank=True)
+    content_sha256 = models.CharField(
+        'SHA-256 Περιεχομένου', max_length=64, blank=True, db_index=True,
+        help_text='Συμπληρώνεται στην πρώτη μετατροπή σε PDF (cache μετατροπών)',
+    )
     
     class Meta:
         verbose_name = 'Ασφαλές Αρχείο'
@@ -140,7 +168,84 @@ class SecureFile(models.Model):
         return reverse('leaves:serve_secure_file', kwargs={'file_id': self.pk})
 
 
-class LeaveRequest(models.Model):
+class AttachmentPdfCache(models.Model):
+    """
+    Μετατροπή συνημμένου σε PDF, ανά περιεχόμενο (SHA-256 του αποκρυπτογραφημένου αρχείου).
+
+    Για εικόνες κρατιέται κρυπτογραφημένο το παραγόμενο PDF· για PDF συνημμένα μόνο
+    το πλήθος σελίδων (το ίδιο το αρχείο είναι ήδη PDF).
+    """
+    content_sha256 = models.CharField('SHA-256 Περιεχομένου', max_length=64, unique=True)
+    pdf_path = models.CharField('Διαδρομή PDF', max_length=500, blank=True)
+    encryption_key = models.CharField('Κλειδί Κρυπτογράφησης', max_length=64, blank=True)
+    page_count = models.PositiveIntegerField('Σελίδες', default=0)
+    pdf_size = models.PositiveIntegerField('Μέγεθος PDF (bytes)', default=0)
+    created_at = models.DateTimeField('Ημερομηνία Δημιουργίας', auto_now_add=True)
+
+    class Meta:
+        verbose_name = 'Μετατροπή Συνημμένου σε PDF'
+        verbose_name_plural = 'Μετατροπές Συνημμένων σε PDF'
+
+    def __str__(self):
+        return f"{self.content_sha256[:12]} ({self.page_count} σελ.)"
+
+
+class TrackedFieldsMixin:
+    """
+    Κρατά τις τιμές των TRACKED_FIELDS όπως διαβάστηκαν από τη βάση (from_db) ή
+    αποθηκεύτηκαν τελευταία, ώστε οι pre_save signals να βρίσκουν τις προηγούμενες
+    τιμές χωρίς νέο query. Πεδία που δεν φορτώθηκαν (defer/only) δεν έχουν στιγμιότυπο.
+    """
+
+    TRACKED_FIELDS = ()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._snapshot_tracked_fields()
+        return instance
+
+    def _snapshot_tracked_fields(self, fields=None):
+        # Νέο λεξικό κάθε φορά: τα copy.copy() αντίγραφα δεν μοιράζονται στιγμιότυπο
+        snapshot = dict(self.__dict__.get('_tracked_snapshot') or {})
+        for name in self.TRACKED_FIELDS:
+            attname = self._meta.get_field(name).attname
+            if fields is not None and name not in fields and attname not in fields:
+                continue
+            if attname in self.__dict__:
+                snapshot[attname] = self.__dict__[attname]
+        self._tracked_snapshot = snapshot
+
+    def tracked_previous_values(self):
+        """
+        Οι τιμές των παρακολουθούμενων πεδίων στη βάση, κατά attname.
+
+        Returns:
+            dict | None: None αν το αντικείμενο δεν φορτώθηκε από τη βάση ή λείπει κάποιο πεδίο
+        """
+        snapshot = self.__dict__.get('_tracked_snapshot')
+        if snapshot is None or len(snapshot) < len(self.TRACKED_FIELDS):
+            return None
+        return dict(snapshot)
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self._snapshot_tracked_fields(kwargs.get('update_fields'))
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+        self._snapshot_tracked_fields(fields)
+
+
+class LeaveRequestQuerySet(models.QuerySet):
+    def visible_to(self, user):
+        """Αιτήσεις που μπορεί να δει ο χρήστης — ίδιοι κανόνες με το can_user_view, σε SQL."""
+        from leaves.utils.visibility import leave_request_visibility_q
+        condition = leave_request_visibility_q(user)
+        return self if condition is None else self.filter(condition)
+
+
+class LeaveRequest(TrackedFieldsMixin, models.Model):
     """Αίτηση άδειας"""
     
     STATUS_CHOICES = [
@@ -165,6 +270,16 @@ class LeaveRequest(models.Model):
         ('PARTIAL', 'Μερική'),
     ]
 
+    # Ασύγχρονη δημιουργία ενοποιημένου PDF και αποστολή στο πρωτόκολλο
+    PROTOCOL_DISPATCH_STATUS_CHOICES = [
+        ('QUEUED', 'Σε αναμονή'),
+        ('BUILDING', 'Δημιουργία PDF'),
+        ('SENDING', 'Αποστολή email'),
+        ('SENT', 'Στάλθηκε'),
+        ('FAILED', 'Απέτυχε'),
+    ]
+    PROTOCOL_DISPATCH_ACTIVE_STATUSES = ('QUEUED', 'BUILDING', 'SENDING')
+
     # Καταστάσεις αίτησης ανάκλησης που θεωρούνται «κλειστές»
     REVOCATION_TERMINAL_STATUSES = (
         'COMPLETED',
@@ -304,8 +419,27 @@ class LeaveRequest(models.Model):
         blank=True,
         help_text='Συμπληρώνεται όταν αποτύχει η αυτόματη αποστολή PDF στο πρωτόκολλο κατά την υποβολή',
     )
+    protocol_dispatch_status = models.CharField(
+        'Κατάσταση Αποστολής στο Πρωτόκολλο',
+        max_length=10,
+        choices=PROTOCOL_DISPATCH_STATUS_CHOICES,
+        blank=True,
+        help_text='Κατάσταση της ασύγχρονης δημιουργίας και αποστολής του ενοποιημένου PDF',
+    )
+    protocol_dispatch_key = models.CharField(
+        'Κλειδί Αποστολής στο Πρωτόκολλο',
+        max_length=64,
+        blank=True,
+        help_text='Idempotency key της τελευταίας αποστολής — αποτρέπει διπλές αποστολές',
+    )
+    protocol_dispatch_error = models.TextField('Σφάλμα Αποστολής στο Πρωτόκολλο', blank=True)
+    protocol_dispatch_updated_at = models.DateTimeField(
+        'Τελευταία Ενημέρωση Αποστολής στο Πρωτόκολλο',
+        null=True,
+        blank=True,
+    )
     
-    # Ανάκληση και κλείδωμα
+    # Ανάκληση
     parent_leave = models.ForeignKey('self', on_delete=models.SET_NULL, null=True, blank=True,
                                      related_name='child_requests', verbose_name='Γονική Αίτηση',
                                      help_text='Για ανάκληση/μερική ανάκληση - συνδέει με την αρχική αίτηση')
@@ -318,14 +452,27 @@ class LeaveRequest(models.Model):
         blank=True,
         help_text='Ολική ή μερική — μόνο για αιτήσεις τύπου ανάκλησης',
     )
-    locking_user = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True,
-                                     related_name='locked_leaves', verbose_name='Κλειδωμένο από Χειριστή')
-    locked_at = models.DateTimeField('Ώρα Κλειδώματος', null=True, blank=True)
+
+    # Σύνοψη διαστημάτων — ενημερώνεται από τα signals του LeavePeriod (sync_period_summary)
+    first_start_date = models.DateField('Πρώτη Ημερομηνία Έναρξης', null=True, blank=True, editable=False)
+    last_end_date = models.DateField('Τελευταία Ημερομηνία Λήξης', null=True, blank=True, db_index=True,
+                                     editable=False)
+    total_days = models.PositiveIntegerField('Συνολικές Ημέρες', default=0, editable=False)
+
+    PERIOD_SUMMARY_FIELDS = ('first_start_date', 'last_end_date', 'total_days')
+
+    # Προηγούμενες τιμές για audit log και σύνολα αναρρωτικών (leaves/signals.py)
+    TRACKED_FIELDS = ('status', 'submitted_at', 'user', 'leave_type')
+
+    objects = LeaveRequestQuerySet.as_manager()
     
     class Meta:
         verbose_name = 'Αίτηση Άδειας'
         verbose_name_plural = 'Αιτήσεις Αδειών'
         ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['first_start_date', 'last_end_date'], name='leaves_lr_period_range_idx'),
+        ]
         permissions = [
             ('can_approve_leave', 'Μπορεί να εγκρίνει άδειες'),
             ('can_process_leave', 'Μπορεί να επεξεργαστεί άδειες'),
@@ -336,10 +483,28 @@ class LeaveRequest(models.Model):
             return f"{self.user.full_name} - {self.leave_type.name} ({self.start_date} - {self.end_date})"
         return f"{self.user.full_name} - {self.leave_type.name} ({self.total_days} ημέρες)"
     
-    @property
-    def total_days(self):
-        """Υπολογισμός συνολικών ημερών άδειας από όλα τα διαστήματα"""
-        return sum(period.days for period in self.periods.all())
+    def save(self, *args, **kwargs):
+        # Τα πεδία σύνοψης διαστημάτων γράφονται μόνο από sync_period_summary,
+        # ώστε ένα παλιό in-memory αντικείμενο να μην τα επαναφέρει σε παλιές τιμές.
+        if not self._state.adding and kwargs.get('update_fields') is None and not kwargs.get('force_insert'):
+            deferred = self.get_deferred_fields()
+            kwargs['update_fields'] = [
+                field.name for field in self._meta.concrete_fields
+                if not field.primary_key
+                and field.attname not in deferred
+                and field.name not in self.PERIOD_SUMMARY_FIELDS
+            ]
+        super().save(*args, **kwargs)
+
+    def sync_period_summary(self):
+        """Επαναϋπολογίζει first_start_date / last_end_date / total_days από τα διαστήματα."""
+        summary = period_summary(
+            LeavePeriod.objects.filter(leave_request_id=self.pk).values_list('start_date', 'end_date')
+        )
+        LeaveRequest.objects.filter(pk=self.pk).update(**summary)
+        for field, value in summary.items():
+            setattr(self, field, value)
+        return summary
 
     @property
     def remaining_revocable_days(self):
@@ -369,8 +534,11 @@ class LeaveRequest(models.Model):
             leave_type__is_revocation=True,
         ).exclude(status__in=self.REVOCATION_TERMINAL_STATUSES)
 
-    def can_request_leave_revocation(self, user):
-        """Ελέγχει αν ο χρήστης μπορεί να ξεκινήσει ανάκληση ολοκληρωμένης άδειας."""
+    def can_request_leave_revocation(self, user, has_open_revocation=None):
+        """
+        Ελέγχει αν ο χρήστης μπορεί να ξεκινήσει ανάκληση ολοκληρωμένης άδειας.
+        has_open_revocation: ήδη υπολογισμένο (μαζικός υπολογισμός ενεργειών dashboard).
+        """
         if not user or not user.is_authenticated:
             return False
         if self.status != 'COMPLETED':
@@ -379,9 +547,9 @@ class LeaveRequest(models.Model):
             return False
         if self.user_id != user.id and not getattr(user, 'is_leave_handler', False):
             return False
-        if self.get_open_revocation_requests().exists():
-            return False
-        return True
+        if has_open_revocation is None:
+            has_open_revocation = self.get_open_revocation_requests().exists()
+        return not has_open_revocation
 
     def date_covered_by_parent_periods(self, check_date):
         """True αν η ημερομηνία ανήκει σε κάποιο διάστημα της αίτησης."""
@@ -393,18 +561,12 @@ class LeaveRequest(models.Model):
     @property
     def start_date(self):
         """Πρώτη ημερομηνία έναρξης από όλα τα διαστήματα"""
-        periods = self.periods.all().order_by('start_date')
-        if periods:
-            return periods.first().start_date
-        return None
+        return self.first_start_date
 
     @property
     def end_date(self):
         """Τελευταία ημερομηνία λήξης από όλα τα διαστήματα"""
-        periods = self.periods.all().order_by('-end_date')
-        if periods:
-            return periods.first().end_date
-        return None
+        return self.last_end_date
 
     @property
     def submission_datetime(self):
@@ -432,17 +594,12 @@ class LeaveRequest(models.Model):
         if not manager.is_department_manager or self.user == manager:
             return False
 
-        approving_manager = self.user.get_approving_manager()
-        if approving_manager and approving_manager.id == manager.id:
-            return True
-
-        if (manager.department and manager.department.department_type and
-                manager.department.department_type.code == 'KEDASY' and
-                is_sdey_department(self.user.department) and
-                self.user.department.parent_department == manager.department):
+        if self.user.get_approving_manager_id() == manager.id:
             return True
 
-        return False
+        from accounts.utils.department_hierarchy import get_department_hierarchy
+        hierarchy = get_department_hierarchy(self.user.department_id)
+        return hierarchy.is_kedasy_sdey_child(self.user.department_id, manager.department_id)
     
     @property
     def can_be_processed(self):
@@ -706,7 +863,7 @@ class LeaveRequest(models.Model):
         self.revoked_days = days
         self.save(update_fields=['revoked_days', 'updated_at'])
 
-        from notifications.utils import create_notification
+        from notifications.utils import create_notification, notify_many
 
         scope_label = self.get_revocation_scope_display() or 'ανάκληση'
         create_notification(
@@ -722,18 +879,17 @@ class LeaveRequest(models.Model):
         handlers = User.objects.filter(
             roles__code='LEAVE_HANDLER',
             is_active=True,
-        ).distinct()
-        for handler in handlers:
-            create_notification(
-                user=handler,
-                title='Ολοκληρώθηκε ανάκληση άδειας',
-                message=(
-                    f'Ο/Η {self.user.full_name}: {scope_label.lower()} ανάκληση '
-                    f'άδειας #{parent.id} ({days} ημέρες).'
-                ),
-                notification_type='info',
-                related_object=self,
-            )    
+        )
+        notify_many(
+            handlers,
+            title='Ολοκληρώθηκε ανάκληση άδειας',
+            message=(
+                f'Ο/Η {self.user.full_name}: {scope_label.lower()} ανάκληση '
+                f'άδειας #{parent.id} ({days} ημέρες).'
+            ),
+            notification_type='info',
+            related_object=self,
+        )    
     def reject_by_operator(self, operator, reason):
         """Απόρριψη από χειριστή"""
         if self.status in ['PENDING_PROTOCOL', 'IN_REVIEW']:
@@ -798,14 +954,20 @@ class LeaveRequest(models.Model):
         """Έχει ο αιτών ανεβάσει τουλάχιστον ένα συνημμένο σε αυτή την αίτηση."""
         return self.attachments.filter(uploaded_by_id=self.user_id).exists()
 
-    def can_submit_applicant_documents(self, user):
-        """Έλεγχος αν ο αιτών μπορεί να δηλώσει ολοκλήρωση αποστολής δικαιολογητικών."""
-        return (
+    def can_submit_applicant_documents(self, user, has_uploaded_documents=None):
+        """
+        Έλεγχος αν ο αιτών μπορεί να δηλώσει ολοκλήρωση αποστολής δικαιολογητικών.
+        has_uploaded_documents: ήδη υπολογισμένο applicant_has_uploaded_documents().
+        """
+        if not (
             user.is_authenticated
             and self.user_id == user.pk
             and self.status == 'WAITING_FOR_DOCUMENTS'
-            and self.applicant_has_uploaded_documents()
-        )
+        ):
+            return False
+        if has_uploaded_documents is None:
+            has_uploaded_documents = self.applicant_has_uploaded_documents()
+        return has_uploaded_documents
 
     def submit_applicant_documents(self, user):
         """Ολοκλήρωση αποστολής δικαιολογητικών από αιτούντα → ετοιμασία απόφασης."""
@@ -890,16 +1052,25 @@ class LeaveRequest(models.Model):
     @property
     def can_send_to_yc(self):
         """Ελέγχει αν μπορεί να σταλεί σε Υγειονομική Επιτροπή"""
+        return self.check_can_send_to_yc()
+
+    def check_can_send_to_yc(self, returned_from_yc=None, sick_total=None):
+        """
+        Όπως το can_send_to_yc, με προαιρετικά ήδη υπολογισμένα στοιχεία
+        (επιστροφή από ΥΕ, σύνολο αναρρωτικών του αιτούντα) για μαζικό υπολογισμό.
+        """
         if self.status != 'IN_REVIEW':
             return False
         if not self.leave_type.is_sick_leave_total:
             return False
-        if self.has_returned_from_yc_committee:
-            return False
         if self.documents_provided_at:
             return False
+        if returned_from_yc is None:
+            returned_from_yc = self.has_returned_from_yc_committee
+        if returned_from_yc:
+            return False
         from leaves.utils.sick_leave_alerts import user_exceeds_sick_threshold
-        return user_exceeds_sick_threshold(self.user)
+        return user_exceeds_sick_threshold(self.user_id, sick_total=sick_total)
 
     def send_to_yc_committee(self, handler, notes=''):
         """Αποστολή σε Υγειονομική Επιτροπή"""
@@ -946,6 +1117,11 @@ class LeaveRequest(models.Model):
         """Επιστρέφει True αν υπάρχει ακριβές αντίγραφο PDF"""
         return bool(self.exact_copy_pdf_path and self.exact_copy_pdf_encryption_key)
     
+    @property
+    def is_protocol_dispatch_active(self):
+        """Αν η δημιουργία/αποστολή του ενοποιημένου PDF βρίσκεται σε εξέλιξη"""
+        return self.protocol_dispatch_status in self.PROTOCOL_DISPATCH_ACTIVE_STATUSES
+
     def has_merged_pdf(self):
         """Επιστρέφει True αν υπάρχει ενοποιημένο PDF"""
         return bool(self.merged_pdf_path and self.merged_pdf_encryption_key)
@@ -982,7 +1158,7 @@ class LeaveRequest(models.Model):
         if not self.leave_type.is_sick_leave_total:
             return
 
-        from notifications.utils import create_notification as _create_notification
+        from notifications.utils import create_notification as _create_notification, notify_many
         from leaves.utils.sick_leave_alerts import calculate_yearly_sick_total
 
         current_year = timezone.now().year
@@ -997,23 +1173,15 @@ class LeaveRequest(models.Model):
             f"στο τρέχον έτος (όριο: 8). Απαιτείται παραπομπή στην Υγειονομική Επιτροπή."
         )
 
-        handlers = User.objects.filter(roles__code='LEAVE_HANDLER', is_active=True)
-        for handler in handlers:
-            _create_notification(
-                user=handler,
-                title="Υπέρβαση Αναρρωτικών — Απαιτείται Υγειονομική Επιτροπή",
-                message=message_base,
-                related_object=self,
-            )
-
-        manager = self.user.get_approving_manager()
-        if manager:
-            _create_notification(
-                user=manager,
-                title="Υπέρβαση Αναρρωτικών — Απαιτείται Υγειονομική Επιτροπή",
-                message=message_base,
-                related_object=self,
-            )
+        handler_ids = list(
+            User.objects.filter(roles__code='LEAVE_HANDLER', is_active=True).values_list('pk', flat=True)
+        )
+        notify_many(
+            handler_ids + [self.user.get_approving_manager()],
+            title="Υπέρβαση Αναρρωτικών — Απαιτείται Υγειονομική Επιτροπή",
+            message=message_base,
+            related_object=self,
+        )
 
         _create_notification(
             user=self.user,
@@ -1096,36 +1264,30 @@ class LeaveRequest(models.Model):
         if self.user == user:
             return True
         
-        # Οι προϊστάμενοι μπορούν να δουν αιτήσεις του τμήματός τους
-        if user.is_department_manager and self.user.department == user.department:
-            return True
+        owner_department_id = self.user.department_id
+        from accounts.utils.department_hierarchy import get_department_hierarchy
+        hierarchy = get_department_hierarchy(owner_department_id)
 
-        # Προϊστάμενος PDEDE — πρόσβαση σε όλες τις αιτήσεις
-        if (user.is_department_manager and user.department and
-                user.department.department_type and
-                user.department.department_type.code == 'PDEDE_MAIN'):
-            return True
-        
-        # Οι προϊστάμενοι ΚΕΔΑΣΥ μπορούν να δουν και αιτήσεις από ΣΔΕΥ
-        if (user.is_department_manager and
-            user.department and user.department.department_type and
-            user.department.department_type.code == 'KEDASY' and
-            is_sdey_department(self.user.department) and
-            self.user.department.parent_department == user.department):
-            return True
+        if user.is_department_manager:
+            # Αιτήσεις του τμήματός τους
+            if owner_department_id == user.department_id:
+                return True
+            # Προϊστάμενος PDEDE — πρόσβαση σε όλες τις αιτήσεις
+            if hierarchy.type_code(user.department_id) == 'PDEDE_MAIN':
+                return True
+            # Οι προϊστάμενοι ΚΕΔΑΣΥ βλέπουν και αιτήσεις από ΣΔΕΥ
+            if hierarchy.is_kedasy_sdey_child(owner_department_id, user.department_id):
+                return True
         
         # Οι χειριστές μπορούν να δουν όλες τις αιτήσεις
         if user.is_leave_handler:
             return True
         
-        # Οι γραμματείς μπορούν να δουν αιτήσεις του τμήματός τους
+        # Οι γραμματείς μπορούν να δουν αιτήσεις του τμήματός τους (και ΣΔΕΥ για ΚΕΔΑΣΥ)
         if user.is_secretary:
-            if self.user.department == user.department:
+            if owner_department_id == user.department_id:
                 return True
-            if (user.department and user.department.department_type and
-                user.department.department_type.code == 'KEDASY' and
-                is_sdey_department(self.user.department) and
-                self.user.department.parent_department == user.department):
+            if hierarchy.is_kedasy_sdey_child(owner_department_id, user.department_id):
                 return True
         
         return False
@@ -1197,7 +1359,7 @@ class LeaveRequest(models.Model):
         try:
             department = self.user.department
             if department and user.department:
-                user_has_permission = user.roles.filter(code__in=['SECRETARY', 'MANAGER']).exists()
+                user_has_permission = user.is_secretary or user.is_department_manager
                 if not user_has_permission:
                     return False
                 
@@ -1268,8 +1430,9 @@ class Logo(models.Model):
     
     @classmethod
     def get_active(cls):
-        """Επιστρέφει το ενεργό λογότυπο"""
-        return cls.objects.filter(is_active=True).first()
+        """Επιστρέφει το ενεργό λογότυπο (από το cache δεδομένων αναφοράς)"""
+        from leaves.utils.reference_data import get_active_reference
+        return get_active_reference(cls)
 
 
 class Info(models.Model):
@@ -1290,8 +1453,9 @@ class Info(models.Model):
     
     @classmethod
     def get_active(cls):
-        """Επιστρέφει τις ενεργές πληροφορίες"""
-        return cls.objects.filter(is_active=True).first()
+        """Επιστρέφει τις ενεργές πληροφορίες (από το cache δεδομένων αναφοράς)"""
+        from leaves.utils.reference_data import get_active_reference
+        return get_active_reference(cls)
 
 
 class Ypopsin(models.Model):
@@ -1312,8 +1476,9 @@ class Ypopsin(models.Model):
     
     @classmethod
     def get_active(cls):
-        """Επιστρέφει το ενεργό κείμενο υπόψη"""
-        return cls.objects.filter(is_active=True).first()
+        """Επιστρέφει το ενεργό κείμενο υπόψη (από το cache δεδομένων αναφοράς)"""
+        from leaves.utils.reference_data import get_active_reference
+        return get_active_reference(cls)
 
 
 class Signee(models.Model):
@@ -1335,8 +1500,9 @@ class Signee(models.Model):
     
     @classmethod
     def get_active(cls):
-        """Επιστρέφει τον ενεργό υπογράφοντα"""
-        return cls.objects.filter(is_active=True).first()
+        """Επιστρέφει τον ενεργό υπογράφοντα (από το cache δεδομένων αναφοράς)"""
+        from leaves.utils.reference_data import get_active_reference
+        return get_active_reference(cls)
 
 
 class PublicHoliday(models.Model):
@@ -1378,6 +1544,7 @@ class LeaveActionLog(models.Model):
         verbose_name = 'Log Ενέργειας Άδειας'
         verbose_name_plural = 'Logs Ενεργειών Αδειών'
         ordering = ['-timestamp']
+        indexes = [models.Index(fields=['timestamp'], name='leaves_actionlog_ts_idx')]
 
     def __str__(self):
         return f"{self.action} - {self.leave_request} ({self.timestamp.strftime('%d/%m/%Y %H:%M')})"
@@ -1398,6 +1565,7 @@ class LeaveAccessLog(models.Model):
         verbose_name = 'Log Πρόσβασης Άδειας'
         verbose_name_plural = 'Logs Πρόσβασης Αδειών'
         ordering = ['-timestamp']
+        indexes = [models.Index(fields=['timestamp'], name='leaves_accesslog_ts_idx')]
 
     def __str__(self):
         return f"{self.accessed_by} → {self.leave_request} ({self.access_type})"
@@ -1706,6 +1874,33 @@ class YearlySickLeaveTotal(models.Model):
         return f"{self.employee} - {self.year}: {self.total_days} ημέρες"
 
 
+class SickLeaveAlertTotal(models.Model):
+    """
+    Τρέχον σύνολο αναρρωτικών ημερών ανά υπάλληλο και έτος υποβολής, για το alert ΥΕ.
+
+    Περιλαμβάνει ενεργές + ολοκληρωμένες αιτήσεις (σε αντίθεση με το
+    YearlySickLeaveTotal που καταγράφει μόνο ολοκληρωμένες). Συντηρείται από τα
+    signals σε αλλαγές κατάστασης/διαστημάτων· το reconcile_sick_leave_alert_totals
+    ελέγχει και διορθώνει αποκλίσεις.
+    """
+    employee = models.ForeignKey(User, on_delete=models.CASCADE, related_name='sick_leave_alert_totals',
+                                 verbose_name='Υπάλληλος')
+    year = models.PositiveIntegerField('Έτος')
+    total_days = models.PositiveIntegerField('Σύνολο Ημερών', default=0)
+    updated_at = models.DateTimeField('Τελευταία Ενημέρωση', auto_now=True)
+
+    class Meta:
+        verbose_name = 'Τρέχον Σύνολο Αναρρωτικών (alert ΥΕ)'
+        verbose_name_plural = 'Τρέχοντα Σύνολα Αναρρωτικών (alert ΥΕ)'
+        unique_together = ['employee', 'year']
+        indexes = [
+            models.Index(fields=['year', 'total_days'], name='leaves_sick_alert_total_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.employee} - {self.year}: {self.total_days} ημέρες"
+
+
 class YCCommitteeAcknowledgment(models.Model):
     """Καταγραφή ότι ένας χειριστής έλαβε γνώση για την υπέρβαση αναρρωτικών ενός υπαλλήλου"""
     handler = models.ForeignKey(User, on_delete=models.CASCADE, related_name='yc_acknowledgments',
@@ -85,14 +85,13 @@ def _sch_export_queryset(date_from: date, date_to: date):
             'user__department__department_type',
             'leave_type',
         )
-        .prefetch_related('periods')
     )
 
     # Φιλτράρισμα βάσει ημερομηνίας έναρξης πρώτης περιόδου
     qs = qs.filter(
-        periods__start_date__gte=date_from,
-        periods__start_date__lte=date_to,
-    ).distinct()
+        first_start_date__gte=date_from,
+        first_start_date__lte=date_to,
+    )
 
     return qs.order_by('user__last_name', 'user__first_name', 'id')
 
@@ -120,12 +119,11 @@ def sch_export_report(request):
             else:
                 qs = _sch_export_queryset(date_from, date_to)
                 for lr in qs:
-                    first_period = lr.periods.order_by('start_date').first()
                     rows.append({
                         'employee_number': lr.user.employee_number or '',
                         'full_name': lr.user.full_name,
                         'leave_type': lr.leave_type.name,
-                        'start_date': first_period.start_date if first_period else '',
+                        'start_date': lr.start_date or '',
                         'total_days': lr.total_days,
                         'pdede_protocol_number': lr.pdede_protocol_number or '',
                         'pdede_protocol_date': lr.pdede_protocol_date.date() if lr.pdede_protocol_date else '',
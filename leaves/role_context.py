@@ -6,6 +6,7 @@ from django.urls import reverse
 
 from accounts.department_utils import SDEY_DEPARTMENT_TYPE_CODES
 from leaves.models import LeaveRequest
+from leaves.utils.role_badges import read_role_badges, store_role_badges
 
 ROLE_NAV_CONFIG = {
     'employee': {
@@ -45,6 +46,8 @@ URL_NAME_TO_ROLE = {
 
 ROLE_PRIORITY = ['manager', 'handler', 'secretary', 'employee', 'admin']
 
+ROLE_ORDER = ['employee', 'manager', 'handler', 'secretary', 'admin']
+
 
 def _secretary_department_filter(user):
     """Φίλτρο τμήματος για γραμματέα (ΚΕΔΑΣΥ + ΣΔΕΥ)."""
@@ -120,19 +123,42 @@ def get_active_role_key(request):
     return URL_NAME_TO_ROLE.get(url_name)
 
 
-def get_role_nav_items(user, request=None):
-    """Λίστα κουμπιών role switcher με badges."""
+def get_role_badges(user):
+    """
+    Ρόλοι dashboard και εκκρεμότητες του χρήστη, από το cache (leaves.utils.role_badges).
+
+    Returns:
+        tuple: ({'roles': [...], 'counts': {...}}, πλήθος εκκρεμών εγγραφών | None)
+            Το πλήθος εγγραφών υπολογίζεται μόνο για χειριστές.
+    """
+    badges, registrations = read_role_badges(user.pk, with_registrations=True)
+    new_badges = new_registrations = None
+    if badges is None:
+        badges = new_badges = {
+            'roles': [key for key in ROLE_ORDER if user_has_dashboard_role(user, key)],
+            'counts': get_role_pending_counts(user),
+        }
+    if 'handler' not in badges['roles']:
+        registrations = None
+    elif registrations is None:
+        from accounts.utils.pending_registration_alerts import get_pending_registrations_queryset
+        registrations = new_registrations = get_pending_registrations_queryset().count()
+    store_role_badges(user.pk, new_badges, new_registrations)
+    return badges, registrations
+
+
+def get_role_nav_items(user, request=None, badges=None):
+    """Λίστα κουμπιών role switcher με badges (badges: ήδη φορτωμένο get_role_badges)."""
     if not user.is_authenticated:
         return []
 
-    counts = get_role_pending_counts(user)
+    if badges is None:
+        badges, _ = get_role_badges(user)
+    counts = badges['counts']
     active_role = get_active_role_key(request)
     items = []
 
-    role_order = ['employee', 'manager', 'handler', 'secretary', 'admin']
-    for role_key in role_order:
-        if not user_has_dashboard_role(user, role_key):
-            continue
+    for role_key in badges['roles']:
         config = ROLE_NAV_CONFIG[role_key]
         items.append({
             'key': role_key,
@@ -151,18 +177,20 @@ def resolve_default_dashboard_name(user, session=None):
     1) ρόλος με εκκρεμότητες, 2) session, 3) handler > manager > secretary > employee.
     """
     session = session or {}
-    counts = get_role_pending_counts(user)
+    badges, _ = get_role_badges(user)
+    roles = badges['roles']
+    counts = badges['counts']
 
     for role_key in ROLE_PRIORITY:
-        if counts.get(role_key, 0) > 0 and user_has_dashboard_role(user, role_key):
+        if counts.get(role_key, 0) > 0 and role_key in roles:
             return ROLE_NAV_CONFIG[role_key]['url_name']
 
     last_role = session.get('active_dashboard_role')
-    if last_role and user_has_dashboard_role(user, last_role):
+    if last_role in roles:
         return ROLE_NAV_CONFIG[last_role]['url_name']
 
     for role_key in ROLE_PRIORITY:
-        if user_has_dashboard_role(user, role_key):
+        if role_key in roles:
             return ROLE_NAV_CONFIG[role_key]['url_name']
 
     return ROLE_NAV_CONFIG['employee']['url_name']
@@ -1,27 +1,69 @@
 """
 Signals για αυτόματη καταγραφή audit trail
 """
-from django.db.models.signals import post_save, pre_save
+from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
 from django.dispatch import receiver
 from django.utils import timezone
-from leaves.models import LeaveRequest, LeaveActionLog
+from leaves.models import (
+    Info,
+    LeavePeriod,
+    LeaveRequest,
+    LeaveType,
+    Logo,
+    PublicHoliday,
+    SecureFile,
+    Signee,
+    Ypopsin,
+)
+from leaves.utils.action_log import record_action_log
+from leaves.utils.attachment_pdf_cache import evict_attachment_pdf_cache
+from leaves.utils.handler_tab_counts import invalidate_handler_tab_counts
+from leaves.utils.leave_calendar import invalidate_leave_calendar
+from leaves.utils.reference_data import invalidate_leave_type_colors, invalidate_reference_data
+from leaves.utils.role_badges import (
+    invalidate_registration_badge,
+    invalidate_role_badges,
+    invalidate_role_badges_for_transition,
+)
+from leaves.utils.sick_leave_alerts import sync_sick_alert_totals, sync_sick_alert_totals_for_request_id
+from leaves.utils.working_days import invalidate_working_day_index, working_day_index
+
+User = get_user_model()
+
+# Πεδία χρήστη που επηρεάζουν το πλήθος εκκρεμών εγγραφών
+REGISTRATION_FIELDS = {'registration_status', 'registration_submitted_at', 'is_active'}
 
 
 @receiver(pre_save, sender=LeaveRequest)
 def track_leave_status_changes(sender, instance, **kwargs):
     """
     Καταγράφει αλλαγές κατάστασης στο LeaveActionLog.
-    Χρησιμοποιούμε pre_save για να πιάσουμε την προηγούμενη τιμή.
+    Οι προηγούμενες τιμές έρχονται από το στιγμιότυπο του TrackedFieldsMixin· query
+    γίνεται μόνο για αντικείμενα που δεν φορτώθηκαν από τη βάση (ή με deferred πεδία).
     """
     if not instance.pk:
         # Νέα αίτηση - θα καταγραφεί στο post_save
         return
 
-    try:
-        old_instance = LeaveRequest.objects.get(pk=instance.pk)
-        old_status = old_instance.status
-    except LeaveRequest.DoesNotExist:
-        old_status = None
+    previous = instance.tracked_previous_values()
+    if previous is None:
+        previous = LeaveRequest.objects.filter(pk=instance.pk).values(
+            'status', 'submitted_at', 'user_id', 'leave_type_id',
+        ).first()
+    old_status = previous['status'] if previous is not None else None
+
+    # Αλλαγές που μετακινούν την αίτηση μεταξύ συνόλων αναρρωτικών (υπάλληλος/έτος/τύπος)
+    if previous is not None and (
+        old_status != instance.status
+        or previous['submitted_at'] != instance.submitted_at
+        or previous['user_id'] != instance.user_id
+        or previous['leave_type_id'] != instance.leave_type_id
+    ):
+        instance._sick_total_previous = (
+            previous['user_id'], previous['submitted_at'], previous['leave_type_id'],
+        )
 
     # Αν άλλαξε το status, καταγράφουμε στο log
     if old_status != instance.status:
@@ -37,8 +79,12 @@ def create_status_change_log(sender, instance, created, **kwargs):
     Δημιουργεί LeaveActionLog entry όταν αλλάζει status.
     """
     if created:
+        invalidate_handler_tab_counts()
+        invalidate_leave_calendar()
+        invalidate_role_badges_for_transition(instance.user_id, None, instance.status)
+        sync_sick_alert_totals(instance)
         # Νέα αίτηση
-        LeaveActionLog.objects.create(
+        record_action_log(
             leave_request=instance,
             user=instance.user,
             action='CREATE',
@@ -48,8 +94,15 @@ def create_status_change_log(sender, instance, created, **kwargs):
         )
         return
 
+    if hasattr(instance, '_sick_total_previous'):
+        sync_sick_alert_totals(instance, previous=instance._sick_total_previous)
+        del instance._sick_total_previous
+
     # Έλεγχος για αλλαγή status
     if hasattr(instance, '_status_changed') and instance._status_changed:
+        invalidate_handler_tab_counts()
+        invalidate_leave_calendar()
+        invalidate_role_badges_for_transition(instance.user_id, instance._old_status, instance._new_status)
         action_map = {
             'SUBMITTED': 'SUBMIT',
             'PENDING_PROTOCOL': 'MANAGER_APPROVE',
@@ -81,7 +134,7 @@ def create_status_change_log(sender, instance, created, **kwargs):
         if hasattr(instance, '_change_notes'):
             notes = instance._change_notes
 
-        LeaveActionLog.objects.create(
+        record_action_log(
             leave_request=instance,
             user=user,
             action=action,
@@ -101,3 +154,92 @@ def create_status_change_log(sender, instance, created, **kwargs):
             del instance._changed_by
         if hasattr(instance, '_change_notes'):
             del instance._change_notes
+
+
+@receiver(post_delete, sender=LeaveRequest)
+def invalidate_caches_on_delete(sender, instance, **kwargs):
+    """Η διαγραφή αίτησης αλλάζει μετρητές καρτελών, badges, ημερολόγιο και σύνολα αναρρωτικών."""
+    invalidate_handler_tab_counts()
+    invalidate_leave_calendar()
+    invalidate_role_badges_for_transition(instance.user_id, instance.status, None)
+    sync_sick_alert_totals(instance)
+
+
+@receiver(post_save, sender=LeavePeriod)
+@receiver(post_delete, sender=LeavePeriod)
+def sync_leave_request_period_summary(sender, instance, **kwargs):
+    """
+    Κρατά συγχρονισμένα τα first_start_date / last_end_date / total_days της αίτησης.
+    Αν η αίτηση είναι ήδη φορτωμένη στο διάστημα, ενημερώνεται και το ίδιο αντικείμενο.
+    """
+    if LeavePeriod.leave_request.is_cached(instance):
+        leave_request = instance.leave_request
+    else:
+        leave_request = LeaveRequest(pk=instance.leave_request_id)
+    leave_request.sync_period_summary()
+    invalidate_leave_calendar()
+    sync_sick_alert_totals_for_request_id(instance.leave_request_id)
+
+
+@receiver(post_save, sender=PublicHoliday)
+@receiver(post_delete, sender=PublicHoliday)
+def invalidate_working_days_on_holiday_change(sender, instance, **kwargs):
+    """
+    Ακυρώνει το ευρετήριο εργάσιμων ημερών όταν αλλάζει μια αργία.
+    Ξανά μετά το commit, ώστε να μη μείνει ευρετήριο χτισμένο από
+    δεδομένα συναλλαγής που δεν ολοκληρώθηκε.
+    """
+    invalidate_working_day_index()
+    transaction.on_commit(working_day_index.invalidate)
+
+
+@receiver(post_delete, sender=SecureFile)
+def evict_attachment_pdf_cache_on_delete(sender, instance, **kwargs):
+    """Η μετατροπή σε PDF διαγράφεται μαζί με το τελευταίο συνημμένο ίδιου περιεχομένου (μετά το commit)."""
+    if instance.content_sha256:
+        content_sha256 = instance.content_sha256
+        transaction.on_commit(lambda: evict_attachment_pdf_cache(content_sha256))
+
+
+@receiver(post_save, sender=Logo)
+@receiver(post_delete, sender=Logo)
+@receiver(post_save, sender=Info)
+@receiver(post_delete, sender=Info)
+@receiver(post_save, sender=Ypopsin)
+@receiver(post_delete, sender=Ypopsin)
+@receiver(post_save, sender=Signee)
+@receiver(post_delete, sender=Signee)
+def invalidate_reference_data_on_change(sender, instance, **kwargs):
+    """Αλλαγή στοιχείων αποφάσεων (π.χ. από το admin) ακυρώνει τα cached δεδομένα αναφοράς."""
+    invalidate_reference_data()
+
+
+@receiver(post_save, sender=LeaveType)
+@receiver(post_delete, sender=LeaveType)
+def invalidate_leave_type_colors_on_change(sender, instance, **kwargs):
+    """Νέος ή απενεργοποιημένος τύπος άδειας αλλάζει τα χρώματα του ημερολογίου."""
+    invalidate_leave_type_colors()
+
+
+@receiver(post_save, sender=User)
+@receiver(post_delete, sender=User)
+def invalidate_role_badges_on_user_change(sender, instance, **kwargs):
+    """
+    Αλλαγές χρήστη (τμήμα, superuser, εγγραφή) αλλάζουν τα badges του role switcher.
+    Το πλήθος εκκρεμών εγγραφών ακυρώνεται μόνο όταν αλλάζουν πεδία εγγραφής.
+    """
+    invalidate_role_badges([instance.pk])
+    update_fields = kwargs.get('update_fields')
+    if update_fields is None or REGISTRATION_FIELDS & set(update_fields):
+        invalidate_registration_badge()
+
+
+@receiver(m2m_changed, sender=User.roles.through)
+def invalidate_role_badges_on_role_change(sender, instance, action, reverse, pk_set, **kwargs):
+    """Προσθήκη/αφαίρεση ρόλου αλλάζει τα κουμπιά του role switcher."""
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if not reverse:
+        invalidate_role_badges([instance.pk])
+    elif pk_set:
+        invalidate_role_badges(pk_set)
@@ -0,0 +1,106 @@
+"""
+Celery tasks της εφαρμογής leaves.
+
+Η αποστολή στο πρωτόκολλο εκτελείται ως αλυσίδα:
+build_protocol_pdf → send_protocol_email (βλ. leaves/utils/protocol_dispatch.py).
+"""
+import logging
+import smtplib
+
+from celery import Task, chain, shared_task
+
+from leaves.models import LeaveRequest
+from leaves.utils.protocol_dispatch import set_dispatch_status
+
+logger = logging.getLogger(__name__)
+
+
+class ProtocolDispatchTask(Task):
+    """Σημειώνει την αποστολή ως αποτυχημένη όταν εξαντληθούν οι επαναλήψεις."""
+
+    def on_failure(self, exc, task_id, args, kwargs, einfo):
+        leave_request_id, key = args[0], args[1]
+        logger.error(
+            "Protocol dispatch %s failed for leave request %s: %s",
+            key, leave_request_id, exc,
+        )
+        if not set_dispatch_status(leave_request_id, key, 'FAILED', error=str(exc)[:1000]):
+            return
+        from leaves.utils.protocol_email_alerts import mark_protocol_email_failed
+        leave_request = LeaveRequest.objects.filter(pk=leave_request_id).first()
+        if leave_request is not None:
+            mark_protocol_email_failed(leave_request)
+
+
+def _current_dispatch(leave_request_id, key):
+    """Η αίτηση, μόνο αν η αποστολή `key` δεν έχει αντικατασταθεί από νεότερη."""
+    return LeaveRequest.objects.filter(
+        pk=leave_request_id, protocol_dispatch_key=key,
+    ).select_related('user', 'leave_type').first()
+
+
+@shared_task(
+    base=ProtocolDispatchTask,
+    autoretry_for=(Exception,),
+    retry_backoff=True,
+    max_retries=2,
+)
+def build_protocol_pdf(leave_request_id, key):
+    """Δημιουργία, κρυπτογράφηση και αποθήκευση του ενοποιημένου PDF."""
+    leave_request = _current_dispatch(leave_request_id, key)
+    if leave_request is None or leave_request.protocol_dispatch_status in ('SENT', 'FAILED'):
+        # Ολοκληρώθηκε ή σημειώθηκε χαμένη (fail_stale_dispatch) πριν το παραλάβει worker
+        return
+    set_dispatch_status(leave_request_id, key, 'BUILDING')
+
+    from leaves.utils.pdf_merger import save_merged_pdf
+    save_merged_pdf(leave_request)
+
+
+@shared_task(
+    base=ProtocolDispatchTask,
+    autoretry_for=(smtplib.SMTPException, OSError),
+    retry_backoff=True,
+    retry_backoff_max=600,
+    max_retries=5,
+)
+def send_protocol_email(leave_request_id, key, recipient, subject=''):
+    """Αποστολή του αποθηκευμένου ενοποιημένου PDF στο email πρωτοκόλλου."""
+    leave_request = _current_dispatch(leave_request_id, key)
+    if leave_request is None or leave_request.protocol_dispatch_status in ('SENT', 'FAILED'):
+        # Αντικαταστάθηκε, έχει ήδη σταλεί (π.χ. επανάληψη μετά από worker restart)
+        # ή σημειώθηκε χαμένη
+        return
+    set_dispatch_status(leave_request_id, key, 'SENDING')
+
+    from leaves.crypto_utils import SecureFileHandler
+    from leaves.utils.pdf_merger import save_merged_pdf
+    from leaves.utils.protocol_email_alerts import clear_protocol_email_failure
+    from pdede_leaves.email_utils import send_merged_pdf_email
+
+    pdf_content = None
+    if leave_request.has_merged_pdf():
+        pdf_content = SecureFileHandler.load_encrypted_file(
+            leave_request.merged_pdf_path,
+            leave_request.merged_pdf_encryption_key,
+        )
+    if pdf_content is None:
+        pdf_content, _, _ = save_merged_pdf(leave_request)
+
+    send_merged_pdf_email(
+        leave_request,
+        pdf_content,
+        recipient=recipient,
+        custom_subject=subject,
+        fail_silently=False,
+    )
+    set_dispatch_status(leave_request_id, key, 'SENT')
+    clear_protocol_email_failure(leave_request)
+
+
+def start_protocol_dispatch(leave_request_id, key, recipient, subject=''):
+    """Στέλνει την αλυσίδα build → email στον broker."""
+    chain(
+        build_protocol_pdf.si(leave_request_id, key),
+        send_protocol_email.si(leave_request_id, key, recipient, subject),
+    ).delay()
@@ -0,0 +1,105 @@
+"""Tests για το cache μετατροπών συνημμένων σε PDF."""
+import os
+import shutil
+import tempfile
+from datetime import date
+from io import BytesIO
+from unittest.mock import patch
+
+from django.test import TestCase, override_settings
+from pypdf import PdfWriter
+
+from accounts.tests.test_data import TestDataMixin
+from leaves.crypto_utils import SecureFileHandler
+from leaves.models import AttachmentPdfCache, LeaveType, SecureFile
+from leaves.tests.helpers import create_submitted_leave_request
+from leaves.utils.attachment_pdf_cache import get_attachment_pdf_parts
+
+
+def _blank_pdf(pages):
+    writer = PdfWriter()
+    for _ in range(pages):
+        writer.add_blank_page(width=595, height=842)
+    output = BytesIO()
+    writer.write(output)
+    return output.getvalue()
+
+
+class AttachmentPdfCacheTests(TestDataMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir)
+        settings_override = override_settings(PRIVATE_MEDIA_ROOT=self.tmpdir)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+        leave_type = LeaveType.objects.create(name='Κανονική', code='PDFCACHE_ANNUAL')
+        self.leave_request = create_submitted_leave_request(
+            self.employee, leave_type, 'cache', date(2026, 7, 1), date(2026, 7, 3),
+        )
+        self.image_pdf = _blank_pdf(1)
+
+    def _attachment(self, filename, content):
+        path, key_hex = SecureFileHandler.save_encrypted_bytes(
+            content, os.path.join(self.tmpdir, 'uploads', f'{os.urandom(4).hex()}_{filename}'),
+        )
+        return SecureFile.objects.create(
+            leave_request=self.leave_request,
+            original_filename=filename,
+            file_path=path,
+            file_size=len(content),
+            content_type='application/octet-stream',
+            encryption_key=key_hex,
+            uploaded_by=self.employee,
+        )
+
+    def test_image_is_converted_once_and_shared_by_content(self):
+        first = self._attachment('scan.png', b'\x89PNG same image')
+        second = self._attachment('copy.png', b'\x89PNG same image')
+
+        with patch('leaves.utils.pdf_merger.image_to_pdf_bytes', return_value=self.image_pdf) as convert:
+            parts = get_attachment_pdf_parts([first, second])
+            self.assertEqual(convert.call_count, 1)
+            self.assertEqual([part[2] for part in parts], [1, 1])
+
+            first.refresh_from_db()
+            self.assertEqual(len(first.content_sha256), 64)
+            self.assertEqual(AttachmentPdfCache.objects.count(), 1)
+
+            parts = get_attachment_pdf_parts(SecureFile.objects.filter(pk__in=[first.pk, second.pk]))
+            self.assertEqual(convert.call_count, 1)
+        self.assertEqual(parts[0][1], self.image_pdf)
+
+    def test_pdf_attachment_caches_only_page_count(self):
+        content = _blank_pdf(3)
+        attachment = self._attachment('cert.pdf', content)
+
+        parts = get_attachment_pdf_parts([attachment])
+        self.assertEqual(parts[0][1:], (content, 3))
+        entry = AttachmentPdfCache.objects.get()
+        self.assertEqual(entry.pdf_path, '')
+        self.assertEqual(entry.page_count, 3)
+
+        attachment.refresh_from_db()
+        with patch('leaves.utils.pdf_merger.count_pdf_pages') as count_pages:
+            parts = get_attachment_pdf_parts([attachment])
+        count_pages.assert_not_called()
+        self.assertEqual(parts[0][1:], (content, 3))
+
+    def test_entry_is_evicted_with_last_attachment(self):
+        first = self._attachment('scan.png', b'\x89PNG evict')
+        second = self._attachment('copy.png', b'\x89PNG evict')
+        with patch('leaves.utils.pdf_merger.image_to_pdf_bytes', return_value=self.image_pdf):
+            get_attachment_pdf_parts([first, second])
+        entry = AttachmentPdfCache.objects.get()
+        self.assertTrue(os.path.exists(entry.pdf_path))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            SecureFile.objects.get(pk=first.pk).delete()
+        self.assertTrue(AttachmentPdfCache.objects.filter(pk=entry.pk).exists())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            SecureFile.objects.get(pk=second.pk).delete()
+        self.assertFalse(AttachmentPdfCache.objects.filter(pk=entry.pk).exists())
+        self.assertFalse(os.path.exists(entry.pdf_path))
@@ -0,0 +1,67 @@
+"""Tests για το παρουσιολόγιο (ένα query για όλους τους υπαλλήλους, λειτουργία διαστήματος)."""
+import io
+from datetime import date
+
+from django.test import TestCase
+from django.urls import reverse
+from openpyxl import load_workbook
+
+from accounts.tests.test_data import TestDataMixin
+from leaves.models import LeavePeriod, LeaveRequest, LeaveType
+from leaves.utils.attendance import iter_attendance_sheets
+from leaves.utils.working_days import working_day_index
+
+
+class AttendanceSheetTests(TestDataMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        working_day_index.invalidate()
+        self.addCleanup(working_day_index.invalidate)
+        self.leave_type = LeaveType.objects.create(name='Κανονική', code='AT_ANNUAL')
+        self.leave_request = LeaveRequest.objects.create(
+            user=self.employee, leave_type=self.leave_type, description='attendance', status='COMPLETED',
+        )
+        LeavePeriod.objects.create(
+            leave_request=self.leave_request, start_date=date(2026, 3, 2), end_date=date(2026, 3, 3),
+        )
+        draft = LeaveRequest.objects.create(
+            user=self.dept_manager, leave_type=self.leave_type, description='draft', status='DRAFT',
+        )
+        LeavePeriod.objects.create(leave_request=draft, start_date=date(2026, 3, 2), end_date=date(2026, 3, 2))
+
+    def test_sheets_mark_employees_on_leave(self):
+        employees = [self.employee, self.dept_manager]
+        with self.assertNumQueries(1):
+            sheets = list(iter_attendance_sheets(employees, date(2026, 3, 2), date(2026, 3, 4)))
+
+        self.assertEqual([sheet['date'] for sheet in sheets], [date(2026, 3, 2), date(2026, 3, 3), date(2026, 3, 4)])
+        self.assertEqual([row['leave_type'] for row in sheets[0]['rows']], ['Κανονική', None])
+        self.assertEqual([row['leave_type'] for row in sheets[2]['rows']], [None, None])
+
+    def test_working_days_only_skips_weekend(self):
+        sheets = list(iter_attendance_sheets(
+            [self.employee], date(2026, 3, 6), date(2026, 3, 9), working_days_only=True,
+        ))
+        self.assertEqual([sheet['date'] for sheet in sheets], [date(2026, 3, 6), date(2026, 3, 9)])
+
+    def test_excel_range_export_has_one_worksheet_per_working_day(self):
+        self.client.force_login(self.leave_handler)
+        response = self.client.post(reverse('leaves:attendance_sheet'), {
+            'date': '2026-03-02', 'date_to': '2026-03-08', 'export': 'excel',
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('parousiologio_20260302_20260308.xlsx', response['Content-Disposition'])
+
+        workbook = load_workbook(io.BytesIO(response.content))
+        self.assertEqual(len(workbook.worksheets), 5)
+        first = workbook.worksheets[0]
+        names = {first.cell(row=r, column=2).value: first.cell(row=r, column=3).value for r in range(5, 5 + 10)}
+        self.assertEqual(names.get(f'{self.employee.last_name} {self.employee.first_name}'), 'Κανονική')
+
+    def test_range_longer_than_limit_is_rejected(self):
+        self.client.force_login(self.leave_handler)
+        response = self.client.post(reverse('leaves:attendance_sheet'), {
+            'date': '2026-03-01', 'date_to': '2026-05-01', 'export': 'excel',
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertTemplateUsed(response, 'leaves/attendance_sheet.html')
@@ -27,6 +27,7 @@ from leaves.utils.balance_renewal import (
     is_apply_allowed,
     notify_users,
     refresh_season_statuses,
+    run_renewal,
 )
 
 
@@ -151,6 +152,78 @@ class BalanceRenewalLogicTests(TestDataMixin, TestCase):
         self.assertIsNotNone(status.notified_at)
 
 
+class BalanceRenewalBulkTests(TestDataMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        administrative_type, _ = EmployeeType.objects.get_or_create(
+            code='ADMINISTRATIVE', defaults={'name': 'Διοικητικοί'},
+        )
+        self.users = [self.employee, self.dept_manager, self.kizilou, self.delegkos]
+        for index, user in enumerate(self.users):
+            user.employee_type = administrative_type
+            user.annual_leave_entitlement = 25
+            user.registration_status = 'APPROVED'
+            user.is_active = True
+            user.save()
+            create_balance_entry(
+                employee=user,
+                entry_type='INITIAL_BALANCE',
+                description='Αρχικό',
+                carryover_after=index,
+                current_after=10 + index,
+                created_by=self.leave_handler,
+            )
+        BalanceRenewalSettings.get_solo()
+        self.season = BalanceRenewalSeason.objects.create(closing_year=2025)
+        refresh_season_statuses(self.season)
+
+    def test_refresh_updates_only_changed_statuses(self):
+        deduct_leave_days(self.employee, 2, created_by=self.leave_handler)
+        refresh_season_statuses(self.season)
+        status = BalanceRenewalUserStatus.objects.get(season=self.season, user=self.employee)
+        self.assertEqual((status.expiring_days, status.carryover_days), (0, 8))
+        self.assertEqual(
+            BalanceRenewalUserStatus.objects.filter(season=self.season, user__in=self.users).count(), 4,
+        )
+
+    def test_dry_run_reports_diff_without_writing(self):
+        before = RegularLeaveBalanceEntry.objects.count()
+        result = run_renewal(self.season, self.leave_handler, user_ids=[u.pk for u in self.users], dry_run=True)
+        self.assertEqual(RegularLeaveBalanceEntry.objects.count(), before)
+        rows = {row['user_id']: row for row in result['diff']}
+        self.assertEqual(rows[self.kizilou.pk]['balance_before'], 14)
+        self.assertEqual(rows[self.kizilou.pk]['balance_after'], 37)
+        self.assertEqual(rows[self.kizilou.pk]['expired_days'], 2)
+        self.assertEqual(rows[self.employee.pk]['entry_types'], ['CARRYOVER_IMPORT', 'ANNUAL_GRANT'])
+
+    def test_chunked_apply_matches_per_user_algorithm(self):
+        calls = []
+        result = run_renewal(
+            self.season, self.leave_handler, user_ids=[u.pk for u in self.users],
+            chunk_size=3, progress=lambda done, total: calls.append((done, total)),
+        )
+        self.assertEqual(result['applied'], 4)
+        self.assertEqual(result['errors'], [])
+        self.assertEqual(calls, [(3, 4), (4, 4)])
+
+        for index, user in enumerate(self.users):
+            self.assertEqual(get_last_buckets(user), (10 + index, 25))
+            user.refresh_from_db()
+            self.assertEqual(user.current_regular_leave_balance, 35 + index)
+        self.assertFalse(
+            BalanceRenewalUserStatus.objects.filter(season=self.season, user__in=self.users, applied_at=None).exists()
+        )
+
+        # Δεύτερη εκτέλεση: δεν ξαναεφαρμόζεται
+        self.assertEqual(run_renewal(self.season, self.leave_handler)['applied'], 0)
+
+    def test_query_count_does_not_grow_with_users(self):
+        with self.assertNumQueries(8):
+            run_renewal(self.season, self.leave_handler, user_ids=[self.employee.pk])
+        with self.assertNumQueries(8):
+            run_renewal(self.season, self.leave_handler, user_ids=[u.pk for u in self.users[1:]])
+
+
 class BalanceRenewalViewTests(TestDataMixin, TestCase):
     def setUp(self):
         super().setUp()
@@ -0,0 +1,106 @@
+"""Tests για τη streaming κρυπτογράφηση αρχείων (SecureFileHandler)."""
+import io
+import os
+import shutil
+import tempfile
+
+from Crypto.Cipher import AES
+from Crypto.Random import get_random_bytes
+from Crypto.Util.Padding import pad
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.test import SimpleTestCase
+
+from leaves.crypto_utils import SecureFileHandler
+
+
+def _legacy_cbc_encrypt(content, key):
+    """Παράγει αρχείο στην παλαιά μορφή IV + AES-256-CBC."""
+    iv = get_random_bytes(AES.block_size)
+    cipher = AES.new(key, AES.MODE_CBC, iv)
+    return iv + cipher.encrypt(pad(content, AES.block_size))
+
+
+class SecureFileHandlerStreamingTests(SimpleTestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir)
+
+    def _path(self, name='file.bin'):
+        return os.path.join(self.tmpdir, 'sub', name)
+
+    def test_round_trip_various_sizes(self):
+        chunk = SecureFileHandler.CHUNK_SIZE
+        for size in (0, 1, chunk - 1, chunk, chunk + 1, 3 * chunk + 17):
+            with self.subTest(size=size):
+                content = os.urandom(size)
+                encrypted, key_hex = SecureFileHandler.encrypt_file(content)
+                self.assertTrue(encrypted.startswith(SecureFileHandler.STREAM_MAGIC))
+                self.assertEqual(SecureFileHandler.decrypt_file(encrypted, key_hex), content)
+
+    def test_save_encrypted_file_streams_upload_chunks(self):
+        content = os.urandom(2 * SecureFileHandler.CHUNK_SIZE + 123)
+        upload = SimpleUploadedFile('cert.pdf', content, content_type='application/pdf')
+        path = self._path()
+
+        success, key_hex, file_size = SecureFileHandler.save_encrypted_file(upload, path)
+
+        self.assertTrue(success)
+        self.assertEqual(file_size, len(content))
+        self.assertEqual(SecureFileHandler.load_encrypted_file(path, key_hex), content)
+        chunks = list(SecureFileHandler.iter_encrypted_file(path, key_hex))
+        self.assertEqual(len(chunks), 3)
+        self.assertTrue(all(len(c) <= SecureFileHandler.CHUNK_SIZE for c in chunks))
+
+    def test_legacy_cbc_files_remain_readable(self):
+        key = SecureFileHandler.generate_key()
+        content = os.urandom(SecureFileHandler.CHUNK_SIZE * 2 + 5)
+        path = self._path('legacy.bin')
+        os.makedirs(os.path.dirname(path))
+        with open(path, 'wb') as f:
+            f.write(_legacy_cbc_encrypt(content, key))
+
+        self.assertEqual(SecureFileHandler.load_encrypted_file(path, key.hex()), content)
+        self.assertEqual(
+            b''.join(SecureFileHandler.iter_encrypted_file(path, key.hex())), content
+        )
+
+    def test_tampered_or_truncated_file_is_rejected(self):
+        content = os.urandom(SecureFileHandler.CHUNK_SIZE + 10)
+        encrypted, key_hex = SecureFileHandler.encrypt_file(content)
+
+        tampered = bytearray(encrypted)
+        tampered[SecureFileHandler.HEADER_SIZE + 5] ^= 0x01
+        with self.assertRaises(ValueError):
+            SecureFileHandler.decrypt_file(bytes(tampered), key_hex)
+
+        # Αποκοπή του τελευταίου record: το προηγούμενο δεν είναι σημειωμένο ως τελευταίο
+        record_size = SecureFileHandler.CHUNK_SIZE + SecureFileHandler.TAG_SIZE
+        truncated = encrypted[:SecureFileHandler.HEADER_SIZE + record_size]
+        with self.assertRaises(ValueError):
+            SecureFileHandler.decrypt_file(truncated, key_hex)
+
+    def test_header_chunk_size_is_bounded(self):
+        encrypted, key_hex = SecureFileHandler.encrypt_file(os.urandom(100))
+        path = self._path()
+        os.makedirs(os.path.dirname(path))
+        for chunk_size in (0, SecureFileHandler.MAX_CHUNK_SIZE + 1, 0xFFFFFFFF):
+            with self.subTest(chunk_size=chunk_size):
+                forged = encrypted[:5] + chunk_size.to_bytes(4, 'big') + encrypted[9:]
+                with self.assertRaises(ValueError):
+                    SecureFileHandler.decrypt_file(forged, key_hex)
+                with open(path, 'wb') as f:
+                    f.write(forged)
+                with self.assertRaises(ValueError):
+                    SecureFileHandler.get_plaintext_size(path, key_hex)
+
+    def test_wrong_key_returns_none_from_loader(self):
+        path, key_hex = SecureFileHandler.save_encrypted_bytes(b'secret', self._path())
+        self.assertEqual(SecureFileHandler.load_encrypted_file(path, key_hex), b'secret')
+        wrong = SecureFileHandler.generate_key().hex()
+        with self.assertLogs('leaves.crypto_utils', level='ERROR'):
+            self.assertIsNone(SecureFileHandler.load_encrypted_file(path, wrong))
+
+    def test_iter_decrypted_stream_accepts_file_like(self):
+        encrypted, key_hex = SecureFileHandler.encrypt_file(b'abc' * 1000)
+        stream = SecureFileHandler.iter_decrypted_stream(io.BytesIO(encrypted), key_hex)
+        self.assertEqual(b''.join(stream), b'abc' * 1000)
@@ -1,10 +1,12 @@
 """Tests για ενιαία εμφάνιση ενεργειών dashboard / προβολής."""
 from django.contrib.auth import get_user_model
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.utils import timezone
 
 from accounts.tests.test_data import TestDataMixin
-from leaves.dashboard_utils import get_available_actions
+from leaves.dashboard_utils import get_available_actions, resolve_available_actions
 from leaves.models import LeavePeriod, LeaveRequest, LeaveType
 
 User = get_user_model()
@@ -150,3 +152,67 @@ class DashboardActionsTests(TestDataMixin, TestCase):
         self.assertIn('request_documents', detail_codes)
         self.assertIn('return', detail_codes)
         self.assertIn('complete', detail_codes)
+
+
+class ResolveAvailableActionsTests(TestDataMixin, TestCase):
+    """Μαζικός υπολογισμός ενεργειών: ίδια αποτελέσματα, σταθερό πλήθος queries."""
+
+    STATUSES = ('SUBMITTED', 'WAITING_FOR_DOCUMENTS', 'IN_REVIEW', 'COMPLETED', 'PENDING_PROTOCOL')
+
+    def setUp(self):
+        super().setUp()
+        self.leave_type = LeaveType.objects.create(name='Κανονική', code='RA_ANNUAL')
+        self.sick_type = LeaveType.objects.create(
+            name='Αναρρωτική', code='RA_SICK', is_sick_leave_total=True,
+        )
+
+    def _create_page(self, count):
+        rows = []
+        for index in range(count):
+            status = self.STATUSES[index % len(self.STATUSES)]
+            rows.append(LeaveRequest.objects.create(
+                user=self.employee,
+                leave_type=self.sick_type if index % 2 else self.leave_type,
+                description=f'page {index}',
+                status=status,
+                submitted_at=timezone.now(),
+                total_days=3,
+            ))
+        return rows
+
+    def _page(self, rows):
+        return list(LeaveRequest.objects.filter(pk__in=[lr.pk for lr in rows]).order_by('pk'))
+
+    def _count_queries(self, rows, user):
+        user = User.objects.get(pk=user.pk)
+        with CaptureQueriesContext(connection) as ctx:
+            resolve_available_actions(self._page(rows), user)
+        return len(ctx.captured_queries)
+
+    def test_matches_per_row_actions(self):
+        rows = self._create_page(10)
+        for user in (self.employee, self.leave_handler, self.dept_manager):
+            resolved = resolve_available_actions(self._page(rows), User.objects.get(pk=user.pk))
+            for lr in self._page(rows):
+                expected = get_available_actions(lr, User.objects.get(pk=user.pk))
+                self.assertEqual(resolved[lr.pk], expected, (user.username, lr.status))
+
+    def test_query_count_does_not_depend_on_page_size(self):
+        rows = self._create_page(30)
+        for user in (self.employee, self.leave_handler, self.dept_manager):
+            # Πρώτη κλήση για φόρτωση στιγμιότυπων (ιεραρχία τμημάτων)
+            resolve_available_actions(self._page(rows), User.objects.get(pk=user.pk))
+            small = self._count_queries(rows[:10], user)
+            large = self._count_queries(rows, user)
+            self.assertEqual(small, large, user.username)
+
+    def test_open_revocation_hides_revoke_action(self):
+        completed = self._create_page(4)[3]
+        revocation_type = LeaveType.objects.create(name='Ανάκληση', code='RA_REVOKE', is_revocation=True)
+        LeaveRequest.objects.create(
+            user=self.employee, leave_type=revocation_type, description='revoke',
+            status='SUBMITTED', parent_leave=completed,
+        )
+        actions = resolve_available_actions(self._page([completed]), self.employee)
+        self.assertNotIn('revoke_leave', [code for code, _label, _url in actions[completed.pk]])
+
@@ -141,7 +141,7 @@ class DocumentNotificationTests(TestDataMixin, TestCase):
         )
         mark_applicant_document_uploaded(req)
 
-    @patch('leaves.views.create_notification')
+    @patch('leaves.views.notify_many')
     def test_applicant_submit_documents_moves_to_decision_preparation(self, mock_notify):
         req = self._waiting_request()
         self._upload_applicant_attachment(req)
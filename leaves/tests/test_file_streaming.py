@@ -0,0 +1,142 @@
+"""Tests για το streaming σερβίρισμα κρυπτογραφημένων αρχείων (HTTP Range)."""
+import os
+import shutil
+import tempfile
+from datetime import date
+
+from django.test import RequestFactory, SimpleTestCase, TestCase
+from django.urls import reverse
+
+from accounts.tests.test_data import TestDataMixin
+from leaves.crypto_utils import SecureFileHandler
+from leaves.file_streaming import encrypted_file_response, parse_range_header
+from leaves.models import LeaveAccessLog, LeaveType, SecureFile
+from leaves.tests.helpers import create_submitted_leave_request
+
+
+class ParseRangeHeaderTests(SimpleTestCase):
+    def test_ranges(self):
+        self.assertIsNone(parse_range_header('', 100))
+        self.assertIsNone(parse_range_header('bytes=0-1,5-6', 100))
+        self.assertEqual(parse_range_header('bytes=10-19', 100), (10, 19))
+        self.assertEqual(parse_range_header('bytes=90-', 100), (90, 99))
+        self.assertEqual(parse_range_header('bytes=-10', 100), (90, 99))
+        self.assertEqual(parse_range_header('bytes=50-500', 100), (50, 99))
+        self.assertIs(parse_range_header('bytes=100-', 100), False)
+        self.assertIs(parse_range_header('bytes=20-10', 100), False)
+
+
+class EncryptedFileResponseTests(SimpleTestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir)
+        self.factory = RequestFactory()
+        self.content = os.urandom(3 * SecureFileHandler.CHUNK_SIZE + 321)
+        self.path, self.key_hex = SecureFileHandler.save_encrypted_bytes(
+            self.content, os.path.join(self.tmpdir, 'doc.pdf')
+        )
+
+    def _response(self, **headers):
+        request = self.factory.get('/', **headers)
+        return encrypted_file_response(
+            request, self.path, self.key_hex, 'application/pdf', 'Απόφαση.pdf'
+        )
+
+    def test_full_response_streams_content(self):
+        response = self._response()
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Length'], str(len(self.content)))
+        self.assertEqual(response['Accept-Ranges'], 'bytes')
+        self.assertIn("filename*=utf-8''", response['Content-Disposition'])
+        self.assertEqual(b''.join(response.streaming_content), self.content)
+
+    def test_range_across_chunk_boundary(self):
+        start = SecureFileHandler.CHUNK_SIZE - 10
+        end = 2 * SecureFileHandler.CHUNK_SIZE + 5
+        response = self._response(HTTP_RANGE=f'bytes={start}-{end}')
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(
+            response['Content-Range'], f'bytes {start}-{end}/{len(self.content)}'
+        )
+        self.assertEqual(b''.join(response.streaming_content), self.content[start:end + 1])
+
+    def test_unsatisfiable_range(self):
+        response = self._response(HTTP_RANGE=f'bytes={len(self.content)}-')
+        self.assertEqual(response.status_code, 416)
+        self.assertEqual(response['Content-Range'], f'bytes */{len(self.content)}')
+
+    def test_wrong_key_or_missing_file_returns_none(self):
+        request = self.factory.get('/')
+        with self.assertLogs('leaves.file_streaming', level='ERROR'):
+            self.assertIsNone(encrypted_file_response(
+                request, self.path, SecureFileHandler.generate_key().hex(),
+                'application/pdf', 'x.pdf',
+            ))
+        with self.assertLogs('leaves.file_streaming', level='ERROR'):
+            self.assertIsNone(encrypted_file_response(
+                request, os.path.join(self.tmpdir, 'missing'), self.key_hex,
+                'application/pdf', 'x.pdf',
+            ))
+
+    def test_legacy_cbc_range(self):
+        from leaves.tests.test_crypto_utils import _legacy_cbc_encrypt
+        key = SecureFileHandler.generate_key()
+        legacy_path = os.path.join(self.tmpdir, 'legacy.pdf')
+        with open(legacy_path, 'wb') as f:
+            f.write(_legacy_cbc_encrypt(self.content, key))
+        self.assertEqual(
+            SecureFileHandler.get_plaintext_size(legacy_path, key.hex()), len(self.content)
+        )
+        request = self.factory.get('/', HTTP_RANGE='bytes=33-70000')
+        response = encrypted_file_response(
+            request, legacy_path, key.hex(), 'application/pdf', 'x.pdf'
+        )
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(b''.join(response.streaming_content), self.content[33:70001])
+
+
+class ServeSecureFileViewTests(TestDataMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.tmpdir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.tmpdir)
+        leave_type = LeaveType.objects.create(name='Κανονική', code='STREAM_ANNUAL')
+        self.leave_request = create_submitted_leave_request(
+            self.employee, leave_type, 'stream', date(2026, 7, 1), date(2026, 7, 3),
+        )
+        self.content = b'%PDF-1.4 ' + os.urandom(100000)
+        path, key_hex = SecureFileHandler.save_encrypted_bytes(
+            self.content, os.path.join(self.tmpdir, 'cert.pdf')
+        )
+        self.secure_file = SecureFile.objects.create(
+            leave_request=self.leave_request,
+            original_filename='cert.pdf',
+            file_path=path,
+            file_size=len(self.content),
+            content_type='application/pdf',
+            encryption_key=key_hex,
+            uploaded_by=self.employee,
+        )
+
+    def test_owner_gets_range_and_access_is_logged(self):
+        self.client.force_login(self.employee)
+        response = self.client.get(
+            reverse('leaves:serve_secure_file', kwargs={'file_id': self.secure_file.pk}),
+            HTTP_RANGE='bytes=0-99',
+        )
+        self.assertEqual(response.status_code, 206)
+        self.assertEqual(response['Cache-Control'], 'no-cache, no-store, must-revalidate')
+        self.assertEqual(b''.join(response.streaming_content), self.content[:100])
+        self.assertTrue(LeaveAccessLog.objects.filter(
+            leave_request=self.leave_request, accessed_by=self.employee, access_type='VIEW',
+        ).exists())
+
+    def test_follow_up_ranges_are_not_logged_again(self):
+        self.client.force_login(self.employee)
+        url = reverse('leaves:serve_secure_file', kwargs={'file_id': self.secure_file.pk})
+        for byte_range in ('bytes=0-', 'bytes=65536-131071', 'bytes=-100'):
+            response = self.client.get(url, HTTP_RANGE=byte_range)
+            self.assertEqual(response.status_code, 206)
+        self.assertEqual(self.client.get(url).status_code, 200)
+        self.assertEqual(LeaveAccessLog.objects.filter(leave_request=self.leave_request).count(), 2)
@@ -0,0 +1,57 @@
+"""Tests για τους cached μετρητές καρτελών του dashboard χειριστή."""
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from accounts.tests.test_data import TestDataMixin
+from leaves.models import LeaveRequest, LeaveType
+from leaves.utils.handler_tab_counts import get_handler_tab_counts
+
+
+class HandlerTabCountsTests(TestDataMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.leave_type = LeaveType.objects.create(name='Κανονική', code='TC_ANNUAL')
+
+    def _create_request(self, status):
+        return LeaveRequest.objects.create(
+            user=self.employee, leave_type=self.leave_type, description='tab counts', status=status,
+        )
+
+    def test_counts_all_tabs_in_one_query_then_from_cache(self):
+        self._create_request('PENDING_PROTOCOL')
+        self._create_request('PENDING_PROTOCOL')
+        self._create_request('IN_REVIEW')
+        self._create_request('DRAFT')
+
+        with self.assertNumQueries(1):
+            counts = get_handler_tab_counts()
+        self.assertEqual(counts['protocol'], 2)
+        self.assertEqual(counts['processing'], 1)
+        self.assertEqual(counts['completed'], 0)
+        self.assertEqual(counts['all'], 3)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(get_handler_tab_counts(), counts)
+
+    def test_status_change_invalidates_counts(self):
+        leave_request = self._create_request('PENDING_PROTOCOL')
+        self.assertEqual(get_handler_tab_counts()['protocol'], 1)
+
+        leave_request.status = 'IN_REVIEW'
+        leave_request.save()
+        counts = get_handler_tab_counts()
+        self.assertEqual((counts['protocol'], counts['processing']), (0, 1))
+
+        leave_request.delete()
+        self.assertEqual(get_handler_tab_counts()['all'], 0)
+
+    def test_dashboard_uses_counts(self):
+        self._create_request('PENDING_SIGNATURES')
+        self.client.force_login(self.leave_handler)
+        response = self.client.get(reverse('leaves:handler_dashboard'), {'tab': 'signatures'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['tab_counts']['signatures'], 1)
+        self.assertEqual(len(response.context['leave_requests']), 1)
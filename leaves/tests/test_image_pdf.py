@@ -0,0 +1,72 @@
+"""Tests για την άμεση μετατροπή εικόνας συνημμένου σε PDF."""
+from io import BytesIO
+
+from django.test import SimpleTestCase, override_settings
+from PIL import Image
+from pypdf import PdfReader
+
+from leaves.utils.image_pdf import PAGE_HEIGHT, PAGE_WIDTH, image_bytes_to_pdf
+
+
+def _image_bytes(size, fmt, mode='RGB', color=(200, 30, 30), exif=None):
+    output = BytesIO()
+    image = Image.new(mode, size, color)
+    kwargs = {'exif': exif} if exif is not None else {}
+    image.save(output, fmt, **kwargs)
+    return output.getvalue()
+
+
+def _page_image(pdf_bytes):
+    reader = PdfReader(BytesIO(pdf_bytes))
+    page = reader.pages[0]
+    xobject = page['/Resources']['/XObject']['/Im0'].get_object()
+    return reader, page, xobject
+
+
+class ImageBytesToPdfTests(SimpleTestCase):
+    def test_small_jpeg_is_embedded_unchanged_on_a4(self):
+        jpeg = _image_bytes((300, 200), 'JPEG')
+        reader, page, xobject = _page_image(image_bytes_to_pdf(jpeg))
+
+        self.assertEqual(len(reader.pages), 1)
+        self.assertAlmostEqual(float(page.mediabox.width), PAGE_WIDTH, places=1)
+        self.assertAlmostEqual(float(page.mediabox.height), PAGE_HEIGHT, places=1)
+        self.assertEqual(xobject['/Filter'], '/DCTDecode')
+        self.assertEqual(xobject.get_data(), jpeg)
+        # Φυσικό μέγεθος (1px = 0.75pt), χωρίς μεγέθυνση
+        self.assertIn(b'225.00 0 0 150.00', page.get_contents().get_data())
+
+    @override_settings(ATTACHMENT_IMAGE_PDF_DPI=100)
+    def test_large_photo_is_downsampled_but_fills_the_page_width(self):
+        jpeg = _image_bytes((4000, 3000), 'JPEG')
+        pdf = image_bytes_to_pdf(jpeg)
+        _reader, page, xobject = _page_image(pdf)
+
+        # Πλάτος περιοχής 538.58pt στα 100dpi ≈ 748px
+        self.assertEqual(int(xobject['/Width']), 748)
+        self.assertEqual(int(xobject['/Height']), 561)
+        self.assertLess(len(pdf), len(jpeg))
+        self.assertIn(b'538.58 0 0 403.93', page.get_contents().get_data())
+
+    def test_exif_orientation_is_applied(self):
+        exif = Image.Exif()
+        exif[0x0112] = 6  # περιστροφή 90°
+        jpeg = _image_bytes((300, 200), 'JPEG', exif=exif)
+        _reader, _page, xobject = _page_image(image_bytes_to_pdf(jpeg))
+        self.assertEqual((int(xobject['/Width']), int(xobject['/Height'])), (200, 300))
+
+    def test_transparent_png_is_flattened_losslessly(self):
+        png = _image_bytes((40, 20), 'PNG', mode='RGBA', color=(0, 0, 0, 0))
+        _reader, _page, xobject = _page_image(image_bytes_to_pdf(png))
+        self.assertEqual(xobject['/Filter'], '/FlateDecode')
+        self.assertEqual(xobject['/ColorSpace'], '/DeviceRGB')
+        self.assertEqual(xobject.get_data()[:3], b'\xff\xff\xff')
+
+    def test_16bit_grayscale_png_is_scaled_not_clipped(self):
+        image = Image.new('I;16', (4, 1))
+        image.putdata([0, 16384, 32768, 65535])
+        output = BytesIO()
+        image.save(output, 'PNG')
+        _reader, _page, xobject = _page_image(image_bytes_to_pdf(output.getvalue()))
+        self.assertEqual(xobject['/ColorSpace'], '/DeviceGray')
+        self.assertEqual(list(xobject.get_data()), [0, 64, 128, 255])
@@ -0,0 +1,87 @@
+"""Tests για το ημερολόγιο αδειών προϊσταμένων και το JSON feed."""
+from datetime import date, timedelta
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+from django.urls import reverse
+
+from accounts.tests.test_data import TestDataMixin
+from leaves.models import LeavePeriod, LeaveRequest, LeaveType
+from leaves.utils.leave_calendar import bucket_events_by_day
+
+
+class BucketEventsByDayTests(SimpleTestCase):
+    def test_matches_per_day_scan(self):
+        start, end = date(2026, 3, 1), date(2026, 3, 31)
+        events = [
+            {'request_id': 1, 'start': date(2026, 3, 1), 'end': date(2026, 3, 31)},
+            {'request_id': 2, 'start': date(2026, 3, 10), 'end': date(2026, 3, 12)},
+            {'request_id': 3, 'start': date(2026, 3, 5), 'end': date(2026, 3, 5)},
+            {'request_id': 4, 'start': date(2026, 3, 11), 'end': date(2026, 3, 20)},
+        ]
+        buckets = bucket_events_by_day(events, start, end)
+
+        day = start
+        while day <= end:
+            expected = sorted(
+                (e for e in events if e['start'] <= day <= e['end']),
+                key=lambda e: (e['start'], e['request_id']),
+            )
+            self.assertEqual(buckets[day], expected, day)
+            day += timedelta(days=1)
+
+
+class LeaveCalendarViewTests(TestDataMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.leave_type = LeaveType.objects.create(name='Κανονική', code='CAL_ANNUAL')
+        self.leave_request = LeaveRequest.objects.create(
+            user=self.employee, leave_type=self.leave_type, description='calendar', status='COMPLETED',
+        )
+        LeavePeriod.objects.create(
+            leave_request=self.leave_request, start_date=date(2026, 2, 25), end_date=date(2026, 3, 3),
+        )
+        LeavePeriod.objects.create(
+            leave_request=self.leave_request, start_date=date(2026, 5, 4), end_date=date(2026, 5, 5),
+        )
+        self.client.force_login(self.dept_manager)
+
+    def test_month_view_shows_only_periods_in_month(self):
+        response = self.client.get(reverse('leaves:calendar', args=[2026, 3]))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['total_requests'], 1)
+
+        days = {
+            day['date']: day['events']
+            for week in response.context['calendar_weeks'] for day in week if day['date']
+        }
+        self.assertEqual(len(days[date(2026, 3, 3)]), 1)
+        self.assertEqual(days[date(2026, 3, 3)][0]['user_name'], self.employee.full_name)
+        self.assertEqual(days[date(2026, 3, 4)], [])
+
+    def test_feed_returns_clipped_events_and_tracks_status_changes(self):
+        url = reverse('leaves:calendar_feed')
+        data = self.client.get(url, {'start': '2026-03-01', 'end': '2026-05-04'}).json()
+        self.assertEqual(
+            [(e['start'], e['end']) for e in data['events']],
+            [('2026-03-01', '2026-03-03'), ('2026-05-04', '2026-05-04')],
+        )
+        self.assertEqual(data['events'][0]['request_id'], self.leave_request.pk)
+
+        self.leave_request.status = 'CANCELLED_BY_APPLICANT'
+        self.leave_request.save()
+        data = self.client.get(url, {'start': '2026-03-01', 'end': '2026-05-04'}).json()
+        self.assertEqual(data['events'], [])
+
+    def test_feed_rejects_invalid_ranges(self):
+        url = reverse('leaves:calendar_feed')
+        self.assertEqual(self.client.get(url, {'start': 'x', 'end': '2026-03-01'}).status_code, 400)
+        self.assertEqual(self.client.get(url, {'start': '2026-03-02', 'end': '2026-03-01'}).status_code, 400)
+        self.assertEqual(self.client.get(url, {'start': '2026-01-01', 'end': '2027-06-01'}).status_code, 400)
+
+    def test_feed_requires_department_manager(self):
+        self.client.force_login(self.employee)
+        response = self.client.get(reverse('leaves:calendar_feed'), {'start': '2026-03-01', 'end': '2026-03-31'})
+        self.assertEqual(response.status_code, 403)
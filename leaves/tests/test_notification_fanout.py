@@ -0,0 +1,80 @@
+"""Tests για τη μαζική αποστολή ειδοποιήσεων (notify_many)."""
+import smtplib
+from datetime import date
+from unittest.mock import patch
+
+from django.contrib.contenttypes.models import ContentType
+from django.core import mail
+from django.core.mail.backends.locmem import EmailBackend
+from django.test import TestCase
+
+from accounts.tests.test_data import TestDataMixin
+from leaves.models import LeaveRequest, LeaveType
+from leaves.tests.helpers import create_submitted_leave_request
+from notifications.models import Notification
+from notifications.tasks import send_notification_emails
+from notifications.utils import notify_many
+
+
+class NotifyManyTests(TestDataMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        leave_type = LeaveType.objects.create(name='Κανονική', code='FANOUT_ANNUAL')
+        self.leave_request = create_submitted_leave_request(
+            self.employee, leave_type, 'fanout', date(2026, 7, 1), date(2026, 7, 2),
+        )
+        ContentType.objects.get_for_model(LeaveRequest)
+
+    def test_fan_out_is_a_single_insert(self):
+        recipients = [self.leave_handler, self.dept_manager, self.employee]
+        with self.assertNumQueries(1):
+            notifications = notify_many(
+                recipients, 'Τίτλος', 'Μήνυμα', notification_type='warning', related_object=self.leave_request,
+            )
+
+        self.assertEqual(len(notifications), 3)
+        rows = Notification.objects.filter(title='Τίτλος')
+        self.assertEqual(set(rows.values_list('user_id', flat=True)), {user.pk for user in recipients})
+        self.assertTrue(all(row.related_object == self.leave_request for row in rows))
+        self.assertEqual(set(rows.values_list('notification_type', flat=True)), {'warning'})
+
+    def test_duplicates_and_missing_recipients_are_skipped(self):
+        notifications = notify_many(
+            [self.leave_handler, self.leave_handler.pk, None], 'Διπλή', 'Μήνυμα',
+        )
+        self.assertEqual(len(notifications), 1)
+        self.assertEqual(notify_many([], 'Κενή', 'Μήνυμα'), [])
+        self.assertIsNone(notifications[0].content_type_id)
+
+    def test_email_is_queued_after_commit(self):
+        with patch('notifications.tasks.send_notification_emails.delay') as delay:
+            with self.captureOnCommitCallbacks(execute=True):
+                notifications = notify_many([self.leave_handler, self.dept_manager], 'Email', 'Σώμα', send_email=True)
+                delay.assert_not_called()
+        delay.assert_called_once_with([notification.pk for notification in notifications])
+
+        self.assertEqual(send_notification_emails([n.pk for n in notifications]), 2)
+        self.assertEqual(sorted(message.to[0] for message in mail.outbox),
+                         sorted([self.leave_handler.email, self.dept_manager.email]))
+        self.assertEqual(mail.outbox[0].subject, 'Email')
+
+    def test_retry_after_partial_failure_skips_delivered_emails(self):
+        notifications = notify_many([self.leave_handler, self.dept_manager], 'Email', 'Σώμα')
+        ids = [notification.pk for notification in notifications]
+        original = EmailBackend.send_messages
+
+        def flaky_send(backend, messages):
+            if messages[0].to == [self.dept_manager.email]:
+                raise smtplib.SMTPRecipientsRefused({})
+            return original(backend, messages)
+
+        with patch.object(EmailBackend, 'send_messages', flaky_send):
+            with self.assertRaises(smtplib.SMTPException):
+                send_notification_emails(ids)
+        self.assertEqual([message.to for message in mail.outbox], [[self.leave_handler.email]])
+
+        # Η επανάληψη στέλνει μόνο την αποτυχημένη
+        self.assertEqual(send_notification_emails(ids), 1)
+        self.assertEqual([message.to for message in mail.outbox[1:]], [[self.dept_manager.email]])
+        self.assertFalse(Notification.objects.filter(pk__in=ids, emailed_at__isnull=True).exists())
+        self.assertEqual(send_notification_emails(ids), 0)
@@ -0,0 +1,114 @@
+"""Tests για τον μετρητή μη αναγνωσμένων στο Redis, το ETag endpoint και το SSE stream."""
+import json
+from unittest.mock import patch
+
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.urls import reverse
+
+from accounts.tests.test_data import TestDataMixin
+from notifications.models import Notification
+from notifications.unread import _apply_delta, get_unread_count
+from notifications.utils import create_notification, mark_all_notifications_as_read, notify_many
+from notifications.views import _notification_events
+
+
+class UnreadCounterTests(TestDataMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    def _notify(self, title='Νέα'):
+        with self.captureOnCommitCallbacks(execute=True):
+            return create_notification(self.employee, title, 'Μήνυμα')
+
+    def test_counter_is_cached_and_follows_changes(self):
+        self._notify()
+        self.assertEqual(get_unread_count(self.employee.pk), 1)
+        with self.assertNumQueries(0):
+            self.assertEqual(get_unread_count(self.employee.pk), 1)
+
+        second = self._notify('Δεύτερη')
+        with self.captureOnCommitCallbacks(execute=True):
+            notify_many([self.employee, self.leave_handler], 'Μαζική', 'Μήνυμα')
+        self.assertEqual(get_unread_count(self.employee.pk), 3)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            second.mark_as_read()
+        self.assertEqual(get_unread_count(self.employee.pk), 2)
+
+        self.client.force_login(self.employee)
+        bulk = Notification.objects.get(user=self.employee, title='Μαζική')
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(reverse('notifications:delete_notification', args=[bulk.pk]))
+        self.assertEqual(get_unread_count(self.employee.pk), 1)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(mark_all_notifications_as_read(self.employee), 1)
+        with self.assertNumQueries(0):
+            self.assertEqual(get_unread_count(self.employee.pk), 0)
+
+    def test_update_during_recount_is_not_lost(self):
+        def stale_count():
+            # Νέα ειδοποίηση που γίνεται commit αφού μετρήθηκαν οι εγγραφές
+            Notification.objects.create(user=self.employee, title='Ενδιάμεση', message='Μήνυμα')
+            _apply_delta(self.employee.pk, 1)
+            return 0
+
+        with patch('notifications.unread.Notification') as model:
+            model.objects.filter.return_value.count.side_effect = stale_count
+            self.assertEqual(get_unread_count(self.employee.pk), 0)
+        self.assertEqual(get_unread_count(self.employee.pk), 1)
+
+    def test_unread_count_endpoint_supports_etag(self):
+        self._notify()
+        self.client.force_login(self.employee)
+        url = reverse('notifications:api_unread_count')
+
+        response = self.client.get(url)
+        self.assertEqual(response.json(), {'unread_count': 1})
+        etag = response['ETag']
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+        self._notify('Δεύτερη')
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json(), {'unread_count': 2})
+        self.assertNotEqual(response['ETag'], etag)
+
+
+class NotificationStreamTests(TestDataMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.addCleanup(cache.clear)
+
+    def test_stream_is_disabled_by_default(self):
+        self.client.force_login(self.employee)
+        response = self.client.get(reverse('notifications:api_notification_stream'))
+        self.assertEqual(response.status_code, 404)
+
+    @override_settings(NOTIFICATIONS_STREAM_ENABLED=True)
+    def test_stream_endpoint_is_event_stream(self):
+        self.client.force_login(self.employee)
+        response = self.client.get(reverse('notifications:api_notification_stream'))
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        self.assertTrue(response.streaming)
+
+    def test_stream_pushes_counter_changes(self):
+        events = _notification_events(self.employee.pk, timeout=5)
+        try:
+            self.assertEqual(next(events), 'retry: 5000\n\n')
+            self.assertIn('"unread_count": 0', next(events))
+
+            with self.captureOnCommitCallbacks(execute=True):
+                create_notification(self.employee, 'Push', 'Μήνυμα')
+            event = next(events)
+            self.assertTrue(event.startswith('event: unread\n'))
+            payload = json.loads(event.split('data: ', 1)[1])
+            self.assertEqual(payload['unread_count'], 1)
+        finally:
+            events.close()
@@ -0,0 +1,44 @@
+"""Tests για τον κοινό renderer PDF (stylesheets/γραμματοσειρές μία φορά ανά διεργασία)."""
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+
+from leaves.utils.pdf_renderer import STYLE_FAMILIES, PdfRenderer, PdfRendererBusy
+
+
+@patch('weasyprint.CSS')
+@patch('weasyprint.HTML')
+class PdfRendererTests(SimpleTestCase):
+    def test_stylesheet_compiled_once_per_family(self, mock_html, mock_css):
+        renderer = PdfRenderer(max_concurrent=1, wait_timeout=1)
+        mock_html.return_value.write_pdf.return_value = b'%PDF'
+
+        for _ in range(3):
+            self.assertEqual(renderer.render_html('<p>x</p>', family='attendance'), b'%PDF')
+
+        self.assertEqual(mock_css.call_count, 1)
+        self.assertIn('@page', mock_css.call_args.kwargs['string'])
+        calls = mock_html.return_value.write_pdf.call_args_list
+        self.assertEqual(len(calls), 3)
+        self.assertEqual(calls[0].kwargs['stylesheets'], [mock_css.return_value])
+        self.assertIs(calls[0].kwargs['font_config'], calls[2].kwargs['font_config'])
+
+    def test_template_uses_its_family_stylesheet(self, mock_html, mock_css):
+        renderer = PdfRenderer(max_concurrent=1, wait_timeout=1)
+        renderer.render('leaves/pdf_attachments_index.html', {'attachments_list': []}, target='out.pdf')
+
+        self.assertIn('page-break-before', mock_css.call_args.kwargs['string'])
+        self.assertEqual(mock_html.return_value.write_pdf.call_args.args, ('out.pdf',))
+
+    def test_warm_up_compiles_every_family(self, mock_html, mock_css):
+        renderer = PdfRenderer(max_concurrent=1, wait_timeout=1)
+        renderer.warm_up()
+        self.assertEqual(mock_css.call_count, len(STYLE_FAMILIES))
+
+    def test_busy_when_no_slot_frees_in_time(self, mock_html, mock_css):
+        renderer = PdfRenderer(max_concurrent=1, wait_timeout=0.01)
+        renderer._slots.acquire()
+        self.addCleanup(renderer._slots.release)
+        with self.assertRaises(PdfRendererBusy):
+            renderer.render_html('<p>x</p>')
+        mock_html.return_value.write_pdf.assert_not_called()
@@ -0,0 +1,84 @@
+"""Tests για τα αποθηκευμένα πεδία σύνοψης διαστημάτων της αίτησης."""
+from datetime import date
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from accounts.tests.test_data import TestDataMixin
+from leaves.models import LeavePeriod, LeaveRequest, LeaveType
+
+
+class PeriodSummaryTests(TestDataMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.leave_type = LeaveType.objects.create(name='Κανονική', code='PS_ANNUAL')
+        self.leave_request = LeaveRequest.objects.create(
+            user=self.employee, leave_type=self.leave_type, description='summary test',
+        )
+
+    def test_period_changes_keep_summary_in_sync(self):
+        LeavePeriod.objects.create(
+            leave_request=self.leave_request, start_date=date(2026, 7, 6), end_date=date(2026, 7, 10),
+        )
+        period = LeavePeriod.objects.create(
+            leave_request=self.leave_request, start_date=date(2026, 7, 1), end_date=date(2026, 7, 2),
+        )
+        self.assertEqual(self.leave_request.total_days, 7)
+        self.assertEqual(self.leave_request.start_date, date(2026, 7, 1))
+
+        stored = LeaveRequest.objects.get(pk=self.leave_request.pk)
+        self.assertEqual(
+            (stored.first_start_date, stored.last_end_date, stored.total_days),
+            (date(2026, 7, 1), date(2026, 7, 10), 7),
+        )
+
+        LeavePeriod.objects.filter(pk=period.pk).delete()
+        stored.refresh_from_db()
+        self.assertEqual((stored.first_start_date, stored.total_days), (date(2026, 7, 6), 5))
+
+        stored.periods.all().delete()
+        stored.refresh_from_db()
+        self.assertEqual((stored.first_start_date, stored.last_end_date, stored.total_days), (None, None, 0))
+
+    def test_stale_instance_save_does_not_overwrite_summary(self):
+        stale = LeaveRequest.objects.get(pk=self.leave_request.pk)
+        LeavePeriod.objects.create(
+            leave_request=self.leave_request, start_date=date(2026, 7, 1), end_date=date(2026, 7, 3),
+        )
+        stale.description = 'updated'
+        stale.save()
+
+        stored = LeaveRequest.objects.get(pk=self.leave_request.pk)
+        self.assertEqual(stored.description, 'updated')
+        self.assertEqual(stored.total_days, 3)
+
+    def test_summary_properties_do_not_query(self):
+        LeavePeriod.objects.create(
+            leave_request=self.leave_request, start_date=date(2026, 7, 1), end_date=date(2026, 7, 3),
+        )
+        stored = LeaveRequest.objects.get(pk=self.leave_request.pk)
+        with self.assertNumQueries(0):
+            self.assertEqual(stored.start_date, date(2026, 7, 1))
+            self.assertEqual(stored.end_date, date(2026, 7, 3))
+            self.assertEqual(stored.total_days, 3)
+
+    def test_backfill_command_repairs_summary(self):
+        LeavePeriod.objects.create(
+            leave_request=self.leave_request, start_date=date(2026, 7, 1), end_date=date(2026, 7, 3),
+        )
+        LeaveRequest.objects.filter(pk=self.leave_request.pk).update(
+            first_start_date=None, last_end_date=None, total_days=0,
+        )
+
+        out = StringIO()
+        call_command('backfill_period_summary', '--dry-run', stdout=out)
+        self.assertIn('1', out.getvalue())
+        self.assertEqual(LeaveRequest.objects.get(pk=self.leave_request.pk).total_days, 0)
+
+        call_command('backfill_period_summary', stdout=StringIO())
+        stored = LeaveRequest.objects.get(pk=self.leave_request.pk)
+        self.assertEqual(
+            (stored.first_start_date, stored.last_end_date, stored.total_days),
+            (date(2026, 7, 1), date(2026, 7, 3), 3),
+        )
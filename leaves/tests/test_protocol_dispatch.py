@@ -0,0 +1,162 @@
+"""Tests για την ασύγχρονη αποστολή στο πρωτόκολλο (Celery pipeline)."""
+import smtplib
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.tests.test_data import TestDataMixin
+from leaves.models import LeavePeriod, LeaveRequest, LeaveType
+from leaves.tasks import build_protocol_pdf, send_protocol_email
+from leaves.utils.protocol_dispatch import enqueue_protocol_dispatch, submission_dispatch_key
+
+
+class ProtocolDispatchTests(TestDataMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.leave_type = LeaveType.objects.create(
+            name='Κανονική',
+            code='DISPATCH_REG',
+            requires_approval=False,
+            is_simple=False,
+            is_active=True,
+        )
+        self.leave_request = LeaveRequest.objects.create(
+            user=self.employee,
+            leave_type=self.leave_type,
+            description='Test',
+            status='PENDING_PROTOCOL',
+            submitted_at=timezone.now(),
+        )
+        LeavePeriod.objects.create(
+            leave_request=self.leave_request,
+            start_date=timezone.localdate(),
+            end_date=timezone.localdate(),
+        )
+
+    @patch('leaves.tasks.start_protocol_dispatch')
+    def test_enqueue_is_idempotent_per_key(self, mock_start):
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertTrue(enqueue_protocol_dispatch(
+                self.leave_request, 'protocol@example.com', idempotency_key='k1',
+            ))
+        mock_start.assert_called_once_with(
+            self.leave_request.pk, 'k1', 'protocol@example.com', '',
+        )
+        self.leave_request.refresh_from_db()
+        self.assertEqual(self.leave_request.protocol_dispatch_status, 'QUEUED')
+
+        # Διπλό submit της ίδιας φόρμας δεν ξαναστέλνει
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertFalse(enqueue_protocol_dispatch(
+                self.leave_request, 'protocol@example.com', idempotency_key='k1',
+            ))
+        self.assertEqual(mock_start.call_count, 1)
+
+        # Νέο key (νέα φόρμα) επιτρέπεται
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertTrue(enqueue_protocol_dispatch(
+                self.leave_request, 'protocol@example.com', idempotency_key='k2',
+            ))
+        self.assertEqual(mock_start.call_count, 2)
+
+    @patch('pdede_leaves.email_utils.send_merged_pdf_email', return_value=True)
+    @patch('leaves.utils.pdf_merger.save_merged_pdf', return_value=(b'%PDF', 'x', 'y'))
+    def test_pipeline_marks_sent_once(self, mock_save, mock_email):
+        with self.captureOnCommitCallbacks():
+            enqueue_protocol_dispatch(self.leave_request, 'p@example.com', idempotency_key='k1')
+
+        build_protocol_pdf(self.leave_request.pk, 'k1')
+        send_protocol_email(self.leave_request.pk, 'k1', 'p@example.com', 'Θέμα')
+        self.leave_request.refresh_from_db()
+        self.assertEqual(self.leave_request.protocol_dispatch_status, 'SENT')
+        mock_email.assert_called_once()
+        self.assertEqual(mock_email.call_args.kwargs['custom_subject'], 'Θέμα')
+        self.assertFalse(mock_email.call_args.kwargs['fail_silently'])
+
+        # Επανάληψη του task (π.χ. redelivery) δεν στέλνει δεύτερο email
+        send_protocol_email(self.leave_request.pk, 'k1', 'p@example.com', 'Θέμα')
+        mock_email.assert_called_once()
+
+    @patch('pdede_leaves.email_utils.send_merged_pdf_email', return_value=True)
+    @patch('leaves.utils.pdf_merger.save_merged_pdf', return_value=(b'%PDF', 'x', 'y'))
+    def test_superseded_dispatch_is_skipped(self, mock_save, mock_email):
+        with self.captureOnCommitCallbacks():
+            enqueue_protocol_dispatch(self.leave_request, 'p@example.com', idempotency_key='old')
+            enqueue_protocol_dispatch(self.leave_request, 'p@example.com', idempotency_key='new')
+
+        send_protocol_email(self.leave_request.pk, 'old', 'p@example.com')
+        mock_email.assert_not_called()
+
+    @patch(
+        'pdede_leaves.email_utils.send_merged_pdf_email',
+        side_effect=smtplib.SMTPException('down'),
+    )
+    @patch('leaves.utils.pdf_merger.save_merged_pdf', return_value=(b'%PDF', 'x', 'y'))
+    def test_final_failure_marks_failed_and_raises_alert(self, mock_save, mock_email):
+        with self.captureOnCommitCallbacks():
+            enqueue_protocol_dispatch(self.leave_request, 'p@example.com', idempotency_key='k1')
+
+        result = send_protocol_email.apply(args=(self.leave_request.pk, 'k1', 'p@example.com'))
+        self.assertTrue(result.failed())
+        self.leave_request.refresh_from_db()
+        self.assertEqual(self.leave_request.protocol_dispatch_status, 'FAILED')
+        self.assertIn('down', self.leave_request.protocol_dispatch_error)
+        self.assertIsNotNone(self.leave_request.protocol_email_failed_at)
+
+    @patch('leaves.tasks.start_protocol_dispatch')
+    def test_view_enqueues_and_status_fragment_polls(self, mock_start):
+        self.client.force_login(self.leave_handler)
+        url = reverse('leaves:send_to_protocol', kwargs={'pk': self.leave_request.pk})
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(url, {
+                'protocol_email': 'p@example.com',
+                'email_subject': '',
+                'dispatch_key': 'form-key',
+            })
+        self.assertRedirects(response, url, fetch_redirect_response=False)
+        mock_start.assert_called_once()
+
+        response = self.client.get(
+            reverse('leaves:protocol_dispatch_status', kwargs={'pk': self.leave_request.pk})
+        )
+        self.assertContains(response, 'hx-trigger="every 3s"')
+
+    @override_settings(PROTOCOL_DISPATCH_STALE_MINUTES=30)
+    @patch('leaves.tasks.start_protocol_dispatch')
+    def test_lost_dispatch_becomes_retryable(self, mock_start):
+        key = submission_dispatch_key(self.leave_request)
+        with self.captureOnCommitCallbacks(execute=True):
+            enqueue_protocol_dispatch(self.leave_request, 'p@example.com', idempotency_key=key)
+        status_url = reverse('leaves:protocol_dispatch_status', kwargs={'pk': self.leave_request.pk})
+        self.client.force_login(self.leave_handler)
+
+        # Πρόσφατη αποστολή σε εξέλιξη: συνεχίζει το polling και δεν ξαναστέλνεται
+        LeaveRequest.objects.filter(pk=self.leave_request.pk).update(
+            protocol_dispatch_updated_at=timezone.now() - timedelta(minutes=10),
+        )
+        self.assertContains(self.client.get(status_url), 'hx-trigger="every 3s"')
+        self.assertFalse(enqueue_protocol_dispatch(self.leave_request, 'p@example.com', idempotency_key=key))
+
+        # Το task χάθηκε: μετά το όριο το polling τη σημειώνει FAILED
+        LeaveRequest.objects.filter(pk=self.leave_request.pk).update(
+            protocol_dispatch_status='BUILDING',
+            protocol_dispatch_updated_at=timezone.now() - timedelta(minutes=31),
+        )
+        response = self.client.get(status_url)
+        self.assertNotContains(response, 'hx-trigger')
+        self.leave_request.refresh_from_db()
+        self.assertEqual(self.leave_request.protocol_dispatch_status, 'FAILED')
+        self.assertIsNotNone(self.leave_request.protocol_email_failed_at)
+
+        # Καθυστερημένο task της χαμένης αποστολής δεν κάνει τίποτα
+        with patch('leaves.utils.pdf_merger.save_merged_pdf') as mock_save:
+            build_protocol_pdf(self.leave_request.pk, key)
+        mock_save.assert_not_called()
+
+        # Το ίδιο key επιτρέπεται ξανά
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertTrue(enqueue_protocol_dispatch(self.leave_request, 'p@example.com', idempotency_key=key))
+        self.assertEqual(mock_start.call_count, 2)
@@ -0,0 +1,95 @@
+"""Tests για το cache δεδομένων αναφοράς (στοιχεία αποφάσεων, χρώματα τύπων, εθνόσημο)."""
+import os
+import tempfile
+from io import StringIO
+from pathlib import Path
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+
+from leaves.decision_helpers import get_ethnosimo_markup
+from leaves.models import LeaveType, Logo, Signee
+from leaves.utils.reference_data import (
+    get_active_reference_data,
+    get_leave_type_colors,
+    get_reference_by_id,
+)
+
+
+class ReferenceDataCacheTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        # Οι migrations φέρνουν αρχικά στοιχεία αποφάσεων
+        Logo.objects.update(is_active=False)
+        Signee.objects.update(is_active=False)
+        self.logo = Logo.objects.create(logo_short='ΕΛ', logo='ΕΛΛΗΝΙΚΗ ΔΗΜΟΚΡΑΤΙΑ')
+        self.signee = Signee.objects.create(signee_short='Δ/ντης', signee_name='Διευθυντής', signee='Ο Διευθυντής')
+
+    def test_second_read_hits_cache(self):
+        with self.assertNumQueries(4):
+            data = get_active_reference_data()
+        self.assertEqual(data['logos'], [self.logo])
+
+        with self.assertNumQueries(0):
+            self.assertEqual(Logo.get_active(), self.logo)
+            self.assertEqual(Signee.get_active(), self.signee)
+
+    def test_save_invalidates_cache(self):
+        get_active_reference_data()
+        self.logo.is_active = False
+        self.logo.save()
+        self.assertIsNone(Logo.get_active())
+
+        newer = Logo.objects.create(logo_short='ΝΕΟ', logo='ΝΕΟ ΛΟΓΟΤΥΠΟ')
+        self.assertEqual(Logo.get_active(), newer)
+
+    def test_reference_by_id_falls_back_to_inactive_rows(self):
+        self.logo.is_active = False
+        self.logo.save()
+        self.assertEqual(get_reference_by_id(Logo, str(self.logo.pk)), self.logo)
+        self.assertIsNone(get_reference_by_id(Logo, 'abc'))
+
+    def test_leave_type_colors_follow_leave_type_changes(self):
+        first = LeaveType.objects.create(name='Κανονική', code='REF_ANNUAL')
+        colors = get_leave_type_colors()
+        self.assertIn(first.id, colors)
+
+        second = LeaveType.objects.create(name='Αναρρωτική', code='REF_SICK')
+        with self.assertNumQueries(1):
+            colors = get_leave_type_colors()
+        self.assertNotEqual(colors[first.id], colors[second.id])
+
+    def test_leave_type_colors_follow_csv_import(self):
+        leave_type = LeaveType.objects.create(name='Κανονική', code='REF_CSV')
+        self.assertIn(leave_type.id, get_leave_type_colors())
+
+        with tempfile.NamedTemporaryFile('w', suffix='.csv', delete=False, encoding='utf-8') as csv_file:
+            csv_file.write('code;name;is_active\nREF_CSV;Κανονική;όχι\n')
+        self.addCleanup(os.remove, csv_file.name)
+        call_command('import_leave_types_csv', '--csv', csv_file.name, '--force', stdout=StringIO())
+
+        self.assertNotIn(leave_type.id, get_leave_type_colors())
+
+
+class EthnosimoMarkupTests(TestCase):
+    def test_markup_is_reused_until_file_changes(self):
+        with tempfile.TemporaryDirectory() as base_dir:
+            static_dir = Path(base_dir) / 'static'
+            static_dir.mkdir()
+            svg = static_dir / 'ethnosimo.svg'
+            svg.write_text('<svg id="first"></svg>', encoding='utf-8')
+            stat = svg.stat()
+
+            self.assertIn('id="first"', get_ethnosimo_markup(base_dir))
+
+            # Ίδιο mtime: επιστρέφεται το υπολογισμένο markup χωρίς νέα ανάγνωση
+            svg.write_text('<svg id="second"></svg>', encoding='utf-8')
+            os.utime(svg, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+            self.assertIn('id="first"', get_ethnosimo_markup(base_dir))
+
+            os.utime(svg, ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+            markup = get_ethnosimo_markup(base_dir)
+            self.assertIn('id="second"', markup)
+            self.assertIn('class="ethnosimo"', markup)
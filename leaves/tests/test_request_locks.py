@@ -0,0 +1,92 @@
+"""Tests για το κλείδωμα αιτήσεων από χειριστές (leases στο Redis)."""
+from unittest.mock import patch
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from django.urls import reverse
+
+from accounts.tests.test_data import TestDataMixin
+from leaves.models import LeaveRequest, LeaveType
+from leaves.utils.request_locks import acquire_lock, get_lock, get_locks, release_lock
+
+User = get_user_model()
+
+
+class RequestLockTests(TestDataMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.leave_type = LeaveType.objects.create(name='Κανονική', code='LK_ANNUAL')
+        self.leave_request = LeaveRequest.objects.create(
+            user=self.employee, leave_type=self.leave_type, description='lock test', status='IN_REVIEW',
+        )
+        self.other_handler = User.objects.create_user(
+            email='other_handler@test.com', password='testpass123', first_name='Άλλος', last_name='Χειριστής',
+        )
+        self.other_handler.roles.add(self.leave_handler_role)
+
+    def test_lease_is_exclusive_and_renewable_by_holder(self):
+        acquired, lease = acquire_lock(self.leave_request.pk, self.leave_handler)
+        self.assertTrue(acquired)
+        self.assertEqual(lease['user_id'], self.leave_handler.pk)
+
+        acquired, holder = acquire_lock(self.leave_request.pk, self.other_handler)
+        self.assertFalse(acquired)
+        self.assertEqual(holder['user_id'], self.leave_handler.pk)
+
+        self.assertTrue(acquire_lock(self.leave_request.pk, self.leave_handler)[0])
+
+        self.assertFalse(release_lock(self.leave_request.pk, self.other_handler))
+        self.assertTrue(release_lock(self.leave_request.pk, self.other_handler, force=True))
+        self.assertIsNone(get_lock(self.leave_request.pk))
+
+    def test_get_locks_returns_only_locked_requests(self):
+        other = LeaveRequest.objects.create(
+            user=self.employee, leave_type=self.leave_type, description='unlocked', status='IN_REVIEW',
+        )
+        acquire_lock(self.leave_request.pk, self.leave_handler)
+        locks = get_locks([self.leave_request.pk, other.pk])
+        self.assertEqual(list(locks), [self.leave_request.pk])
+        self.assertEqual(get_locks([]), {})
+
+    def test_detail_page_degrades_when_cache_is_down(self):
+        self.client.force_login(self.leave_handler)
+        with patch('leaves.utils.request_locks.cache') as broken_cache:
+            broken_cache.get.side_effect = ConnectionError('redis down')
+            broken_cache.get_many.side_effect = ConnectionError('redis down')
+            response = self.client.get(reverse('leaves:detail', args=[self.leave_request.pk]))
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.context['is_locked'])
+
+    def test_lock_and_unlock_degrade_when_cache_is_down(self):
+        self.client.force_login(self.leave_handler)
+        with patch('leaves.utils.request_locks.cache') as broken_cache:
+            for method in ('add', 'get', 'set', 'delete'):
+                getattr(broken_cache, method).side_effect = ConnectionError('redis down')
+            acquired, lease = acquire_lock(self.leave_request.pk, self.leave_handler)
+            self.assertTrue(acquired)
+            self.assertEqual(lease['user_id'], self.leave_handler.pk)
+            self.assertTrue(release_lock(self.leave_request.pk, self.leave_handler))
+
+            detail_url = reverse('leaves:leave_request_detail', args=[self.leave_request.pk])
+            response = self.client.get(reverse('leaves:lock_leave_request', args=[self.leave_request.pk]))
+            self.assertRedirects(response, detail_url, fetch_redirect_response=False)
+            response = self.client.get(reverse('leaves:unlock_leave_request', args=[self.leave_request.pk]))
+            self.assertRedirects(response, detail_url, fetch_redirect_response=False)
+
+    def test_lock_views_do_not_write_leave_request(self):
+        self.client.force_login(self.leave_handler)
+        updated_at = LeaveRequest.objects.get(pk=self.leave_request.pk).updated_at
+
+        self.client.get(reverse('leaves:lock_leave_request', args=[self.leave_request.pk]))
+        self.assertEqual(get_lock(self.leave_request.pk)['user_id'], self.leave_handler.pk)
+
+        response = self.client.get(reverse('leaves:handler_dashboard'), {'tab': 'processing'})
+        row = response.context['leave_requests'][0]
+        self.assertEqual(row.lock['user_id'], self.leave_handler.pk)
+
+        self.client.get(reverse('leaves:unlock_leave_request', args=[self.leave_request.pk]))
+        self.assertIsNone(get_lock(self.leave_request.pk))
+        self.assertEqual(LeaveRequest.objects.get(pk=self.leave_request.pk).updated_at, updated_at)
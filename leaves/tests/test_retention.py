@@ -0,0 +1,87 @@
+"""Tests για τη διαγραφή παλαιών δεδομένων σε παρτίδες (retention)."""
+from datetime import date, timedelta
+from io import StringIO
+
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from accounts.tests.test_data import TestDataMixin
+from leaves.models import LeaveAccessLog, LeaveActionLog, LeaveRequest, LeaveType
+from leaves.tests.helpers import create_submitted_leave_request
+from notifications.models import Notification
+from notifications.unread import get_unread_count
+from notifications.utils import create_notification, delete_old_notifications
+from pdede_leaves.retention import delete_in_batches
+
+
+class RetentionTests(TestDataMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.addCleanup(cache.clear)
+        leave_type = LeaveType.objects.create(name='Κανονική', code='RETENTION_ANNUAL')
+        self.leave_request = create_submitted_leave_request(
+            self.employee, leave_type, 'retention', date(2026, 7, 1), date(2026, 7, 2),
+        )
+        self.old = timezone.now() - timedelta(days=9 * 365)
+
+    def _access_logs(self, count, timestamp):
+        logs = LeaveAccessLog.objects.bulk_create([
+            LeaveAccessLog(leave_request=self.leave_request, accessed_by=self.employee, access_type='VIEW')
+            for _ in range(count)
+        ])
+        LeaveAccessLog.objects.filter(pk__in=[log.pk for log in logs]).update(timestamp=timestamp)
+
+    def test_deletes_in_bounded_batches(self):
+        self._access_logs(5, self.old)
+        self._access_logs(2, timezone.now())
+        progress = []
+
+        deleted = delete_in_batches(
+            LeaveAccessLog.objects.filter(timestamp__lt=timezone.now() - timedelta(days=1)),
+            batch_size=2, progress=progress.append,
+        )
+
+        self.assertEqual(deleted, 5)
+        self.assertEqual(progress, [2, 4, 5])
+        self.assertEqual(LeaveAccessLog.objects.count(), 2)
+
+    def test_dry_run_and_referenced_models(self):
+        self._access_logs(3, self.old)
+        self.assertEqual(delete_in_batches(LeaveAccessLog.objects.all(), batch_size=2, dry_run=True), 3)
+        self.assertEqual(LeaveAccessLog.objects.count(), 3)
+
+        with self.assertRaises(ValueError):
+            delete_in_batches(LeaveRequest.objects.none())
+
+    def test_old_notifications_reset_unread_counter(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            old = create_notification(self.employee, 'Παλιά', 'Μήνυμα')
+            create_notification(self.employee, 'Νέα', 'Μήνυμα')
+        Notification.objects.filter(pk=old.pk).update(created_at=self.old)
+        self.assertEqual(get_unread_count(self.employee.pk), 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(delete_old_notifications(30), 1)
+
+        self.assertEqual(get_unread_count(self.employee.pk), 1)
+        self.assertFalse(Notification.objects.filter(pk=old.pk).exists())
+
+    def test_cleanup_command_uses_batches(self):
+        self._access_logs(3, self.old)
+        LeaveActionLog.objects.create(leave_request=self.leave_request, action='Παλιά')
+        LeaveActionLog.objects.update(timestamp=self.old)
+        LeaveActionLog.objects.create(leave_request=self.leave_request, action='Νέα')
+
+        out = StringIO()
+        call_command('cleanup_old_data', '--batch-size', '2', '--sleep', '0', '--notifications-days', '30',
+                     verbosity=2, stdout=out)
+
+        output = out.getvalue()
+        self.assertIn('Access Logs: 3 διαγραφές', output)
+        self.assertIn('Access Logs: 2...', output)
+        self.assertIn('Notifications: 0 διαγραφές', output)
+        self.assertFalse(LeaveAccessLog.objects.exists())
+        self.assertEqual(list(LeaveActionLog.objects.values_list('action', flat=True)), ['Νέα'])
@@ -0,0 +1,43 @@
+"""Tests για το cache των badges του role switcher."""
+from django.core.cache import cache
+from django.test import TestCase
+
+from accounts.tests.test_data import TestDataMixin
+from leaves.models import LeaveRequest, LeaveType
+from leaves.role_context import get_role_badges
+
+
+class RoleBadgeCacheTests(TestDataMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.leave_type = LeaveType.objects.create(code='RB_REGULAR', name='Κανονική Άδεια')
+
+    def test_cached_badges_cost_no_queries(self):
+        badges, _ = get_role_badges(self.dept_manager)
+        self.assertIn('manager', badges['roles'])
+        with self.assertNumQueries(0):
+            self.assertEqual(get_role_badges(self.dept_manager)[0], badges)
+
+    def test_status_transition_refreshes_manager_and_handler_badges(self):
+        self.assertEqual(get_role_badges(self.dept_manager)[0]['counts']['manager'], 0)
+        self.assertEqual(get_role_badges(self.leave_handler)[0]['counts']['handler'], 0)
+
+        leave_request = LeaveRequest.objects.create(
+            user=self.employee, leave_type=self.leave_type, status='SUBMITTED',
+        )
+        self.assertEqual(get_role_badges(self.dept_manager)[0]['counts']['manager'], 1)
+        self.assertEqual(get_role_badges(self.employee)[0]['counts']['employee'], 1)
+
+        leave_request.status = 'PENDING_PROTOCOL'
+        leave_request.save()
+        self.assertEqual(get_role_badges(self.dept_manager)[0]['counts']['manager'], 0)
+        self.assertEqual(get_role_badges(self.leave_handler)[0]['counts']['handler'], 1)
+
+    def test_role_change_refreshes_roles(self):
+        self.assertNotIn('handler', get_role_badges(self.dept_manager)[0]['roles'])
+        self.dept_manager.roles.add(self.leave_handler_role)
+        badges, registrations = get_role_badges(self.dept_manager)
+        self.assertIn('handler', badges['roles'])
+        self.assertEqual(registrations, 0)
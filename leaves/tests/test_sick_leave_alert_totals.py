@@ -0,0 +1,85 @@
+"""Tests για τον πίνακα τρεχόντων συνόλων αναρρωτικών (SickLeaveAlertTotal)."""
+from datetime import date
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+from django.utils import timezone
+
+from accounts.tests.test_data import TestDataMixin
+from leaves.models import LeavePeriod, LeaveRequest, LeaveType, SickLeaveAlertTotal
+from leaves.utils.sick_leave_alerts import (
+    calculate_yearly_sick_total,
+    get_sick_alert_users,
+    reconcile_sick_alert_totals,
+)
+
+
+class SickLeaveAlertTotalTests(TestDataMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.year = timezone.now().year
+        self.sick_type = LeaveType.objects.create(
+            name='Αναρρωτική σύνολο', code='SAT_SICK', is_sick_leave_total=True,
+        )
+        self.leave_request = LeaveRequest.objects.create(
+            user=self.employee, leave_type=self.sick_type, description='sick', status='DRAFT',
+        )
+        self.period = LeavePeriod.objects.create(
+            leave_request=self.leave_request,
+            start_date=date(self.year, 3, 2), end_date=date(self.year, 3, 6),
+        )
+
+    def _stored_total(self):
+        return SickLeaveAlertTotal.objects.filter(
+            employee=self.employee, year=self.year,
+        ).values_list('total_days', flat=True).first()
+
+    def test_total_follows_submission_period_edits_and_cancellation(self):
+        self.assertIsNone(self._stored_total())
+
+        self.leave_request.status = 'SUBMITTED'
+        self.leave_request.submitted_at = timezone.now()
+        self.leave_request.save()
+        self.assertEqual(self._stored_total(), 5)
+
+        self.period.end_date = date(self.year, 3, 11)
+        self.period.save()
+        self.assertEqual(self._stored_total(), 10)
+
+        self.leave_request.status = 'CANCELLED_BY_APPLICANT'
+        self.leave_request.save()
+        self.assertIsNone(self._stored_total())
+        self.assertEqual(calculate_yearly_sick_total(self.employee), 0)
+
+    def test_alerts_are_a_threshold_lookup_on_the_table(self):
+        self.leave_request.status = 'SUBMITTED'
+        self.leave_request.submitted_at = timezone.now()
+        self.leave_request.save()
+        self.assertEqual(get_sick_alert_users(self.leave_handler), [])
+
+        LeavePeriod.objects.create(
+            leave_request=self.leave_request,
+            start_date=date(self.year, 4, 6), end_date=date(self.year, 4, 9),
+        )
+        alerts = get_sick_alert_users(self.leave_handler)
+        self.assertEqual([(u.pk, u.sick_alert_days) for u in alerts], [(self.employee.pk, 9)])
+
+    def test_reconcile_repairs_drift(self):
+        LeaveRequest.objects.filter(pk=self.leave_request.pk).update(
+            status='IN_REVIEW', submitted_at=timezone.now(),
+        )
+        SickLeaveAlertTotal.objects.create(employee=self.dept_manager, year=self.year, total_days=3)
+
+        self.assertEqual(
+            reconcile_sick_alert_totals(dry_run=True),
+            {'created': 1, 'updated': 0, 'deleted': 1},
+        )
+        self.assertIsNone(self._stored_total())
+
+        out = StringIO()
+        call_command('reconcile_sick_leave_alert_totals', stdout=out)
+        self.assertIn('Αποκλίσεις: 2', out.getvalue())
+        self.assertEqual(self._stored_total(), 5)
+        self.assertFalse(SickLeaveAlertTotal.objects.filter(employee=self.dept_manager).exists())
+        self.assertEqual(reconcile_sick_alert_totals(), {'created': 0, 'updated': 0, 'deleted': 0})
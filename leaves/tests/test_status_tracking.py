@@ -0,0 +1,119 @@
+"""Tests για την καταγραφή αλλαγών κατάστασης χωρίς query προηγούμενης τιμής."""
+from datetime import date
+
+from django.db import connection, transaction
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from accounts.tests.test_data import TestDataMixin
+from leaves.models import LeaveActionLog, LeaveRequest, LeaveType
+from leaves.tests.helpers import create_submitted_leave_request
+from leaves.utils.action_log import buffered_action_logs, record_action_log
+
+
+class StatusTrackingTests(TestDataMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        self.leave_type = LeaveType.objects.create(name='Κανονική', code='TRACK_ANNUAL')
+        self.leave_request = create_submitted_leave_request(
+            self.employee, self.leave_type, 'track', date(2026, 7, 1), date(2026, 7, 3),
+        )
+
+    def test_loaded_instance_does_not_query_previous_status(self):
+        leave_request = LeaveRequest.objects.get(pk=self.leave_request.pk)
+        leave_request.status = 'IN_REVIEW'
+        leave_request._changed_by = self.leave_handler
+        with self.assertNumQueries(0):
+            self.assertEqual(leave_request.tracked_previous_values()['status'], 'SUBMITTED')
+        leave_request.save(update_fields=['status'])
+
+        log = LeaveActionLog.objects.get(leave_request=leave_request, action='START_PROCESSING')
+        self.assertEqual((log.previous_status, log.new_status), ('SUBMITTED', 'IN_REVIEW'))
+        self.assertEqual(log.user, self.leave_handler)
+
+        # Μετά την αποθήκευση το στιγμιότυπο ακολουθεί τη βάση
+        leave_request.status = 'IN_REVIEW'
+        leave_request.save(update_fields=['status'])
+        self.assertEqual(
+            LeaveActionLog.objects.filter(leave_request=leave_request, new_status='IN_REVIEW').count(), 1,
+        )
+
+    def test_save_queries_match_plain_update(self):
+        leave_request = LeaveRequest.objects.get(pk=self.leave_request.pk)
+        leave_request.description = 'χωρίς αλλαγή κατάστασης'
+        with self.assertNumQueries(1):
+            leave_request.save(update_fields=['description'])
+
+    def test_instance_without_snapshot_falls_back_to_database(self):
+        leave_request = LeaveRequest.objects.only('id', 'status').get(pk=self.leave_request.pk)
+        self.assertIsNone(leave_request.tracked_previous_values())
+        leave_request.status = 'IN_REVIEW'
+        leave_request.save(update_fields=['status'])
+        self.assertTrue(LeaveActionLog.objects.filter(
+            leave_request=leave_request, previous_status='SUBMITTED', new_status='IN_REVIEW',
+        ).exists())
+
+    def test_refresh_from_db_updates_snapshot(self):
+        leave_request = LeaveRequest.objects.get(pk=self.leave_request.pk)
+        LeaveRequest.objects.filter(pk=leave_request.pk).update(status='IN_REVIEW')
+        leave_request.refresh_from_db()
+        self.assertEqual(leave_request.tracked_previous_values()['status'], 'IN_REVIEW')
+
+
+class BufferedActionLogTests(TestDataMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        leave_type = LeaveType.objects.create(name='Κανονική', code='BUFFER_ANNUAL')
+        self.leave_requests = [
+            create_submitted_leave_request(
+                self.employee, leave_type, f'buffer {i}', date(2026, 7, 1 + i), date(2026, 7, 1 + i),
+            )
+            for i in range(3)
+        ]
+
+    def test_logs_are_written_in_one_insert(self):
+        with CaptureQueriesContext(connection) as queries:
+            with buffered_action_logs():
+                for leave_request in self.leave_requests:
+                    record_action_log(leave_request, 'BULK_NOTE', user=self.leave_handler, notes='μαζική')
+                self.assertFalse(LeaveActionLog.objects.filter(action='BULK_NOTE').exists())
+
+        inserts = [query for query in queries if query['sql'].startswith('INSERT INTO "leaves_leaveactionlog"')]
+        self.assertEqual(len(inserts), 1)
+        self.assertEqual(LeaveActionLog.objects.filter(action='BULK_NOTE').count(), 3)
+
+    def test_status_change_logs_from_signals_are_buffered(self):
+        with buffered_action_logs():
+            for leave_request in self.leave_requests:
+                leave_request.status = 'IN_REVIEW'
+                leave_request.save(update_fields=['status'])
+            self.assertFalse(LeaveActionLog.objects.filter(action='START_PROCESSING').exists())
+        self.assertEqual(LeaveActionLog.objects.filter(action='START_PROCESSING').count(), 3)
+
+    def test_rolled_back_savepoint_discards_its_logs(self):
+        rolled_back, committed = self.leave_requests[:2]
+        with buffered_action_logs():
+            try:
+                with transaction.atomic():
+                    rolled_back.status = 'IN_REVIEW'
+                    rolled_back.save(update_fields=['status'])
+                    raise RuntimeError
+            except RuntimeError:
+                pass
+            committed.status = 'IN_REVIEW'
+            committed.save(update_fields=['status'])
+
+        self.assertEqual(LeaveRequest.objects.get(pk=rolled_back.pk).status, 'SUBMITTED')
+        logs = LeaveActionLog.objects.filter(action='START_PROCESSING')
+        self.assertEqual(list(logs.values_list('leave_request_id', flat=True)), [committed.pk])
+
+    def test_failed_block_rolls_back_changes_and_logs(self):
+        leave_request = self.leave_requests[0]
+        with self.assertRaises(RuntimeError):
+            with buffered_action_logs():
+                leave_request.status = 'IN_REVIEW'
+                leave_request.save(update_fields=['status'])
+                record_action_log(leave_request, 'BULK_NOTE')
+                raise RuntimeError
+        self.assertEqual(LeaveRequest.objects.get(pk=leave_request.pk).status, 'SUBMITTED')
+        self.assertFalse(LeaveActionLog.objects.filter(action__in=['BULK_NOTE', 'START_PROCESSING']).exists())
@@ -0,0 +1,112 @@
+"""Tests για τον generator συνθετικών δεδομένων και το benchmark σελίδων."""
+import json
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from accounts.models import Department, DepartmentType, User
+from accounts.tests.test_data import TestDataMixin
+from accounts.utils.department_hierarchy import build_department_hierarchy
+from leaves.models import LeavePeriod, LeaveRequest, RegularLeaveBalanceEntry
+from leaves.utils.benchmark import compare_results, percentile, run_benchmarks
+from leaves.utils.synthetic_data import SYNTHETIC_EMAIL_DOMAIN, SyntheticDataGenerator, clear_synthetic_data
+from notifications.models import Notification
+
+SMALL = {
+    'users': 30, 'leave_requests': 120, 'departments': 3, 'kedasy': 2, 'sdey_per_kedasy': 2,
+    'handlers': 2, 'notifications_per_user': 2, 'force': True,
+}
+
+
+def _snapshot():
+    return list(
+        LeaveRequest.objects.filter(user__email__endswith=f'@{SYNTHETIC_EMAIL_DOMAIN}')
+        .order_by('pk')
+        .values_list('user__email', 'leave_type__code', 'status', 'first_start_date', 'total_days')
+    )
+
+
+class SyntheticDataTests(TestDataMixin, TestCase):
+    def test_generates_consistent_organisation(self):
+        stats = SyntheticDataGenerator(seed=7, **SMALL).generate()
+
+        synthetic_users = User.objects.filter(email__endswith=f'@{SYNTHETIC_EMAIL_DOMAIN}')
+        self.assertEqual(stats['users'], synthetic_users.count())
+        # 1 ρίζα + Αυτοτελής + 3 τμήματα + 2 ΚΕΔΑΣΥ + 4 ΣΔΕΥ
+        self.assertEqual(stats['departments'], 11)
+        self.assertEqual(Department.objects.filter(code__startswith='SYN_SDEY_').count(), 4)
+        self.assertFalse(Department.objects.filter(code__startswith='SYN_', manager__isnull=True).exists())
+
+        requests = LeaveRequest.objects.filter(user__in=synthetic_users)
+        self.assertEqual(requests.count(), 120)
+        self.assertEqual(LeavePeriod.objects.filter(leave_request__in=requests).count(), stats['leave_periods'])
+        self.assertGreater(stats['leave_periods'], 120)
+        for leave_request in requests.prefetch_related('periods')[:20]:
+            periods = list(leave_request.periods.all())
+            self.assertEqual(leave_request.first_start_date, min(p.start_date for p in periods))
+            self.assertEqual(leave_request.total_days, sum(p.days for p in periods))
+
+        # Το αποθηκευμένο υπόλοιπο ακολουθεί την τελευταία εγγραφή του ledger
+        user = synthetic_users.filter(regular_leave_balance_entries__isnull=False).first()
+        last_entry = RegularLeaveBalanceEntry.objects.filter(employee=user).order_by('-entry_date', '-id').first()
+        self.assertEqual(user.current_regular_leave_balance, last_entry.balance_after)
+        self.assertEqual(Notification.objects.filter(user__in=synthetic_users).count(), stats['notifications'])
+
+    def test_real_hierarchy_is_left_untouched(self):
+        options = dict(SMALL, force=False)
+        with self.assertRaises(ValueError):
+            SyntheticDataGenerator(seed=1, **options).generate()
+        self.assertFalse(User.objects.filter(email__endswith=f'@{SYNTHETIC_EMAIL_DOMAIN}').exists())
+
+        SyntheticDataGenerator(seed=1, **SMALL).generate()
+        hierarchy = build_department_hierarchy()
+        self.assertEqual(hierarchy.pdede_id, Department.objects.get(code='PDEDE').pk)
+        self.assertEqual(Department.objects.get(code='SYN_PDEDE').department_type.code, 'SYN_PDEDE_MAIN')
+        self.assertFalse(Department.objects.filter(
+            parent_department__code='AUTOTELOUS_DN', code__startswith='SYN_',
+        ).exists())
+
+    def test_same_seed_produces_same_data_and_clear_removes_it(self):
+        stats = SyntheticDataGenerator(seed=3, **SMALL).generate()
+        first = _snapshot()
+        self.assertEqual(clear_synthetic_data(), stats['users'])
+        self.assertFalse(Department.objects.filter(code__startswith='SYN_').exists())
+        self.assertTrue(Department.objects.filter(code='AUTOTELOUS_DN').exists())
+        self.assertFalse(DepartmentType.objects.filter(code='SYN_PDEDE_MAIN').exists())
+
+        SyntheticDataGenerator(seed=3, **SMALL).generate()
+        self.assertEqual([row[1:] for row in _snapshot()], [row[1:] for row in first])
+
+
+class BenchmarkTests(TestDataMixin, TestCase):
+    def test_percentile_nearest_rank(self):
+        values = list(range(1, 21))
+        self.assertEqual(percentile(values, 50), 10)
+        self.assertEqual(percentile(values, 95), 19)
+        self.assertIsNone(percentile([], 50))
+
+    def test_run_benchmarks_reports_every_case(self):
+        SyntheticDataGenerator(seed=1, **SMALL).generate()
+        report = run_benchmarks(iterations=1, warmup=0)
+
+        self.assertEqual(report['meta']['leave_requests'], LeaveRequest.objects.count())
+        for name in ('handler_dashboard[all]', 'manager_dashboard', 'leave_calendar', 'attendance_sheet[week]',
+                     'sch_export_report[xlsx]'):
+            self.assertGreater(report['results'][name]['queries'], 0)
+        self.assertIn('get_calendar_events', report['results'])
+        json.dumps(report)
+
+        baseline = {'results': {'manager_dashboard': {**report['results']['manager_dashboard'], 'queries': 1}}}
+        compare_results(report, baseline)
+        delta = report['results']['manager_dashboard']['delta']
+        self.assertEqual(delta['queries'], report['results']['manager_dashboard']['queries'] - 1)
+        self.assertEqual(delta['p50_pct'], 0.0)
+
+    def test_command_writes_json(self):
+        out = StringIO()
+        call_command('benchmark_views', iterations=1, warmup=0, only=['get_'], stdout=out, stderr=StringIO())
+        report = json.loads(out.getvalue())
+        self.assertEqual(
+            sorted(report['results']), ['get_calendar_events', 'get_handler_tab_counts'],
+        )
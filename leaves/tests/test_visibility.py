@@ -0,0 +1,85 @@
+"""Parity tests: visible_to / accessible_file_ids έναντι των ελέγχων ανά αντικείμενο."""
+from itertools import product
+
+from django.contrib.auth import get_user_model
+from django.test import TestCase
+
+from accounts.models import Department, DepartmentType, Role
+from accounts.tests.test_data import TestDataMixin
+from leaves.crypto_utils import FileAccessController
+from leaves.models import LeaveRequest, LeaveType, SecureFile
+
+User = get_user_model()
+
+
+class VisibilityParityTests(TestDataMixin, TestCase):
+    def setUp(self):
+        super().setUp()
+        kedasy_type = DepartmentType.objects.create(name='ΚΕΔΑΣΥ', code='KEDASY')
+        kepea_type = DepartmentType.objects.create(name='ΚΕΠΕΑ', code='KEPEA')
+        sdey_type = DepartmentType.objects.create(name='ΣΔΕΥ', code='SDEY')
+        self.kedasy = Department.objects.create(name='ΚΕΔΑΣΥ', code='VIS_KEDASY', department_type=kedasy_type)
+        self.sdey = Department.objects.create(
+            name='ΣΔΕΥ', code='VIS_SDEY', department_type=sdey_type, parent_department=self.kedasy,
+        )
+        self.kepea = Department.objects.create(name='ΚΕΠΕΑ', code='VIS_KEPEA', department_type=kepea_type)
+        secretary_role = Role.objects.create(name='Γραμματέας', code='SECRETARY')
+        admin_role = Role.objects.create(name='Διαχειριστής', code='ADMIN')
+
+        def make_user(email, department, *roles):
+            user = User.objects.create_user(
+                email=email, first_name=email, last_name='Vis', department=department,
+                registration_status='APPROVED',
+            )
+            user.roles.add(*roles)
+            return user
+
+        kedasy_manager = make_user('vis_kedasy_mgr@test.com', self.kedasy, self.manager_role)
+        self.kedasy.manager = kedasy_manager
+        self.kedasy.save()
+        self.viewers = [
+            self.employee, self.dept_manager, self.kizilou, self.delegkos, self.leave_handler,
+            kedasy_manager,
+            make_user('vis_kedasy_sec@test.com', self.kedasy, secretary_role),
+            make_user('vis_kepea_sec@test.com', self.kepea, secretary_role),
+            make_user('vis_sdey_mgr@test.com', self.sdey, self.manager_role),
+            make_user('vis_sec_handler@test.com', self.kedasy, secretary_role, self.leave_handler_role),
+            make_user('vis_nodept_mgr@test.com', None, self.manager_role),
+            make_user('vis_admin@test.com', self.child_department, admin_role),
+        ]
+        owners = [
+            self.employee, self.dept_manager, self.kizilou,
+            make_user('vis_kedasy_emp@test.com', self.kedasy),
+            make_user('vis_sdey_emp@test.com', self.sdey),
+            make_user('vis_kepea_emp@test.com', self.kepea),
+            make_user('vis_nodept_emp@test.com', None),
+        ]
+        leave_types = [
+            LeaveType.objects.create(name='Κανονική', code='VIS_REGULAR'),
+            LeaveType.objects.create(name='Αναρρωτική άδεια', code='VIS_SICK'),
+            LeaveType.objects.create(name='ΚΕΔΑΣΥ άδεια', code='VIS_KEDASY', workflow_variant='KEDASY'),
+            LeaveType.objects.create(name='ΣΔΕΥ άδεια', code='VIS_SDEY', workflow_variant='sdey'),
+        ]
+        for owner, leave_type, status in product(owners, leave_types, ['SUBMITTED', 'PENDING_KEDASY_PROTOCOL']):
+            leave_request = LeaveRequest.objects.create(
+                user=owner, leave_type=leave_type, status=status, description='visibility',
+            )
+            for uploader in (owner, self.leave_handler):
+                SecureFile.objects.create(
+                    leave_request=leave_request, original_filename='a.pdf', file_path='x', file_size=1,
+                    content_type='application/pdf', encryption_key='0' * 64, uploaded_by=uploader,
+                )
+
+    def test_visible_to_matches_can_user_view(self):
+        requests = list(LeaveRequest.objects.select_related('user'))
+        for viewer in self.viewers:
+            expected = {lr.pk for lr in requests if lr.can_user_view(viewer)}
+            actual = set(LeaveRequest.objects.visible_to(viewer).values_list('pk', flat=True))
+            self.assertEqual(actual, expected, viewer.email)
+
+    def test_accessible_file_ids_matches_can_user_access_file(self):
+        files = list(SecureFile.objects.select_related('leave_request__user', 'leave_request__leave_type'))
+        for viewer in self.viewers:
+            expected = {f.pk for f in files if FileAccessController.can_user_access_file(viewer, f)}
+            actual = FileAccessController.accessible_file_ids(viewer, [f.pk for f in files])
+            self.assertEqual(actual, expected, viewer.email)
@@ -0,0 +1,96 @@
+"""Tests για τον υπολογισμό εργάσιμων ημερών από το ευρετήριο ανά έτος."""
+from datetime import date, timedelta
+
+from django.test import TestCase
+
+from leaves.models import PublicHoliday
+from leaves.utils.working_days import (
+    calculate_working_days,
+    calculate_working_days_many,
+    get_leave_periods_working_days,
+    is_working_day,
+    working_day_index,
+)
+
+
+def _naive_count(start_date, end_date, holidays):
+    count = 0
+    current = start_date
+    while current <= end_date:
+        if current.weekday() < 5 and current not in holidays:
+            count += 1
+        current += timedelta(days=1)
+    return count
+
+
+class WorkingDayIndexTests(TestCase):
+    def setUp(self):
+        working_day_index.invalidate()
+        self.addCleanup(working_day_index.invalidate)
+        self.holiday = PublicHoliday.objects.create(
+            name='Ευαγγελισμός', date=date(2026, 3, 25), year=2026,
+        )
+        PublicHoliday.objects.create(
+            name='Πρωτοχρονιά', date=date(2027, 1, 1), year=2027,
+        )
+        PublicHoliday.objects.create(
+            name='Ανενεργή', date=date(2026, 3, 26), year=2026, is_active=False,
+        )
+
+    def test_counts_match_day_by_day_walk(self):
+        holidays = {date(2026, 3, 25), date(2027, 1, 1)}
+        ranges = [
+            (date(2026, 3, 23), date(2026, 3, 29)),
+            (date(2026, 12, 28), date(2027, 1, 8)),
+            (date(2025, 6, 1), date(2027, 2, 1)),
+            (date(2026, 3, 25), date(2026, 3, 25)),
+            (date(2026, 3, 28), date(2026, 3, 28)),
+        ]
+        for start_date, end_date in ranges:
+            self.assertEqual(
+                calculate_working_days(start_date, end_date),
+                _naive_count(start_date, end_date, holidays),
+            )
+
+    def test_single_days_and_reversed_range(self):
+        self.assertFalse(is_working_day(date(2026, 3, 25)))
+        self.assertFalse(is_working_day(date(2026, 3, 28)))
+        self.assertTrue(is_working_day(date(2026, 3, 26)))
+        self.assertEqual(calculate_working_days(date(2026, 3, 27), date(2026, 3, 26)), 0)
+
+    def test_warm_index_does_not_hit_database(self):
+        calculate_working_days(date(2026, 1, 1), date(2026, 12, 31))
+        with self.assertNumQueries(0):
+            self.assertEqual(calculate_working_days(date(2026, 3, 23), date(2026, 3, 27)), 4)
+            self.assertFalse(is_working_day(date(2026, 3, 25)))
+
+    def test_many_ranges_load_missing_years_in_one_query(self):
+        with self.assertNumQueries(1):
+            counts = calculate_working_days_many([
+                (date(2026, 3, 23), date(2026, 3, 27)),
+                (date(2026, 12, 31), date(2027, 1, 4)),
+                (date(2026, 3, 27), date(2026, 3, 23)),
+            ])
+        self.assertEqual(counts, [4, 2, 0])
+
+    def test_leave_periods_total_skips_incomplete_periods(self):
+        total = get_leave_periods_working_days([
+            {'start_date': date(2026, 3, 23), 'end_date': date(2026, 3, 27)},
+            {'start_date': date(2026, 3, 30), 'end_date': None},
+            {'start_date': date(2026, 3, 30), 'end_date': date(2026, 3, 31)},
+        ])
+        self.assertEqual(total, 6)
+
+    def test_holiday_changes_invalidate_index(self):
+        week = (date(2026, 3, 23), date(2026, 3, 27))
+        self.assertEqual(calculate_working_days(*week), 4)
+
+        PublicHoliday.objects.create(name='Έκτακτη', date=date(2026, 3, 24), year=2026)
+        self.assertEqual(calculate_working_days(*week), 3)
+
+        self.holiday.is_active = False
+        self.holiday.save()
+        self.assertEqual(calculate_working_days(*week), 4)
+
+        PublicHoliday.objects.filter(name='Έκτακτη').delete()
+        self.assertEqual(calculate_working_days(*week), 5)
@@ -5,7 +5,7 @@ from .decision_views import (
     upload_exact_copy_pdf, serve_exact_copy_pdf, complete_leave_request_final,
     send_to_signatures_view
 )
-from .calendar_views import leave_calendar_view
+from .calendar_views import leave_calendar_feed, leave_calendar_view
 from .balance_views import balance_ledger_view, manual_balance_adjustment
 from .balance_renewal_views import (
     balance_renewal_view,
@@ -51,6 +51,7 @@ urlpatterns = [
     path('manager/', views.ManagerDashboardView.as_view(), name='manager_dashboard'),
     path('calendar/', leave_calendar_view, name='calendar'),
     path('calendar/<int:year>/<int:month>/', leave_calendar_view, name='calendar'),
+    path('calendar/feed/', leave_calendar_feed, name='calendar_feed'),
     path('approve/<int:pk>/', views.approve_leave_request, name='approve_leave_request'),
     path('reject/<int:pk>/', views.reject_leave_request, name='reject_leave_request'),
     
@@ -131,6 +132,7 @@ urlpatterns = [
 
     # Merged PDF & Send to Protocol (email)
     path('send-to-protocol-email/<int:pk>/', views.send_to_protocol_view, name='send_to_protocol'),
+    path('send-to-protocol-email/<int:pk>/status/', views.protocol_dispatch_status, name='protocol_dispatch_status'),
     path('merged-pdf/<int:pk>/', views.serve_merged_pdf, name='serve_merged_pdf'),
 
     # YC Committee workflow
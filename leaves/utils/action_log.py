@@ -0,0 +1,93 @@
+"""
+Εγγραφή LeaveActionLog, μεμονωμένα ή μαζικά.
+
+Μέσα σε `with buffered_action_logs():` οι εγγραφές (και όσες δημιουργούν τα signals
+του leaves στις αλλαγές κατάστασης) συγκεντρώνονται και γράφονται με bulk_create στο
+τέλος του block, μέσα στην ίδια transaction με τις αλλαγές που καταγράφουν, αντί για
+ένα INSERT ανά αίτηση — για λειτουργίες πολλών αιτήσεων.
+"""
+import threading
+from contextlib import contextmanager
+
+from django.db import transaction
+
+from leaves.models import LeaveActionLog
+
+_local = threading.local()
+
+
+class ActionLogBuffer:
+    """Εκκρεμείς εγγραφές LeaveActionLog που γράφονται μαζί."""
+
+    def __init__(self, batch_size=500):
+        self.batch_size = batch_size
+        # (εγγραφή, marker): ο marker είναι no-op on_commit callback, που το Django
+        # αφαιρεί αν γίνει rollback το savepoint στο οποίο δημιουργήθηκε η εγγραφή
+        self.entries = []
+
+    def add(self, **fields):
+        entry = LeaveActionLog(**fields)
+        marker = _noop_marker()
+        transaction.on_commit(marker)
+        self.entries.append((entry, marker))
+        return entry
+
+    def flush(self):
+        """Εγγραφή (μέσα στην τρέχουσα transaction) όσων δεν ακυρώθηκαν από rollback savepoint."""
+        if not self.entries:
+            return []
+        pending = {id(callback) for _sids, callback, _robust in transaction.get_connection().run_on_commit}
+        entries = [entry for entry, marker in self.entries if id(marker) in pending]
+        self.entries = []
+        return LeaveActionLog.objects.bulk_create(entries, batch_size=self.batch_size)
+
+
+def _noop_marker():
+    return lambda: None
+
+
+def get_active_buffer():
+    return getattr(_local, 'buffer', None)
+
+
+@contextmanager
+def buffered_action_logs(batch_size=500):
+    """
+    Συγκέντρωση των LeaveActionLog του block σε ένα bulk_create.
+
+    Το block τρέχει σε transaction.atomic() και το bulk_create γίνεται στο τέλος του,
+    πριν το commit: εξαίρεση ακυρώνει μαζί αλλαγές και εγγραφές, ενώ εγγραφές
+    εσωτερικού savepoint που έγινε rollback παραλείπονται. Εμφωλευμένα blocks
+    χρησιμοποιούν τον εξωτερικό buffer.
+    """
+    outer = get_active_buffer()
+    if outer is not None:
+        yield outer
+        return
+
+    buffer = ActionLogBuffer(batch_size=batch_size)
+    _local.buffer = buffer
+    try:
+        with transaction.atomic():
+            yield buffer
+            buffer.flush()
+    finally:
+        _local.buffer = None
+
+
+def record_action_log(leave_request, action, user=None, previous_status='', new_status='',
+                      notes='', ip_address=None):
+    """Νέα εγγραφή LeaveActionLog (στον ενεργό buffer, αν υπάρχει)."""
+    fields = {
+        'leave_request': leave_request,
+        'user': user,
+        'action': action,
+        'previous_status': previous_status or '',
+        'new_status': new_status or '',
+        'notes': notes,
+        'ip_address': ip_address,
+    }
+    buffer = get_active_buffer()
+    if buffer is not None:
+        return buffer.add(**fields)
+    return LeaveActionLog.objects.create(**fields)
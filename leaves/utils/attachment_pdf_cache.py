@@ -0,0 +1,151 @@
+"""
+Cache μετατροπών συνημμένων σε PDF για το ενοποιημένο PDF.
+
+Κάθε συνημμένο αποκρυπτογραφείται, μετατρέπεται (εικόνες με άμεση ενσωμάτωση,
+leaves.utils.image_pdf) και μετριούνται οι σελίδες του μόνο την πρώτη φορά. Το αποτέλεσμα αποθηκεύεται ανά
+SHA-256 του περιεχομένου (AttachmentPdfCache) κρυπτογραφημένο στο PRIVATE_MEDIA_ROOT,
+οπότε η επαναποστολή/αναγέννηση ενοποιημένου PDF είναι κυρίως συνένωση έτοιμων
+κομματιών με pypdf. Ίδιο περιεχόμενο σε πολλά συνημμένα μοιράζεται μία εγγραφή.
+
+Η εγγραφή διαγράφεται (μαζί με το αρχείο της) όταν διαγραφεί το τελευταίο
+SecureFile με το ίδιο περιεχόμενο (leaves/signals.py).
+"""
+import hashlib
+import logging
+import os
+
+from django.conf import settings
+from django.db import IntegrityError, transaction
+
+from leaves.crypto_utils import SecureFileHandler
+from leaves.models import AttachmentPdfCache, SecureFile
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR_NAME = 'attachment_pdf_cache'
+
+
+def _cache_file_path(content_sha256):
+    private_media_root = getattr(settings, 'PRIVATE_MEDIA_ROOT',
+                                 os.path.join(settings.BASE_DIR, 'private_media'))
+    return os.path.join(private_media_root, CACHE_DIR_NAME, content_sha256[:2], f'{content_sha256}.pdf')
+
+
+def _store_entry(content_sha256, attachment, pdf_bytes, page_count):
+    """Νέα εγγραφή cache (το PDF αποθηκεύεται μόνο όταν προέκυψε από μετατροπή)."""
+    pdf_path = encryption_key = ''
+    if attachment.file_extension != 'pdf':
+        pdf_path, encryption_key = SecureFileHandler.save_encrypted_bytes(
+            pdf_bytes, _cache_file_path(content_sha256),
+        )
+    try:
+        with transaction.atomic():
+            return AttachmentPdfCache.objects.create(
+                content_sha256=content_sha256,
+                pdf_path=pdf_path,
+                encryption_key=encryption_key,
+                page_count=page_count,
+                pdf_size=len(pdf_bytes),
+            )
+    except IntegrityError:
+        # Ταυτόχρονη μετατροπή του ίδιου περιεχομένου: κρατάμε την υπάρχουσα
+        if pdf_path:
+            SecureFileHandler.delete_encrypted_file(pdf_path)
+        return AttachmentPdfCache.objects.filter(content_sha256=content_sha256).first()
+
+
+def _cached_part(attachment, entry, handler):
+    """(pdf_bytes, σελίδες) από εγγραφή cache ή None αν το αρχείο της λείπει."""
+    if entry.pdf_path:
+        pdf_bytes = handler.load_encrypted_file(entry.pdf_path, entry.encryption_key)
+    else:
+        pdf_bytes = handler.load_encrypted_file(attachment.file_path, attachment.encryption_key)
+    if pdf_bytes is None:
+        return None
+    return pdf_bytes, entry.page_count
+
+
+def _fresh_part(attachment, handler, entries):
+    """Αποκρυπτογράφηση, μετατροπή, μέτρηση σελίδων και εγγραφή στο cache."""
+    from leaves.utils.pdf_merger import attachment_bytes_to_pdf, count_pdf_pages
+
+    decrypted = handler.load_encrypted_file(attachment.file_path, attachment.encryption_key)
+    if decrypted is None:
+        return None
+
+    content_sha256 = hashlib.sha256(decrypted).hexdigest()
+    if attachment.content_sha256 != content_sha256:
+        SecureFile.objects.filter(pk=attachment.pk).update(content_sha256=content_sha256)
+        attachment.content_sha256 = content_sha256
+
+    entry = entries.get(content_sha256) or AttachmentPdfCache.objects.filter(
+        content_sha256=content_sha256,
+    ).first()
+    if entry is not None:
+        entries[content_sha256] = entry
+        if not entry.pdf_path:
+            return decrypted, entry.page_count
+        part = _cached_part(attachment, entry, handler)
+        if part is not None:
+            return part
+        entry.delete()
+        entries.pop(content_sha256, None)
+
+    try:
+        pdf_bytes = attachment_bytes_to_pdf(attachment, decrypted)
+    except Exception as exc:
+        logger.warning('Attachment %s could not be converted to PDF: %s', attachment.pk, exc)
+        return None
+    if pdf_bytes is None:
+        return None
+
+    page_count = count_pdf_pages(pdf_bytes)
+    try:
+        entry = _store_entry(content_sha256, attachment, pdf_bytes, page_count)
+        if entry is not None:
+            entries[content_sha256] = entry
+    except Exception as exc:
+        logger.warning('Could not cache converted attachment %s: %s', attachment.pk, exc)
+    return pdf_bytes, page_count
+
+
+def get_attachment_pdf_parts(attachments, handler=None):
+    """
+    PDF κάθε συνημμένου με το πλήθος σελίδων του, από το cache όπου υπάρχει.
+
+    Returns:
+        list: [(attachment, pdf_bytes, page_count), ...] — χωρίς τα συνημμένα που
+              δεν μετατρέπονται (μη υποστηριζόμενος τύπος, αρχείο που λείπει)
+    """
+    handler = handler or SecureFileHandler()
+    attachments = list(attachments)
+    hashes = {att.content_sha256 for att in attachments if att.content_sha256}
+    entries = {
+        entry.content_sha256: entry
+        for entry in AttachmentPdfCache.objects.filter(content_sha256__in=hashes)
+    } if hashes else {}
+
+    parts = []
+    for attachment in attachments:
+        part = None
+        entry = entries.get(attachment.content_sha256) if attachment.content_sha256 else None
+        if entry is not None:
+            part = _cached_part(attachment, entry, handler)
+        if part is None:
+            part = _fresh_part(attachment, handler, entries)
+        if part is not None:
+            parts.append((attachment, *part))
+    return parts
+
+
+def evict_attachment_pdf_cache(content_sha256):
+    """Διαγραφή της εγγραφής (και του αρχείου της) αν κανένα συνημμένο δεν έχει πια αυτό το περιεχόμενο."""
+    if not content_sha256 or SecureFile.objects.filter(content_sha256=content_sha256).exists():
+        return False
+    entry = AttachmentPdfCache.objects.filter(content_sha256=content_sha256).first()
+    if entry is None:
+        return False
+    if entry.pdf_path:
+        SecureFileHandler.delete_encrypted_file(entry.pdf_path)
+    entry.delete()
+    return True
@@ -0,0 +1,72 @@
+"""
+Δεδομένα παρουσιολογίου.
+
+Οι άδειες όλων των υπαλλήλων για όλο το διάστημα ημερομηνιών φορτώνονται με ένα
+query στα διαστήματα (start_date <= τέλος, end_date >= αρχή), αντί για ένα query
+ανά υπάλληλο. Τα φύλλα παράγονται ένα-ένα ανά ημέρα (generator), ώστε τα PDF/Excel
+να τα καταναλώνουν σταδιακά.
+"""
+from collections import defaultdict
+from datetime import timedelta
+
+from leaves.models import LeavePeriod
+from leaves.utils.working_days import is_working_day
+
+# Καταστάσεις αιτήσεων που εμφανίζονται ως άδεια στο παρουσιολόγιο
+ATTENDANCE_STATUSES = [
+    'SUBMITTED', 'PENDING_PROTOCOL', 'IN_REVIEW', 'WAITING_FOR_DOCUMENTS',
+    'DECISION_PREPARATION', 'PENDING_YC_COMMITTEE', 'PENDING_SIGNATURES', 'COMPLETED',
+]
+
+# Μέγιστο πλήθος ημερών σε ένα παρουσιολόγιο διαστήματος
+ATTENDANCE_MAX_RANGE_DAYS = 31
+
+
+def _leave_periods_by_user(user_ids, start_date, end_date):
+    """user_id -> λίστα (start, end, request_id, leave_type) που τέμνουν το διάστημα."""
+    periods = defaultdict(list)
+    rows = LeavePeriod.objects.filter(
+        leave_request__user_id__in=user_ids,
+        leave_request__status__in=ATTENDANCE_STATUSES,
+        start_date__lte=end_date,
+        end_date__gte=start_date,
+    ).order_by('leave_request_id', 'start_date').values_list(
+        'leave_request__user_id', 'start_date', 'end_date',
+        'leave_request_id', 'leave_request__leave_type__name',
+    )
+    for user_id, period_start, period_end, request_id, leave_type in rows:
+        periods[user_id].append((period_start, period_end, request_id, leave_type))
+    return periods
+
+
+def iter_attendance_sheets(employees, start_date, end_date, working_days_only=False):
+    """
+    Φύλλα παρουσιολογίου ανά ημέρα του διαστήματος.
+
+    Args:
+        employees: Υπάλληλοι με τη σειρά εμφάνισης
+        start_date / end_date: Διάστημα (inclusive)
+        working_days_only (bool): Παράλειψη Σαββατοκύριακων και αργιών
+
+    Yields:
+        dict: {'date': ημέρα, 'rows': [{'emp': υπάλληλος, 'leave_type': str | None}, ...]}
+    """
+    employees = list(employees)
+    periods = _leave_periods_by_user([emp.pk for emp in employees], start_date, end_date)
+
+    day = start_date
+    while day <= end_date:
+        if not working_days_only or is_working_day(day):
+            rows = []
+            for emp in employees:
+                # Ένα όνομα τύπου ανά αίτηση που καλύπτει την ημέρα
+                names = {}
+                for period_start, period_end, request_id, leave_type in periods.get(emp.pk, ()):
+                    if period_start <= day <= period_end:
+                        names.setdefault(request_id, leave_type)
+                rows.append({
+                    'emp': emp,
+                    'leave_type': ' | '.join(names.values()) if names else None,
+                })
+            yield {'date': day, 'rows': rows}
+        day += timedelta(days=1)
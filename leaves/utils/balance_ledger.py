@@ -24,7 +24,23 @@ def get_effective_entitlement(user):
 def get_last_entry(employee):
     return RegularLeaveBalanceEntry.objects.filter(
         employee=employee
-    ).order_by('-entry_date', '-created_at').first()
+    ).order_by('-entry_date', '-created_at', '-id').first()
+
+
+def get_last_entries_by_employee(employee_ids):
+    """
+    Τελευταία εγγραφή ledger ανά υπάλληλο με ένα query (DISTINCT ON, PostgreSQL).
+
+    Returns:
+        dict: {employee_id: RegularLeaveBalanceEntry} — μόνο όσοι έχουν εγγραφές
+    """
+    employee_ids = list(employee_ids)
+    if not employee_ids:
+        return {}
+    entries = RegularLeaveBalanceEntry.objects.filter(
+        employee_id__in=employee_ids,
+    ).order_by('employee_id', '-entry_date', '-created_at', '-id').distinct('employee_id')
+    return {entry.employee_id: entry for entry in entries}
 
 
 def get_last_balance(employee):
@@ -35,12 +51,8 @@ def get_last_balance(employee):
     return None
 
 
-def get_last_buckets(employee):
-    """
-    Επιστρέφει (carryover, current).
-    Για παλιές εγγραφές χωρίς κουβάδες: όλο το υπόλοιπο θεωρείται current.
-    """
-    last_entry = get_last_entry(employee)
+def buckets_from_entry(last_entry, employee):
+    """(carryover, current) από την τελευταία εγγραφή (ή την cache του χρήστη αν δεν υπάρχει)."""
     if not last_entry:
         total = employee.current_regular_leave_balance or 0
         return 0, total
@@ -50,6 +62,14 @@ def get_last_buckets(employee):
     return 0, max(0, total)
 
 
+def get_last_buckets(employee):
+    """
+    Επιστρέφει (carryover, current).
+    Για παλιές εγγραφές χωρίς κουβάδες: όλο το υπόλοιπο θεωρείται current.
+    """
+    return buckets_from_entry(get_last_entry(employee), employee)
+
+
 def apply_fifo_deduction(carryover, current, days):
     """Αφαίρεση ημερών: πρώτα από carryover, μετά από current."""
     days = max(0, int(days))
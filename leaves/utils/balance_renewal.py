@@ -1,5 +1,9 @@
 """
 Λογική ετήσιας ανανέωσης κανονικών αδειών (Φάση Α: Διοικητικοί / Εκπαιδευτικοί).
+
+Η εφαρμογή γίνεται ανά ομάδες χρηστών (RENEWAL_CHUNK_SIZE): η τελευταία εγγραφή ledger
+όλων των χρηστών της ομάδας διαβάζεται με ένα query, οι νέες εγγραφές υπολογίζονται στη
+μνήμη και γράφονται με bulk_create, ενώ υπόλοιπα χρηστών και καταστάσεις με bulk_update.
 """
 from datetime import date
 
@@ -12,13 +16,18 @@ from leaves.models import (
     BalanceRenewalSeason,
     BalanceRenewalSettings,
     BalanceRenewalUserStatus,
+    RegularLeaveBalanceEntry,
 )
 from leaves.utils.balance_ledger import (
-    create_balance_entry,
+    buckets_from_entry,
     get_effective_entitlement,
-    get_last_buckets,
+    get_last_entries_by_employee,
+    get_last_entry,
 )
 
+# Χρήστες ανά transaction/bulk εγγραφή κατά την εφαρμογή
+RENEWAL_CHUNK_SIZE = 500
+
 
 def closing_year_for_date(today=None):
     """
@@ -93,25 +102,39 @@ def refresh_season_statuses(season):
     - entitlement_days = νέο δικαίωμα
     """
     settings = BalanceRenewalSettings.get_solo()
-    users = target_users_queryset(settings)
+    users = list(target_users_queryset(settings))
+    last_entries = get_last_entries_by_employee(user.pk for user in users)
+    existing = {status.user_id: status for status in season.user_statuses.all()}
+
+    to_create = []
+    to_update = []
     for user in users:
-        carry, current = get_last_buckets(user)
+        carry, current = buckets_from_entry(last_entries.get(user.pk), user)
         entitlement = get_effective_entitlement(user)
-        status, _ = BalanceRenewalUserStatus.objects.get_or_create(
-            season=season,
-            user=user,
-            defaults={
-                'expiring_days': carry,
-                'carryover_days': current,
-                'entitlement_days': entitlement,
-            },
-        )
+        status = existing.get(user.pk)
+        if status is None:
+            to_create.append(BalanceRenewalUserStatus(
+                season=season,
+                user=user,
+                expiring_days=carry,
+                carryover_days=current,
+                entitlement_days=entitlement,
+            ))
+            continue
         if status.applied_at:
             continue
-        status.expiring_days = carry
-        status.carryover_days = current
-        status.entitlement_days = entitlement
-        status.save(update_fields=['expiring_days', 'carryover_days', 'entitlement_days'])
+        if (status.expiring_days, status.carryover_days, status.entitlement_days) != (carry, current, entitlement):
+            status.expiring_days = carry
+            status.carryover_days = current
+            status.entitlement_days = entitlement
+            to_update.append(status)
+
+    with transaction.atomic():
+        # ignore_conflicts: ταυτόχρονο refresh (δύο χειριστές) δεν αποτυγχάνει στο unique
+        BalanceRenewalUserStatus.objects.bulk_create(to_create, batch_size=500, ignore_conflicts=True)
+        BalanceRenewalUserStatus.objects.bulk_update(
+            to_update, ['expiring_days', 'carryover_days', 'entitlement_days'], batch_size=500,
+        )
 
 
 def build_user_message(status, template=None):
@@ -129,12 +152,12 @@ def build_user_message(status, template=None):
 
 def notify_handlers(season):
     """Ειδοποίηση χειριστών ότι άνοιξε η περίοδος προειδοποίησης."""
-    from notifications.utils import create_notification
+    from notifications.utils import notify_many
 
     handlers = User.objects.filter(
         is_active=True,
         roles__code=ROLE_LEAVE_HANDLER,
-    ).distinct()
+    )
     expiring_count = season.user_statuses.filter(expiring_days__gt=0).count()
     unused_count = season.user_statuses.filter(carryover_days__gt=0).count()
     title = f'Ετήσια ανανέωση αδειών {season.closing_year}→{season.new_year}'
@@ -144,17 +167,16 @@ def notify_handlers(season):
         f'Χρήστες με υπόλοιπο προηγούμενου έτους προς μεταφορά: {unused_count}.\n'
         f'Μεταβείτε στην οθόνη «Ετήσια Ανανέωση» για έλεγχο και αποστολή μηνυμάτων.'
     )
-    for handler in handlers:
-        create_notification(
-            user=handler,
-            title=title,
-            message=message,
-            notification_type='warning',
-            related_object=season,
-        )
+    notifications = notify_many(
+        handlers,
+        title=title,
+        message=message,
+        notification_type='warning',
+        related_object=season,
+    )
     season.handlers_notified_at = timezone.now()
     season.save(update_fields=['handlers_notified_at'])
-    return handlers.count()
+    return len(notifications)
 
 
 def notify_users(season, user_ids, sent_by, message_override=None):
@@ -182,92 +204,208 @@ def notify_users(season, user_ids, sent_by, message_override=None):
     return count
 
 
-@transaction.atomic
-def apply_renewal_for_user(status, applied_by):
+def build_renewal_entries(user, last_entry, entitlement, season, applied_by, entry_date=None):
     """
+    Οι εγγραφές ledger της ανανέωσης ενός χρήστη, χωρίς αποθήκευση:
+
     1) Λήξη παλαιού carryover (expiring)
     2) Μεταφορά current → νέο carryover
     3) Χορήγηση entitlement στο current
-    """
-    user = status.user
-    if status.applied_at:
-        return status
-
-    carry, current = get_last_buckets(user)
-    entitlement = get_effective_entitlement(user)
-    closing = status.season.closing_year
-    new_year = status.season.new_year
 
-    if carry > 0:
-        create_balance_entry(
+    Returns:
+        list: [RegularLeaveBalanceEntry, ...] — η τελευταία είναι πάντα το ANNUAL_GRANT
+    """
+    entry_date = entry_date or timezone.now().date()
+    carry, current = buckets_from_entry(last_entry, user)
+    balance = last_entry.balance_after if last_entry else (user.current_regular_leave_balance or 0)
+    closing = season.closing_year
+    new_year = season.new_year
+    entries = []
+
+    def add_entry(entry_type, description, days_delta, carryover_after, current_after, notes):
+        nonlocal balance
+        balance_after = carryover_after + current_after
+        entries.append(RegularLeaveBalanceEntry(
             employee=user,
-            entry_type='CARRYOVER_EXPIRE',
-            description=f'Λήξη υπολοίπου παλαιότερων ετών (πριν το {closing})',
-            days_delta=-carry,
-            notes=f'Ετήσια ανανέωση {closing}→{new_year}',
+            entry_type=entry_type,
+            entry_date=entry_date,
+            description=description,
+            balance_before=balance,
+            balance_after=balance_after,
+            carryover_after=carryover_after,
+            current_after=current_after,
+            days_delta=days_delta,
+            notes=notes,
             created_by=applied_by,
-            carryover_after=0,
-            current_after=current,
+        ))
+        balance = balance_after
+
+    if carry > 0:
+        add_entry(
+            'CARRYOVER_EXPIRE', f'Λήξη υπολοίπου παλαιότερων ετών (πριν το {closing})',
+            -carry, 0, current, f'Ετήσια ανανέωση {closing}→{new_year}',
         )
-        carry, current = 0, current
 
     if current > 0:
-        create_balance_entry(
-            employee=user,
-            entry_type='CARRYOVER_IMPORT',
-            description=f'Μεταφορά υπολοίπου έτους {closing}',
-            days_delta=0,
-            notes=f'Ετήσια ανανέωση {closing}→{new_year}',
-            created_by=applied_by,
-            carryover_after=current,
-            current_after=0,
+        add_entry(
+            'CARRYOVER_IMPORT', f'Μεταφορά υπολοίπου έτους {closing}',
+            0, current, 0, f'Ετήσια ανανέωση {closing}→{new_year}',
         )
-        carry, current = current, 0
+        carry = current
     else:
-        carry, current = 0, 0
-
-    create_balance_entry(
-        employee=user,
-        entry_type='ANNUAL_GRANT',
-        description=f'Χορήγηση δικαιώματος έτους {new_year}',
-        days_delta=entitlement,
-        notes=f'entitlement={entitlement}',
-        created_by=applied_by,
-        carryover_after=carry,
-        current_after=entitlement,
+        carry = 0
+
+    add_entry(
+        'ANNUAL_GRANT', f'Χορήγηση δικαιώματος έτους {new_year}',
+        entitlement, carry, entitlement, f'entitlement={entitlement}',
     )
+    return entries
 
-    status.applied_at = timezone.now()
-    status.entitlement_days = entitlement
-    status.apply_error = ''
-    status.save(update_fields=['applied_at', 'entitlement_days', 'apply_error'])
+
+def plan_renewal(statuses, applied_by, last_entries=None):
+    """
+    Υπολογισμός ανανέωσης για λίστα καταστάσεων (με select_related('user', 'season')).
+
+    Returns:
+        list: [{'status', 'entitlement', 'entries'}, ...] για όσους δεν έχει εφαρμοστεί
+    """
+    statuses = [status for status in statuses if not status.applied_at]
+    if last_entries is None:
+        last_entries = get_last_entries_by_employee(status.user_id for status in statuses)
+    entry_date = timezone.now().date()
+    plans = []
+    for status in statuses:
+        entitlement = get_effective_entitlement(status.user)
+        plans.append({
+            'status': status,
+            'entitlement': entitlement,
+            'entries': build_renewal_entries(
+                status.user, last_entries.get(status.user_id), entitlement,
+                status.season, applied_by, entry_date=entry_date,
+            ),
+        })
+    return plans
+
+
+def describe_plan(plan):
+    """Γραμμή diff για dry-run: υπόλοιπο πριν/μετά και οι εγγραφές που θα δημιουργηθούν."""
+    entries = plan['entries']
+    grant = entries[-1]
+    expired = next((-e.days_delta for e in entries if e.entry_type == 'CARRYOVER_EXPIRE'), 0)
+    return {
+        'user_id': plan['status'].user_id,
+        'user': str(plan['status'].user),
+        'balance_before': entries[0].balance_before,
+        'balance_after': grant.balance_after,
+        'expired_days': expired,
+        'carryover_days': grant.carryover_after,
+        'entitlement_days': plan['entitlement'],
+        'entry_types': [entry.entry_type for entry in entries],
+    }
+
+
+def write_renewal_plans(plans):
+    """Αποθήκευση υπολογισμένων ανανεώσεων (εντός transaction του καλούντος)."""
+    if not plans:
+        return
+    RegularLeaveBalanceEntry.objects.bulk_create(
+        [entry for plan in plans for entry in plan['entries']], batch_size=500,
+    )
+    now = timezone.now()
+    users = []
+    statuses = []
+    for plan in plans:
+        status = plan['status']
+        status.user.current_regular_leave_balance = plan['entries'][-1].balance_after
+        status.applied_at = now
+        status.entitlement_days = plan['entitlement']
+        status.apply_error = ''
+        users.append(status.user)
+        statuses.append(status)
+    User.objects.bulk_update(users, ['current_regular_leave_balance'], batch_size=500)
+    BalanceRenewalUserStatus.objects.bulk_update(
+        statuses, ['applied_at', 'entitlement_days', 'apply_error'], batch_size=500,
+    )
+
+
+@transaction.atomic
+def apply_renewal_for_user(status, applied_by):
+    """Ανανέωση ενός χρήστη (βλ. build_renewal_entries)."""
+    if status.applied_at:
+        return status
+    last_entries = {}
+    last_entry = get_last_entry(status.user)
+    if last_entry is not None:
+        last_entries[status.user_id] = last_entry
+    write_renewal_plans(plan_renewal([status], applied_by, last_entries=last_entries))
     return status
 
 
-def apply_renewal_season(season, applied_by, user_ids=None, force=False):
-    if season.applied_at and not force and not user_ids:
-        return 0, ['Η σεζόν έχει ήδη εφαρμοστεί.']
+def run_renewal(season, applied_by, user_ids=None, dry_run=False, chunk_size=RENEWAL_CHUNK_SIZE,
+                progress=None):
+    """
+    Εφαρμογή (ή dry-run) της ανανέωσης ανά ομάδες χρηστών.
+
+    Κάθε ομάδα γράφεται σε δικό της transaction με κλείδωμα των καταστάσεων της.
+    Αν αποτύχει η μαζική εγγραφή, η ομάδα ξαναδοκιμάζεται ανά χρήστη ώστε το σφάλμα
+    να καταγραφεί στο apply_error του συγκεκριμένου χρήστη.
 
-    qs = season.user_statuses.all()
+    Args:
+        progress: callable(επεξεργασμένοι, σύνολο) μετά από κάθε ομάδα
+
+    Returns:
+        dict: {'applied': n, 'errors': [...], 'diff': [describe_plan(...), ...]}
+              (το diff συμπληρώνεται μόνο σε dry_run)
+    """
+    qs = season.user_statuses.filter(applied_at__isnull=True)
     if user_ids:
         qs = qs.filter(user_id__in=user_ids)
-    else:
-        qs = qs.filter(applied_at__isnull=True)
-
-    ok = 0
-    errors = []
-    for status in qs.select_related('user'):
+    status_ids = list(qs.order_by('pk').values_list('pk', flat=True))
+    total = len(status_ids)
+    result = {'applied': 0, 'errors': [], 'diff': []}
+
+    for start in range(0, total, chunk_size):
+        chunk_ids = status_ids[start:start + chunk_size]
+        chunk_qs = BalanceRenewalUserStatus.objects.filter(
+            pk__in=chunk_ids, applied_at__isnull=True,
+        ).select_related('user', 'user__employee_type', 'season').order_by('pk')
+
+        if dry_run:
+            result['diff'].extend(describe_plan(plan) for plan in plan_renewal(chunk_qs, applied_by))
+        else:
+            try:
+                with transaction.atomic():
+                    plans = plan_renewal(chunk_qs.select_for_update(of=('self',)), applied_by)
+                    write_renewal_plans(plans)
+                result['applied'] += len(plans)
+            except Exception:
+                _apply_chunk_per_user(chunk_qs, applied_by, result)
+
+        if progress is not None:
+            progress(min(start + chunk_size, total), total)
+    return result
+
+
+def _apply_chunk_per_user(chunk_qs, applied_by, result):
+    for status in chunk_qs:
         try:
-            with transaction.atomic():
-                apply_renewal_for_user(status, applied_by)
-            ok += 1
+            apply_renewal_for_user(status, applied_by)
+            result['applied'] += 1
         except Exception as exc:
             status.apply_error = str(exc)
             status.save(update_fields=['apply_error'])
-            errors.append(f'{status.user}: {exc}')
+            result['errors'].append(f'{status.user}: {exc}')
+
+
+def apply_renewal_season(season, applied_by, user_ids=None, force=False,
+                         chunk_size=RENEWAL_CHUNK_SIZE, progress=None):
+    if season.applied_at and not force and not user_ids:
+        return 0, ['Η σεζόν έχει ήδη εφαρμοστεί.']
+
+    result = run_renewal(season, applied_by, user_ids=user_ids, chunk_size=chunk_size, progress=progress)
 
     if not user_ids:
         season.applied_at = timezone.now()
         season.applied_by = applied_by
         season.save(update_fields=['applied_at', 'applied_by'])
-    return ok, errors
+    return result['applied'], result['errors']
@@ -0,0 +1,252 @@
+"""
+Μετρήσεις latency και πλήθους SQL queries για τις «βαριές» σελίδες και utilities.
+
+Κάθε περίπτωση εκτελείται `warmup` φορές χωρίς μέτρηση και μετά `iterations` φορές·
+καταγράφονται p50/p95 (ms) και queries ανά εκτέλεση. Τα αποτελέσματα είναι dict
+έτοιμο για JSON, ώστε δύο εκτελέσεις (π.χ. πριν/μετά από μια αλλαγή) να
+συγκρίνονται με compare_results().
+
+Οι σελίδες καλούνται μέσω django.test.Client (όλο το middleware/templates),
+με force_login ως χειριστής ή προϊστάμενος.
+"""
+import math
+import time
+from collections import namedtuple
+from datetime import date, timedelta
+
+from django.db import connection
+from django.db.models import Count
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import reverse
+from django.utils import timezone
+
+from accounts.models import Department, User
+from accounts.role_constants import ROLE_LEAVE_HANDLER, ROLE_MANAGER
+
+BenchmarkCase = namedtuple('BenchmarkCase', ['name', 'kind', 'run'])
+
+
+def percentile(values, pct):
+    """Percentile με τη μέθοδο nearest-rank (χωρίς παρεμβολή)."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(1, math.ceil(pct / 100 * len(ordered)))
+    return ordered[rank - 1]
+
+
+def measure(func, iterations=10, warmup=2, before_each=None):
+    """
+    Μέτρηση μίας περίπτωσης.
+
+    Args:
+        func: callable χωρίς ορίσματα
+        before_each: callable που τρέχει πριν από κάθε εκτέλεση εκτός μέτρησης (π.χ. άδειασμα cache)
+
+    Returns:
+        dict: p50_ms, p95_ms, min_ms, max_ms, mean_ms, queries, max_queries, iterations
+    """
+    for _ in range(warmup):
+        if before_each:
+            before_each()
+        func()
+
+    timings = []
+    query_counts = []
+    for _ in range(iterations):
+        if before_each:
+            before_each()
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            func()
+            elapsed = time.perf_counter() - started
+        timings.append(elapsed * 1000)
+        query_counts.append(len(queries))
+
+    return {
+        'p50_ms': round(percentile(timings, 50), 2),
+        'p95_ms': round(percentile(timings, 95), 2),
+        'min_ms': round(min(timings), 2),
+        'max_ms': round(max(timings), 2),
+        'mean_ms': round(sum(timings) / len(timings), 2),
+        'queries': percentile(query_counts, 50),
+        'max_queries': max(query_counts),
+        'iterations': iterations,
+    }
+
+
+def _role_users(role_code):
+    return User.objects.filter(roles__code=role_code, is_active=True).order_by('pk')
+
+
+def default_handler():
+    return _role_users(ROLE_LEAVE_HANDLER).first()
+
+
+def default_manager():
+    """Ο προϊστάμενος του τμήματος με τους περισσότερους υπαλλήλους."""
+    department = (
+        Department.objects.filter(manager__roles__code=ROLE_MANAGER, manager__is_active=True)
+        .annotate(staff=Count('users'))
+        .order_by('-staff', 'pk')
+        .first()
+    )
+    return department.manager if department else _role_users(ROLE_MANAGER).first()
+
+
+def _consume(response):
+    """Διάβασμα ολόκληρου του σώματος (και των streaming responses) ώστε να μετρηθεί το rendering."""
+    if response.status_code >= 400:
+        raise RuntimeError(f'{response.request["PATH_INFO"]}: HTTP {response.status_code}')
+    if getattr(response, 'streaming', False):
+        for _chunk in response.streaming_content:
+            pass
+    return response
+
+
+def view_cases(handler, manager, today=None):
+    """Σελίδες προς μέτρηση: dashboards, ημερολόγιο, παρουσιολόγιο, εξαγωγή SCH."""
+    from leaves.utils.handler_tab_counts import HANDLER_TAB_STATUSES
+
+    today = today or timezone.localdate()
+    handler_client = Client()
+    handler_client.force_login(handler)
+    manager_client = Client()
+    manager_client.force_login(manager)
+
+    def get(client, url, data=None):
+        return lambda: _consume(client.get(url, data or {}, secure=True))
+
+    def post(client, url, data):
+        return lambda: _consume(client.post(url, data, secure=True))
+
+    handler_url = reverse('leaves:handler_dashboard')
+    cases = [
+        BenchmarkCase(f'handler_dashboard[{tab}]', 'view', get(handler_client, handler_url, {'tab': tab}))
+        for tab in HANDLER_TAB_STATUSES
+    ]
+    week_start = today - timedelta(days=today.weekday())
+    cases += [
+        BenchmarkCase('manager_dashboard', 'view', get(manager_client, reverse('leaves:manager_dashboard'))),
+        BenchmarkCase('leave_calendar', 'view', get(
+            manager_client, reverse('leaves:calendar', args=[today.year, today.month]),
+        )),
+        BenchmarkCase('attendance_sheet[day]', 'view', post(
+            handler_client, reverse('leaves:attendance_sheet'),
+            {'date': today.isoformat(), 'export': 'excel'},
+        )),
+        BenchmarkCase('attendance_sheet[week]', 'view', post(
+            handler_client, reverse('leaves:attendance_sheet'),
+            {'date': week_start.isoformat(), 'date_to': (week_start + timedelta(days=4)).isoformat(),
+             'export': 'excel'},
+        )),
+        BenchmarkCase('sch_export_report', 'view', get(
+            handler_client, reverse('leaves:report_sch_export'),
+            {'date_from': date(today.year, 1, 1).isoformat(), 'date_to': today.isoformat()},
+        )),
+        BenchmarkCase('sch_export_report[xlsx]', 'view', get(
+            handler_client, reverse('leaves:report_sch_export'),
+            {'date_from': date(today.year, 1, 1).isoformat(), 'date_to': today.isoformat(), 'export': 'xlsx'},
+        )),
+    ]
+    return cases
+
+
+def utility_cases(manager, today=None):
+    """Utilities που καλούνται από τις παραπάνω σελίδες, μετρημένα μεμονωμένα."""
+    from leaves.utils.attendance import iter_attendance_sheets
+    from leaves.utils.handler_tab_counts import get_handler_tab_counts
+    from leaves.utils.leave_calendar import get_calendar_events
+    from leaves.utils.sick_leave_alerts import compute_sick_totals
+
+    today = today or timezone.localdate()
+    month_start = today.replace(day=1)
+    month_end = (month_start + timedelta(days=32)).replace(day=1) - timedelta(days=1)
+    employees = list(User.objects.filter(is_active=True, department__isnull=False).order_by('pk')[:500])
+
+    return [
+        BenchmarkCase('get_handler_tab_counts', 'utility', get_handler_tab_counts),
+        BenchmarkCase('get_calendar_events', 'utility', lambda: get_calendar_events(manager, month_start, month_end)),
+        BenchmarkCase('iter_attendance_sheets[month]', 'utility', lambda: list(
+            iter_attendance_sheets(employees, month_start, month_end, working_days_only=True),
+        )),
+        BenchmarkCase('compute_sick_totals[year]', 'utility', lambda: compute_sick_totals(year=today.year)),
+    ]
+
+
+def reset_caches():
+    """Ακύρωση των caches που χρησιμοποιούν οι σελίδες (cold μετρήσεις)."""
+    from accounts.utils.department_hierarchy import invalidate_department_hierarchy
+    from leaves.utils.handler_tab_counts import invalidate_handler_tab_counts
+    from leaves.utils.leave_calendar import invalidate_leave_calendar
+
+    invalidate_handler_tab_counts()
+    invalidate_leave_calendar()
+    invalidate_department_hierarchy()
+
+
+def run_benchmarks(handler=None, manager=None, iterations=10, warmup=2, cold=False, only=None,
+                   today=None, log=None):
+    """
+    Εκτέλεση όλων των περιπτώσεων.
+
+    Args:
+        only: iterable με ονόματα (ή προθέματα ονομάτων) περιπτώσεων
+        cold (bool): Ακύρωση caches πριν από κάθε εκτέλεση
+
+    Returns:
+        dict: {'meta': {...}, 'results': {όνομα: {'kind': ..., p50_ms, p95_ms, queries, ...}}}
+    """
+    from leaves.models import LeaveRequest
+
+    handler = handler or default_handler()
+    manager = manager or default_manager()
+    if handler is None or manager is None:
+        raise ValueError('Χρειάζεται τουλάχιστον ένας χειριστής αδειών και ένας προϊστάμενος.')
+    log = log or (lambda message: None)
+
+    results = {}
+    # Ο test client χρησιμοποιεί host 'testserver'
+    with override_settings(ALLOWED_HOSTS=['testserver']):
+        cases = view_cases(handler, manager, today=today) + utility_cases(manager, today=today)
+        for case in cases:
+            if only and not any(case.name.startswith(prefix) for prefix in only):
+                continue
+            stats = measure(case.run, iterations=iterations, warmup=warmup,
+                            before_each=reset_caches if cold else None)
+            results[case.name] = {'kind': case.kind, **stats}
+            log(f"{case.name}: p50 {stats['p50_ms']}ms, p95 {stats['p95_ms']}ms, {stats['queries']} queries")
+
+    return {
+        'meta': {
+            'generated_at': timezone.now().isoformat(),
+            'iterations': iterations,
+            'warmup': warmup,
+            'cold': cold,
+            'handler': handler.email,
+            'manager': manager.email,
+            'users': User.objects.count(),
+            'leave_requests': LeaveRequest.objects.count(),
+        },
+        'results': results,
+    }
+
+
+def compare_results(current, baseline):
+    """
+    Προσθήκη 'delta' σε κάθε αποτέλεσμα που υπάρχει και στο baseline.
+
+    delta: p50_pct / p95_pct (ποσοστιαία μεταβολή) και queries (διαφορά).
+    """
+    base_results = baseline.get('results', {})
+    for name, stats in current['results'].items():
+        base = base_results.get(name)
+        if not base:
+            continue
+        delta = {'queries': stats['queries'] - base['queries']}
+        for key in ('p50_ms', 'p95_ms'):
+            label = key.replace('_ms', '_pct')
+            delta[label] = round((stats[key] - base[key]) / base[key] * 100, 1) if base[key] else None
+        stats['delta'] = delta
+    return current
@@ -0,0 +1,77 @@
+"""
+Μετρητές έκδοσης στο cache για ακύρωση cached δεδομένων σε όλους τους workers.
+
+Κάθε ομάδα cached δεδομένων έχει ένα όνομα (π.χ. 'handler_tab_counts'). Τα κλειδιά
+περιέχουν την τρέχουσα έκδοση· η αύξησή της κάνει όλα τα παλιά κλειδιά αόρατα
+χωρίς διαγραφή. Σφάλματα του cache δεν διακόπτουν τη ροή: χωρίς cache οι
+αναγνώσεις υπολογίζονται απευθείας από τη βάση.
+"""
+import logging
+
+from django.core.cache import cache
+from django.db import transaction
+
+logger = logging.getLogger(__name__)
+
+
+def _version_key(name):
+    return f'leaves:version:{name}'
+
+
+def get_cache_version(name):
+    """Τρέχουσα έκδοση της ομάδας `name` (None αν το cache δεν είναι διαθέσιμο)."""
+    try:
+        return cache.get_or_set(_version_key(name), 1, None)
+    except Exception as exc:
+        logger.warning('Cache unavailable reading version %s: %s', name, exc)
+        return None
+
+
+def _incr(name):
+    key = _version_key(name)
+    try:
+        cache.add(key, 1, None)
+        return cache.incr(key)
+    except Exception as exc:
+        logger.warning('Cache unavailable bumping version %s: %s', name, exc)
+        return None
+
+
+def bump_cache_version(name):
+    """
+    Ακυρώνει τα cached δεδομένα της ομάδας `name`.
+
+    Η έκδοση αυξάνεται αμέσως και ξανά μετά το commit, ώστε τιμές που
+    υπολογίστηκαν πριν ολοκληρωθεί η συναλλαγή να μη μείνουν στο cache.
+    """
+    version = _incr(name)
+    transaction.on_commit(lambda: _incr(name))
+    return version
+
+
+def versioned_cache_get_or_set(name, key, compute, timeout=300):
+    """
+    Ανάγνωση από cache με κλειδί που περιέχει την έκδοση της ομάδας `name`.
+
+    Args:
+        name (str): Ομάδα cached δεδομένων
+        key (str): Κλειδί μέσα στην ομάδα
+        compute (callable): Υπολογισμός της τιμής όταν λείπει
+        timeout (int): Διάρκεια ζωής σε δευτερόλεπτα
+    """
+    version = get_cache_version(name)
+    if version is None:
+        return compute()
+    cache_key = f'leaves:{name}:{version}:{key}'
+    try:
+        value = cache.get(cache_key)
+    except Exception as exc:
+        logger.warning('Cache unavailable reading %s: %s', cache_key, exc)
+        return compute()
+    if value is None:
+        value = compute()
+        try:
+            cache.set(cache_key, value, timeout)
+        except Exception as exc:
+            logger.warning('Cache unavailable writing %s: %s', cache_key, exc)
+    return value
@@ -0,0 +1,45 @@
+"""
+Μετρητές καρτελών του dashboard χειριστή.
+
+Όλοι οι μετρητές υπολογίζονται με ένα query (Count με filter) και κρατιούνται
+στο cache. Κάθε αλλαγή κατάστασης αίτησης αυξάνει την έκδοση (leaves/signals.py).
+"""
+from django.db.models import Count, Q
+
+from leaves.models import LeaveRequest
+from leaves.utils.cache_versions import bump_cache_version, versioned_cache_get_or_set
+
+CACHE_VERSION_NAME = 'handler_tab_counts'
+
+# Καρτέλα -> καταστάσεις αιτήσεων που εμφανίζει
+HANDLER_TAB_STATUSES = {
+    'protocol': ['PENDING_PROTOCOL'],
+    'processing': ['IN_REVIEW'],
+    'documents': ['WAITING_FOR_DOCUMENTS'],
+    'decision': ['DECISION_PREPARATION'],
+    'yc_committee': ['PENDING_YC_COMMITTEE'],
+    'signatures': ['PENDING_SIGNATURES'],
+    'completed': ['COMPLETED'],
+    'rejected': ['REJECTED_BY_LEAVES_DEPT'],
+}
+HANDLER_TAB_STATUSES['all'] = [
+    status for statuses in HANDLER_TAB_STATUSES.values() for status in statuses
+]
+
+
+def _compute_handler_tab_counts():
+    return LeaveRequest.objects.filter(
+        status__in=HANDLER_TAB_STATUSES['all'],
+    ).aggregate(**{
+        tab: Count('pk', filter=Q(status__in=statuses))
+        for tab, statuses in HANDLER_TAB_STATUSES.items()
+    })
+
+
+def get_handler_tab_counts():
+    """Λεξικό καρτέλα -> πλήθος αιτήσεων (από cache όταν είναι διαθέσιμο)."""
+    return versioned_cache_get_or_set(CACHE_VERSION_NAME, 'all', _compute_handler_tab_counts)
+
+
+def invalidate_handler_tab_counts():
+    bump_cache_version(CACHE_VERSION_NAME)
@@ -0,0 +1,165 @@
+"""
+Άμεση μετατροπή εικόνας συνημμένου (JPG/PNG) σε PDF μίας σελίδας A4.
+
+Η εικόνα ενσωματώνεται απευθείας ως image XObject σε ένα ελάχιστο PDF, χωρίς
+HTML/base64 και χωρίς layout του WeasyPrint. Η σελίδα είναι ίδια με την παλιά HTML
+εκδοχή: A4, περιθώρια 1cm, οριζόντια στοίχιση στο κέντρο, η εικόνα στο φυσικό της
+μέγεθος (1px = 1/96 ίντσας) και σμίκρυνση μόνο αν δεν χωράει.
+
+Εικόνες με περισσότερη ανάλυση από ATTACHMENT_IMAGE_PDF_DPI στο τελικό τους μέγεθος
+υποδειγματοληπτούνται και επανασυμπιέζονται (φωτογραφίες κινητών, σαρώσεις 600dpi).
+Ένα JPEG που δεν χρειάζεται αλλαγή ενσωματώνεται αυτούσιο (DCTDecode), χωρίς
+αποσυμπίεση/επανασυμπίεση.
+"""
+import zlib
+from io import BytesIO
+
+from django.conf import settings
+from PIL import Image, ImageOps
+
+# A4 σε points και περιθώριο 1cm
+PAGE_WIDTH = 595.28
+PAGE_HEIGHT = 841.89
+PAGE_MARGIN = 28.35
+
+# CSS px -> points (96 px ανά ίντσα, 72 points ανά ίντσα)
+PX_TO_PT = 72 / 96
+
+# Ανοχή πριν την υποδειγματοληψία (δεν αξίζει resample για λίγα επιπλέον pixels)
+DOWNSAMPLE_TOLERANCE = 1.25
+
+# EXIF Orientation
+_ORIENTATION_TAG = 0x0112
+
+
+def _target_dpi():
+    return getattr(settings, 'ATTACHMENT_IMAGE_PDF_DPI', 150)
+
+
+def _jpeg_quality():
+    return getattr(settings, 'ATTACHMENT_IMAGE_PDF_JPEG_QUALITY', 85)
+
+
+def _placement(width_px, height_px):
+    """(x, y, πλάτος, ύψος) της εικόνας στη σελίδα, σε points."""
+    box_width = PAGE_WIDTH - 2 * PAGE_MARGIN
+    box_height = PAGE_HEIGHT - 2 * PAGE_MARGIN
+    width = width_px * PX_TO_PT
+    height = height_px * PX_TO_PT
+    scale = min(1.0, box_width / width, box_height / height)
+    width, height = width * scale, height * scale
+    x = (PAGE_WIDTH - width) / 2
+    y = PAGE_HEIGHT - PAGE_MARGIN - height
+    return x, y, width, height
+
+
+def _flatten(image):
+    """RGB ή L χωρίς διαφάνεια (η διαφάνεια γίνεται λευκό φόντο, όπως στη σελίδα)."""
+    if image.mode == 'P':
+        image = image.convert('RGBA' if 'transparency' in image.info else 'RGB')
+    if image.mode in ('RGBA', 'LA'):
+        background = Image.new('RGB', image.size, 'white')
+        background.paste(image.convert('RGBA'), mask=image.getchannel('A'))
+        return background
+    if image.mode == 'I' or image.mode.startswith('I;16'):
+        # 16-bit τιμές (π.χ. σαρώσεις PNG σε αποχρώσεις γκρι): το convert('L') τις
+        # κόβει στο 255 (σχεδόν λευκή σελίδα) — κλιμάκωση πρώτα σε 8-bit
+        return image.point(lambda value: value / 256).convert('L')
+    if image.mode in ('1', 'F'):
+        return image.convert('L')
+    if image.mode not in ('RGB', 'L'):
+        return image.convert('RGB')
+    return image
+
+
+def _image_stream(image_bytes):
+    """
+    Δεδομένα του image XObject.
+
+    Returns:
+        tuple: (λεξικό PDF χωρίς /Length, περιεχόμενο stream, (πλάτος, ύψος) του stream σε px,
+                (πλάτος, ύψος) της αρχικής εικόνας σε px — καθορίζει το μέγεθος στη σελίδα)
+    """
+    image = Image.open(BytesIO(image_bytes))
+    is_jpeg = image.format == 'JPEG'
+    rotated = image.getexif().get(_ORIENTATION_TAG, 1) not in (1, None)
+    image = ImageOps.exif_transpose(image)
+    display_size = image.size
+
+    _x, _y, width_pt, height_pt = _placement(*display_size)
+    max_width_px = round(width_pt / 72 * _target_dpi())
+    max_height_px = round(height_pt / 72 * _target_dpi())
+    downsample = (
+        image.width > max_width_px * DOWNSAMPLE_TOLERANCE
+        or image.height > max_height_px * DOWNSAMPLE_TOLERANCE
+    )
+
+    if is_jpeg and not rotated and not downsample and image.mode in ('RGB', 'L'):
+        colorspace = '/DeviceRGB' if image.mode == 'RGB' else '/DeviceGray'
+        header = f'/Filter /DCTDecode /ColorSpace {colorspace} /BitsPerComponent 8'
+        return header, image_bytes, image.size, display_size
+
+    image = _flatten(image)
+    if downsample:
+        image = image.resize((max(1, max_width_px), max(1, max_height_px)), Image.LANCZOS)
+    colorspace = '/DeviceRGB' if image.mode == 'RGB' else '/DeviceGray'
+
+    if is_jpeg:
+        output = BytesIO()
+        image.save(output, 'JPEG', quality=_jpeg_quality(), optimize=True)
+        header = f'/Filter /DCTDecode /ColorSpace {colorspace} /BitsPerComponent 8'
+        return header, output.getvalue(), image.size, display_size
+
+    # PNG (κείμενο, σκαναρισμένα έγγραφα): χωρίς απώλειες
+    header = f'/Filter /FlateDecode /ColorSpace {colorspace} /BitsPerComponent 8'
+    return header, zlib.compress(image.tobytes(), 6), image.size, display_size
+
+
+def _write_pdf(objects):
+    """Ελάχιστο PDF από λίστα σωμάτων αντικειμένων (bytes), αριθμημένων από 1."""
+    output = BytesIO()
+    output.write(b'%PDF-1.4\n%\xe2\xe3\xcf\xd3\n')
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(output.tell())
+        output.write(f'{number} 0 obj\n'.encode('ascii'))
+        output.write(body)
+        output.write(b'\nendobj\n')
+    xref_offset = output.tell()
+    output.write(f'xref\n0 {len(objects) + 1}\n0000000000 65535 f \n'.encode('ascii'))
+    for offset in offsets:
+        output.write(f'{offset:010d} 00000 n \n'.encode('ascii'))
+    output.write(
+        f'trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\n'
+        f'startxref\n{xref_offset}\n%%EOF\n'.encode('ascii')
+    )
+    return output.getvalue()
+
+
+def _stream_object(header, data):
+    return f'<< {header} /Length {len(data)} >>\nstream\n'.encode('ascii') + data + b'\nendstream'
+
+
+def image_bytes_to_pdf(image_bytes):
+    """
+    PDF μίας σελίδας A4 με την εικόνα ενσωματωμένη απευθείας.
+
+    Raises:
+        PIL.UnidentifiedImageError: Αν τα bytes δεν είναι εικόνα που αναγνωρίζεται
+    """
+    header, data, (width_px, height_px), display_size = _image_stream(image_bytes)
+    x, y, width, height = _placement(*display_size)
+    content = f'q {width:.2f} 0 0 {height:.2f} {x:.2f} {y:.2f} cm /Im0 Do Q'.encode('ascii')
+
+    return _write_pdf([
+        b'<< /Type /Catalog /Pages 2 0 R >>',
+        b'<< /Type /Pages /Kids [3 0 R] /Count 1 >>',
+        (
+            f'<< /Type /Page /Parent 2 0 R /MediaBox [0 0 {PAGE_WIDTH} {PAGE_HEIGHT}] '
+            '/Resources << /XObject << /Im0 5 0 R >> >> /Contents 4 0 R >>'
+        ).encode('ascii'),
+        _stream_object('', content),
+        _stream_object(
+            f'/Type /XObject /Subtype /Image /Width {width_px} /Height {height_px} {header}', data,
+        ),
+    ])
@@ -0,0 +1,124 @@
+"""
+Δεδομένα ημερολογίου αδειών για προϊσταμένους.
+
+Τα διαστήματα φιλτράρονται στη βάση με το παράθυρο ημερομηνιών
+(start_date <= τέλος, end_date >= αρχή) και κατανέμονται στις ημέρες με
+sweep-line: ταξινόμηση κατά έναρξη και σωρός ενεργών διαστημάτων κατά λήξη,
+O((ημέρες + διαστήματα) log διαστήματα) αντί για ημέρες × διαστήματα.
+Τα αποτελέσματα κρατιούνται στο cache ανά (τμήμα, διάστημα ημερομηνιών) και
+ακυρώνονται σε κάθε αλλαγή κατάστασης ή διαστημάτων αίτησης.
+"""
+import hashlib
+import heapq
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+
+from accounts.department_utils import SDEY_DEPARTMENT_TYPE_CODES
+from leaves.models import LeavePeriod
+from leaves.utils.cache_versions import bump_cache_version, versioned_cache_get_or_set
+
+User = get_user_model()
+
+CACHE_VERSION_NAME = 'leave_calendar'
+CACHE_TIMEOUT = 600
+
+# Καταστάσεις αιτήσεων που εμφανίζονται στο ημερολόγιο
+CALENDAR_STATUSES = ['PENDING_PROTOCOL', 'WAITING_FOR_DOCUMENTS', 'IN_REVIEW', 'COMPLETED']
+
+
+def calendar_scope_user_ids(manager):
+    """Υπάλληλοι που βλέπει ο προϊστάμενος στο ημερολόγιο (υφιστάμενοι + ΣΔΕΥ για ΚΕΔΑΣΥ)."""
+    user_ids = set(manager.get_subordinates().values_list('pk', flat=True))
+
+    department = manager.department
+    if department and department.department_type and department.department_type.code == 'KEDASY':
+        user_ids.update(User.objects.filter(
+            department__department_type__code__in=SDEY_DEPARTMENT_TYPE_CODES,
+            department__parent_department=department,
+            is_active=True,
+        ).values_list('pk', flat=True))
+
+    return sorted(user_ids)
+
+
+def _load_calendar_events(user_ids, start_date, end_date):
+    rows = LeavePeriod.objects.filter(
+        leave_request__user_id__in=user_ids,
+        leave_request__status__in=CALENDAR_STATUSES,
+        leave_request__leave_type__is_revocation=False,
+        start_date__lte=end_date,
+        end_date__gte=start_date,
+    ).order_by('start_date', 'leave_request_id').values_list(
+        'leave_request_id', 'start_date', 'end_date',
+        'leave_request__status',
+        'leave_request__leave_type_id', 'leave_request__leave_type__name',
+        'leave_request__user__first_name', 'leave_request__user__last_name',
+    )
+    return [
+        {
+            'request_id': request_id,
+            # Περικοπή στο ζητούμενο διάστημα
+            'start': max(period_start, start_date),
+            'end': min(period_end, end_date),
+            'status': status,
+            'leave_type_id': leave_type_id,
+            'leave_type': leave_type_name,
+            'user_name': f'{first_name} {last_name}',
+        }
+        for (request_id, period_start, period_end, status, leave_type_id,
+             leave_type_name, first_name, last_name) in rows
+    ]
+
+
+def get_calendar_events(manager, start_date, end_date, user_ids=None):
+    """
+    Διαστήματα αδειών του τμήματος που τέμνουν το [start_date, end_date].
+
+    Args:
+        manager: Ο προϊστάμενος (ορίζει το σύνολο υπαλλήλων)
+        start_date / end_date: Όρια διαστήματος (inclusive)
+        user_ids (list, optional): Ήδη υπολογισμένο calendar_scope_user_ids
+
+    Returns:
+        list[dict]: Γεγονότα με start/end περικομμένα στο διάστημα
+    """
+    if user_ids is None:
+        user_ids = calendar_scope_user_ids(manager)
+    if not user_ids:
+        return []
+    scope = hashlib.sha1(','.join(map(str, user_ids)).encode()).hexdigest()[:16]
+    key = f'{manager.department_id}:{start_date.isoformat()}:{end_date.isoformat()}:{scope}'
+    return versioned_cache_get_or_set(
+        CACHE_VERSION_NAME, key,
+        lambda: _load_calendar_events(user_ids, start_date, end_date),
+        timeout=CACHE_TIMEOUT,
+    )
+
+
+def bucket_events_by_day(events, start_date, end_date):
+    """
+    Κατανομή γεγονότων στις ημέρες του διαστήματος (sweep-line).
+
+    Returns:
+        dict: date -> λίστα γεγονότων της ημέρας (με σειρά έναρξης)
+    """
+    ordered = sorted(enumerate(events), key=lambda item: (item[1]['start'], item[0]))
+    active = []  # heap (end, order, event)
+    buckets = {}
+    next_index = 0
+    day = start_date
+    while day <= end_date:
+        while next_index < len(ordered) and ordered[next_index][1]['start'] <= day:
+            order, event = ordered[next_index]
+            heapq.heappush(active, (event['end'], order, event))
+            next_index += 1
+        while active and active[0][0] < day:
+            heapq.heappop(active)
+        buckets[day] = [event for _, _, event in sorted(active, key=lambda item: item[1])]
+        day += timedelta(days=1)
+    return buckets
+
+
+def invalidate_leave_calendar():
+    bump_cache_version(CACHE_VERSION_NAME)
@@ -8,17 +8,16 @@ PDF Merger — Δημιουργία ενοποιημένου PDF αίτησης
 """
 import os
 import re
-import base64
 from io import BytesIO
 
-from django.template.loader import render_to_string
 from django.conf import settings
 from django.utils import timezone
 
-from weasyprint import HTML
 from pypdf import PdfReader, PdfWriter
 
 from leaves.crypto_utils import SecureFileHandler
+from leaves.utils.image_pdf import image_bytes_to_pdf
+from leaves.utils.pdf_renderer import render_pdf
 
 
 def _sanitize_filename_part(value, fallback='unknown'):
@@ -68,25 +67,12 @@ def build_merged_pdf_filename(leave_request, reference_date=None):
     return f'{date_str}_{full_name}_{leave_type_name}.pdf'
 
 
-def image_to_pdf_bytes(image_bytes, filename_hint=''):
+def image_to_pdf_bytes(image_bytes):
     """
-    Μετατρέπει bytes εικόνας (JPG/PNG) σε PDF bytes (μία σελίδα).
-    Χρησιμοποιεί WeasyPrint με base64 embedded <img>.
+    Μετατρέπει bytes εικόνας (JPG/PNG) σε PDF bytes (μία σελίδα A4).
+    Η εικόνα ενσωματώνεται απευθείας, με υποδειγματοληψία στο ATTACHMENT_IMAGE_PDF_DPI.
     """
-    mime = 'image/png'
-    if filename_hint.lower().endswith('.jpg') or filename_hint.lower().endswith('.jpeg'):
-        mime = 'image/jpeg'
-    b64 = base64.b64encode(image_bytes).decode('ascii')
-    html = (
-        '<!DOCTYPE html><html><head><meta charset="utf-8"><style>'
-        '@page { size: A4; margin: 1cm; }'
-        'body { margin: 0; padding: 0; text-align: center; }'
-        'img { max-width: 100%; max-height: 100%; }'
-        '</style></head><body>'
-        f'<img src="data:{mime};base64,{b64}" alt="attachment"/>'
-        '</body></html>'
-    )
-    return HTML(string=html).write_pdf()
+    return image_bytes_to_pdf(image_bytes)
 
 
 def build_attachments_index_pdf(attachments_list, total_attachment_pages=0):
@@ -95,11 +81,10 @@ def build_attachments_index_pdf(attachments_list, total_attachment_pages=0):
     attachments_list: list of dicts με 'filename', 'description' keys
     total_attachment_pages: άθροισμα σελίδων όλων των συνημμένων
     """
-    html = render_to_string('leaves/pdf_attachments_index.html', {
+    return render_pdf('leaves/pdf_attachments_index.html', {
         'attachments_list': attachments_list,
         'total_attachment_pages': total_attachment_pages,
     })
-    return HTML(string=html).write_pdf()
 
 
 def build_leave_request_pdf(leave_request):
@@ -115,30 +100,32 @@ def build_leave_request_pdf(leave_request):
         'request_text': leave_request.description or '',
         'attachments': list(leave_request.attachments.all()),
     }
-    html = render_to_string('leaves/pdf_template.html', context)
-    return HTML(string=html).write_pdf()
+    return render_pdf('leaves/pdf_template.html', context)
+
+
+def attachment_bytes_to_pdf(attachment, decrypted):
+    """PDF bytes από το αποκρυπτογραφημένο περιεχόμενο συνημμένου (None για μη υποστηριζόμενο τύπο)."""
+    ext = attachment.file_extension
+    if ext == 'pdf':
+        return decrypted
+    elif ext in ('jpg', 'jpeg', 'png'):
+        return image_to_pdf_bytes(decrypted)
+    # Μη υποστηριζόμενος τύπος
+    return None
 
 
 def convert_attachment_to_pdf(attachment, handler):
     """
-    Αποκρυπτογραφεί ένα συνημμένο και το μετατρέπει σε PDF bytes.
-    Επιστρέφει (pdf_bytes, filename, description) ή None σε περίπτωση σφάλματος.
+    Αποκρυπτογραφεί ένα συνημμένο και το μετατρέπει σε PDF bytes (μέσω του cache μετατροπών).
+    Επιστρέφει τα PDF bytes ή None σε περίπτωση σφάλματος.
     """
+    from leaves.utils.attachment_pdf_cache import get_attachment_pdf_parts
+
     try:
-        ext = attachment.file_extension
-        decrypted = handler.load_encrypted_file(attachment.file_path, attachment.encryption_key)
-        if decrypted is None:
-            return None
-
-        if ext == 'pdf':
-            return decrypted
-        elif ext in ('jpg', 'jpeg', 'png'):
-            return image_to_pdf_bytes(decrypted, attachment.original_filename)
-        else:
-            # Μη υποστηριζόμενος τύπος
-            return None
+        parts = get_attachment_pdf_parts([attachment], handler)
     except Exception:
         return None
+    return parts[0][1] if parts else None
 
 
 def build_merged_pdf(leave_request):
@@ -148,6 +135,8 @@ def build_merged_pdf(leave_request):
     Returns:
         bytes: Το πλήρες ενοποιημένο PDF
     """
+    from leaves.utils.attachment_pdf_cache import get_attachment_pdf_parts
+
     writer = PdfWriter()
     handler = SecureFileHandler()
 
@@ -155,23 +144,15 @@ def build_merged_pdf(leave_request):
     leave_pdf = build_leave_request_pdf(leave_request)
     writer.append(BytesIO(leave_pdf))
 
-    # 2. Μετατροπή συνημμένων + μέτρηση σελίδων πριν το ευρετήριο
+    # 2. Συνημμένα ως PDF + σελίδες (από το cache μετατροπών) πριν το ευρετήριο
     attachments_qs = list(leave_request.attachments.all().order_by('uploaded_at'))
     if attachments_qs:
-        attachments_list = []
-        converted_attachments = []
-        total_attachment_pages = 0
-
-        for att in attachments_qs:
-            attachments_list.append({
-                'filename': att.original_filename,
-                'description': att.description or '',
-            })
-            pdf_bytes = convert_attachment_to_pdf(att, handler)
-            if pdf_bytes is not None:
-                pages = count_pdf_pages(pdf_bytes)
-                total_attachment_pages += pages
-                converted_attachments.append(pdf_bytes)
+        attachments_list = [
+            {'filename': att.original_filename, 'description': att.description or ''}
+            for att in attachments_qs
+        ]
+        parts = get_attachment_pdf_parts(attachments_qs, handler)
+        total_attachment_pages = sum(page_count for _att, _pdf, page_count in parts)
 
         index_pdf = build_attachments_index_pdf(
             attachments_list,
@@ -180,7 +161,7 @@ def build_merged_pdf(leave_request):
         writer.append(BytesIO(index_pdf))
 
         # 3. Κάθε συνημμένο σε δική του σελίδα/σελίδες
-        for pdf_bytes in converted_attachments:
+        for _att, pdf_bytes, _page_count in parts:
             writer.append(BytesIO(pdf_bytes))
 
     # Εξαγωγή
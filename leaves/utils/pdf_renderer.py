@@ -0,0 +1,135 @@
+"""
+Κοινός renderer PDF (WeasyPrint) της διεργασίας.
+
+Κάθε οικογένεια εγγράφων (αίτηση, ευρετήριο συνημμένων, παρουσιολόγιο,
+απόφαση) έχει το stylesheet της σε leaves/pdf_styles/ (η απόφαση
+στο DECISION_PDF_CSS, κοινό με την προεπισκόπηση). Τα stylesheets μεταγλωττίζονται
+μία φορά ανά διεργασία με ένα κοινό FontConfiguration, οπότε το «κρύο» κόστος
+(CSS, γραμματοσειρές, @font-face) πληρώνεται μία φορά ανά worker και όχι ανά έγγραφο.
+
+Το πλήθος ταυτόχρονων renders ανά διεργασία περιορίζεται (PDF_RENDER_CONCURRENCY)·
+όποιος περιμένει περισσότερο από PDF_RENDER_WAIT_TIMEOUT παίρνει PdfRendererBusy,
+ώστε το αίτημα να αποτύχει ελεγχόμενα πριν το timeout του gunicorn.
+"""
+import logging
+import threading
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.template.loader import render_to_string
+
+from pdede_leaves.profiling import profile_span
+
+logger = logging.getLogger(__name__)
+
+PDF_STYLES_DIR = Path(__file__).resolve().parent.parent / 'pdf_styles'
+
+# Template -> οικογένεια stylesheet
+TEMPLATE_FAMILIES = {
+    'leaves/pdf_template.html': 'leave_request',
+    'leaves/pdf_attachments_index.html': 'attachments_index',
+    'leaves/attendance_pdf_template.html': 'attendance',
+    'leaves/decision_pdf_template.html': 'decision',
+}
+
+STYLE_FAMILIES = ('leave_request', 'attachments_index', 'attendance', 'decision')
+
+
+class PdfRendererBusy(Exception):
+    """Δεν βρέθηκε ελεύθερη θέση render μέσα στο χρονικό όριο αναμονής."""
+
+
+def _stylesheet_source(family):
+    if family == 'decision':
+        from leaves.decision_helpers import DECISION_PDF_CSS
+        return DECISION_PDF_CSS
+    if family not in STYLE_FAMILIES:
+        raise ValueError(f'Άγνωστη οικογένεια PDF: {family}')
+    return (PDF_STYLES_DIR / f'{family}.css').read_text(encoding='utf-8')
+
+
+class PdfRenderer:
+    """FontConfiguration και μεταγλωττισμένα stylesheets κοινά για όλα τα renders."""
+
+    def __init__(self, max_concurrent=None, wait_timeout=None):
+        if max_concurrent is None:
+            max_concurrent = getattr(settings, 'PDF_RENDER_CONCURRENCY', 1)
+        if wait_timeout is None:
+            wait_timeout = getattr(settings, 'PDF_RENDER_WAIT_TIMEOUT', 60)
+        self.wait_timeout = wait_timeout
+        self._slots = threading.BoundedSemaphore(max(1, max_concurrent))
+        self._lock = threading.RLock()
+        self._font_config = None
+        self._stylesheets = {}
+
+    def font_config(self):
+        if self._font_config is None:
+            with self._lock:
+                if self._font_config is None:
+                    from weasyprint.text.fonts import FontConfiguration
+                    self._font_config = FontConfiguration()
+        return self._font_config
+
+    def stylesheet(self, family):
+        """Το μεταγλωττισμένο CSS της οικογένειας (μία φορά ανά διεργασία)."""
+        css = self._stylesheets.get(family)
+        if css is None:
+            with self._lock:
+                css = self._stylesheets.get(family)
+                if css is None:
+                    from weasyprint import CSS
+                    css = CSS(string=_stylesheet_source(family), font_config=self.font_config())
+                    self._stylesheets[family] = css
+        return css
+
+    def warm_up(self):
+        """Προφόρτωση γραμματοσειρών και όλων των stylesheets."""
+        for family in STYLE_FAMILIES:
+            self.stylesheet(family)
+
+    def reset(self):
+        with self._lock:
+            self._font_config = None
+            self._stylesheets = {}
+
+    def render_html(self, html, family=None, target=None):
+        """
+        PDF από έτοιμο HTML.
+
+        Args:
+            html (str): Το έγγραφο
+            family (str): Οικογένεια stylesheet (None: μόνο τα inline styles του HTML)
+            target: Διαδρομή ή file object· αλλιώς επιστρέφονται τα bytes
+        """
+        from weasyprint import HTML
+
+        stylesheets = [self.stylesheet(family)] if family else None
+        font_config = self.font_config()
+        if not self._slots.acquire(timeout=self.wait_timeout):
+            raise PdfRendererBusy('Η δημιουργία PDF είναι απασχολημένη, δοκιμάστε ξανά.')
+        started = time.monotonic()
+        try:
+            with profile_span('pdf'):
+                return HTML(string=html).write_pdf(
+                    target, stylesheets=stylesheets, font_config=font_config,
+                )
+        finally:
+            self._slots.release()
+            logger.debug('PDF %s rendered in %.3fs', family or '-', time.monotonic() - started)
+
+    def render(self, template_name, context, target=None):
+        """PDF από Django template με το stylesheet της οικογένειάς του."""
+        html = render_to_string(template_name, context)
+        return self.render_html(html, family=TEMPLATE_FAMILIES.get(template_name), target=target)
+
+
+pdf_renderer = PdfRenderer()
+
+
+def render_pdf(template_name, context, target=None):
+    return pdf_renderer.render(template_name, context, target=target)
+
+
+def render_html_to_pdf(html, family=None, target=None):
+    return pdf_renderer.render_html(html, family=family, target=target)
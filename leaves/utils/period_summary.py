@@ -0,0 +1,46 @@
+"""Συμπλήρωση/διόρθωση των πεδίων σύνοψης διαστημάτων (first_start_date, last_end_date, total_days)."""
+from leaves.models import LeavePeriod, LeaveRequest, period_summary
+
+SUMMARY_FIELDS = ('first_start_date', 'last_end_date', 'total_days')
+
+
+def backfill_period_summaries(batch_size=500, dry_run=False):
+    """
+    Επαναϋπολογίζει τη σύνοψη διαστημάτων όλων των αιτήσεων σε παρτίδες.
+
+    Args:
+        batch_size (int): Αιτήσεις ανά παρτίδα
+        dry_run (bool): Μόνο καταμέτρηση, χωρίς αποθήκευση
+
+    Returns:
+        int: Πλήθος αιτήσεων που είχαν λάθος τιμές
+    """
+    changed = 0
+    last_pk = 0
+    while True:
+        batch = list(
+            LeaveRequest.objects.filter(pk__gt=last_pk)
+            .order_by('pk')
+            .only('pk', *SUMMARY_FIELDS)[:batch_size]
+        )
+        if not batch:
+            return changed
+        last_pk = batch[-1].pk
+
+        periods_by_request = {}
+        for leave_request_id, start_date, end_date in LeavePeriod.objects.filter(
+            leave_request_id__in=[lr.pk for lr in batch],
+        ).values_list('leave_request_id', 'start_date', 'end_date'):
+            periods_by_request.setdefault(leave_request_id, []).append((start_date, end_date))
+
+        stale = []
+        for lr in batch:
+            summary = period_summary(periods_by_request.get(lr.pk, ()))
+            if any(getattr(lr, field) != value for field, value in summary.items()):
+                for field, value in summary.items():
+                    setattr(lr, field, value)
+                stale.append(lr)
+
+        changed += len(stale)
+        if stale and not dry_run:
+            LeaveRequest.objects.bulk_update(stale, SUMMARY_FIELDS)
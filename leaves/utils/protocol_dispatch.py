@@ -0,0 +1,145 @@
+"""
+Ασύγχρονη αποστολή αίτησης στο πρωτόκολλο.
+
+Pipeline (Celery, βλ. leaves/tasks.py):
+  1. build_protocol_pdf    — δημιουργία ενοποιημένου PDF, κρυπτογράφηση και αποθήκευση
+  2. send_protocol_email   — αποστολή του αποθηκευμένου PDF μέσω email
+
+Η κατάσταση κρατιέται στα πεδία protocol_dispatch_* του LeaveRequest ώστε
+το dashboard του χειριστή να την παρακολουθεί μέσω HTMX polling. Κάθε
+αποστολή έχει idempotency key: διπλό submit της ίδιας φόρμας ή επανάληψη
+task από τον broker δεν στέλνει δεύτερο email. Αποστολή που έμεινε σε QUEUED/BUILDING
+πέρα από PROTOCOL_DISPATCH_STALE_MINUTES (χαμένο task, νεκρός worker) σημειώνεται
+FAILED στο επόμενο polling ή submit, ώστε να σταματά το polling και να επιτρέπεται νέα
+αποστολή με το ίδιο key.
+"""
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from leaves.models import LeaveRequest
+
+# Καταστάσεις πριν από το SENDING: η επανάληψη δεν κινδυνεύει να στείλει δεύτερο email
+STALE_DISPATCH_STATUSES = ('QUEUED', 'BUILDING')
+
+
+def new_dispatch_key():
+    """Νέο idempotency key για φόρμα αποστολής στο πρωτόκολλο."""
+    return uuid.uuid4().hex
+
+
+def submission_dispatch_key(leave_request):
+    """Idempotency key της αυτόματης αποστολής κατά την υποβολή (μία ανά αίτηση)."""
+    return f'submit-{leave_request.pk}'
+
+
+def enqueue_protocol_dispatch(leave_request, recipient, subject='', idempotency_key=None):
+    """
+    Προγραμματίζει δημιουργία ενοποιημένου PDF και αποστολή του στο πρωτόκολλο.
+
+    Η εργασία στέλνεται στον broker μετά το commit της τρέχουσας συναλλαγής.
+
+    Args:
+        leave_request: LeaveRequest instance
+        recipient (str): Email παραλήπτη
+        subject (str): Προσαρμοσμένο θέμα (κενό = default)
+        idempotency_key (str, optional): Κλειδί αποστολής· αν λείπει, δημιουργείται νέο
+
+    Returns:
+        bool: False αν η ίδια αποστολή (ίδιο key) είναι ήδη σε εξέλιξη ή έχει σταλεί
+    """
+    key = (idempotency_key or new_dispatch_key())[:64]
+
+    with transaction.atomic():
+        current = LeaveRequest.objects.select_for_update().only(
+            'protocol_dispatch_key', 'protocol_dispatch_status', 'protocol_dispatch_updated_at',
+        ).get(pk=leave_request.pk)
+        if current.protocol_dispatch_key == key and (
+            (current.is_protocol_dispatch_active and not is_dispatch_stale(current))
+            or current.protocol_dispatch_status == 'SENT'
+        ):
+            return False
+
+        leave_request.protocol_dispatch_key = key
+        leave_request.protocol_dispatch_status = 'QUEUED'
+        leave_request.protocol_dispatch_error = ''
+        leave_request.protocol_dispatch_updated_at = timezone.now()
+        leave_request.save(update_fields=[
+            'protocol_dispatch_key', 'protocol_dispatch_status',
+            'protocol_dispatch_error', 'protocol_dispatch_updated_at',
+        ])
+
+        from leaves.tasks import start_protocol_dispatch
+        leave_request_id = leave_request.pk
+        transaction.on_commit(
+            lambda: start_protocol_dispatch(leave_request_id, key, recipient, subject)
+        )
+    return True
+
+
+def set_dispatch_status(leave_request_id, key, status, error=''):
+    """
+    Ενημερώνει την κατάσταση μόνο αν η αποστολή `key` είναι ακόμη η τρέχουσα.
+
+    Returns:
+        bool: False αν στο μεταξύ ξεκίνησε νεότερη αποστολή
+    """
+    updated = LeaveRequest.objects.filter(
+        pk=leave_request_id,
+        protocol_dispatch_key=key,
+    ).update(
+        protocol_dispatch_status=status,
+        protocol_dispatch_error=error,
+        protocol_dispatch_updated_at=timezone.now(),
+    )
+    return bool(updated)
+
+
+def is_dispatch_stale(leave_request):
+    """True αν η αποστολή είναι σε QUEUED/BUILDING περισσότερο από PROTOCOL_DISPATCH_STALE_MINUTES."""
+    updated_at = leave_request.protocol_dispatch_updated_at
+    return (
+        leave_request.protocol_dispatch_status in STALE_DISPATCH_STATUSES
+        and updated_at is not None
+        and updated_at < timezone.now() - timedelta(minutes=settings.PROTOCOL_DISPATCH_STALE_MINUTES)
+    )
+
+
+def fail_stale_dispatch(leave_request):
+    """
+    Σημειώνει ως FAILED αποστολή που κόλλησε (βλ. is_dispatch_stale) και ενημερώνει
+    το instance.
+
+    Returns:
+        bool: True αν η αποστολή σημειώθηκε αποτυχημένη
+    """
+    if not is_dispatch_stale(leave_request):
+        return False
+    error = (
+        f'Η αποστολή δεν προχώρησε για {settings.PROTOCOL_DISPATCH_STALE_MINUTES} λεπτά '
+        f'({leave_request.get_protocol_dispatch_status_display()}) — δοκιμάστε ξανά.'
+    )
+    now = timezone.now()
+    # Μόνο αν δεν άλλαξε στο μεταξύ (π.χ. ο worker προχώρησε ή ξεκίνησε νέα αποστολή)
+    updated = LeaveRequest.objects.filter(
+        pk=leave_request.pk,
+        protocol_dispatch_key=leave_request.protocol_dispatch_key,
+        protocol_dispatch_status=leave_request.protocol_dispatch_status,
+        protocol_dispatch_updated_at=leave_request.protocol_dispatch_updated_at,
+    ).update(
+        protocol_dispatch_status='FAILED',
+        protocol_dispatch_error=error,
+        protocol_dispatch_updated_at=now,
+    )
+    if not updated:
+        return False
+    leave_request.protocol_dispatch_status = 'FAILED'
+    leave_request.protocol_dispatch_error = error
+    leave_request.protocol_dispatch_updated_at = now
+
+    from leaves.utils.protocol_email_alerts import mark_protocol_email_failed
+    mark_protocol_email_failed(leave_request)
+    return True
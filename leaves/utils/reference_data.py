@@ -0,0 +1,119 @@
+"""
+Δεδομένα αναφοράς που αλλάζουν σπάνια (στοιχεία αποφάσεων, χρώματα τύπων άδειας).
+
+Τα ενεργά Λογότυπα / Πληροφορίες / Υπόψη / Υπογράφοντες φορτώνονται μαζί (ένα query
+ανά πίνακα) και κρατιούνται στο cache με μετρητή έκδοσης· το ίδιο τα χρώματα των
+τύπων άδειας του ημερολογίου. Τα signals του leaves αυξάνουν την έκδοση σε κάθε
+αποθήκευση/διαγραφή (π.χ. από το admin).
+"""
+from leaves.models import Info, LeaveType, Logo, Signee, Ypopsin
+from leaves.utils.cache_versions import bump_cache_version, versioned_cache_get_or_set
+
+CACHE_VERSION_NAME = 'decision_reference_data'
+LEAVE_TYPE_COLORS_VERSION_NAME = 'leave_type_colors'
+
+REFERENCE_CACHE_TIMEOUT = 60 * 60
+
+# Κλειδί στο cached λεξικό -> μοντέλο (σειρά Meta.ordering, άρα το πρώτο είναι το get_active)
+REFERENCE_MODELS = {
+    'logos': Logo,
+    'infos': Info,
+    'ypopsins': Ypopsin,
+    'signees': Signee,
+}
+
+# Χρώματα ημερολογίου ανά τύπο άδειας (κυκλικά, κατά id)
+LEAVE_TYPE_COLORS = [
+    '#007bff',  # Primary blue
+    '#28a745',  # Success green
+    '#dc3545',  # Danger red
+    '#ffc107',  # Warning yellow
+    '#17a2b8',  # Info cyan
+    '#6f42c1',  # Purple
+    '#e83e8c',  # Pink
+    '#fd7e14',  # Orange
+    '#20c997',  # Teal
+    '#6c757d',  # Secondary gray
+    '#795548',  # Brown
+    '#607d8b',  # Blue gray
+    '#f44336',  # Red
+    '#e91e63',  # Pink
+    '#9c27b0',  # Purple
+    '#673ab7',  # Deep purple
+    '#3f51b5',  # Indigo
+    '#2196f3',  # Blue
+    '#03a9f4',  # Light blue
+    '#00bcd4',  # Cyan
+]
+
+
+def _model_key(model):
+    for key, reference_model in REFERENCE_MODELS.items():
+        if reference_model is model:
+            return key
+    raise ValueError(f'{model.__name__} is not a decision reference model')
+
+
+def _compute_active_reference_data():
+    return {
+        key: list(model.objects.filter(is_active=True))
+        for key, model in REFERENCE_MODELS.items()
+    }
+
+
+def get_active_reference_data():
+    """
+    Ενεργές εγγραφές όλων των πινάκων αναφοράς αποφάσεων.
+
+    Returns:
+        dict: {'logos': [Logo, ...], 'infos': [...], 'ypopsins': [...], 'signees': [...]}
+    """
+    return versioned_cache_get_or_set(
+        CACHE_VERSION_NAME, 'active', _compute_active_reference_data, timeout=REFERENCE_CACHE_TIMEOUT,
+    )
+
+
+def get_active_reference(model):
+    """Η πρώτη ενεργή εγγραφή του μοντέλου (όπως το Model.get_active)."""
+    items = get_active_reference_data()[_model_key(model)]
+    return items[0] if items else None
+
+
+def get_reference_by_id(model, pk):
+    """
+    Εγγραφή αναφοράς με id: από τις cached ενεργές, αλλιώς από τη βάση
+    (ανενεργές εγγραφές που έχουν ήδη επιλεγεί σε αποφάσεις).
+    """
+    if not pk:
+        return None
+    try:
+        pk = int(pk)
+    except (TypeError, ValueError):
+        return None
+    for item in get_active_reference_data()[_model_key(model)]:
+        if item.pk == pk:
+            return item
+    return model.objects.filter(pk=pk).first()
+
+
+def invalidate_reference_data():
+    bump_cache_version(CACHE_VERSION_NAME)
+
+
+def _compute_leave_type_colors():
+    leave_type_ids = LeaveType.objects.filter(is_active=True).order_by('id').values_list('id', flat=True)
+    return {
+        leave_type_id: LEAVE_TYPE_COLORS[index % len(LEAVE_TYPE_COLORS)]
+        for index, leave_type_id in enumerate(leave_type_ids)
+    }
+
+
+def get_leave_type_colors():
+    """Λεξικό id τύπου άδειας -> χρώμα ημερολογίου."""
+    return versioned_cache_get_or_set(
+        LEAVE_TYPE_COLORS_VERSION_NAME, 'all', _compute_leave_type_colors, timeout=REFERENCE_CACHE_TIMEOUT,
+    )
+
+
+def invalidate_leave_type_colors():
+    bump_cache_version(LEAVE_TYPE_COLORS_VERSION_NAME)
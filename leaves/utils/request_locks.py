@@ -0,0 +1,98 @@
+"""
+Κλείδωμα αιτήσεων από χειριστές ως leases στο Redis.
+
+Κάθε κλείδωμα είναι ένα κλειδί ανά αίτηση με TTL· η λήξη γίνεται από το ίδιο
+το Redis, χωρίς UPDATE στον πίνακα αιτήσεων. Τα dashboards διαβάζουν την
+κατάσταση όλων των αιτήσεων της σελίδας με ένα MGET (get_locks).
+
+Αν το cache δεν είναι διαθέσιμο, το κλείδωμα είναι συμβουλευτικό: οι αναγνώσεις
+βλέπουν την αίτηση ξεκλείδωτη, το κλείδωμα θεωρείται ότι δόθηκε και το ξεκλείδωμα
+δεν κάνει τίποτα.
+"""
+import logging
+
+from django.core.cache import cache
+from django.utils import timezone
+
+logger = logging.getLogger(__name__)
+
+LOCK_TIMEOUT_MINUTES = 30
+
+
+def _lock_key(leave_request_id):
+    return f'leaves:lock:{leave_request_id}'
+
+
+def get_lock(leave_request_id):
+    """Το ενεργό κλείδωμα της αίτησης (dict user_id/user_name/locked_at) ή None."""
+    try:
+        return cache.get(_lock_key(leave_request_id))
+    except Exception as exc:
+        logger.warning('Cache unavailable reading request lock: %s', exc)
+        return None
+
+
+def get_locks(leave_request_ids):
+    """Λεξικό leave_request_id -> κλείδωμα, μόνο για όσες αιτήσεις είναι κλειδωμένες."""
+    keys = {_lock_key(pk): pk for pk in leave_request_ids}
+    if not keys:
+        return {}
+    try:
+        found = cache.get_many(list(keys))
+    except Exception as exc:
+        logger.warning('Cache unavailable reading request locks: %s', exc)
+        return {}
+    return {keys[key]: lease for key, lease in found.items()}
+
+
+def acquire_lock(leave_request_id, user):
+    """
+    Κλειδώνει την αίτηση για τον χειριστή ή ανανεώνει το δικό του κλείδωμα.
+
+    Returns:
+        tuple: (True, lease) αν ο χρήστης κατέχει πλέον το κλείδωμα,
+        (False, lease άλλου χειριστή) αν είναι ήδη κλειδωμένη
+    """
+    key = _lock_key(leave_request_id)
+    timeout = LOCK_TIMEOUT_MINUTES * 60
+    lease = {'user_id': user.pk, 'user_name': user.full_name, 'locked_at': timezone.now()}
+
+    try:
+        return _acquire(key, lease, user, timeout)
+    except Exception as exc:
+        logger.warning('Cache unavailable acquiring request lock: %s', exc)
+        return True, lease
+
+
+def _acquire(key, lease, user, timeout):
+    if cache.add(key, lease, timeout):
+        return True, lease
+    holder = cache.get(key)
+    if holder is None and cache.add(key, lease, timeout):
+        # Έληξε ανάμεσα στο add και στο get
+        return True, lease
+    holder = holder or cache.get(key)
+    if holder and holder['user_id'] == user.pk:
+        cache.set(key, lease, timeout)
+        return True, lease
+    return False, holder
+
+
+def release_lock(leave_request_id, user, force=False):
+    """
+    Ξεκλειδώνει την αίτηση.
+
+    Returns:
+        bool: False αν την κατέχει άλλος χειριστής και δεν δόθηκε force
+    """
+    key = _lock_key(leave_request_id)
+    try:
+        holder = cache.get(key)
+        if holder is None:
+            return True
+        if holder['user_id'] != user.pk and not force:
+            return False
+        cache.delete(key)
+    except Exception as exc:
+        logger.warning('Cache unavailable releasing request lock: %s', exc)
+    return True
@@ -0,0 +1,124 @@
+"""
+Cache των badges του role switcher (εκκρεμότητες ανά ρόλο).
+
+Κάθε χρήστης έχει ένα κλειδί με τους μετρητές όλων των ρόλων του· το πλήθος
+εκκρεμών εγγραφών (κοινό για όλους τους χειριστές) έχει δικό του κλειδί. Και τα δύο
+διαβάζονται με ένα get_many, άρα η απόδοση των badges κοστίζει ένα round trip στο
+Redis αντί για έως πέντε queries ανά σελίδα.
+
+Τα κλειδιά διαγράφονται από τα signals όταν μια αλλαγή κατάστασης αίτησης αφορά
+τον χρήστη: ο ίδιος ο αιτών, οι χρήστες του τμήματός του και του γονικού τμήματος
+(προϊστάμενοι/γραμματείς ΚΕΔΑΣΥ) και οι χειριστές. Το σύντομο TTL καλύπτει αλλαγές
+που δεν περνούν από signals (π.χ. αλλαγή προϊσταμένου τμήματος, μαζικά .update()).
+"""
+import logging
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Q
+
+from accounts.role_constants import ROLE_LEAVE_HANDLER
+
+logger = logging.getLogger(__name__)
+
+User = get_user_model()
+
+BADGE_CACHE_TIMEOUT = 60
+
+REGISTRATIONS_KEY = 'leaves:role_badges:pending_registrations'
+
+# Καταστάσεις που μετρούν στα badges κάθε ρόλου (βλ. role_context.get_role_pending_counts)
+EMPLOYEE_BADGE_STATUSES = {'SUBMITTED', 'PENDING_PROTOCOL', 'WAITING_FOR_DOCUMENTS'}
+DEPARTMENT_BADGE_STATUSES = {'SUBMITTED', 'PENDING_KEDASY_PROTOCOL'}
+HANDLER_BADGE_STATUSES = {'PENDING_PROTOCOL'}
+
+
+def _user_key(user_id):
+    return f'leaves:role_badges:user:{user_id}'
+
+
+def read_role_badges(user_id, with_registrations=False):
+    """
+    Cached badges χρήστη σε ένα round trip.
+
+    Returns:
+        tuple: (μετρητές ρόλων | None, πλήθος εκκρεμών εγγραφών | None)
+    """
+    keys = [_user_key(user_id)]
+    if with_registrations:
+        keys.append(REGISTRATIONS_KEY)
+    try:
+        values = cache.get_many(keys)
+    except Exception as exc:
+        logger.warning('Cache unavailable reading role badges: %s', exc)
+        return None, None
+    return values.get(_user_key(user_id)), values.get(REGISTRATIONS_KEY)
+
+
+def store_role_badges(user_id, counts=None, registrations=None):
+    """Αποθήκευση των υπολογισμένων badges (όσα δεν είναι None)."""
+    values = {}
+    if counts is not None:
+        values[_user_key(user_id)] = counts
+    if registrations is not None:
+        values[REGISTRATIONS_KEY] = registrations
+    if not values:
+        return
+    try:
+        cache.set_many(values, BADGE_CACHE_TIMEOUT)
+    except Exception as exc:
+        logger.warning('Cache unavailable writing role badges: %s', exc)
+
+
+def _delete_keys(keys):
+    try:
+        cache.delete_many(keys)
+    except Exception as exc:
+        logger.warning('Cache unavailable deleting role badges: %s', exc)
+
+
+def _invalidate_keys(keys):
+    """Διαγραφή αμέσως και ξανά μετά το commit (όπως το bump_cache_version)."""
+    keys = list(keys)
+    if not keys:
+        return
+    _delete_keys(keys)
+    transaction.on_commit(lambda: _delete_keys(keys))
+
+
+def invalidate_role_badges(user_ids):
+    """Ακύρωση των badges συγκεκριμένων χρηστών."""
+    _invalidate_keys(_user_key(user_id) for user_id in user_ids)
+
+
+def invalidate_registration_badge():
+    """Ακύρωση του πλήθους εκκρεμών εγγραφών."""
+    _invalidate_keys([REGISTRATIONS_KEY])
+
+
+def invalidate_role_badges_for_transition(user_id, old_status, new_status):
+    """
+    Ακύρωση των badges που επηρεάζει μια αλλαγή κατάστασης αίτησης του user_id.
+
+    old_status / new_status: None για δημιουργία / διαγραφή αίτησης.
+    """
+    statuses = {old_status, new_status}
+    if not statuses & (EMPLOYEE_BADGE_STATUSES | DEPARTMENT_BADGE_STATUSES | HANDLER_BADGE_STATUSES):
+        return
+
+    affected = Q()
+    if statuses & DEPARTMENT_BADGE_STATUSES:
+        departments = User.objects.filter(pk=user_id).values_list(
+            'department_id', 'department__parent_department_id',
+        ).first() or ()
+        department_ids = [dept_id for dept_id in departments if dept_id]
+        if department_ids:
+            affected |= Q(department_id__in=department_ids)
+    if statuses & HANDLER_BADGE_STATUSES:
+        affected |= Q(roles__code=ROLE_LEAVE_HANDLER)
+
+    user_ids = {user_id}
+    if affected:
+        user_ids.update(User.objects.filter(affected).values_list('pk', flat=True))
+    invalidate_role_badges(user_ids)
@@ -1,9 +1,17 @@
 """
 Υπολογισμός και εμφάνιση alert Υγειονομικής Επιτροπής (>8 αναρρωτικές ημέρες/έτος).
+
+Τα σύνολα ανά (υπάλληλο, έτος υποβολής) διαβάζονται από τον πίνακα
+SickLeaveAlertTotal, που ενημερώνεται από τα signals σε κάθε αλλαγή κατάστασης,
+υποβολής ή διαστημάτων αίτησης αναρρωτικής. Το alert είναι έτσι ένα indexed
+lookup (year, total_days > 8) αντί για άθροιση όλων των αιτήσεων του έτους.
 """
+from django.db import transaction
+from django.db.models import Sum
+from django.db.models.functions import ExtractYear
 from django.utils import timezone
 
-from leaves.models import LeaveRequest, YCCommitteeAcknowledgment
+from leaves.models import LeaveRequest, LeaveType, SickLeaveAlertTotal, YCCommitteeAcknowledgment
 
 SICK_LEAVE_THRESHOLD = 8
 
@@ -15,35 +23,147 @@ EXCLUDED_SICK_STATUSES = [
 ]
 
 
-def calculate_yearly_sick_total(user, year=None):
-    """Σύνολο αναρρωτικών ημερών τρέχοντος έτους (ενεργές + ολοκληρωμένες αιτήσεις)."""
-    year = year or timezone.now().year
-    sick_lrs = LeaveRequest.objects.filter(
-        user=user,
+def _counted_sick_requests():
+    """Αιτήσεις που μετρούν στο σύνολο αναρρωτικών (ενεργές + ολοκληρωμένες)."""
+    return LeaveRequest.objects.filter(
         leave_type__is_sick_leave_total=True,
-        submitted_at__year=year,
+        submitted_at__isnull=False,
     ).exclude(
         status__in=EXCLUDED_SICK_STATUSES,
-    ).prefetch_related('periods')
-    return sum(lr.total_days for lr in sick_lrs)
+    )
 
 
-def get_yearly_sick_totals_by_user(year=None, user_ids=None):
-    """Λεξικό user_id -> σύνολο αναρρωτικών ημερών για το έτος."""
-    year = year or timezone.now().year
-    sick_lrs = LeaveRequest.objects.filter(
-        leave_type__is_sick_leave_total=True,
-        submitted_at__year=year,
-    ).exclude(
-        status__in=EXCLUDED_SICK_STATUSES,
-    ).select_related('user').prefetch_related('periods')
+def compute_sick_totals(year=None, user_ids=None):
+    """
+    Σύνολα αναρρωτικών υπολογισμένα απευθείας από τις αιτήσεις.
+
+    Returns:
+        dict: (user_id, έτος) -> ημέρες (μόνο μη μηδενικά σύνολα)
+    """
+    sick_lrs = _counted_sick_requests()
+    if year is not None:
+        sick_lrs = sick_lrs.filter(submitted_at__year=year)
     if user_ids is not None:
         sick_lrs = sick_lrs.filter(user_id__in=user_ids)
 
-    totals = {}
-    for lr in sick_lrs:
-        totals[lr.user_id] = totals.get(lr.user_id, 0) + lr.total_days
-    return totals
+    rows = sick_lrs.order_by().annotate(
+        submitted_year=ExtractYear('submitted_at'),
+    ).values('user_id', 'submitted_year').annotate(
+        total=Sum('total_days'),
+    ).values_list('user_id', 'submitted_year', 'total')
+    return {(user_id, sub_year): total for user_id, sub_year, total in rows if total}
+
+
+def refresh_sick_alert_total(user_id, year):
+    """Επαναϋπολογισμός της γραμμής (υπάλληλος, έτος) του SickLeaveAlertTotal."""
+    total = compute_sick_totals(year=year, user_ids=[user_id]).get((user_id, year), 0)
+    if total:
+        SickLeaveAlertTotal.objects.update_or_create(
+            employee_id=user_id, year=year, defaults={'total_days': total},
+        )
+    else:
+        SickLeaveAlertTotal.objects.filter(employee_id=user_id, year=year).delete()
+    return total
+
+
+def _submitted_year(submitted_at):
+    return timezone.localtime(submitted_at).year if submitted_at else None
+
+
+def sync_sick_alert_totals(leave_request, previous=None):
+    """
+    Ενημέρωση των συνόλων που επηρεάζει μια αλλαγή αίτησης.
+
+    Args:
+        leave_request: Η αίτηση μετά την αλλαγή
+        previous (tuple, optional): (user_id, submitted_at, leave_type_id) πριν την
+            αλλαγή, ώστε να διορθωθεί και το παλιό έτος/υπάλληλος/τύπος
+    """
+    buckets = set()
+    type_ids = {leave_request.leave_type_id}
+    if leave_request.submitted_at:
+        buckets.add((leave_request.user_id, _submitted_year(leave_request.submitted_at)))
+    if previous:
+        old_user_id, old_submitted_at, old_type_id = previous
+        type_ids.add(old_type_id)
+        if old_submitted_at:
+            buckets.add((old_user_id, _submitted_year(old_submitted_at)))
+    if not buckets:
+        return
+
+    if len(type_ids) == 1 and LeaveRequest.leave_type.is_cached(leave_request):
+        is_sick = leave_request.leave_type.is_sick_leave_total
+    else:
+        is_sick = LeaveType.objects.filter(pk__in=type_ids, is_sick_leave_total=True).exists()
+    if not is_sick:
+        return
+
+    for user_id, year in buckets:
+        refresh_sick_alert_total(user_id, year)
+
+
+def sync_sick_alert_totals_for_request_id(leave_request_id):
+    """Ενημέρωση μετά από αλλαγή διαστημάτων (μόνο για αιτήσεις που μετρούν)."""
+    row = _counted_sick_requests().filter(pk=leave_request_id).values_list('user_id', 'submitted_at').first()
+    if row:
+        user_id, submitted_at = row
+        refresh_sick_alert_total(user_id, _submitted_year(submitted_at))
+
+
+def reconcile_sick_alert_totals(year=None, dry_run=False):
+    """
+    Σύγκριση του SickLeaveAlertTotal με τα σύνολα των αιτήσεων και διόρθωση αποκλίσεων
+    (π.χ. μετά από μαζικά .update() ή αλλαγή του is_sick_leave_total σε τύπο άδειας).
+
+    Returns:
+        dict: {'created': n, 'updated': n, 'deleted': n}
+    """
+    expected = compute_sick_totals(year=year)
+
+    stored_rows = SickLeaveAlertTotal.objects.all()
+    if year is not None:
+        stored_rows = stored_rows.filter(year=year)
+    stored = {(row.employee_id, row.year): row for row in stored_rows}
+
+    to_create = [
+        SickLeaveAlertTotal(employee_id=user_id, year=row_year, total_days=total)
+        for (user_id, row_year), total in expected.items()
+        if (user_id, row_year) not in stored
+    ]
+    to_update = []
+    for key, row in stored.items():
+        if key in expected and row.total_days != expected[key]:
+            row.total_days = expected[key]
+            to_update.append(row)
+    to_delete = [row.pk for key, row in stored.items() if key not in expected]
+
+    if not dry_run:
+        with transaction.atomic():
+            SickLeaveAlertTotal.objects.bulk_create(to_create, batch_size=500)
+            SickLeaveAlertTotal.objects.bulk_update(to_update, ['total_days'], batch_size=500)
+            SickLeaveAlertTotal.objects.filter(pk__in=to_delete).delete()
+
+    return {'created': len(to_create), 'updated': len(to_update), 'deleted': len(to_delete)}
+
+
+def calculate_yearly_sick_total(user, year=None):
+    """Σύνολο αναρρωτικών ημερών τρέχοντος έτους (ενεργές + ολοκληρωμένες αιτήσεις)."""
+    year = year or timezone.now().year
+    total = SickLeaveAlertTotal.objects.filter(
+        employee=user, year=year,
+    ).values_list('total_days', flat=True).first()
+    return total or 0
+
+
+def get_yearly_sick_totals_by_user(year=None, user_ids=None, min_total=None):
+    """Λεξικό user_id -> σύνολο αναρρωτικών ημερών για το έτος (min_total: μόνο > min_total)."""
+    year = year or timezone.now().year
+    totals = SickLeaveAlertTotal.objects.filter(year=year)
+    if min_total is not None:
+        totals = totals.filter(total_days__gt=min_total)
+    if user_ids is not None:
+        totals = totals.filter(employee_id__in=user_ids)
+    return dict(totals.values_list('employee_id', 'total_days'))
 
 
 def get_acknowledged_employee_ids(viewer):
@@ -68,33 +188,33 @@ def get_sick_alert_users(viewer, *, scope_user_ids=None, year=None):
     scope_user_ids: περιορισμός σε συγκεκριμένους υπαλλήλους (π.χ. υφιστάμενοι).
     """
     year = year or timezone.now().year
-    totals = get_yearly_sick_totals_by_user(year=year, user_ids=scope_user_ids)
-    acknowledged = get_acknowledged_employee_ids(viewer)
-
-    alert_ids = [
-        uid for uid, total in totals.items()
-        if total > SICK_LEAVE_THRESHOLD and uid not in acknowledged
-    ]
-    if not alert_ids:
+    totals = get_yearly_sick_totals_by_user(
+        year=year, user_ids=scope_user_ids, min_total=SICK_LEAVE_THRESHOLD,
+    )
+    if not totals:
         return []
 
     from accounts.models import User
     users = User.objects.filter(
-        id__in=alert_ids,
+        id__in=list(totals),
         is_active=True,
+    ).exclude(
+        yc_acknowledged_by__handler=viewer,
     ).select_related('department').prefetch_related('roles').order_by('last_name', 'first_name')
 
     return [_attach_alert_days(user, totals[user.id]) for user in users]
 
 
-def user_exceeds_sick_threshold(user, year=None):
-    """Έλεγχος αν ο υπάλληλος ξεπερνά το όριο αναρρωτικών."""
-    return calculate_yearly_sick_total(user, year=year) > SICK_LEAVE_THRESHOLD
+def user_exceeds_sick_threshold(user, year=None, sick_total=None):
+    """Έλεγχος αν ο υπάλληλος ξεπερνά το όριο αναρρωτικών (sick_total: ήδη υπολογισμένο σύνολο)."""
+    if sick_total is None:
+        sick_total = calculate_yearly_sick_total(user, year=year)
+    return sick_total > SICK_LEAVE_THRESHOLD
 
 
-def user_has_acknowledged_own_sick_alert(user, year=None):
+def user_has_acknowledged_own_sick_alert(user, year=None, sick_total=None):
     """Έχει ο ίδιος ο υπάλληλος δηλώσει γνώση για την υπέρβαση."""
-    if not user_exceeds_sick_threshold(user, year=year):
+    if not user_exceeds_sick_threshold(user, year=year, sick_total=sick_total):
         return True
     return YCCommitteeAcknowledgment.objects.filter(
         handler=user,
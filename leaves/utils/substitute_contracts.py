@@ -281,25 +281,24 @@ def maybe_notify_handlers_on_reappearance(user):
     if last and (now - last) < timedelta(hours=20):
         return False
 
-    from notifications.utils import create_notification
+    from notifications.utils import notify_many
     handlers = User.objects.filter(
         is_active=True,
         roles__code=ROLE_LEAVE_HANDLER,
-    ).distinct()
+    )
     title = 'Επανεμφάνιση αναπληρωτή'
     message = (
         f'Ο/Η {user.full_name} ({user.email}) έκανε είσοδο στην εφαρμογή '
         f'ενώ εκκρεμεί καταχώρηση νέας σύμβασης. '
         f'Μεταβείτε στην οθόνη «Συμβάσεις Αναπληρωτών».'
     )
-    for handler in handlers:
-        create_notification(
-            user=handler,
-            title=title,
-            message=message,
-            notification_type='warning',
-            related_object=user,
-        )
+    notify_many(
+        handlers,
+        title=title,
+        message=message,
+        notification_type='warning',
+        related_object=user,
+    )
     user.substitute_reappearance_notified_at = now
     user.save(update_fields=['substitute_reappearance_notified_at'])
     return True
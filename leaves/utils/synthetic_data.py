@@ -0,0 +1,457 @@
+"""
+Συνθετικά δεδομένα μεγάλης κλίμακας για μετρήσεις απόδοσης.
+
+Χτίζει ρεαλιστικό οργανόγραμμα (ΠΔΕΔΕ → Αυτοτελής Διεύθυνση → τμήματα, ΚΕΔΑΣΥ → ΣΔΕΥ),
+ξεχωριστό από τα πραγματικά τμήματα (όλοι οι κωδικοί με πρόθεμα SYNTHETIC_PREFIX),
+χιλιάδες χρήστες με προϊσταμένους και χειριστές, αιτήσεις με πολλά διαστήματα σε
+όλες τις καταστάσεις, εγγραφές ledger, audit log και ειδοποιήσεις. Όλα γράφονται με
+bulk_create (χωρίς signals), οπότε στο τέλος συμπληρώνονται τα παράγωγα σύνολα
+(SickLeaveAlertTotal) και ακυρώνονται τα caches.
+
+Τα δεδομένα αναγνωρίζονται από το πρόθεμα SYNTHETIC_PREFIX στους κωδικούς και το
+SYNTHETIC_EMAIL_DOMAIN στα email και διαγράφονται με clear_synthetic_data().
+Ίδιο seed → ίδια δεδομένα. Σε βάση με πραγματικά τμήματα εκτελείται μόνο με force=True.
+"""
+import random
+from datetime import date, datetime, time, timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.utils import timezone
+
+from accounts.models import Department, DepartmentType, EmployeeType, Role, User
+from accounts.role_constants import ROLE_EMPLOYEE, ROLE_LEAVE_HANDLER, ROLE_MANAGER
+from leaves.models import (
+    LeaveActionLog,
+    LeavePeriod,
+    LeaveRequest,
+    LeaveType,
+    RegularLeaveBalanceEntry,
+    period_summary,
+)
+from notifications.models import Notification
+from notifications.unread import clear_unread_counts
+
+SYNTHETIC_PREFIX = 'SYN_'
+SYNTHETIC_EMAIL_DOMAIN = 'synthetic.invalid'
+
+# Τύπος ρίζας όταν υπάρχει ήδη πραγματική ΠΔΕΔΕ — η ιεραρχία εγκρίσεων βρίσκει
+# την ΠΔΕΔΕ από τον τύπο PDEDE_MAIN και δεν πρέπει να δει δεύτερη
+SYNTHETIC_ROOT_TYPE_CODE = f'{SYNTHETIC_PREFIX}PDEDE_MAIN'
+
+# (κατάσταση, βάρος) — κατανομή που μοιάζει με παραγωγή μετά από μερικά έτη λειτουργίας
+STATUS_WEIGHTS = [
+    ('COMPLETED', 55),
+    ('DRAFT', 4),
+    ('SUBMITTED', 5),
+    ('PENDING_PROTOCOL', 5),
+    ('IN_REVIEW', 6),
+    ('WAITING_FOR_DOCUMENTS', 3),
+    ('DECISION_PREPARATION', 4),
+    ('PENDING_YC_COMMITTEE', 1),
+    ('PENDING_SIGNATURES', 4),
+    ('SUPERVISOR_REJECTED', 3),
+    ('REJECTED_BY_LEAVES_DEPT', 2),
+    ('CANCELLED_BY_APPLICANT', 3),
+    ('REVOKED_BY_REQUEST', 1),
+]
+
+# (κωδικός χωρίς πρόθεμα, όνομα, βάρος, επηρεάζει κανονικές, σύνολο αναρρωτικών)
+LEAVE_TYPES = [
+    ('ANNUAL', 'Κανονική Άδεια', 60, True, False),
+    ('SICK', 'Αναρρωτική Άδεια', 20, False, True),
+    ('SICK_YD', 'Αναρρωτική με Υπεύθυνη Δήλωση', 8, False, True),
+    ('SPECIAL', 'Ειδική Άδεια', 7, False, False),
+    ('BLOOD', 'Άδεια Αιμοδοσίας', 5, False, False),
+]
+
+FIRST_NAMES = ['Γεώργιος', 'Μαρία', 'Ιωάννης', 'Ελένη', 'Κωνσταντίνος', 'Αικατερίνη', 'Δημήτριος',
+               'Βασιλική', 'Νικόλαος', 'Σοφία', 'Παναγιώτης', 'Αναστασία', 'Χρήστος', 'Ευαγγελία']
+LAST_NAMES = ['Παπαδόπουλος', 'Νικολάου', 'Γεωργίου', 'Οικονόμου', 'Παπαδάκης', 'Αντωνίου',
+              'Δημητρίου', 'Ιωάννου', 'Βασιλείου', 'Κωνσταντίνου', 'Μακρής', 'Αθανασίου']
+
+BATCH_SIZE = 2000
+
+
+def _get_or_create_type(model, code, name):
+    obj, _created = model.objects.get_or_create(code=code, defaults={'name': name})
+    return obj
+
+
+class SyntheticDataGenerator:
+    """
+    Παραγωγή συνθετικού οργανισμού.
+
+    Args:
+        users (int): Πλήθος υπαλλήλων (εκτός προϊσταμένων/χειριστών)
+        leave_requests (int): Πλήθος αιτήσεων
+        departments (int): Τμήματα κάτω από την Αυτοτελή Διεύθυνση
+        kedasy (int): Μονάδες ΚΕΔΑΣΥ, καθεμία με sdey_per_kedasy ΣΔΕΥ
+        handlers (int): Χειριστές αδειών
+        notifications_per_user (int): Ειδοποιήσεις ανά υπάλληλο
+        years (int): Έτη ιστορικού αιτήσεων πριν από το today
+        seed (int): Seed του random
+        log: callable(str) για μηνύματα προόδου
+        force (bool): Εκτέλεση και σε βάση με πραγματικά (μη συνθετικά) τμήματα
+    """
+
+    def __init__(self, users=5000, leave_requests=100000, departments=40, kedasy=8,
+                 sdey_per_kedasy=12, handlers=5, notifications_per_user=20, years=3,
+                 seed=1, today=None, log=None, force=False):
+        self.user_count = users
+        self.leave_request_count = leave_requests
+        self.department_count = departments
+        self.kedasy_count = kedasy
+        self.sdey_per_kedasy = sdey_per_kedasy
+        self.handler_count = handlers
+        self.notifications_per_user = notifications_per_user
+        self.years = years
+        self.today = today or timezone.localdate()
+        self.random = random.Random(seed)
+        self.log = log or (lambda message: None)
+        self.force = force
+        self.stats = {}
+
+    def generate(self):
+        """Δημιουργία όλων των δεδομένων. Returns: dict με πλήθη ανά είδος."""
+        if not self.force and Department.objects.exclude(code__startswith=SYNTHETIC_PREFIX).exists():
+            raise ValueError('Η βάση έχει πραγματικά τμήματα — τα συνθετικά δεδομένα δημιουργούνται μόνο με force.')
+        with transaction.atomic():
+            self._create_reference_data()
+            self._create_departments()
+            self._create_users()
+            self._create_leave_requests()
+            self._create_ledger()
+            self._create_notifications()
+        self._refresh_derived_data()
+        return self.stats
+
+    # Βασικά δεδομένα -----------------------------------------------------
+
+    def _create_reference_data(self):
+        self.department_types = {
+            code: _get_or_create_type(DepartmentType, code, name)
+            for code, name in [
+                ('PDEDE_MAIN', 'Περιφερειακή Διεύθυνση Εκπαίδευσης'),
+                ('AUTONOMOUS_DIRECTION', 'Αυτοτελής Διεύθυνση'),
+                ('DEPARTMENT', 'Τμήμα'),
+                ('KEDASY', 'ΚΕΔΑΣΥ'),
+                ('SDEY', 'ΣΔΕΥ'),
+            ]
+        }
+        self.roles = {
+            code: _get_or_create_type(Role, code, name)
+            for code, name in [
+                (ROLE_EMPLOYEE, 'Υπάλληλος'),
+                (ROLE_MANAGER, 'Προϊστάμενος'),
+                (ROLE_LEAVE_HANDLER, 'Χειριστής Αδειών'),
+            ]
+        }
+        self.employee_types = [
+            _get_or_create_type(EmployeeType, 'ADMINISTRATIVE', 'Διοικητικοί'),
+            _get_or_create_type(EmployeeType, 'EDUCATIONAL', 'Εκπαιδευτικοί'),
+        ]
+        self.leave_types = []
+        self.leave_type_weights = []
+        for code, name, weight, affects_balance, sick_total in LEAVE_TYPES:
+            leave_type, _created = LeaveType.objects.get_or_create(
+                code=f'{SYNTHETIC_PREFIX}{code}',
+                defaults={
+                    'name': f'{name} (SYN)',
+                    'affects_regular_leave_balance': affects_balance,
+                    'is_sick_leave_total': sick_total,
+                    'is_sick_leave_yd': code == 'SICK_YD',
+                },
+            )
+            self.leave_types.append(leave_type)
+            self.leave_type_weights.append(weight)
+
+    def _create_departments(self):
+        types = self.department_types
+        real_pdede = Department.objects.filter(department_type=types['PDEDE_MAIN']).exclude(
+            code__startswith=SYNTHETIC_PREFIX,
+        ).exists()
+        root_type = types['PDEDE_MAIN']
+        if real_pdede:
+            root_type = _get_or_create_type(DepartmentType, SYNTHETIC_ROOT_TYPE_CODE, 'ΠΔΕΔΕ (SYN)')
+        root = Department.objects.create(
+            code=f'{SYNTHETIC_PREFIX}PDEDE', name='ΠΔΕΔΕ (συνθετικά δεδομένα)', department_type=root_type,
+        )
+        autotelous = Department.objects.create(
+            code=f'{SYNTHETIC_PREFIX}AUTOTELOUS_DN', name='Αυτοτελής Διεύθυνση (συνθετικά δεδομένα)',
+            department_type=types['AUTONOMOUS_DIRECTION'], parent_department=root,
+        )
+
+        departments = Department.objects.bulk_create([
+            Department(
+                code=f'{SYNTHETIC_PREFIX}DEPT_{index:03d}', name=f'Τμήμα {index} (SYN)',
+                department_type=types['DEPARTMENT'], parent_department=autotelous,
+            )
+            for index in range(1, self.department_count + 1)
+        ])
+        kedasy_units = Department.objects.bulk_create([
+            Department(
+                code=f'{SYNTHETIC_PREFIX}KEDASY_{index:02d}', name=f'ΚΕΔΑΣΥ {index} (SYN)',
+                department_type=types['KEDASY'], parent_department=root,
+            )
+            for index in range(1, self.kedasy_count + 1)
+        ])
+        sdey_units = Department.objects.bulk_create([
+            Department(
+                code=f'{SYNTHETIC_PREFIX}SDEY_{number:02d}_{index:02d}', name=f'ΣΔΕΥ {index} {kedasy.name}',
+                department_type=types['SDEY'], parent_department=kedasy,
+            )
+            for number, kedasy in enumerate(kedasy_units, start=1)
+            for index in range(1, self.sdey_per_kedasy + 1)
+        ])
+        self.root = root
+        self.headed_departments = [root, autotelous] + departments + kedasy_units + sdey_units
+        # Οι υπάλληλοι κατανέμονται στα τμήματα της Αυτοτελούς και στα ΣΔΕΥ
+        self.staff_departments = departments + sdey_units or [autotelous]
+        self.stats['departments'] = len(self.headed_departments)
+
+    # Χρήστες -------------------------------------------------------------
+
+    def _new_user(self, number, department, **extra):
+        return User(
+            email=f'syn{number:06d}@{SYNTHETIC_EMAIL_DOMAIN}',
+            first_name=self.random.choice(FIRST_NAMES),
+            last_name=self.random.choice(LAST_NAMES),
+            employee_number=f'{SYNTHETIC_PREFIX}{number:06d}',
+            department=department,
+            employee_type=self.random.choice(self.employee_types),
+            registration_status='APPROVED',
+            is_active=True,
+            password=self.password,
+            annual_leave_entitlement=25,
+            **extra,
+        )
+
+    def _create_users(self):
+        self.password = make_password(None)
+        number = 0
+        managers = []
+        for department in self.headed_departments:
+            number += 1
+            managers.append(self._new_user(number, department))
+        handlers = []
+        for _ in range(self.handler_count):
+            number += 1
+            handlers.append(self._new_user(number, self.root))
+        employees = []
+        for _ in range(self.user_count):
+            number += 1
+            employees.append(self._new_user(number, self.random.choice(self.staff_departments)))
+
+        User.objects.bulk_create(managers + handlers + employees, batch_size=BATCH_SIZE)
+
+        for department, manager in zip(self.headed_departments, managers):
+            department.manager = manager
+        Department.objects.bulk_update(self.headed_departments, ['manager'], batch_size=BATCH_SIZE)
+
+        through = User.roles.through
+        role_links = [through(user_id=user.pk, role_id=self.roles[ROLE_MANAGER].pk) for user in managers]
+        role_links += [through(user_id=user.pk, role_id=self.roles[ROLE_LEAVE_HANDLER].pk) for user in handlers]
+        role_links += [
+            through(user_id=user.pk, role_id=self.roles[ROLE_EMPLOYEE].pk) for user in managers + employees
+        ]
+        through.objects.bulk_create(role_links, batch_size=BATCH_SIZE)
+
+        self.managers = managers
+        self.handlers = handlers
+        self.applicants = managers + employees
+        self.stats['users'] = len(managers) + len(handlers) + len(employees)
+
+    # Αιτήσεις ------------------------------------------------------------
+
+    def _random_periods(self, start):
+        """1-3 διαδοχικά διαστήματα (με κενά) από την ημερομηνία start."""
+        periods = []
+        for _ in range(self.random.choices([1, 2, 3], weights=[70, 22, 8])[0]):
+            end = start + timedelta(days=self.random.choice([0, 0, 1, 2, 4, 9]))
+            periods.append((start, end))
+            start = end + timedelta(days=self.random.randint(2, 20))
+        return periods
+
+    def _aware(self, day, hour=9):
+        return timezone.make_aware(datetime.combine(day, time(hour, self.random.randint(0, 59))))
+
+    def _create_leave_requests(self):
+        statuses = [status for status, _weight in STATUS_WEIGHTS]
+        status_weights = [weight for _status, weight in STATUS_WEIGHTS]
+        history_days = 365 * self.years
+        handler_ids = [user.pk for user in self.handlers]
+        self.completed_annual = []
+        created = periods_created = logs_created = 0
+
+        remaining = self.leave_request_count
+        while remaining > 0:
+            size = min(BATCH_SIZE, remaining)
+            remaining -= size
+            batch = []
+            batch_periods = []
+            for _ in range(size):
+                user = self.random.choice(self.applicants)
+                leave_type = self.random.choices(self.leave_types, weights=self.leave_type_weights)[0]
+                status = self.random.choices(statuses, weights=status_weights)[0]
+                submitted_day = self.today - timedelta(days=self.random.randint(0, history_days))
+                periods = self._random_periods(submitted_day + timedelta(days=self.random.randint(1, 30)))
+                summary = period_summary(periods)
+                days = summary['total_days']
+                leave_request = LeaveRequest(
+                    user=user,
+                    leave_type=leave_type,
+                    description='Συνθετική αίτηση',
+                    status=status,
+                    requested_days=days,
+                    days=days,
+                    submitted_at=None if status == 'DRAFT' else self._aware(submitted_day),
+                    processed_by_id=self.random.choice(handler_ids) if handler_ids and status == 'COMPLETED' else None,
+                    protocol_number='' if status in ('DRAFT', 'SUBMITTED') else f'SYN-{self.random.randint(1, 99999)}',
+                    **summary,
+                )
+                batch.append(leave_request)
+                batch_periods.append(periods)
+
+            LeaveRequest.objects.bulk_create(batch, batch_size=BATCH_SIZE)
+            period_rows = [
+                LeavePeriod(leave_request=leave_request, start_date=start, end_date=end)
+                for leave_request, periods in zip(batch, batch_periods)
+                for start, end in periods
+            ]
+            LeavePeriod.objects.bulk_create(period_rows, batch_size=BATCH_SIZE)
+            logs = [
+                LeaveActionLog(
+                    leave_request=leave_request, user_id=leave_request.user_id, action='SUBMIT',
+                    previous_status='DRAFT', new_status=leave_request.status,
+                    notes='Συνθετικά δεδομένα',
+                )
+                for leave_request in batch if leave_request.status != 'DRAFT'
+            ]
+            LeaveActionLog.objects.bulk_create(logs, batch_size=BATCH_SIZE)
+
+            self.completed_annual.extend(
+                lr for lr in batch
+                if lr.status == 'COMPLETED' and lr.leave_type.affects_regular_leave_balance
+            )
+            created += len(batch)
+            periods_created += len(period_rows)
+            logs_created += len(logs)
+            self.log(f'Αιτήσεις: {created}/{self.leave_request_count}')
+
+        self.stats.update({
+            'leave_requests': created, 'leave_periods': periods_created, 'action_logs': logs_created,
+        })
+
+    # Ledger / ειδοποιήσεις ----------------------------------------------
+
+    def _create_ledger(self):
+        """Αρχικό υπόλοιπο ανά χρήστη και μία αφαίρεση ανά ολοκληρωμένη κανονική άδεια."""
+        by_user = {}
+        for leave_request in sorted(self.completed_annual, key=lambda lr: lr.first_start_date):
+            by_user.setdefault(leave_request.user_id, []).append(leave_request)
+
+        entries = []
+        start_day = self.today - timedelta(days=365 * self.years + 31)
+        for user in self.applicants:
+            carry, current = self.random.randint(0, 10), 25
+            entries.append(RegularLeaveBalanceEntry(
+                employee_id=user.pk, entry_type='INITIAL_BALANCE', entry_date=start_day,
+                description='Αρχικό υπόλοιπο (SYN)', balance_before=0, balance_after=carry + current,
+                carryover_after=carry, current_after=current, days_delta=carry + current,
+            ))
+            for leave_request in by_user.get(user.pk, ()):
+                before = carry + current
+                from_carry = min(carry, leave_request.days)
+                carry -= from_carry
+                current = max(0, current - (leave_request.days - from_carry))
+                entries.append(RegularLeaveBalanceEntry(
+                    employee_id=user.pk, leave_request_id=leave_request.pk, entry_type='LEAVE_GRANTED',
+                    entry_date=leave_request.last_end_date, description='Χορήγηση κανονικής άδειας (SYN)',
+                    balance_before=before, balance_after=carry + current,
+                    carryover_after=carry, current_after=current, days_delta=(carry + current) - before,
+                ))
+            user.current_regular_leave_balance = carry + current
+
+        RegularLeaveBalanceEntry.objects.bulk_create(entries, batch_size=BATCH_SIZE)
+        User.objects.bulk_update(self.applicants, ['current_regular_leave_balance'], batch_size=BATCH_SIZE)
+        self.stats['ledger_entries'] = len(entries)
+
+    def _create_notifications(self):
+        content_type = ContentType.objects.get_for_model(LeaveRequest)
+        request_ids = list(
+            LeaveRequest.objects.filter(user__email__endswith=f'@{SYNTHETIC_EMAIL_DOMAIN}')
+            .values_list('user_id', 'pk')
+        )
+        ids_by_user = {}
+        for user_id, pk in request_ids:
+            ids_by_user.setdefault(user_id, []).append(pk)
+
+        created = 0
+        batch = []
+        for user in self.applicants + self.handlers:
+            own_ids = ids_by_user.get(user.pk) or [None]
+            for _ in range(self.notifications_per_user):
+                is_read = self.random.random() < 0.8
+                object_id = self.random.choice(own_ids)
+                batch.append(Notification(
+                    user_id=user.pk,
+                    title='Ενημέρωση αίτησης (SYN)',
+                    message='Η κατάσταση της αίτησής σας άλλαξε.',
+                    notification_type=self.random.choice(['info', 'success', 'warning']),
+                    content_type=content_type if object_id else None,
+                    object_id=object_id,
+                    is_read=is_read,
+                    read_at=timezone.now() if is_read else None,
+                ))
+            if len(batch) >= BATCH_SIZE:
+                Notification.objects.bulk_create(batch, batch_size=BATCH_SIZE)
+                created += len(batch)
+                batch = []
+        Notification.objects.bulk_create(batch, batch_size=BATCH_SIZE)
+        self.stats['notifications'] = created + len(batch)
+
+    def _refresh_derived_data(self):
+        from accounts.utils.department_hierarchy import invalidate_department_hierarchy
+        from leaves.utils.handler_tab_counts import invalidate_handler_tab_counts
+        from leaves.utils.leave_calendar import invalidate_leave_calendar
+        from leaves.utils.reference_data import invalidate_leave_type_colors
+        from leaves.utils.sick_leave_alerts import reconcile_sick_alert_totals
+
+        reconcile_sick_alert_totals()
+        # Οι ειδοποιήσεις γράφτηκαν με bulk_create, χωρίς ενημέρωση των μετρητών
+        clear_unread_counts([user.pk for user in self.applicants])
+        invalidate_department_hierarchy()
+        invalidate_handler_tab_counts()
+        invalidate_leave_calendar()
+        invalidate_leave_type_colors()
+
+
+def clear_synthetic_data():
+    """
+    Διαγραφή όλων των συνθετικών δεδομένων (χρήστες, αιτήσεις, τμήματα, τύποι άδειας).
+
+    Returns:
+        int: Πλήθος συνθετικών χρηστών που διαγράφηκαν
+    """
+    from accounts.utils.department_hierarchy import invalidate_department_hierarchy
+    from leaves.utils.handler_tab_counts import invalidate_handler_tab_counts
+    from leaves.utils.leave_calendar import invalidate_leave_calendar
+
+    users = User.objects.filter(email__endswith=f'@{SYNTHETIC_EMAIL_DOMAIN}')
+    with transaction.atomic():
+        user_ids = list(users.values_list('pk', flat=True))
+        LeaveRequest.objects.filter(user__in=users).delete()
+        Notification.objects.filter(user__in=users).delete()
+        clear_unread_counts(user_ids)
+        count = len(user_ids)
+        users.delete()
+        # Τα ΣΔΕΥ/τμήματα διαγράφονται διαδοχικά (CASCADE από το γονικό)
+        Department.objects.filter(code__startswith=SYNTHETIC_PREFIX).delete()
+        LeaveType.objects.filter(code__startswith=SYNTHETIC_PREFIX).delete()
+        DepartmentType.objects.filter(code=SYNTHETIC_ROOT_TYPE_CODE).delete()
+    invalidate_department_hierarchy()
+    invalidate_handler_tab_counts()
+    invalidate_leave_calendar()
+    return count
@@ -0,0 +1,128 @@
+"""
+Κανόνες ορατότητας αιτήσεων και πρόσβασης σε συνημμένα ως φίλτρα SQL.
+
+Κάθε συνάρτηση μεταφράζει τους ελέγχους ανά αντικείμενο (LeaveRequest.can_user_view,
+FileAccessController.can_user_access_file) σε ένα Q για τον δοσμένο χρήστη: οι ρόλοι
+και η θέση του χρήστη στην ιεραρχία υπολογίζονται μία φορά στην Python, οπότε οι
+λίστες, οι αναζητήσεις και οι εξαγωγές φιλτράρουν στη βάση. Οι δύο υλοποιήσεις
+πρέπει να μένουν ισοδύναμες (βλ. leaves/tests/test_visibility.py).
+"""
+from django.db.models import Q
+
+from accounts.department_utils import KEDASY_KEPEA_DEPARTMENT_TYPE_CODES, SDEY_DEPARTMENT_TYPE_CODES
+from accounts.utils.department_hierarchy import get_department_hierarchy
+
+# Αδύνατη συνθήκη (κανένα αποτέλεσμα)
+NOTHING = Q(pk__in=[])
+
+
+def _prefixed(prefix, **lookups):
+    return Q(**{f'{prefix}{key}': value for key, value in lookups.items()})
+
+
+def _same_department_q(user, prefix):
+    """Αιτήσεις υπαλλήλων του ίδιου τμήματος (και χωρίς τμήμα αν ο χρήστης δεν έχει)."""
+    if user.department_id is None:
+        return _prefixed(prefix, user__department__isnull=True)
+    return _prefixed(prefix, user__department_id=user.department_id)
+
+
+def leave_request_visibility_q(user, prefix=''):
+    """
+    Q για τις αιτήσεις που βλέπει ο χρήστης (ίδιοι κανόνες με το can_user_view).
+
+    Args:
+        user: Ο χρήστης
+        prefix (str): Διαδρομή προς το LeaveRequest (π.χ. 'leave_request__')
+
+    Returns:
+        Q | None: None όταν ο χρήστης βλέπει όλες τις αιτήσεις
+    """
+    if not user.is_authenticated:
+        return NOTHING
+
+    hierarchy = get_department_hierarchy(user.department_id)
+    sdey_children = hierarchy.kedasy_sdey_child_ids(user.department_id)
+    condition = _prefixed(prefix, user_id=user.pk)
+
+    if user.is_department_manager:
+        if hierarchy.type_code(user.department_id) == 'PDEDE_MAIN':
+            return None
+        condition |= _same_department_q(user, prefix)
+        if sdey_children:
+            condition |= _prefixed(prefix, user__department_id__in=sdey_children)
+
+    if user.is_leave_handler:
+        return None
+
+    if user.is_secretary:
+        condition |= _same_department_q(user, prefix)
+        if sdey_children:
+            condition |= _prefixed(prefix, user__department_id__in=sdey_children)
+
+    return condition
+
+
+def _variant_q(prefix, *variants):
+    """Τύποι άδειας με workflow_variant σε ένα από τα variants (κενό = STANDARD)."""
+    condition = NOTHING
+    for variant in variants:
+        condition |= _prefixed(prefix, leave_type__workflow_variant__iexact=variant)
+        if variant == 'STANDARD':
+            condition |= _prefixed(prefix, leave_type__workflow_variant='')
+    return condition
+
+
+def _secretary_file_q(user, hierarchy):
+    """Συνημμένα αιτήσεων σε αναμονή πρωτοκόλλου ΚΕΔΑΣΥ/ΚΕΠΕΑ του τμήματος του γραμματέα."""
+    if user.department_id is None:
+        return NOTHING
+    prefix = 'leave_request__'
+    condition = NOTHING
+    if hierarchy.type_code(user.department_id) in KEDASY_KEPEA_DEPARTMENT_TYPE_CODES:
+        condition |= (
+            _prefixed(prefix, user__department_id=user.department_id)
+            & _variant_q(prefix, 'KEDASY', 'STANDARD')
+        )
+    sdey_children = hierarchy.kedasy_sdey_child_ids(user.department_id)
+    if sdey_children:
+        condition |= (
+            _prefixed(prefix, user__department_id__in=sdey_children)
+            & _variant_q(prefix, 'KEDASY', 'SDEY', 'STANDARD')
+        )
+    return condition & _prefixed(prefix, status='PENDING_KEDASY_PROTOCOL')
+
+
+def secure_file_access_q(user):
+    """
+    Q για τα συνημμένα (SecureFile) που μπορεί να ανοίξει ο χρήστης
+    (ίδιοι κανόνες με το FileAccessController.can_user_access_file).
+
+    Returns:
+        Q | None: None όταν ο χρήστης έχει πρόσβαση σε όλα
+    """
+    if not user.is_authenticated:
+        return NOTHING
+
+    own = Q(uploaded_by_id=user.pk) | Q(leave_request__user_id=user.pk)
+    hierarchy = get_department_hierarchy(user.department_id)
+
+    # Προϊστάμενοι/χρήστες ΣΔΕΥ: μόνο τα δικά τους
+    if hierarchy.type_code(user.department_id) in SDEY_DEPARTMENT_TYPE_CODES:
+        return own
+    if user.is_secretary:
+        return own | _secretary_file_q(user, hierarchy)
+    if user.is_leave_handler:
+        return None
+    if user.is_department_manager:
+        # Όχι συνημμένα αναρρωτικών — ο τύπος αναγνωρίζεται από το όνομα στην Python,
+        # ακριβώς όπως στον έλεγχο ανά αρχείο (ανεξάρτητα από το collation της βάσης)
+        from leaves.models import LeaveType
+        sick_type_ids = [
+            pk for pk, name in LeaveType.objects.values_list('pk', 'name')
+            if 'αναρρωτικ' in name.lower() or 'sick' in name.lower()
+        ]
+        return own | ~Q(leave_request__leave_type_id__in=sick_type_ids)
+    if user.is_administrator:
+        return None
+    return own
@@ -1,9 +1,140 @@
 """
 Υπολογισμός εργάσιμων ημερών για αιτήσεις αδειών
 Αφαιρεί Σαββατοκύριακα και δημόσιες αργίες
+
+Οι υπολογισμοί γίνονται από ευρετήριο εργάσιμων ημερών ανά έτος (prefix-sum):
+για κάθε έτος κρατάμε τον αθροιστικό αριθμό εργάσιμων ημερών μέχρι κάθε ημέρα,
+οπότε το πλήθος σε ένα διάστημα είναι μία αφαίρεση χωρίς query. Κάθε έτος
+φορτώνεται με ένα query την πρώτη φορά που χρειάζεται και ακυρώνεται από τα
+signals του PublicHoliday (leaves/signals.py). Οι υπόλοιποι workers μαθαίνουν
+την αλλαγή μέσω μετρητή έκδοσης στο cache.
 """
+import threading
+import time
+from array import array
 from datetime import date, timedelta
-from django.utils import timezone
+from itertools import accumulate
+
+from leaves.utils.cache_versions import bump_cache_version, get_cache_version
+
+CACHE_VERSION_NAME = 'working_days'
+
+# Κάθε πόσα δευτερόλεπτα ελέγχεται ο μετρητής έκδοσης στο cache
+GENERATION_CHECK_INTERVAL = 5
+
+
+class WorkingDayIndex:
+    """Ευρετήριο εργάσιμων ημερών ανά έτος, κοινό για όλη τη διεργασία."""
+
+    def __init__(self):
+        self._years = {}
+        self._lock = threading.Lock()
+        self._generation = None
+        self._checked_at = 0.0
+
+    def invalidate(self):
+        """Απορρίπτει όλα τα φορτωμένα έτη (τοπικά)."""
+        with self._lock:
+            self._years = {}
+
+    def _sync_generation(self):
+        now = time.monotonic()
+        if now - self._checked_at < GENERATION_CHECK_INTERVAL:
+            return
+        self._checked_at = now
+        generation = get_cache_version(CACHE_VERSION_NAME)
+        # Χωρίς cache (None) δεν ξέρουμε αν άλλαξε κάτι σε άλλον worker
+        if generation is None or generation != self._generation:
+            self.invalidate()
+            self._generation = generation
+
+    def _load_years(self, years):
+        """Φορτώνει με ένα query όσα από τα έτη δεν υπάρχουν ήδη στο ευρετήριο."""
+        from leaves.models import PublicHoliday
+
+        missing = sorted(set(years) - self._years.keys())
+        if not missing:
+            return self._years
+
+        holidays = set(PublicHoliday.objects.filter(
+            date__gte=date(missing[0], 1, 1),
+            date__lte=date(missing[-1], 12, 31),
+            is_active=True,
+        ).values_list('date', flat=True))
+
+        loaded = {}
+        for year in missing:
+            first = date(year, 1, 1)
+            days = (date(year, 12, 31) - first).days + 1
+            flags = (
+                1 if d.weekday() < 5 and d not in holidays else 0
+                for d in (first + timedelta(days=i) for i in range(days))
+            )
+            # prefix[i] = εργάσιμες ημέρες του έτους πριν από την ημέρα i
+            loaded[year] = array('H', accumulate(flags, initial=0))
+
+        with self._lock:
+            years_map = dict(self._years)
+            years_map.update(loaded)
+            self._years = years_map
+        return years_map
+
+    def _prepare(self, years):
+        self._sync_generation()
+        return self._load_years(years)
+
+    @staticmethod
+    def _count(years_map, start_date, end_date):
+        total = 0
+        for year in range(start_date.year, end_date.year + 1):
+            prefix = years_map[year]
+            lo = (start_date - date(year, 1, 1)).days if year == start_date.year else 0
+            hi = (end_date - date(year, 1, 1)).days + 1 if year == end_date.year else len(prefix) - 1
+            total += prefix[hi] - prefix[lo]
+        return total
+
+    def count(self, start_date, end_date):
+        """Εργάσιμες ημέρες στο κλειστό διάστημα [start_date, end_date]."""
+        if start_date > end_date:
+            return 0
+        years_map = self._prepare(range(start_date.year, end_date.year + 1))
+        return self._count(years_map, start_date, end_date)
+
+    def count_many(self, ranges):
+        """
+        Εργάσιμες ημέρες για πολλά διαστήματα μαζί (ένα query το πολύ για όλα).
+
+        Args:
+            ranges: iterable από (start_date, end_date)
+
+        Returns:
+            list[int]: Πλήθος ανά διάστημα, με την ίδια σειρά
+        """
+        ranges = list(ranges)
+        years = set()
+        for start_date, end_date in ranges:
+            if start_date <= end_date:
+                years.update(range(start_date.year, end_date.year + 1))
+        years_map = self._prepare(years)
+        return [
+            self._count(years_map, start_date, end_date) if start_date <= end_date else 0
+            for start_date, end_date in ranges
+        ]
+
+    def is_working_day(self, check_date):
+        return self.count(check_date, check_date) == 1
+
+
+working_day_index = WorkingDayIndex()
+
+
+def invalidate_working_day_index():
+    """
+    Ακυρώνει το ευρετήριο σε αυτή τη διεργασία και στους υπόλοιπους workers.
+    Καλείται από τα signals του PublicHoliday.
+    """
+    working_day_index.invalidate()
+    working_day_index._generation = bump_cache_version(CACHE_VERSION_NAME)
 
 
 def get_holidays_in_range(start_date, end_date):
@@ -34,19 +165,7 @@ def is_working_day(check_date):
     Ελέγχει αν μια ημερομηνία είναι εργάσιμη ημέρα.
     False αν είναι Σαββατοκύριακο ή δημόσια αργία.
     """
-    # Σαββατοκύριακο
-    if check_date.weekday() >= 5:
-        return False
-
-    # Δημόσια αργία
-    from leaves.models import PublicHoliday
-    if PublicHoliday.objects.filter(
-        date=check_date,
-        is_active=True
-    ).exists():
-        return False
-
-    return True
+    return working_day_index.is_working_day(check_date)
 
 
 def calculate_working_days(start_date, end_date):
@@ -61,28 +180,21 @@ def calculate_working_days(start_date, end_date):
     Returns:
         int: Αριθμός εργάσιμων ημερών
     """
-    if start_date > end_date:
-        return 0
-
-    # Αν same day, check if it's a working day
-    if start_date == end_date:
-        return 1 if is_working_day(start_date) else 0
+    return working_day_index.count(start_date, end_date)
 
-    # Count working days
-    working_days = 0
-    current_date = start_date
 
-    # Get all holidays in range once (for efficiency)
-    holiday_dates = set(get_holidays_in_range(start_date, end_date))
+def calculate_working_days_many(ranges):
+    """
+    Υπολογίζει εργάσιμες ημέρες για πολλά διαστήματα με μία κλήση.
+    Για φόρμες, αναφορές και ελέγχους υπολοίπου με πολλά διαστήματα.
 
-    while current_date <= end_date:
-        weekday = current_date.weekday()
-        # 0-4 = Δευτέρα-Παρασκευή
-        if weekday < 5 and current_date not in holiday_dates:
-            working_days += 1
-        current_date += timedelta(days=1)
+    Args:
+        ranges: iterable από (start_date, end_date)
 
-    return working_days
+    Returns:
+        list[int]: Εργάσιμες ημέρες ανά διάστημα
+    """
+    return working_day_index.count_many(ranges)
 
 
 def get_leave_periods_working_days(periods):
@@ -96,11 +208,8 @@ def get_leave_periods_working_days(periods):
     Returns:
         int: Συνολικές εργάσιμες ημέρες
     """
-    total = 0
-    for period in periods:
-        if period.get('start_date') and period.get('end_date'):
-            total += calculate_working_days(
-                period['start_date'],
-                period['end_date']
-            )
-    return total
+    return sum(calculate_working_days_many(
+        (period['start_date'], period['end_date'])
+        for period in periods
+        if period.get('start_date') and period.get('end_date')
+    ))
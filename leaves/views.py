@@ -1,5 +1,4 @@
 from django.http import HttpResponse, JsonResponse, Http404
-from django.utils.http import content_disposition_header
 from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
@@ -10,23 +9,23 @@ from django.core.exceptions import PermissionDenied
 from django.db.models import Q, Sum
 from django.conf import settings
 from django.urls import reverse_lazy
-from datetime import timedelta
 import os
 import mimetypes
 from .models import LeaveRequest, LeavePeriod, LeaveType, SecureFile
 from .forms import LeaveRequestForm
 from .crypto_utils import SecureFileHandler, FileAccessController
 from .attachment_helpers import save_leave_request_attachments_from_request
-from .dashboard_utils import DashboardFilterMixin, RoleDashboardMixin, apply_sort, get_available_actions
+from .file_streaming import encrypted_file_response, is_initial_response
+from .dashboard_utils import (
+    DashboardFilterMixin, RoleDashboardMixin, apply_sort, get_available_actions, resolve_available_actions,
+)
 from leaves.role_context import resolve_default_dashboard_name
-from notifications.utils import create_notification
+from notifications.utils import create_notification, notify_many
 from accounts.department_utils import SDEY_DEPARTMENT_TYPE_CODES, is_sdey_department
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
 
-LOCK_TIMEOUT_MINUTES = 30
-
 
 class EmployeeDashboardView(LoginRequiredMixin, RoleDashboardMixin, DashboardFilterMixin, ListView):
     """Dashboard αιτήσεων για τον υπάλληλο - όλες οι προσωπικές του αιτήσεις"""
@@ -53,9 +52,10 @@ class EmployeeDashboardView(LoginRequiredMixin, RoleDashboardMixin, DashboardFil
         context['leave_type_instructions'] = instructions
         user = self.request.user
         
-        # Add actions to each leave request
+        # Add actions to each leave request (σταθερό πλήθος queries ανά σελίδα)
+        page_actions = resolve_available_actions(context['leave_requests'], user)
         for lr in context['leave_requests']:
-            lr.actions = get_available_actions(lr, user)
+            lr.actions = page_actions[lr.pk]
         
         # Leave balance information
         balance = user.get_leave_balance_breakdown()
@@ -75,8 +75,9 @@ class EmployeeDashboardView(LoginRequiredMixin, RoleDashboardMixin, DashboardFil
             user_exceeds_sick_threshold,
             user_has_acknowledged_own_sick_alert,
         )
+        sick_total = calculate_yearly_sick_total(user)
         context['sick_days_remaining'] = user.sick_leave_with_declaration
-        context['sick_days_current_year'] = calculate_yearly_sick_total(user)
+        context['sick_days_current_year'] = sick_total
         
         # Αναρρωτικές Άδειες με ΥΔ — χρήση τρέχοντος έτους
         from django.utils import timezone
@@ -88,10 +89,9 @@ class EmployeeDashboardView(LoginRequiredMixin, RoleDashboardMixin, DashboardFil
         ).count()
         context['sick_leave_yd_limit'] = user.sick_leave_with_declaration
         
-        sick_total = calculate_yearly_sick_total(user)
         context['sick_total_days'] = sick_total
-        context['sick_exceeds_threshold'] = user_exceeds_sick_threshold(user)
-        context['sick_alert_acknowledged'] = user_has_acknowledged_own_sick_alert(user)
+        context['sick_exceeds_threshold'] = user_exceeds_sick_threshold(user, sick_total=sick_total)
+        context['sick_alert_acknowledged'] = user_has_acknowledged_own_sick_alert(user, sick_total=sick_total)
         
         # Ορατότητα καρτών βάσει τύπου υπαλλήλου
         emp_type = getattr(user, 'employee_type', None)
@@ -470,8 +470,7 @@ def create_leave_for_user(request, user_id):
                             )
             try:
                 leave_request.submit()
-                from django.template.loader import render_to_string
-                from weasyprint import HTML
+                from leaves.utils.pdf_renderer import render_pdf
                 private_media_root = getattr(settings, 'PRIVATE_MEDIA_ROOT',
                                             os.path.join(settings.BASE_DIR, 'private_media'))
                 pdf_path = os.path.join(private_media_root, 'leave_requests', str(leave_request.id), 'request.pdf')
@@ -485,8 +484,7 @@ def create_leave_for_user(request, user_id):
                     'attachments': leave_request.attachments.all(),
                     'form_data': {'description': leave_request.description, 'leave_type': leave_request.leave_type},
                 }
-                html_content = render_to_string('leaves/pdf_template.html', pdf_context)
-                HTML(string=html_content).write_pdf(pdf_path)
+                render_pdf('leaves/pdf_template.html', pdf_context, target=pdf_path)
                 next_status = 'ΥΠΟΒΛΗΘΕΙΣΑ' if leave_request.status == 'SUBMITTED' else 'ΓΙΑ ΠΡΩΤΟΚΟΛΛΟ ΠΔΕΔΕ'
                 messages.success(request, f'Η αίτηση δημιουργήθηκε και υποβλήθηκε για τον/την {target_user.full_name}. Κατάσταση: {next_status}.')
             except ValueError as e:
@@ -726,8 +724,7 @@ def approve_leave_request(request, pk):
             
             # Αναγέννηση PDF με την υπογραφή του προϊσταμένου
             try:
-                from django.template.loader import render_to_string
-                from weasyprint import HTML
+                from leaves.utils.pdf_renderer import render_pdf
                 import os
                 from django.conf import settings
                 private_media_root = getattr(settings, 'PRIVATE_MEDIA_ROOT',
@@ -743,8 +740,7 @@ def approve_leave_request(request, pk):
                     'attachments': leave_request.attachments.all(),
                     'form_data': {'description': leave_request.description, 'leave_type': leave_request.leave_type},
                 }
-                html_content = render_to_string('leaves/pdf_template.html', pdf_context)
-                HTML(string=html_content).write_pdf(pdf_path)
+                render_pdf('leaves/pdf_template.html', pdf_context, target=pdf_path)
             except Exception as e:
                 import logging
                 logger = logging.getLogger(__name__)
@@ -753,13 +749,12 @@ def approve_leave_request(request, pk):
             # Ειδοποίηση στους χειριστές αδειών
             from accounts.models import User
             leave_handlers = User.objects.filter(roles__code='LEAVE_HANDLER', is_active=True).distinct()
-            for handler in leave_handlers:
-                create_notification(
-                    user=handler,
-                    title="Αίτηση Εγκρίθηκε από Προϊστάμενο",
-                    message=f"Η αίτηση του/της {leave_request.user.full_name} εγκρίθηκε και περιμένει επεξεργασία",
-                    related_object=leave_request
-                )
+            notify_many(
+                leave_handlers,
+                title="Αίτηση Εγκρίθηκε από Προϊστάμενο",
+                message=f"Η αίτηση του/της {leave_request.user.full_name} εγκρίθηκε και περιμένει επεξεργασία",
+                related_object=leave_request
+            )
             
             # Ειδοποίηση στον υπάλληλο
             create_notification(
@@ -820,8 +815,7 @@ def reject_leave_request(request, pk):
             
             # Αναγέννηση PDF με την απόρριψη
             try:
-                from django.template.loader import render_to_string
-                from weasyprint import HTML
+                from leaves.utils.pdf_renderer import render_pdf
                 from django.conf import settings
                 import os
                 leave_request.refresh_from_db()
@@ -836,7 +830,7 @@ def reject_leave_request(request, pk):
                     'attachments': leave_request.attachments.all(),
                     'form_data': {'description': leave_request.description, 'leave_type': leave_request.leave_type},
                 }
-                HTML(string=render_to_string('leaves/pdf_template.html', pdf_context)).write_pdf(pdf_path)
+                render_pdf('leaves/pdf_template.html', pdf_context, target=pdf_path)
             except Exception as e:
                 import logging
                 logger = logging.getLogger(__name__)
@@ -874,62 +868,35 @@ class HandlerDashboardView(LoginRequiredMixin, RoleDashboardMixin, DashboardFilt
         return super().dispatch(request, *args, **kwargs)
     
     def get_queryset(self):
-        queryset = LeaveRequest.objects.filter(
-            status__in=['PENDING_PROTOCOL', 'WAITING_FOR_DOCUMENTS', 'IN_REVIEW', 'DECISION_PREPARATION', 'PENDING_YC_COMMITTEE', 'PENDING_SIGNATURES', 'COMPLETED', 'REJECTED_BY_LEAVES_DEPT']
-        ).select_related('user', 'leave_type', 'manager_approved_by', 'locking_user')
-        
+        from leaves.utils.handler_tab_counts import HANDLER_TAB_STATUSES
+
         # Filter by active tab
         tab = self.request.GET.get('tab', 'protocol')
-        tab_filters = {
-            'all': ['PENDING_PROTOCOL', 'WAITING_FOR_DOCUMENTS', 'IN_REVIEW', 'DECISION_PREPARATION', 'PENDING_YC_COMMITTEE', 'PENDING_SIGNATURES', 'COMPLETED', 'REJECTED_BY_LEAVES_DEPT'],
-            'protocol': ['PENDING_PROTOCOL'],
-            'processing': ['IN_REVIEW'],
-            'documents': ['WAITING_FOR_DOCUMENTS'],
-            'decision': ['DECISION_PREPARATION'],
-            'yc_committee': ['PENDING_YC_COMMITTEE'],
-            'signatures': ['PENDING_SIGNATURES'],
-            'completed': ['COMPLETED'],
-            'rejected': ['REJECTED_BY_LEAVES_DEPT'],
-        }
-        if tab in tab_filters:
-            queryset = LeaveRequest.objects.filter(
-                status__in=tab_filters[tab]
-            ).select_related('user', 'leave_type', 'manager_approved_by', 'locking_user')
+        queryset = LeaveRequest.objects.filter(
+            status__in=HANDLER_TAB_STATUSES.get(tab, HANDLER_TAB_STATUSES['all'])
+        ).select_related('user', 'leave_type', 'manager_approved_by')
         
         queryset = self.apply_filters(queryset)
         queryset = apply_sort(queryset, self.get_sort_params())
-        
-        # Clean up expired locks
-        cutoff_time = timezone.now() - timedelta(minutes=LOCK_TIMEOUT_MINUTES)
-        LeaveRequest.objects.filter(locked_at__lt=cutoff_time).update(locking_user=None, locked_at=None)
-        
         return queryset
     
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         
-        # Add actions to each leave request
+        # Add actions and lock state (ένα MGET) to each leave request
+        from leaves.utils.request_locks import get_locks
+        locks = get_locks([lr.pk for lr in context['leave_requests']])
+        page_actions = resolve_available_actions(context['leave_requests'], self.request.user)
         for lr in context['leave_requests']:
-            lr.actions = get_available_actions(lr, self.request.user)
+            lr.actions = page_actions[lr.pk]
+            lr.lock = locks.get(lr.pk)
         
         # Active tab
         context['active_tab'] = self.request.GET.get('tab', 'protocol')
         
-        # Tab counts
-        all_active = LeaveRequest.objects.filter(
-            status__in=['PENDING_PROTOCOL', 'WAITING_FOR_DOCUMENTS', 'IN_REVIEW', 'DECISION_PREPARATION', 'PENDING_YC_COMMITTEE', 'PENDING_SIGNATURES', 'COMPLETED', 'REJECTED_BY_LEAVES_DEPT']
-        )
-        context['tab_counts'] = {
-            'all': all_active.count(),
-            'protocol': LeaveRequest.objects.filter(status='PENDING_PROTOCOL').count(),
-            'processing': LeaveRequest.objects.filter(status='IN_REVIEW').count(),
-            'documents': LeaveRequest.objects.filter(status='WAITING_FOR_DOCUMENTS').count(),
-            'decision': LeaveRequest.objects.filter(status='DECISION_PREPARATION').count(),
-            'signatures': LeaveRequest.objects.filter(status='PENDING_SIGNATURES').count(),
-            'completed': LeaveRequest.objects.filter(status='COMPLETED').count(),
-            'rejected': LeaveRequest.objects.filter(status='REJECTED_BY_LEAVES_DEPT').count(),
-            'yc_committee': LeaveRequest.objects.filter(status='PENDING_YC_COMMITTEE').count(),
-        }
+        # Tab counts — ένα query, cached μέχρι την επόμενη αλλαγή κατάστασης
+        from leaves.utils.handler_tab_counts import get_handler_tab_counts
+        context['tab_counts'] = get_handler_tab_counts()
         
         # Αιτήσεις για Πρωτόκολλο ΠΔΕΔΕ (όλες, για τα modals)
         context['pdede_pending_requests'] = LeaveRequest.objects.filter(
@@ -1433,22 +1400,19 @@ def serve_protocol_pdf(request, pk):
         raise Http404("Το πρωτοκολλημένο PDF δεν βρέθηκε.")
     
     try:
-        from .crypto_utils import SecureFileHandler
-        
-        # Αποκρυπτογράφηση και serve του αρχείου
-        decrypted_content = SecureFileHandler.load_encrypted_file(
+        # Σταδιακή αποκρυπτογράφηση και serve του αρχείου
+        filename = f"Πρωτοκολλημένη_Αίτηση_{leave_request.protocol_number or leave_request.id}.pdf"
+        response = encrypted_file_response(
+            request,
             leave_request.protocol_pdf_path,
-            leave_request.protocol_pdf_encryption_key
+            leave_request.protocol_pdf_encryption_key,
+            content_type='application/pdf',
+            filename=filename,
         )
         
-        if decrypted_content is None:
+        if response is None:
             raise Http404("Σφάλμα κατά την αποκρυπτογράφηση του αρχείου.")
         
-        response = HttpResponse(decrypted_content, content_type='application/pdf')
-        filename = f"Πρωτοκολλημένη_Αίτηση_{leave_request.protocol_number or leave_request.id}.pdf"
-        response['Content-Disposition'] = f'inline; filename="{filename}"'
-        response['Content-Length'] = len(decrypted_content)
-        
         return response
         
     except Exception as e:
@@ -1522,15 +1486,12 @@ class LeaveRequestDetailView(LoginRequiredMixin, DetailView):
         # Attachments
         context['attachments'] = leave_request.attachments.all()
 
-        # Locking status
-        context['is_locked'] = leave_request.locking_user is not None
-        context['locked_by'] = leave_request.locking_user
-        context['locked_at'] = leave_request.locked_at
-        context['lock_expired'] = False
-        if leave_request.locked_at:
-            from datetime import timedelta
-            cutoff = timezone.now() - timedelta(minutes=LOCK_TIMEOUT_MINUTES)
-            context['lock_expired'] = leave_request.locked_at < cutoff
+        # Locking status (τα ληγμένα κλειδώματα λείπουν ήδη από το Redis)
+        from leaves.utils.request_locks import get_lock
+        lock = get_lock(leave_request.pk)
+        context['is_locked'] = lock is not None
+        context['locked_by'] = lock['user_name'] if lock else None
+        context['locked_at'] = lock['locked_at'] if lock else None
 
         # Revocation eligibility (μόνο μη ολοκληρωμένες αιτήσεις)
         context['can_withdraw'] = False
@@ -1620,46 +1581,42 @@ def serve_secure_file(request, file_id):
             )
             raise PermissionDenied("Δεν έχετε δικαίωμα πρόσβασης σε αυτό το αρχείο.")
         
-        # Φόρτωση και αποκρυπτογράφηση του αρχείου
-        decrypted_content = SecureFileHandler.load_encrypted_file(
+        # Προσδιορισμός Content-Type
+        content_type = secure_file.content_type or SecureFileHandler.get_content_type(
+            secure_file.original_filename
+        )
+        
+        # Σταδιακή αποκρυπτογράφηση με headers για ασφαλή διαχείριση
+        response = encrypted_file_response(
+            request,
             secure_file.file_path,
-            secure_file.encryption_key
+            secure_file.encryption_key,
+            content_type=content_type,
+            filename=secure_file.original_filename,
+            extra_headers={
+                'X-Content-Type-Options': 'nosniff',
+                'X-Frame-Options': 'DENY',
+                'Cache-Control': 'no-cache, no-store, must-revalidate',
+                'Pragma': 'no-cache',
+                'Expires': '0',
+            },
         )
         
-        if decrypted_content is None:
+        if response is None:
             import logging
             logger = logging.getLogger(__name__)
             logger.error(f"Failed to decrypt file {file_id} for user {request.user.id}")
             raise Http404("Το αρχείο δεν μπορεί να φορτωθεί.")
         
-        # Καταγραφή επιτυχούς πρόσβασης (GDPR)
-        access_type = 'DOWNLOAD' if request.GET.get('download') else 'VIEW'
-        FileAccessController.log_file_access(
-            user=request.user,
-            secure_file=secure_file,
-            access_type=access_type,
-            ip_address=request.META.get('REMOTE_ADDR')
-        )
-        
-        # Προσδιορισμός Content-Type
-        content_type = secure_file.content_type or SecureFileHandler.get_content_type(
-            secure_file.original_filename
-        )
-        
-        # Δημιουργία HTTP Response
-        response = HttpResponse(decrypted_content, content_type=content_type)
-        
-        # Headers για ασφαλή διαχείριση
-        response['Content-Disposition'] = f'inline; filename="{secure_file.original_filename}"'
-        response['Content-Length'] = len(decrypted_content)
-        response['X-Content-Type-Options'] = 'nosniff'
-        response['X-Frame-Options'] = 'DENY'
-        response['Cache-Control'] = 'no-cache, no-store, must-revalidate'
-        response['Pragma'] = 'no-cache'
-        response['Expires'] = '0'
-        
-        # Καθαρισμός μνήμης
-        del decrypted_content
+        # Καταγραφή επιτυχούς πρόσβασης (GDPR) — μία φορά ανά άνοιγμα, όχι ανά Range request
+        if is_initial_response(response):
+            access_type = 'DOWNLOAD' if request.GET.get('download') else 'VIEW'
+            FileAccessController.log_file_access(
+                user=request.user,
+                secure_file=secure_file,
+                access_type=access_type,
+                ip_address=request.META.get('REMOTE_ADDR')
+            )
         
         return response
         
@@ -1738,8 +1695,7 @@ def submit_final_request(request):
         from .crypto_utils import SecureFileHandler
         from django.conf import settings
         import os
-        from django.template.loader import render_to_string
-        from notifications.utils import create_notification
+        from notifications.utils import create_notification, notify_many
         from django.contrib import messages
         from django.shortcuts import redirect
         from django.http import HttpResponse
@@ -1752,7 +1708,7 @@ def submit_final_request(request):
             return redirect('leaves:create_leave_request')
         
         try:
-            from weasyprint import HTML
+            from leaves.utils.pdf_renderer import render_pdf
             # Βρίσκουμε την αίτηση που δημιουργήθηκε ως DRAFT
             leave_request = LeaveRequest.objects.get(id=leave_request_id, user=request.user, status='DRAFT')
 
@@ -1791,13 +1747,12 @@ def submit_final_request(request):
                         is_active=True,
                         department=target_department
                     ).distinct()
-                    for secretary in secretaries:
-                        create_notification(
-                            user=secretary,
-                            title="Νέα Αίτηση προς Πρωτοκόλληση ΚΕΔΑΣΥ/ΚΕΠΕΑ",
-                            message=f"Νέα αίτηση άδειας από {leave_request.user.full_name} για {leave_request.leave_type.name} - χρειάζεται πρωτόκολλο ΚΕΔΑΣΥ/ΚΕΠΕΑ πριν την έγκριση",
-                            related_object=leave_request
-                        )
+                    notify_many(
+                        secretaries,
+                        title="Νέα Αίτηση προς Πρωτοκόλληση ΚΕΔΑΣΥ/ΚΕΠΕΑ",
+                        message=f"Νέα αίτηση άδειας από {leave_request.user.full_name} για {leave_request.leave_type.name} - χρειάζεται πρωτόκολλο ΚΕΔΑΣΥ/ΚΕΠΕΑ πριν την έγκριση",
+                        related_object=leave_request
+                    )
                     
                     # Ειδοποίηση προϊσταμένου
                     manager_to_notify = leave_request.user.get_approving_manager()
@@ -1834,13 +1789,12 @@ def submit_final_request(request):
                         is_active=True,
                         department=target_department
                     ).distinct()
-                    for secretary in secretaries:
-                        create_notification(
-                            user=secretary,
-                            title="Νέα Αίτηση ΚΕΔΑΣΥ/ΚΕΠΕΑ για Πρωτόκολλο",
-                            message=f"Νέα αίτηση άδειας από {leave_request.user.full_name} για {leave_request.leave_type.name} - χρειάζεται πρωτόκολλο ΚΕΔΑΣΥ/ΚΕΠΕΑ",
-                            related_object=leave_request
-                        )
+                    notify_many(
+                        secretaries,
+                        title="Νέα Αίτηση ΚΕΔΑΣΥ/ΚΕΠΕΑ για Πρωτόκολλο",
+                        message=f"Νέα αίτηση άδειας από {leave_request.user.full_name} για {leave_request.leave_type.name} - χρειάζεται πρωτόκολλο ΚΕΔΑΣΥ/ΚΕΠΕΑ",
+                        related_object=leave_request
+                    )
                     
                     # Ειδοποίηση προϊσταμένου - για ΣΔΕΥ, ειδοποιούμε τον ΚΕΔΑΣΥ προϊστάμενο
                     manager_to_notify = leave_request.user.manager
@@ -1865,13 +1819,12 @@ def submit_final_request(request):
                 else:
                     # Παράκαμψη προϊσταμένου - ειδοποίηση χειριστών αδειών
                     leave_handlers = User.objects.filter(roles__code='LEAVE_HANDLER', is_active=True).distinct()
-                    for handler in leave_handlers:
-                        create_notification(
-                            user=handler,
-                            title="Νέα Αίτηση Άδειας (Άμεση Επεξεργασία)",
-                            message=f"Νέα αίτηση άδειας από {leave_request.user.full_name} για {leave_request.leave_type.name} - δεν απαιτεί έγκριση προϊσταμένου",
-                            related_object=leave_request
-                        )
+                    notify_many(
+                        leave_handlers,
+                        title="Νέα Αίτηση Άδειας (Άμεση Επεξεργασία)",
+                        message=f"Νέα αίτηση άδειας από {leave_request.user.full_name} για {leave_request.leave_type.name} - δεν απαιτεί έγκριση προϊσταμένου",
+                        related_object=leave_request
+                    )
             
             # Προσθήκη νέων συνημμένων αρχείων αν υπάρχουν
             private_media_root = getattr(settings, 'PRIVATE_MEDIA_ROOT',
@@ -1939,8 +1892,7 @@ def submit_final_request(request):
             }
             
             # Generate PDF
-            html_content = render_to_string('leaves/pdf_template.html', context)
-            HTML(string=html_content).write_pdf(pdf_path)
+            render_pdf('leaves/pdf_template.html', context, target=pdf_path)
 
             # Αυτόματη δημιουργία ενοποιημένου PDF και αποστολή στο πρωτόκολλο
             # (όχι για άτυπες / is_simple άδειες)
@@ -1949,31 +1901,24 @@ def submit_final_request(request):
                 return redirect('leaves:leave_request_detail', leave_request.id)
 
             try:
-                from leaves.utils.pdf_merger import save_merged_pdf
-                from leaves.utils.protocol_email_alerts import (
-                    clear_protocol_email_failure,
-                    mark_protocol_email_failed,
+                from leaves.utils.protocol_dispatch import (
+                    enqueue_protocol_dispatch,
+                    submission_dispatch_key,
                 )
-                from pdede_leaves.email_utils import send_merged_pdf_email
 
-                pdf_content, _, _ = save_merged_pdf(leave_request)
                 protocol_recipient = getattr(
                     settings, 'PROTOCOL_EMAIL_RECIPIENT', 'adeiespdede@sch.gr'
                 )
-                email_sent = send_merged_pdf_email(
+                # Δημιουργία PDF + email εκτελούνται στον Celery worker
+                enqueue_protocol_dispatch(
                     leave_request,
-                    pdf_content,
                     recipient=protocol_recipient,
+                    idempotency_key=submission_dispatch_key(leave_request),
+                )
+                messages.success(
+                    request,
+                    f'Η αίτηση υποβλήθηκε. Το ενοποιημένο PDF θα σταλεί στο {protocol_recipient}.',
                 )
-                if email_sent:
-                    clear_protocol_email_failure(leave_request)
-                    messages.success(
-                        request,
-                        f'Η αίτηση υποβλήθηκε και το ενοποιημένο PDF στάλθηκε στο {protocol_recipient}.',
-                    )
-                else:
-                    mark_protocol_email_failed(leave_request)
-                    messages.success(request, 'Η αίτηση άδειας υποβλήθηκε επιτυχώς!')
             except Exception as email_error:
                 import logging
                 logging.getLogger(__name__).error(
@@ -2176,13 +2121,12 @@ def withdraw_leave_request(request, pk):
             
             # Ειδοποίηση στους χειριστές αδειών
             leave_handlers = User.objects.filter(roles__code='LEAVE_HANDLER', is_active=True).distinct()
-            for handler in leave_handlers:
-                create_notification(
-                    user=handler,
-                    title="Ανάκληση Αίτησης",
-                    message=f"Η αίτηση του/της {leave_request.user.full_name} για {leave_request.leave_type.name} ανακλήθηκε από τον αιτούντα",
-                    related_object=leave_request
-                )
+            notify_many(
+                leave_handlers,
+                title="Ανάκληση Αίτησης",
+                message=f"Η αίτηση του/της {leave_request.user.full_name} για {leave_request.leave_type.name} ανακλήθηκε από τον αιτούντα",
+                related_object=leave_request
+            )
             
             messages.success(request, 'Η αίτηση ανακλήθηκε επιτυχώς!')
             return redirect('leaves:employee_dashboard')
@@ -2252,8 +2196,7 @@ def add_kedasy_kepea_protocol(request, pk):
                 )
             # Αναγέννηση PDF με τα στοιχεία πρωτοκόλλου
             try:
-                from django.template.loader import render_to_string
-                from weasyprint import HTML
+                from leaves.utils.pdf_renderer import render_pdf
                 from django.conf import settings
                 import os
                 leave_request.refresh_from_db()
@@ -2268,7 +2211,7 @@ def add_kedasy_kepea_protocol(request, pk):
                     'attachments': leave_request.attachments.all(),
                     'form_data': {'description': leave_request.description, 'leave_type': leave_request.leave_type},
                 }
-                HTML(string=render_to_string('leaves/pdf_template.html', pdf_context)).write_pdf(pdf_path)
+                render_pdf('leaves/pdf_template.html', pdf_context, target=pdf_path)
             except Exception as e:
                 import logging
                 logger = logging.getLogger(__name__)
@@ -2483,8 +2426,7 @@ def provide_documents(request, pk):
 
             # Αναγέννηση PDF της αίτησης για να συμπεριληφθούν τα νέα δικαιολογητικά
             try:
-                from django.template.loader import render_to_string
-                from weasyprint import HTML
+                from leaves.utils.pdf_renderer import render_pdf
                 from django.conf import settings
                 leave_request.refresh_from_db()
                 private_media_root = getattr(settings, 'PRIVATE_MEDIA_ROOT', os.path.join(settings.BASE_DIR, 'private_media'))
@@ -2497,7 +2439,7 @@ def provide_documents(request, pk):
                     'attachments': leave_request.attachments.all(),
                     'form_data': {'description': leave_request.description, 'leave_type': leave_request.leave_type},
                 }
-                HTML(string=render_to_string('leaves/pdf_template.html', pdf_context)).write_pdf(pdf_path)
+                render_pdf('leaves/pdf_template.html', pdf_context, target=pdf_path)
             except Exception as e:
                 import logging
                 logger = logging.getLogger(__name__)
@@ -2580,17 +2522,16 @@ def submit_applicant_documents(request, pk):
                 roles__code='LEAVE_HANDLER',
                 is_active=True,
             ).distinct()
-            for handler in leave_handlers:
-                create_notification(
-                    user=handler,
-                    title='Ολοκληρώθηκε η αποστολή δικαιολογητικών',
-                    message=(
-                        f"Ο/Η {leave_request.user.full_name} ολοκλήρωσε την αποστολή "
-                        f"δικαιολογητικών για την αίτηση #{leave_request.pk} "
-                        f"({leave_request.leave_type.name}). Μπορείτε να προχωρήσετε στην απόφαση."
-                    ),
-                    related_object=leave_request,
-                )
+            notify_many(
+                leave_handlers,
+                title='Ολοκληρώθηκε η αποστολή δικαιολογητικών',
+                message=(
+                    f"Ο/Η {leave_request.user.full_name} ολοκλήρωσε την αποστολή "
+                    f"δικαιολογητικών για την αίτηση #{leave_request.pk} "
+                    f"({leave_request.leave_type.name}). Μπορείτε να προχωρήσετε στην απόφαση."
+                ),
+                related_object=leave_request,
+            )
 
             messages.success(
                 request,
@@ -2782,86 +2723,69 @@ def attendance_sheet(request):
     if not request.user.is_leave_handler:
         raise PermissionDenied("Μόνο χειριστές αδειών.")
     from accounts.models import Department, User
+    from leaves.utils.attendance import ATTENDANCE_MAX_RANGE_DAYS, iter_attendance_sheets
     autotelous = Department.objects.filter(code='AUTOTELOUS_DN').first()
     departments = autotelous.get_all_sub_departments() if autotelous else []
     employees = User.objects.filter(department__in=departments, is_active=True).order_by('last_name', 'first_name')
+    form_context = {
+        'employees': employees,
+        'today': timezone.now().date(),
+        'max_range_days': ATTENDANCE_MAX_RANGE_DAYS,
+    }
 
     if request.method == 'POST':
         date_str = request.POST.get('date', '')
+        date_to_str = request.POST.get('date_to', '')
         export_format = request.POST.get('export', 'pdf')
         if not date_str:
             messages.error(request, 'Επιλέξτε ημερομηνία.')
-            return render(request, 'leaves/attendance_sheet.html', {
-                'employees': employees,
-                'today': timezone.now().date(),
-            })
+            return render(request, 'leaves/attendance_sheet.html', form_context)
         from datetime import datetime
-        selected_date = datetime.strptime(date_str, '%Y-%m-%d').date()
-
-        rows = []
-        for emp in employees:
-            leave_types_on_date = []
-            for lr in LeaveRequest.objects.filter(
-                user=emp,
-                submitted_at__year=selected_date.year,
-                status__in=[
-                    'SUBMITTED', 'PENDING_PROTOCOL', 'IN_REVIEW', 'WAITING_FOR_DOCUMENTS',
-                    'DECISION_PREPARATION', 'PENDING_YC_COMMITTEE', 'PENDING_SIGNATURES', 'COMPLETED',
-                ],
-            ).prefetch_related('periods'):
-                for p in lr.periods.all():
-                    if p.start_date <= selected_date <= p.end_date:
-                        leave_types_on_date.append(lr.leave_type.name)
-                        break
-            rows.append({
-                'emp': emp,
-                'leave_type': ' | '.join(leave_types_on_date) if leave_types_on_date else None,
-            })
+        try:
+            selected_date = datetime.strptime(date_str, '%Y-%m-%d').date()
+            date_to = datetime.strptime(date_to_str, '%Y-%m-%d').date() if date_to_str else selected_date
+        except ValueError:
+            messages.error(request, 'Μη έγκυρη μορφή ημερομηνίας.')
+            return render(request, 'leaves/attendance_sheet.html', form_context)
+        if date_to < selected_date or (date_to - selected_date).days >= ATTENDANCE_MAX_RANGE_DAYS:
+            messages.error(
+                request,
+                f'Το διάστημα πρέπει να είναι έως {ATTENDANCE_MAX_RANGE_DAYS} ημέρες, με τη λήξη μετά την έναρξη.',
+            )
+            return render(request, 'leaves/attendance_sheet.html', form_context)
+
+        # Σε διάστημα ημερών παραλείπονται Σαββατοκύριακα και αργίες
+        is_range = date_to != selected_date
+        sheets = iter_attendance_sheets(employees, selected_date, date_to, working_days_only=is_range)
+        filename = f'parousiologio_{selected_date.strftime("%Y%m%d")}'
+        if is_range:
+            filename += f'_{date_to.strftime("%Y%m%d")}'
 
         if export_format == 'excel':
-            return _attendance_excel_response(rows, selected_date)
+            return _attendance_excel_response(sheets, filename)
 
-        from django.template.loader import render_to_string
-        from weasyprint import HTML
-        import io
+        from leaves.utils.pdf_renderer import render_pdf
         from django.http import HttpResponse
 
-        html_str = render_to_string('leaves/attendance_pdf_template.html', {
-            'rows': rows,
-            'selected_date': selected_date,
+        pdf = render_pdf('leaves/attendance_pdf_template.html', {
+            'sheets': sheets,
         })
-        buf = io.BytesIO()
-        HTML(string=html_str).write_pdf(buf)
-        pdf = buf.getvalue()
-        buf.close()
         response = HttpResponse(pdf, content_type='application/pdf')
-        response['Content-Disposition'] = (
-            f'attachment; filename="parousiologio_{selected_date.strftime("%Y%m%d")}.pdf"'
-        )
+        response['Content-Disposition'] = f'attachment; filename="{filename}.pdf"'
         return response
 
-    return render(request, 'leaves/attendance_sheet.html', {
-        'employees': employees,
-        'today': timezone.now().date(),
-    })
+    return render(request, 'leaves/attendance_sheet.html', form_context)
 
 
-def _attendance_excel_response(rows, selected_date):
-    """Εξαγωγή παρουσιολογίου σε Excel (.xlsx)."""
+def _attendance_excel_response(sheets, filename):
+    """Εξαγωγή παρουσιολογίου σε Excel (.xlsx) — ένα φύλλο εργασίας ανά ημέρα."""
     import io
     from openpyxl import Workbook
     from openpyxl.styles import Alignment, Border, Font, Side
     from django.http import HttpResponse
 
     wb = Workbook()
-    ws = wb.active
-    ws.title = 'Παρουσιολόγιο'
-    ws['A1'] = 'ΠΑΡΟΥΣΙΟΛΟΓΙΟ'
-    ws['A1'].font = Font(bold=True, size=14)
-    ws.merge_cells('A1:G1')
-    ws['A2'] = selected_date.strftime('%d/%m/%Y')
-    ws['A2'].font = Font(size=11, color='555555')
-    ws.merge_cells('A2:G2')
+    wb.remove(wb.active)
 
     headers = ['Α/Α', 'Ονοματεπώνυμο', 'Άδεια', 'Άφιξη', 'Υπογραφή', 'Αναχώρηση', 'Υπογραφή']
     header_font = Font(bold=True)
@@ -2871,35 +2795,49 @@ def _attendance_excel_response(rows, selected_date):
         top=Side(style='thin'),
         bottom=Side(style='thin'),
     )
-    for col, header in enumerate(headers, start=1):
-        cell = ws.cell(row=4, column=col, value=header)
-        cell.font = header_font
-        cell.alignment = Alignment(horizontal='center')
-        cell.border = thin
-
-    for idx, row in enumerate(rows, start=1):
-        values = [
-            idx,
-            f"{row['emp'].last_name} {row['emp'].first_name}",
-            row['leave_type'] or '',
-            '',
-            '',
-            '',
-            '',
-        ]
-        for col, value in enumerate(values, start=1):
-            cell = ws.cell(row=4 + idx, column=col, value=value)
+    for sheet in sheets:
+        selected_date = sheet['date']
+        ws = wb.create_sheet(selected_date.strftime('%d-%m-%Y'))
+        ws['A1'] = 'ΠΑΡΟΥΣΙΟΛΟΓΙΟ'
+        ws['A1'].font = Font(bold=True, size=14)
+        ws.merge_cells('A1:G1')
+        ws['A2'] = selected_date.strftime('%d/%m/%Y')
+        ws['A2'].font = Font(size=11, color='555555')
+        ws.merge_cells('A2:G2')
+
+        for col, header in enumerate(headers, start=1):
+            cell = ws.cell(row=4, column=col, value=header)
+            cell.font = header_font
+            cell.alignment = Alignment(horizontal='center')
             cell.border = thin
-            if col in (1, 3, 4, 5, 6, 7):
-                cell.alignment = Alignment(horizontal='center')
 
-    ws.column_dimensions['A'].width = 6
-    ws.column_dimensions['B'].width = 32
-    ws.column_dimensions['C'].width = 22
-    ws.column_dimensions['D'].width = 12
-    ws.column_dimensions['E'].width = 14
-    ws.column_dimensions['F'].width = 12
-    ws.column_dimensions['G'].width = 14
+        for idx, row in enumerate(sheet['rows'], start=1):
+            values = [
+                idx,
+                f"{row['emp'].last_name} {row['emp'].first_name}",
+                row['leave_type'] or '',
+                '',
+                '',
+                '',
+                '',
+            ]
+            for col, value in enumerate(values, start=1):
+                cell = ws.cell(row=4 + idx, column=col, value=value)
+                cell.border = thin
+                if col in (1, 3, 4, 5, 6, 7):
+                    cell.alignment = Alignment(horizontal='center')
+
+        ws.column_dimensions['A'].width = 6
+        ws.column_dimensions['B'].width = 32
+        ws.column_dimensions['C'].width = 22
+        ws.column_dimensions['D'].width = 12
+        ws.column_dimensions['E'].width = 14
+        ws.column_dimensions['F'].width = 12
+        ws.column_dimensions['G'].width = 14
+
+    if not wb.worksheets:
+        # Διάστημα χωρίς εργάσιμες ημέρες
+        wb.create_sheet('Παρουσιολόγιο')
 
     buf = io.BytesIO()
     wb.save(buf)
@@ -2909,9 +2847,7 @@ def _attendance_excel_response(rows, selected_date):
         content,
         content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
     )
-    response['Content-Disposition'] = (
-        f'attachment; filename="parousiologio_{selected_date.strftime("%Y%m%d")}.xlsx"'
-    )
+    response['Content-Disposition'] = f'attachment; filename="{filename}.xlsx"'
     return response
 
 
@@ -2973,17 +2909,11 @@ def lock_leave_request(request, pk):
         messages.error(request, 'Η αίτηση δεν μπορεί να κλειδωθεί σε αυτή τη φάση.')
         return redirect('leaves:handler_dashboard')
 
-    # Auto-unlock expired locks
-    cutoff_time = timezone.now() - timedelta(minutes=LOCK_TIMEOUT_MINUTES)
-    if leave_request.locked_at and leave_request.locked_at < cutoff_time:
-        leave_request.locking_user = None
-        leave_request.locked_at = None
-        leave_request.save()
-
-    # Lock the request
-    leave_request.locking_user = request.user
-    leave_request.locked_at = timezone.now()
-    leave_request.save()
+    from leaves.utils.request_locks import acquire_lock
+    acquired, lock = acquire_lock(leave_request.pk, request.user)
+    if not acquired:
+        messages.error(request, f'Η αίτηση είναι ήδη κλειδωμένη από {lock["user_name"]}.')
+        return redirect('leaves:leave_request_detail', pk=pk)
 
     messages.success(request, 'Η αίτηση κλειδώθηκε για επεξεργασία.')
     return redirect('leaves:leave_request_detail', pk=pk)
@@ -2998,14 +2928,11 @@ def unlock_leave_request(request, pk):
     leave_request = get_object_or_404(LeaveRequest, pk=pk)
 
     # Only the locking user or an admin can unlock
-    if leave_request.locking_user != request.user and not request.user.is_superuser:
+    from leaves.utils.request_locks import release_lock
+    if not release_lock(leave_request.pk, request.user, force=request.user.is_superuser):
         messages.error(request, 'Δεν μπορείτε να ξεκλειδώσετε αυτή την αίτηση.')
         return redirect('leaves:leave_request_detail', pk=pk)
 
-    leave_request.locking_user = None
-    leave_request.locked_at = None
-    leave_request.save()
-
     messages.success(request, 'Η αίτηση ξεκλειδώθηκε.')
     return redirect('leaves:leave_request_detail', pk=pk)
 
@@ -3230,8 +3157,7 @@ def handler_upload_attachment(request, pk):
     
     # Αναγέννηση PDF της αίτησης για να συμπεριληφθούν τα νέα συνημμένα
     try:
-        from django.template.loader import render_to_string
-        from weasyprint import HTML
+        from leaves.utils.pdf_renderer import render_pdf
         leave_request.refresh_from_db()
         pdf_path = os.path.join(
             getattr(settings, 'PRIVATE_MEDIA_ROOT', os.path.join(settings.BASE_DIR, 'private_media')),
@@ -3245,7 +3171,7 @@ def handler_upload_attachment(request, pk):
             'attachments': leave_request.attachments.all(),
             'form_data': {'description': leave_request.description, 'leave_type': leave_request.leave_type},
         }
-        HTML(string=render_to_string('leaves/pdf_template.html', pdf_context)).write_pdf(pdf_path)
+        render_pdf('leaves/pdf_template.html', pdf_context, target=pdf_path)
     except Exception as e:
         import logging
         logger = logging.getLogger(__name__)
@@ -3253,11 +3179,13 @@ def handler_upload_attachment(request, pk):
     
     return redirect('leaves:leave_request_detail', pk=pk)
 
+
+@login_required
 def send_to_protocol_view(request, pk):
     """
     Αποστολή για Πρωτόκολλο — Δημιουργία ενοποιημένου PDF και αποστολή μέσω email.
-    GET:  Εμφάνιση preview του merged PDF
-    POST: Αποστολή email
+    GET:  Εμφάνιση φόρμας και κατάστασης τελευταίας αποστολής
+    POST: Προγραμματισμός δημιουργίας PDF + email στον Celery worker
     """
     # Έλεγχος δικαιωμάτων — μόνο χειριστές
     if not request.user.is_leave_handler:
@@ -3266,14 +3194,35 @@ def send_to_protocol_view(request, pk):
     
     leave_request = get_object_or_404(LeaveRequest, pk=pk)
     
-    # Δημιουργία merged PDF (πάντα από την αρχή για να περιλαμβάνει νέα συνημμένα)
-    try:
-        from leaves.utils.pdf_merger import save_merged_pdf
-        pdf_content, encrypted_path, key_hex = save_merged_pdf(leave_request)
-        messages.success(request, 'Το ενοποιημένο PDF δημιουργήθηκε επιτυχώς.')
-    except Exception as e:
-        messages.error(request, f'Σφάλμα κατά τη δημιουργία του ενοποιημένου PDF: {str(e)}')
-        return redirect('leaves:leave_request_detail', pk=leave_request.id)
+    from leaves.utils.protocol_dispatch import enqueue_protocol_dispatch, new_dispatch_key
+    
+    if request.method == 'POST':
+        # Λήψη email παραλήπτη από τη φόρμα (με fallback στο default)
+        protocol_email = request.POST.get('protocol_email', '').strip() or getattr(
+            settings, 'PROTOCOL_EMAIL_RECIPIENT', 'apettas@gmail.com'
+        )
+        # Λήψη προσαρμοσμένου θέματος email (με fallback στο default)
+        custom_email_subject = request.POST.get('email_subject', '').strip()
+        
+        try:
+            # Το PDF ξαναδημιουργείται πάντα στον worker για να περιλαμβάνει νέα συνημμένα
+            queued = enqueue_protocol_dispatch(
+                leave_request,
+                recipient=protocol_email,
+                subject=custom_email_subject,
+                idempotency_key=request.POST.get('dispatch_key', '').strip() or None,
+            )
+            if queued:
+                messages.success(
+                    request,
+                    f'Η δημιουργία του ενοποιημένου PDF και η αποστολή στο {protocol_email} ξεκίνησαν.',
+                )
+            else:
+                messages.info(request, 'Η αποστολή αυτή έχει ήδη καταχωρηθεί.')
+        except Exception as e:
+            messages.error(request, f'Σφάλμα: {str(e)}')
+        
+        return redirect('leaves:send_to_protocol', pk=leave_request.id)
     
     context = {
         'leave_request': leave_request,
@@ -3281,6 +3230,7 @@ def send_to_protocol_view(request, pk):
         'merged_pdf_size': leave_request.merged_pdf_size,
         'protocol_email': getattr(settings, 'PROTOCOL_EMAIL_RECIPIENT', 'apettas@gmail.com'),
         'email_subject': None,
+        'dispatch_key': new_dispatch_key(),
     }
     
     # Προβολή του email subject
@@ -3290,47 +3240,29 @@ def send_to_protocol_view(request, pk):
     except ImportError:
         pass
     
-    if request.method == 'POST':
-        try:
-            from leaves.utils.pdf_merger import save_merged_pdf
-            from pdede_leaves.email_utils import send_merged_pdf_email
-            from leaves.crypto_utils import SecureFileHandler
-
-            # Λήψη email παραλήπτη από τη φόρμα (με fallback στο default)
-            protocol_email = request.POST.get('protocol_email', '').strip()
-            if protocol_email:
-                context['protocol_email'] = protocol_email
-
-            # Λήψη προσαρμοσμένου θέματος email (με fallback στο default)
-            custom_email_subject = request.POST.get('email_subject', '').strip()
-
-            # Φόρτωση του αποθηκευμένου PDF
-            handler = SecureFileHandler()
-            pdf_content = handler.load_encrypted_file(
-                leave_request.merged_pdf_path,
-                leave_request.merged_pdf_encryption_key
-            )
+    return render(request, 'leaves/send_to_protocol.html', context)
 
-            if pdf_content is None:
-                # Δημιουργία ξανά αν αποτυχία φόρτωσης
-                pdf_content, _, _ = save_merged_pdf(leave_request)
 
-            success = send_merged_pdf_email(leave_request, pdf_content, recipient=context['protocol_email'], custom_subject=custom_email_subject)
-            
-            if success:
-                from leaves.utils.protocol_email_alerts import clear_protocol_email_failure
-                clear_protocol_email_failure(leave_request)
-                messages.success(request, 'Το email στάλθηκε επιτυχώς!')
-                context['sent_success'] = True
-            else:
-                messages.error(request, 'Σφάλμα κατά την αποστολή του email. Ελέγξτε τις ρυθμίσεις SMTP.')
-                context['send_error'] = 'Η αποστολή απέτυχε. Επικοινωνήστε με τον διαχειριστή.'
-                
-        except Exception as e:
-            messages.error(request, f'Σφάλμα: {str(e)}')
-            context['send_error'] = str(e)
+@login_required
+def protocol_dispatch_status(request, pk):
+    """HTMX fragment με την κατάσταση αποστολής στο πρωτόκολλο (polling όσο εκτελείται)."""
+    if not request.user.is_leave_handler:
+        raise PermissionDenied("Δεν έχετε δικαίωμα πρόσβασης.")
     
-    return render(request, 'leaves/send_to_protocol.html', context)
+    from leaves.utils.protocol_dispatch import fail_stale_dispatch
+
+    leave_request = get_object_or_404(
+        LeaveRequest.objects.only(
+            'id', 'protocol_dispatch_status', 'protocol_dispatch_error', 'protocol_dispatch_key',
+            'protocol_dispatch_updated_at', 'merged_pdf_path', 'merged_pdf_encryption_key',
+        ),
+        pk=pk,
+    )
+    # Χαμένο task — τερματισμός του polling και δυνατότητα νέας αποστολής
+    fail_stale_dispatch(leave_request)
+    return render(request, 'leaves/includes/protocol_dispatch_status.html', {
+        'leave_request': leave_request,
+    })
 
 
 @login_required
@@ -3350,25 +3282,22 @@ def serve_merged_pdf(request, pk):
         return redirect('leaves:leave_request_detail', pk=leave_request.id)
     
     try:
-        from leaves.crypto_utils import SecureFileHandler
-        handler = SecureFileHandler()
-        pdf_content = handler.load_encrypted_file(
+        is_download = request.GET.get('download') == '1'
+        
+        from leaves.utils.pdf_merger import build_merged_pdf_filename
+        response = encrypted_file_response(
+            request,
             leave_request.merged_pdf_path,
-            leave_request.merged_pdf_encryption_key
+            leave_request.merged_pdf_encryption_key,
+            content_type='application/pdf',
+            filename=build_merged_pdf_filename(leave_request),
+            as_attachment=is_download,
         )
         
-        if pdf_content is None:
+        if response is None:
             messages.error(request, 'Δεν ήταν δυνατή η φόρτωση του ενοποιημένου PDF.')
             return redirect('leaves:leave_request_detail', pk=leave_request.id)
         
-        is_download = request.GET.get('download') == '1'
-        
-        from leaves.utils.pdf_merger import build_merged_pdf_filename
-        filename = build_merged_pdf_filename(leave_request)
-        response = HttpResponse(pdf_content, content_type='application/pdf')
-        response['Content-Disposition'] = content_disposition_header(
-            as_attachment=is_download, filename=filename
-        )
         return response
         
     except Exception as e:
@@ -4,4 +4,8 @@ from django.apps import AppConfig
 class NotificationsConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'notifications'
-    verbose_name = 'Ειδοποιήσεις'
\ No newline at end of file
+    verbose_name = 'Ειδοποιήσεις'
+
+    def ready(self):
+        """Register signals"""
+        import notifications.signals  # noqa
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.3 on 2026-10-18 14:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('notifications', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notification',
+            name='emailed_at',
+            field=models.DateTimeField(blank=True, help_text='Πότε στάλθηκε με email (αποτρέπει διπλή αποστολή σε επανάληψη)', null=True, verbose_name='Αποστολή Email'),
+        ),
+    ]
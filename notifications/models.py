@@ -30,6 +30,8 @@ class Notification(models.Model):
     # Κατάσταση ειδοποίησης
     is_read = models.BooleanField('Αναγνώστηκε', default=False)
     read_at = models.DateTimeField('Ημερομηνία Ανάγνωσης', null=True, blank=True)
+    emailed_at = models.DateTimeField('Αποστολή Email', null=True, blank=True,
+                                      help_text='Πότε στάλθηκε με email (αποτρέπει διπλή αποστολή σε επανάληψη)')
     
     # Χρονικές σφραγίδες
     created_at = models.DateTimeField('Ημερομηνία Δημιουργίας', auto_now_add=True)
@@ -0,0 +1,25 @@
+"""
+Ενημέρωση του μετρητή μη αναγνωσμένων (notifications.unread) από τις αλλαγές ειδοποιήσεων.
+
+Δεν υπάρχει post_delete receiver: θα απενεργοποιούσε το fast delete του Django και κάθε
+queryset.delete() θα φόρτωνε όλες τις εγγραφές. Όσα σημεία διαγράφουν ειδοποιήσεις
+ενημερώνουν τα ίδια τον μετρητή.
+"""
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from .models import Notification
+from .unread import adjust_unread_count, reset_unread_count
+
+
+@receiver(post_save, sender=Notification)
+def update_unread_count_on_save(sender, instance, created, update_fields=None, **kwargs):
+    if created:
+        if not instance.is_read:
+            adjust_unread_count(instance.user_id, 1)
+    elif update_fields and 'is_read' in update_fields:
+        # mark_as_read() αποθηκεύει μόνο όταν η ειδοποίηση ήταν αδιάβαστη
+        adjust_unread_count(instance.user_id, -1 if instance.is_read else 1)
+    else:
+        reset_unread_count(instance.user_id)
+
@@ -0,0 +1,57 @@
+"""Celery tasks της εφαρμογής notifications."""
+import logging
+import smtplib
+
+from celery import shared_task
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.utils import timezone
+
+from .models import Notification
+
+logger = logging.getLogger(__name__)
+
+
+@shared_task(
+    autoretry_for=(smtplib.SMTPException, OSError),
+    retry_backoff=True,
+    retry_backoff_max=600,
+    max_retries=5,
+)
+def send_notification_emails(notification_ids):
+    """
+    Αποστολή ειδοποιήσεων και με email (μία σύνδεση SMTP για όλους τους παραλήπτες).
+
+    Κάθε επιτυχής αποστολή σημειώνεται στο emailed_at· σε μερική αποτυχία η
+    επανάληψη του task στέλνει μόνο όσες απέμειναν.
+    """
+    notifications = list(Notification.objects.filter(
+        pk__in=notification_ids, user__is_active=True, emailed_at__isnull=True,
+    ).exclude(user__email='').select_related('user'))
+    if not notifications:
+        return 0
+
+    sent_ids = []
+    failure = None
+    try:
+        with get_connection() as connection:
+            for notification in notifications:
+                message = EmailMessage(
+                    subject=notification.title,
+                    body=notification.message,
+                    from_email=settings.DEFAULT_FROM_EMAIL,
+                    to=[notification.user.email],
+                )
+                try:
+                    if connection.send_messages([message]):
+                        sent_ids.append(notification.pk)
+                except (smtplib.SMTPException, OSError) as exc:
+                    logger.warning('Notification email %s failed: %s', notification.pk, exc)
+                    failure = exc
+    finally:
+        Notification.objects.filter(pk__in=sent_ids).update(emailed_at=timezone.now())
+
+    logger.info('Sent %s notification emails', len(sent_ids))
+    if failure is not None:
+        raise failure
+    return len(sent_ids)
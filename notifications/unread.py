@@ -0,0 +1,151 @@
+"""
+Μετρητής μη αναγνωσμένων ειδοποιήσεων ανά χρήστη στο Redis και push ενημερώσεις.
+
+Ο μετρητής υπολογίζεται με COUNT(*) μόνο όταν λείπει από το cache· στη συνέχεια
+ενημερώνεται με incr/decr από τα signals (δημιουργία, ανάγνωση) και από τα σημεία
+που διαγράφουν ή αλλάζουν μαζικά ειδοποιήσεις (notify_many, «όλες ως διαβασμένες»,
+διαγραφές). Αν μια ενημέρωση βρει το κλειδί απόν ή αρνητικό, το κλειδί διαγράφεται
+και ο επόμενος αναγνώστης το ξαναϋπολογίζει.
+
+Κάθε ενημέρωση αυξάνει πρώτα ένα κλειδί έκδοσης ανά χρήστη. Ο αναγνώστης που
+ξαναϋπολογίζει κρατά το COUNT(*) μόνο αν η έκδοση δεν άλλαξε στο μεταξύ· αλλιώς μια
+ενημέρωση που δεν βρήκε κλειδί θα χανόταν και θα έμενε στο cache παλιό πλήθος.
+
+Κάθε αλλαγή (μετά το commit) δημοσιεύεται στο κανάλι Redis του χρήστη, από όπου
+τροφοδοτείται το SSE endpoint (βλ. views.notification_stream).
+"""
+import json
+import logging
+
+from django.core.cache import cache
+from django.db import transaction
+
+from .models import Notification
+
+logger = logging.getLogger(__name__)
+
+UNREAD_CACHE_TIMEOUT = 60 * 60
+
+
+def _key(user_id):
+    return f'notifications:unread:{user_id}'
+
+
+def _version_key(user_id):
+    return f'notifications:unread:version:{user_id}'
+
+
+def channel_name(user_id):
+    return f'notifications:user:{user_id}'
+
+
+def get_unread_count(user_id):
+    """Πλήθος μη αναγνωσμένων από το Redis (COUNT(*) και αποθήκευση όταν λείπει)."""
+    key, version_key = _key(user_id), _version_key(user_id)
+    try:
+        cached = cache.get_many([key, version_key])
+    except Exception as exc:
+        logger.warning('Cache unavailable reading unread count: %s', exc)
+        cached = None
+    if cached and key in cached:
+        return cached[key]
+
+    count = Notification.objects.filter(user_id=user_id, is_read=False).count()
+    if cached is not None:
+        try:
+            cache.add(key, count, UNREAD_CACHE_TIMEOUT)
+            if cache.get(version_key) != cached.get(version_key):
+                # Ενημέρωση κατά τον υπολογισμό — το πλήθος ίσως είναι παλιό
+                cache.delete(key)
+        except Exception as exc:
+            logger.warning('Cache unavailable writing unread count: %s', exc)
+    return count
+
+
+def _bump_version(user_id):
+    key = _version_key(user_id)
+    cache.add(key, 0, UNREAD_CACHE_TIMEOUT * 24)
+    try:
+        cache.incr(key)
+    except ValueError:
+        pass
+
+
+def _publish(user_id):
+    try:
+        from django_redis import get_redis_connection
+
+        count = cache.get(_key(user_id))
+        payload = json.dumps({'unread_count': count})
+        get_redis_connection('default').publish(channel_name(user_id), payload)
+    except Exception as exc:
+        logger.warning('Could not publish notification update for user %s: %s', user_id, exc)
+
+
+def _apply_delta(user_id, delta):
+    key = _key(user_id)
+    try:
+        _bump_version(user_id)
+        if delta:
+            value = cache.incr(key, delta)
+            if value < 0:
+                cache.delete(key)
+    except ValueError:
+        # Το κλειδί δεν υπάρχει — θα υπολογιστεί στην επόμενη ανάγνωση
+        pass
+    except Exception as exc:
+        logger.warning('Cache unavailable updating unread count: %s', exc)
+    _publish(user_id)
+
+
+def adjust_unread_count(user_id, delta):
+    """Μεταβολή του μετρητή κατά delta μετά το commit της τρέχουσας transaction."""
+    transaction.on_commit(lambda: _apply_delta(user_id, delta))
+
+
+def reset_unread_count(user_id, count=None):
+    """
+    Ορισμός του μετρητή (π.χ. 0 μετά το «όλες ως διαβασμένες») ή διαγραφή του (count=None),
+    μετά το commit.
+    """
+    def apply():
+        try:
+            _bump_version(user_id)
+            if count is None:
+                cache.delete(_key(user_id))
+            else:
+                cache.set(_key(user_id), count, UNREAD_CACHE_TIMEOUT)
+        except Exception as exc:
+            logger.warning('Cache unavailable resetting unread count: %s', exc)
+        _publish(user_id)
+
+    transaction.on_commit(apply)
+
+
+def clear_unread_counts(user_ids):
+    """
+    Διαγραφή των μετρητών πολλών χρηστών μετά το commit (μαζικές αλλαγές εκτός
+    signals) — υπολογίζονται ξανά στην επόμενη ανάγνωση.
+    """
+    user_ids = list(user_ids)
+    if not user_ids:
+        return
+
+    def apply():
+        try:
+            for user_id in user_ids:
+                _bump_version(user_id)
+            cache.delete_many([_key(user_id) for user_id in user_ids])
+        except Exception as exc:
+            logger.warning('Cache unavailable clearing unread counts: %s', exc)
+
+    transaction.on_commit(apply)
+
+
+def subscribe(user_id):
+    """PubSub συνδεδεμένο στο κανάλι του χρήστη (ο καλών το κλείνει)."""
+    from django_redis import get_redis_connection
+
+    pubsub = get_redis_connection('default').pubsub(ignore_subscribe_messages=True)
+    pubsub.subscribe(channel_name(user_id))
+    return pubsub
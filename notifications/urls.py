@@ -12,4 +12,5 @@ urlpatterns = [
     # API endpoints
     path('api/unread-count/', views.get_unread_count, name='api_unread_count'),
     path('api/recent/', views.get_recent_notifications, name='api_recent_notifications'),
+    path('api/stream/', views.notification_stream, name='api_notification_stream'),
 ]
\ No newline at end of file
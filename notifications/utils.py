@@ -1,5 +1,19 @@
 from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.db.models import QuerySet
+
 from .models import Notification
+from .unread import adjust_unread_count, get_unread_count, reset_unread_count
+
+
+def _related_object_fields(related_object):
+    """content_type/object_id για το Generic Foreign Key (κενό αν δεν υπάρχει αντικείμενο)."""
+    if not related_object:
+        return {}
+    return {
+        'content_type': ContentType.objects.get_for_model(related_object),
+        'object_id': related_object.pk,
+    }
 
 
 def create_notification(user, title, message, notification_type='info', related_object=None):
@@ -25,19 +39,57 @@ def create_notification(user, title, message, notification_type='info', related_
     }
     
     # Αν υπάρχει σχετιζόμενο αντικείμενο, προσθέτουμε το Generic Foreign Key
-    if related_object:
-        notification_data['content_type'] = ContentType.objects.get_for_model(related_object)
-        notification_data['object_id'] = related_object.pk
+    notification_data.update(_related_object_fields(related_object))
     
     notification = Notification.objects.create(**notification_data)
     return notification
 
 
+def notify_many(users, title, message, notification_type='info', related_object=None, send_email=False):
+    """
+    Ίδια ειδοποίηση σε πολλούς χρήστες με ένα INSERT (π.χ. σε όλους τους χειριστές).
+
+    Args:
+        users: QuerySet, λίστα χρηστών ή ids (οι διπλοεγγραφές και τα None αγνοούνται)
+        send_email (bool): Αποστολή και με email από τον Celery worker, μετά το commit
+
+    Returns:
+        list: Οι Notification που δημιουργήθηκαν
+    """
+    if isinstance(users, QuerySet):
+        users = users.values_list('pk', flat=True)
+    user_ids = list(dict.fromkeys(
+        getattr(user, 'pk', user) for user in users if user is not None
+    ))
+    if not user_ids:
+        return []
+
+    related = _related_object_fields(related_object)
+    notifications = Notification.objects.bulk_create([
+        Notification(
+            user_id=user_id,
+            title=title,
+            message=message,
+            notification_type=notification_type,
+            **related,
+        )
+        for user_id in user_ids
+    ])
+    for user_id in user_ids:
+        adjust_unread_count(user_id, 1)
+
+    if send_email:
+        from .tasks import send_notification_emails
+        notification_ids = [notification.pk for notification in notifications]
+        transaction.on_commit(lambda: send_notification_emails.delay(notification_ids))
+    return notifications
+
+
 def get_unread_notifications_count(user):
     """
-    Επιστρέφει τον αριθμό των μη διαβασμένων ειδοποιήσεων για έναν χρήστη
+    Επιστρέφει τον αριθμό των μη διαβασμένων ειδοποιήσεων για έναν χρήστη (από το Redis)
     """
-    return Notification.objects.filter(user=user, is_read=False).count()
+    return get_unread_count(user.pk)
 
 
 def mark_all_notifications_as_read(user):
@@ -47,21 +99,35 @@ def mark_all_notifications_as_read(user):
     from django.utils import timezone
     
     unread_notifications = Notification.objects.filter(user=user, is_read=False)
-    unread_notifications.update(is_read=True, read_at=timezone.now())
+    count = unread_notifications.update(is_read=True, read_at=timezone.now())
+    reset_unread_count(user.pk, 0)
     
-    return unread_notifications.count()
+    return count
 
 
-def delete_old_notifications(days_old=30):
+def delete_old_notifications(days_old=30, batch_size=None, sleep=0, dry_run=False, progress=None):
     """
-    Διαγραφή παλιών ειδοποιήσεων που είναι παλαιότερες από τον καθορισμένο αριθμό ημερών
+    Διαγραφή παλιών ειδοποιήσεων που είναι παλαιότερες από τον καθορισμένο αριθμό ημερών.
+
+    Η διαγραφή γίνεται σε παρτίδες (βλ. pdede_leaves.retention) χωρίς signals, οπότε
+    ο μετρητής μη αναγνωσμένων ακυρώνεται εδώ για όσους χρήστες έχασαν αδιάβαστες.
     """
     from django.utils import timezone
     from datetime import timedelta
-    
+    from pdede_leaves.retention import RETENTION_BATCH_SIZE, delete_in_batches
+
     cutoff_date = timezone.now() - timedelta(days=days_old)
-    old_notifications = Notification.objects.filter(created_at__lt=cutoff_date)
-    count = old_notifications.count()
-    old_notifications.delete()
-    
-    return count
\ No newline at end of file
+
+    def reset_counters(rows):
+        for user_id in {user_id for _pk, user_id, is_read in rows if not is_read}:
+            reset_unread_count(user_id)
+
+    return delete_in_batches(
+        Notification.objects.filter(created_at__lt=cutoff_date),
+        batch_size=batch_size or RETENTION_BATCH_SIZE,
+        sleep=sleep,
+        dry_run=dry_run,
+        fields=('user_id', 'is_read'),
+        on_batch=reset_counters,
+        progress=progress,
+    )
\ No newline at end of file
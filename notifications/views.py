@@ -1,12 +1,20 @@
+import json
+import time
+
+from django.conf import settings
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required
 from django.contrib.auth.mixins import LoginRequiredMixin
 from django.views.generic import ListView
-from django.http import JsonResponse
+from django.http import Http404, JsonResponse, StreamingHttpResponse
 from django.contrib import messages
+from django.utils.cache import get_conditional_response, patch_cache_control
 from .models import Notification
+from .unread import adjust_unread_count, get_unread_count as get_cached_unread_count, subscribe
 from .utils import mark_all_notifications_as_read
 
+STREAM_KEEPALIVE_SECONDS = 15
+
 
 class NotificationListView(LoginRequiredMixin, ListView):
     """Λίστα ειδοποιήσεων χρήστη"""
@@ -22,10 +30,12 @@ class NotificationListView(LoginRequiredMixin, ListView):
         context = super().get_context_data(**kwargs)
         
         # Στατιστικά
+        total = self.get_queryset().count()
+        unread_count = get_cached_unread_count(self.request.user.pk)
         context.update({
-            'total_notifications': self.get_queryset().count(),
-            'unread_count': self.get_queryset().filter(is_read=False).count(),
-            'read_count': self.get_queryset().filter(is_read=True).count(),
+            'total_notifications': total,
+            'unread_count': unread_count,
+            'read_count': total - unread_count,
         })
         
         return context
@@ -66,6 +76,8 @@ def delete_notification(request, pk):
     
     if request.method == 'POST':
         notification.delete()
+        if not notification.is_read:
+            adjust_unread_count(request.user.pk, -1)
         
         if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
             return JsonResponse({'success': True})
@@ -77,9 +89,71 @@ def delete_notification(request, pk):
 
 @login_required
 def get_unread_count(request):
-    """API endpoint για τον αριθμό μη διαβασμένων ειδοποιήσεων"""
-    unread_count = Notification.objects.filter(user=request.user, is_read=False).count()
-    return JsonResponse({'unread_count': unread_count})
+    """
+    API endpoint για τον αριθμό μη διαβασμένων ειδοποιήσεων.
+
+    Ο μετρητής έρχεται από το Redis· με If-None-Match ίδιο με το ETag επιστρέφεται 304.
+    """
+    unread_count = get_cached_unread_count(request.user.pk)
+    etag = f'"unread-{request.user.pk}-{unread_count}"'
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = JsonResponse({'unread_count': unread_count})
+    response['ETag'] = etag
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+def _sse_event(event, data):
+    return f'event: {event}\ndata: {json.dumps(data)}\n\n'
+
+
+def _notification_events(user_id, timeout):
+    """Γεγονότα SSE: ο τρέχων μετρητής και κάθε αλλαγή του από το κανάλι Redis του χρήστη."""
+    # Εγγραφή πριν από την αρχική τιμή, ώστε να μη χαθεί αλλαγή ανάμεσα
+    pubsub = subscribe(user_id)
+    try:
+        yield 'retry: 5000\n\n'
+        yield _sse_event('unread', {'unread_count': get_cached_unread_count(user_id)})
+        deadline = time.monotonic() + timeout
+        next_keepalive = time.monotonic() + STREAM_KEEPALIVE_SECONDS
+        while True:
+            now = time.monotonic()
+            if now >= deadline:
+                return
+            # None και για τα μηνύματα επιβεβαίωσης εγγραφής, όχι μόνο στο timeout
+            message = pubsub.get_message(timeout=min(next_keepalive, deadline) - now)
+            if message is None:
+                if time.monotonic() >= next_keepalive:
+                    next_keepalive = time.monotonic() + STREAM_KEEPALIVE_SECONDS
+                    yield ': keepalive\n\n'
+                continue
+            data = json.loads(message['data'])
+            if data.get('unread_count') is None:
+                data['unread_count'] = get_cached_unread_count(user_id)
+            yield _sse_event('unread', data)
+    finally:
+        pubsub.close()
+
+
+@login_required
+def notification_stream(request):
+    """
+    Server-Sent Events με τον μετρητή μη αναγνωσμένων (push αντί για polling).
+
+    Κάθε σύνδεση κρατά έναν worker έως NOTIFICATIONS_STREAM_TIMEOUT δευτερόλεπτα (ο browser
+    επανασυνδέεται αυτόματα), γι' αυτό ενεργοποιείται με NOTIFICATIONS_STREAM_ENABLED μόνο
+    όταν ο server εξυπηρετεί ασύγχρονα (π.χ. gunicorn με gevent workers).
+    """
+    if not getattr(settings, 'NOTIFICATIONS_STREAM_ENABLED', False):
+        raise Http404
+    timeout = getattr(settings, 'NOTIFICATIONS_STREAM_TIMEOUT', 55)
+    response = StreamingHttpResponse(
+        _notification_events(request.user.pk, timeout), content_type='text/event-stream',
+    )
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
 
 
 @login_required
@@ -103,5 +177,5 @@ def get_recent_notifications(request):
     
     return JsonResponse({
         'notifications': notifications_data,
-        'unread_count': Notification.objects.filter(user=request.user, is_read=False).count()
+        'unread_count': get_cached_unread_count(request.user.pk),
     })
\ No newline at end of file
@@ -0,0 +1,15 @@
+"""
+Celery application για εργασίες παρασκηνίου (ενοποιημένα PDF, email πρωτοκόλλου).
+
+Ο broker είναι το Redis του docker-compose. Ο worker εκκινείται με:
+    celery -A pdede_leaves worker -l info
+"""
+import os
+
+from celery import Celery
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'pdede_leaves.settings')
+
+app = Celery('pdede_leaves')
+app.config_from_object('django.conf:settings', namespace='CELERY')
+app.autodiscover_tasks()
@@ -74,7 +74,8 @@ def build_email_subject(leave_request):
     return ' - '.join(parts)
 
 
-def send_merged_pdf_email(leave_request, pdf_bytes, recipient=None, custom_subject=None):
+def send_merged_pdf_email(leave_request, pdf_bytes, recipient=None, custom_subject=None,
+                          fail_silently=True):
     """
     Στέλνει το ενοποιημένο PDF μέσω email.
 
@@ -83,6 +84,7 @@ def send_merged_pdf_email(leave_request, pdf_bytes, recipient=None, custom_subje
         pdf_bytes: bytes του ενοποιημένου PDF
         recipient: (optional) email παραλήπτη. Αν δεν δοθεί, χρησιμοποιείται το PROTOCOL_EMAIL_RECIPIENT από settings.
         custom_subject: (optional) προσαρμοσμένο θέμα email. Αν δεν δοθεί, χρησιμοποιείται το default.
+        fail_silently: (optional) αν False, το σφάλμα SMTP προωθείται (π.χ. για retry από Celery task).
 
     Returns:
         bool: True αν στάλθηκε επιτυχώς
@@ -124,6 +126,8 @@ def send_merged_pdf_email(leave_request, pdf_bytes, recipient=None, custom_subje
         import logging
         logger = logging.getLogger(__name__)
         logger.error(f"Failed to send email for leave request {leave_request.id}: {e}")
+        if not fail_silently:
+            raise
         return False
 
 
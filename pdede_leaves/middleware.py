@@ -1,8 +1,19 @@
-"""Security headers middleware για Observatory / production hardening."""
+"""Security headers και profiling middleware."""
+import logging
+import random
 import secrets
+import time
+from contextlib import ExitStack
 
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
 from django.utils.deprecation import MiddlewareMixin
 
+from pdede_leaves.profiling import RequestProfile, activate_profile, install_template_timing
+
+profiling_logger = logging.getLogger('pdede_leaves.profiling')
+
 
 class SecurityHeadersMiddleware(MiddlewareMixin):
     """CSP με nonce, Referrer-Policy και CORP για dynamic responses."""
@@ -34,3 +45,81 @@ class SecurityHeadersMiddleware(MiddlewareMixin):
         response['Referrer-Policy'] = 'strict-origin-when-cross-origin'
         response['Cross-Origin-Resource-Policy'] = 'same-origin'
         return response
+
+
+class RequestProfilingMiddleware:
+    """
+    Χρόνοι και SQL queries ανά αίτημα σε Server-Timing header και γραμμές log.
+
+    Ενεργοποιείται με REQUEST_PROFILING_ENABLED (αλλιώς αφαιρείται από την αλυσίδα).
+    Μόνο ένα δείγμα αιτημάτων (REQUEST_PROFILING_SAMPLE_RATE) καταγράφει queries,
+    templates και PDF· σε όλα μετριέται ο συνολικός χρόνος, ώστε τα αιτήματα πάνω
+    από REQUEST_PROFILING_SLOW_MS να καταγράφονται πάντα ως αργά. Queries με ίδιο
+    fingerprint τουλάχιστον REQUEST_PROFILING_REPEAT_THRESHOLD φορές σημειώνονται ως πιθανό N+1.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'REQUEST_PROFILING_ENABLED', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.sample_rate = getattr(settings, 'REQUEST_PROFILING_SAMPLE_RATE', 1.0)
+        self.slow_ms = getattr(settings, 'REQUEST_PROFILING_SLOW_MS', 1000)
+        self.repeat_threshold = getattr(settings, 'REQUEST_PROFILING_REPEAT_THRESHOLD', 5)
+        install_template_timing()
+
+    def __call__(self, request):
+        if self.sample_rate < 1 and random.random() >= self.sample_rate:
+            started = time.perf_counter()
+            response = self.get_response(request)
+            total_ms = (time.perf_counter() - started) * 1000
+            if total_ms >= self.slow_ms:
+                profiling_logger.warning(
+                    'slow request method=%s path=%s status=%s total_ms=%.1f sampled=0',
+                    request.method, request.path, response.status_code, total_ms,
+                    extra={'profile': {
+                        'method': request.method, 'path': request.path,
+                        'status': response.status_code, 'total_ms': round(total_ms, 1), 'sampled': False,
+                    }},
+                )
+            return response
+
+        profile = RequestProfile()
+        with ExitStack() as stack:
+            stack.enter_context(activate_profile(profile))
+            for alias in connections:
+                stack.enter_context(connections[alias].execute_wrapper(profile.execute_wrapper))
+            response = self.get_response(request)
+
+        self._report(request, response, profile)
+        return response
+
+    def _report(self, request, response, profile):
+        total_ms = profile.elapsed() * 1000
+        timings_ms = {name: seconds * 1000 for name, seconds in profile.timings.items()}
+        repeated = profile.repeated_queries(self.repeat_threshold)
+
+        parts = [f'db;dur={timings_ms.get("db", 0):.1f};desc="{profile.query_count} queries"']
+        parts += [f'{name};dur={timings_ms[name]:.1f}' for name in ('tpl', 'pdf') if name in timings_ms]
+        parts.append(f'total;dur={total_ms:.1f}')
+        response['Server-Timing'] = ', '.join(parts)
+
+        data = {
+            'method': request.method,
+            'path': request.path,
+            'status': response.status_code,
+            'total_ms': round(total_ms, 1),
+            'queries': profile.query_count,
+            'duplicate_queries': profile.duplicate_count(),
+            'repeated_queries': [{'sql': sql[:300], 'count': count} for sql, count in repeated[:5]],
+            'sampled': True,
+            **{f'{name}_ms': round(value, 1) for name, value in timings_ms.items()},
+        }
+        slow = total_ms >= self.slow_ms
+        profiling_logger.log(
+            logging.WARNING if slow or repeated else logging.INFO,
+            '%s method=%s path=%s status=%s total_ms=%.1f db_ms=%.1f queries=%d duplicates=%d repeated=%d',
+            'slow request' if slow else 'request',
+            request.method, request.path, response.status_code, total_ms, timings_ms.get('db', 0),
+            profile.query_count, data['duplicate_queries'], len(repeated),
+            extra={'profile': data},
+        )
@@ -0,0 +1,137 @@
+"""
+Καταγραφή χρόνων και SQL queries ανά αίτημα (βλ. RequestProfilingMiddleware).
+
+Το προφίλ του τρέχοντος αιτήματος κρατιέται σε thread-local· όσο δεν υπάρχει
+ενεργό προφίλ, τα hooks (profile_span, template render) κοστίζουν μόνο ένα lookup.
+"""
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import contextmanager
+
+_local = threading.local()
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r'\b\d+(?:\.\d+)?\b')
+_IN_LIST = re.compile(r'\bIN\s*\((?:\s*(?:%s|\?)\s*,?)+\)', re.IGNORECASE)
+_WHITESPACE = re.compile(r'\s+')
+
+
+def sql_fingerprint(sql):
+    """
+    Κανονικοποιημένη μορφή ενός query: χωρίς literals, με τις λίστες IN (...) σε μία
+    μορφή — ώστε τα «ίδια» queries με άλλες παραμέτρους (N+1) να ομαδοποιούνται.
+    """
+    sql = _STRING_LITERAL.sub('?', sql)
+    sql = _NUMBER.sub('?', sql)
+    sql = sql.replace('%s', '?')
+    sql = _IN_LIST.sub('IN (...)', sql)
+    return _WHITESPACE.sub(' ', sql).strip()
+
+
+class RequestProfile:
+    """Μετρήσεις ενός αιτήματος: queries (ανά SQL και παραμέτρους), χρόνοι ανά κατηγορία (db, tpl, pdf)."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.timings = Counter()
+        self.query_count = 0
+        self._queries = Counter()
+        self._executions = Counter()
+        self._depth = Counter()
+
+    def add_time(self, name, seconds):
+        self.timings[name] += seconds
+
+    def execute_wrapper(self, execute, sql, params, many, context):
+        """Για connection.execute_wrapper(): χρόνος και SQL κάθε query."""
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.timings['db'] += time.perf_counter() - started
+            self.query_count += 1
+            self._queries[sql] += 1
+            self._executions[sql, repr(params)] += 1
+
+    @contextmanager
+    def span(self, name):
+        """Χρονομέτρηση τμήματος· εμφωλευμένα spans ίδιου ονόματος μετρώνται μία φορά."""
+        self._depth[name] += 1
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._depth[name] -= 1
+            if not self._depth[name]:
+                self.timings[name] += time.perf_counter() - started
+
+    def repeated_queries(self, threshold):
+        """
+        Queries που εκτελέστηκαν τουλάχιστον threshold φορές με ίδιο fingerprint.
+
+        Returns:
+            list: [(fingerprint, πλήθος), ...] με φθίνουσα σειρά
+        """
+        fingerprints = Counter()
+        for sql, count in self._queries.items():
+            fingerprints[sql_fingerprint(sql)] += count
+        return [(sql, count) for sql, count in fingerprints.most_common() if count >= threshold]
+
+    def duplicate_count(self):
+        """Πλήθος queries που επαναλαμβάνουν ίδιο SQL με ίδιες παραμέτρους (πέραν της πρώτης εκτέλεσης)."""
+        return sum(count - 1 for count in self._executions.values())
+
+    def elapsed(self):
+        return time.perf_counter() - self.started
+
+
+def get_active_profile():
+    return getattr(_local, 'profile', None)
+
+
+@contextmanager
+def activate_profile(profile):
+    previous = get_active_profile()
+    _local.profile = profile
+    try:
+        yield profile
+    finally:
+        _local.profile = previous
+
+
+@contextmanager
+def profile_span(name):
+    """Χρονομέτρηση τμήματος στο προφίλ του τρέχοντος αιτήματος (χωρίς κόστος αν δεν υπάρχει)."""
+    profile = get_active_profile()
+    if profile is None:
+        yield
+        return
+    with profile.span(name):
+        yield
+
+
+_template_hook_installed = False
+
+
+def install_template_timing():
+    """
+    Χρονομέτρηση του rendering των Django templates (span 'tpl').
+
+    Τυλίγει το Template.render του backend μία φορά ανά διεργασία· τα includes
+    τρέχουν μέσα στο εξωτερικό render και δεν μετρώνται ξεχωριστά.
+    """
+    global _template_hook_installed
+    if _template_hook_installed:
+        return
+    from django.template.backends.django import Template
+
+    original_render = Template.render
+
+    def render(self, context=None, request=None):
+        with profile_span('tpl'):
+            return original_render(self, context, request)
+
+    Template.render = render
+    _template_hook_installed = True
@@ -0,0 +1,79 @@
+"""
+Διαγραφή παλαιών εγγραφών σε φραγμένες παρτίδες (retention logs/ειδοποιήσεων).
+
+Το QuerySet.delete() φορτώνει όλες τις εγγραφές στη μνήμη (collector για cascades και
+signals) και τις διαγράφει σε μία transaction. Εδώ τα ids διαβάζονται ανά παρτίδα με
+keyset pagination στο primary key και κάθε παρτίδα διαγράφεται με ένα
+DELETE ... WHERE id IN (...) στη δική της σύντομη transaction, με προαιρετική παύση
+ανάμεσα στις παρτίδες για να περιοριστεί το φορτίο IO/replication.
+
+Επειδή παρακάμπτονται cascades και signals, επιτρέπεται μόνο σε μοντέλα στα οποία
+δεν δείχνει κανένα άλλο μοντέλο· όσα signals χρειάζονται (π.χ. μετρητές) αντικαθίστανται
+από το on_batch.
+"""
+import time
+
+from django.db import connections, router, transaction
+
+RETENTION_BATCH_SIZE = 1000
+
+
+def _ensure_leaf_model(model):
+    related = [rel.related_model.__name__ for rel in model._meta.related_objects]
+    if related:
+        raise ValueError(
+            f'{model.__name__}: δεν επιτρέπεται μαζική διαγραφή — αναφέρεται από {", ".join(related)}.'
+        )
+
+
+def delete_in_batches(queryset, batch_size=RETENTION_BATCH_SIZE, sleep=0, dry_run=False,
+                      fields=(), on_batch=None, progress=None):
+    """
+    Διαγραφή των εγγραφών του queryset σε παρτίδες των batch_size.
+
+    Args:
+        sleep (float): Δευτερόλεπτα αναμονής μετά από κάθε παρτίδα
+        dry_run (bool): Μόνο μέτρηση, χωρίς διαγραφή
+        fields: Επιπλέον πεδία που διαβάζονται μαζί με το pk για το on_batch
+        on_batch: callable(rows) μετά τη διαγραφή κάθε παρτίδας — rows: [(pk, *fields), ...]
+        progress: callable(σύνολο μέχρι τώρα)
+
+    Returns:
+        int: Πλήθος εγγραφών που διαγράφηκαν (ή θα διαγράφονταν)
+    """
+    model = queryset.model
+    _ensure_leaf_model(model)
+    alias = router.db_for_write(model)
+    connection = connections[alias]
+    quote = connection.ops.quote_name
+    table = quote(model._meta.db_table)
+    pk_column = quote(model._meta.pk.column)
+
+    rows_queryset = queryset.using(alias).order_by('pk').values_list('pk', *fields)
+    total = 0
+    last_pk = None
+    while True:
+        batch_queryset = rows_queryset if last_pk is None else rows_queryset.filter(pk__gt=last_pk)
+        rows = list(batch_queryset[:batch_size])
+        if not rows:
+            break
+        ids = [row[0] for row in rows]
+        last_pk = ids[-1]
+
+        if dry_run:
+            total += len(ids)
+        else:
+            placeholders = ', '.join(['%s'] * len(ids))
+            with transaction.atomic(using=alias), connection.cursor() as cursor:
+                cursor.execute(f'DELETE FROM {table} WHERE {pk_column} IN ({placeholders})', ids)
+                total += cursor.rowcount
+            if on_batch:
+                on_batch(rows)
+
+        if progress:
+            progress(total)
+        if len(rows) < batch_size:
+            break
+        if sleep and not dry_run:
+            time.sleep(sleep)
+    return total
@@ -46,6 +46,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'pdede_leaves.middleware.RequestProfilingMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'pdede_leaves.middleware.SecurityHeadersMiddleware',
     'whitenoise.middleware.WhiteNoiseMiddleware',
@@ -126,7 +127,7 @@ STATICFILES_DIRS = [
     BASE_DIR / 'static',
 ]
 # Αύξησε κατά deploy που αλλάζει CSS/JS — το nginx σερβίρει /static/ με cache 1 έτους.
-THEME_STATIC_VERSION = config('THEME_STATIC_VERSION', default='10')
+THEME_STATIC_VERSION = config('THEME_STATIC_VERSION', default='11')
 
 # Security settings - keep relaxed defaults for local development and enable via env
 # in staging/production.
@@ -200,6 +201,40 @@ CACHES = {
     }
 }
 
+# Celery — εργασίες παρασκηνίου (ενοποιημένο PDF + email πρωτοκόλλου)
+CELERY_BROKER_URL = config('CELERY_BROKER_URL', default=config('REDIS_URL', default='redis://redis:6379/0'))
+CELERY_TASK_ALWAYS_EAGER = config('CELERY_TASK_ALWAYS_EAGER', default=False, cast=bool)
+CELERY_TASK_ACKS_LATE = True
+CELERY_WORKER_PREFETCH_MULTIPLIER = 1
+CELERY_TASK_IGNORE_RESULT = True
+CELERY_TASK_SERIALIZER = 'json'
+CELERY_ACCEPT_CONTENT = ['json']
+CELERY_TIMEZONE = TIME_ZONE
+
+# Αποστολή στο πρωτόκολλο που μένει σε QUEUED/BUILDING περισσότερα λεπτά θεωρείται
+# χαμένη (broker/worker) και σημειώνεται FAILED ώστε να μπορεί να ξαναγίνει
+PROTOCOL_DISPATCH_STALE_MINUTES = config('PROTOCOL_DISPATCH_STALE_MINUTES', default=30, cast=int)
+
+# Δημιουργία PDF (WeasyPrint) — ταυτόχρονα renders ανά διεργασία και μέγιστη αναμονή (δευτ.)
+PDF_RENDER_CONCURRENCY = config('PDF_RENDER_CONCURRENCY', default=1, cast=int)
+PDF_RENDER_WAIT_TIMEOUT = config('PDF_RENDER_WAIT_TIMEOUT', default=60, cast=int)
+
+# Εικόνες συνημμένων στο ενοποιημένο PDF — μέγιστη ανάλυση στη σελίδα και ποιότητα JPEG επανασυμπίεσης
+ATTACHMENT_IMAGE_PDF_DPI = config('ATTACHMENT_IMAGE_PDF_DPI', default=150, cast=int)
+ATTACHMENT_IMAGE_PDF_JPEG_QUALITY = config('ATTACHMENT_IMAGE_PDF_JPEG_QUALITY', default=85, cast=int)
+
+# Profiling αιτημάτων (Server-Timing + log pdede_leaves.profiling) — ποσοστό δείγματος,
+# όριο αργού αιτήματος (ms) και επαναλήψεις ίδιου query που σημειώνονται ως N+1
+REQUEST_PROFILING_ENABLED = config('REQUEST_PROFILING_ENABLED', default=False, cast=bool)
+REQUEST_PROFILING_SAMPLE_RATE = config('REQUEST_PROFILING_SAMPLE_RATE', default=1.0, cast=float)
+REQUEST_PROFILING_SLOW_MS = config('REQUEST_PROFILING_SLOW_MS', default=1000, cast=int)
+REQUEST_PROFILING_REPEAT_THRESHOLD = config('REQUEST_PROFILING_REPEAT_THRESHOLD', default=5, cast=int)
+
+# Ειδοποιήσεις μέσω Server-Sent Events — μόνο με ασύγχρονους workers (κάθε σύνδεση κρατά
+# έναν worker έως NOTIFICATIONS_STREAM_TIMEOUT δευτ.)· αλλιώς polling με ETag/304
+NOTIFICATIONS_STREAM_ENABLED = config('NOTIFICATIONS_STREAM_ENABLED', default=False, cast=bool)
+NOTIFICATIONS_STREAM_TIMEOUT = config('NOTIFICATIONS_STREAM_TIMEOUT', default=55, cast=int)
+
 # django-axes — προστασία brute force στο login
 AXES_FAILURE_LIMIT = config('AXES_FAILURE_LIMIT', default=5, cast=int)
 AXES_COOLOFF_TIME = config('AXES_COOLOFF_TIME', default=1, cast=int)  # ώρες
@@ -0,0 +1,84 @@
+"""Tests για το profiling middleware (Server-Timing, N+1, δειγματοληψία)."""
+from django.core.exceptions import MiddlewareNotUsed
+from django.http import HttpResponse
+from django.template import engines
+from django.test import RequestFactory, SimpleTestCase, TestCase, override_settings
+
+from accounts.models import User
+from pdede_leaves.middleware import RequestProfilingMiddleware
+from pdede_leaves.profiling import RequestProfile, profile_span, sql_fingerprint
+
+
+def n_plus_one_view(request):
+    for pk in range(6):
+        User.objects.filter(pk=pk).exists()
+    html = engines['django'].from_string('{% for i in items %}{{ i }}{% endfor %}').render({'items': [1, 2]})
+    with profile_span('pdf'):
+        pass
+    return HttpResponse(html)
+
+
+class SqlFingerprintTests(SimpleTestCase):
+    def test_literals_and_in_lists_are_normalised(self):
+        self.assertEqual(
+            sql_fingerprint("SELECT * FROM t WHERE a = 'x' AND b = 42 AND c IN (%s, %s,  %s)"),
+            'SELECT * FROM t WHERE a = ? AND b = ? AND c IN (...)',
+        )
+        self.assertEqual(
+            sql_fingerprint('SELECT 1 FROM t WHERE id IN (%s)'),
+            sql_fingerprint('SELECT 1 FROM t WHERE id IN (%s, %s)'),
+        )
+
+    def test_duplicates_need_same_sql_and_params(self):
+        profile = RequestProfile()
+        for params in ([1], [2], [1], [1]):
+            profile.execute_wrapper(lambda *args: None, 'SELECT 1 FROM t WHERE id = %s', params, False, {})
+        self.assertEqual(profile.query_count, 4)
+        self.assertEqual(profile.duplicate_count(), 2)
+
+
+@override_settings(
+    REQUEST_PROFILING_ENABLED=True, REQUEST_PROFILING_SAMPLE_RATE=1.0,
+    REQUEST_PROFILING_SLOW_MS=60000, REQUEST_PROFILING_REPEAT_THRESHOLD=5,
+)
+class RequestProfilingMiddlewareTests(TestCase):
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    @override_settings(REQUEST_PROFILING_ENABLED=False)
+    def test_disabled_middleware_is_removed(self):
+        with self.assertRaises(MiddlewareNotUsed):
+            RequestProfilingMiddleware(n_plus_one_view)
+
+    def test_server_timing_and_repeated_queries(self):
+        middleware = RequestProfilingMiddleware(n_plus_one_view)
+        with self.assertLogs('pdede_leaves.profiling', 'WARNING') as logs:
+            response = middleware(self.factory.get('/list/'))
+
+        header = response['Server-Timing']
+        self.assertIn('desc="6 queries"', header)
+        for name in ('db;dur=', 'tpl;dur=', 'pdf;dur=', 'total;dur='):
+            self.assertIn(name, header)
+
+        profile = logs.records[0].profile
+        self.assertEqual(profile['path'], '/list/')
+        self.assertEqual(profile['queries'], 6)
+        self.assertEqual(profile['repeated_queries'][0]['count'], 6)
+        self.assertEqual(profile['duplicate_queries'], 0)
+        self.assertIn('repeated=1', logs.output[0])
+
+    def test_fast_clean_request_logs_at_info(self):
+        middleware = RequestProfilingMiddleware(lambda request: HttpResponse('ok'))
+        with self.assertLogs('pdede_leaves.profiling', 'INFO') as logs:
+            response = middleware(self.factory.get('/'))
+        self.assertIn('desc="0 queries"', response['Server-Timing'])
+        self.assertEqual(logs.records[0].levelname, 'INFO')
+
+    @override_settings(REQUEST_PROFILING_SAMPLE_RATE=0, REQUEST_PROFILING_SLOW_MS=0)
+    def test_unsampled_requests_only_report_slow_ones(self):
+        middleware = RequestProfilingMiddleware(n_plus_one_view)
+        with self.assertLogs('pdede_leaves.profiling', 'WARNING') as logs:
+            response = middleware(self.factory.get('/list/'))
+        self.assertNotIn('Server-Timing', response)
+        self.assertIn('slow request', logs.output[0])
+        self.assertFalse(logs.records[0].profile['sampled'])
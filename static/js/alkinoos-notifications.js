@@ -4,8 +4,12 @@
     const body = document.body;
     const csrfToken = body.dataset.csrfToken || '';
     const notificationsApi = body.dataset.notificationsApi || '';
+    const unreadCountUrl = body.dataset.unreadCountUrl || '';
+    const notificationsStream = body.dataset.notificationsStream || '';
     const markAllReadUrl = body.dataset.markAllReadUrl || '';
     const isAuthenticated = body.dataset.userAuthenticated === 'true';
+    let lastUnreadCount = null;
+    let unreadEtag = '';
 
     function syncMobileNotifBadge(count) {
         const mobileBadge = document.getElementById('mobile-notif-badge');
@@ -29,6 +33,7 @@
                 return response.json();
             })
             .then(function (data) {
+                lastUnreadCount = data.unread_count;
                 const notificationList = document.getElementById('notification-list');
                 const notificationCount = document.getElementById('notification-count');
                 if (!notificationList || !notificationCount) {
@@ -75,6 +80,51 @@
             });
     }
 
+    // Ανανέωση της λίστας μόνο όταν αλλάξει ο μετρητής μη αναγνωσμένων
+    function onUnreadCount(count) {
+        if (count !== lastUnreadCount) {
+            loadNotifications();
+        }
+    }
+
+    // Fallback: έλεγχος του μετρητή με If-None-Match (304 όσο δεν αλλάζει)
+    function pollUnreadCount() {
+        if (!unreadCountUrl) {
+            return;
+        }
+        const headers = unreadEtag ? { 'If-None-Match': unreadEtag } : {};
+        fetch(unreadCountUrl, { headers: headers, cache: 'no-store' })
+            .then(function (response) {
+                if (response.status === 304 || !response.ok) {
+                    return null;
+                }
+                unreadEtag = response.headers.get('ETag') || '';
+                return response.json();
+            })
+            .then(function (data) {
+                if (data) {
+                    onUnreadCount(data.unread_count);
+                }
+            });
+    }
+
+    function watchUnreadCount() {
+        if (notificationsStream && window.EventSource) {
+            const source = new EventSource(notificationsStream);
+            source.addEventListener('unread', function (event) {
+                onUnreadCount(JSON.parse(event.data).unread_count);
+            });
+            source.addEventListener('error', function () {
+                // Οριστική αποτυχία (π.χ. 404 όταν το stream είναι ανενεργό): επιστροφή σε polling
+                if (source.readyState === EventSource.CLOSED) {
+                    setInterval(pollUnreadCount, 30000);
+                }
+            });
+            return;
+        }
+        setInterval(pollUnreadCount, 30000);
+    }
+
     function markAsRead(notificationId) {
         fetch('/notifications/mark-read/' + notificationId + '/', {
             method: 'POST',
@@ -114,7 +164,7 @@
     document.addEventListener('DOMContentLoaded', function () {
         if (isAuthenticated) {
             loadNotifications();
-            setInterval(loadNotifications, 30000);
+            watchUnreadCount();
 
             const markAllBtn = document.getElementById('mark-all-notifications-read');
             if (markAllBtn) {
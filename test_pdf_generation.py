@@ -11,7 +11,7 @@ django.setup()
 from django.template.loader import render_to_string
 from leaves.models import LeaveRequest, Logo, Info, Ypopsin, Signee
 from leaves.crypto_utils import SecureFileHandler
-import weasyprint
+from leaves.utils.pdf_renderer import render_html_to_pdf
 
 def test_pdf_generation():
     print("Starting PDF Generation Test...")
@@ -41,8 +41,8 @@ def test_pdf_generation():
         html_string = render_to_string('leaves/decision_pdf_template.html', context)
         print(f"✓ HTML generated: {len(html_string)} characters")
         
-        # 2. PDF Generation με WeasyPrint
-        pdf = weasyprint.HTML(string=html_string).write_pdf()
+        # 2. PDF Generation (κοινό stylesheet αποφάσεων του pdf_renderer)
+        pdf = render_html_to_pdf(html_string, family='decision')
         print(f"✓ PDF generated: {len(pdf)} bytes")
         
         # 3. Αποθήκευση και κρυπτογράφηση